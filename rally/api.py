@@ -277,21 +277,44 @@ class _Task(APIGroup):
 
     @api_wrapper(path=API_REQUEST_PREFIX + "/task/get_detailed",
                  method="GET")
-    def get_detailed(self, task_id, extended_results=False):
+    def get_detailed(self, task_id, extended_results=False, load_raw=True):
         """Get detailed task data.
 
         :param task_id: str task UUID
         :param extended_results: whether to return task data as dict
                                  with extended results
+        :param load_raw: whether to load iterations of workloads, if False
+                         then they can be loaded chunk by chunk with
+                         get_workload_data()
         :returns: rally.common.db.sqlalchemy.models.Task
         :returns: dict
         """
-        task = objects.Task.get_detailed(task_id)
+        task = objects.Task.get_detailed(task_id, load_raw=load_raw)
         if task and extended_results:
             task = dict(task)
             task["results"] = objects.Task.extend_results(task["results"])
         return task
 
+    @api_wrapper(path=API_REQUEST_PREFIX + "/task/get_workload_data",
+                 method="GET")
+    def get_workload_data(self, workload_uuid, chunk=0):
+        """Get a page of iterations of the workload.
+
+        Each page contains iterations of a single chunk of the workload, so
+        all iterations can be loaded page by page, starting from the chunk
+        0 and while `next_chunk' of the page is not None.
+
+        :param workload_uuid: str workload UUID
+        :param chunk: int index of the chunk, in order of chunks
+        :returns: dict with the following keys:
+            chunk - index of the chunk
+            offset - index of the first iteration of the chunk in workload
+            iterations_count - number of iterations of the whole workload
+            iterations - list of iterations of the chunk
+            next_chunk - index of the next chunk or None
+        """
+        return objects.Workload.get_data_page(workload_uuid, chunk=chunk)
+
     # TODO(andreykurilin): move it to some kind of utils
     @api_wrapper(path=API_REQUEST_PREFIX + "/task/render_template",
                  method="GET")
@@ -567,11 +590,13 @@ class _Task(APIGroup):
                 results_chunk = result["result"][:chunk_size]
                 result["result"] = result["result"][chunk_size:]
                 results_chunk.sort(key=lambda x: x["timestamp"])
-                workload_obj.add_workload_data(workload_data_count,
-                                               {"raw": results_chunk})
+                workload_obj.add_workload_data(
+                    workload_data_count, {"raw": results_chunk},
+                    compress=CONF.raw_result_chunk_compression)
                 workload_data_count += 1
-            workload_obj.add_workload_data(workload_data_count,
-                                           {"raw": result["result"]})
+            workload_obj.add_workload_data(
+                workload_data_count, {"raw": result["result"]},
+                compress=CONF.raw_result_chunk_compression)
             workload_obj.set_results(result)
             subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
         task_inst.update_status(consts.SubtaskStatus.FINISHED)
@@ -1053,13 +1078,19 @@ class _Verification(APIGroup):
         # TODO(ylobankov): Check that verification exists in the database
         #                  because users may delete verification before tests
         #                  finish.
-        verification.finish(results.totals, results.tests)
+        # NOTE: results of tests are saved while they are running, so only
+        #       the ones which were not saved as they are now are saved here.
+        #       Managers which do not save results while running do not
+        #       report `unreported_tests', all tests are saved then.
+        verification.finish(results.totals,
+                            getattr(results, "unreported_tests",
+                                    results.tests))
 
         LOG.info("Verification (UUID=%s) has been successfully finished for "
                  "deployment '%s' (UUID=%s)!", verification.uuid,
                  verifier.deployment["name"], verifier.deployment["uuid"])
 
-        return {"verification": verification.to_dict(),
+        return {"verification": verification.to_dict(include_tests=False),
                 "totals": results.totals,
                 "tests": results.tests}
 
@@ -1083,16 +1114,15 @@ class _Verification(APIGroup):
             run_args["concurrency"] = concurrency
 
         verification = self._get(verification_uuid)
-        tests = verification.tests
 
         if failed:
-            tests = [t for t, r in tests.items() if r["status"] == "fail"]
+            tests = list(verification.get_tests(status="fail"))
             if not tests:
                 raise exceptions.RallyException(
                     "There are no failed tests from verification (UUID=%s)."
                     % verification_uuid)
         else:
-            tests = tests.keys()
+            tests = list(verification.tests)
 
         deployment = (deployment_id if deployment_id
                       else verification.deployment_uuid)
@@ -1126,9 +1156,10 @@ class _Verification(APIGroup):
         :param tags: Tags to filter verifications by
         :param status: Status to filter verifications by
         """
-        return [item.to_dict() for item in objects.Verification.list(
-            verifier_id, deployment_id=deployment_id,
-            tags=tags, status=status)]
+        return [item.to_dict(include_tests=False)
+                for item in objects.Verification.list(
+                    verifier_id, deployment_id=deployment_id,
+                    tags=tags, status=status)]
 
     @api_wrapper(path=API_REQUEST_PREFIX + "/verification/delete",
                  method="DELETE")
@@ -1201,7 +1232,7 @@ class _Verification(APIGroup):
 
         LOG.info("Test results have been successfully imported.")
 
-        return {"verification": verification.to_dict(),
+        return {"verification": verification.to_dict(include_tests=False),
                 "totals": results.totals,
                 "tests": results.tests}
 
@@ -17,6 +17,7 @@
 
 from __future__ import print_function
 import collections
+import functools
 import json
 import os
 import sys
@@ -664,16 +665,24 @@ class TaskCommands(object):
                 tasks_results = self._load_task_results_file(
                     api, task_file_or_uuid)
             elif uuidutils.is_uuid_like(task_file_or_uuid):
+                # NOTE: iterations are loaded from DB chunk by chunk,
+                #     while report is processed
                 tasks_results = map(
                     lambda x: {"key": x["key"],
                                "sla": x["data"]["sla"],
                                "hooks": x["data"].get("hooks", []),
-                               "result": x["data"]["raw"],
+                               "result": putils.ChunkedIterations(
+                                   functools.partial(
+                                       api.task.get_workload_data,
+                                       workload_uuid=x["data"][
+                                           "workload_uuid"])),
+                               "statistics": x["data"].get("statistics"),
                                "load_duration": x["data"]["load_duration"],
                                "full_duration": x["data"]["full_duration"],
                                "created_at": x["created_at"]},
                     api.task.get_detailed(
-                        task_id=task_file_or_uuid)["results"])
+                        task_id=task_file_or_uuid,
+                        load_raw=False)["results"])
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s"
                         ) % task_file_or_uuid,
@@ -690,8 +699,8 @@ class TaskCommands(object):
                 results.append(task_result)
 
         if out_format.startswith("html"):
-            result = plot.plot(results,
-                               include_libs=(out_format == "html_static"))
+            result = plot.generate_plot(
+                results, include_libs=(out_format == "html_static"))
         elif out_format == "junit":
             test_suite = junit.JUnit("Rally test suite")
             for result in results:
@@ -704,7 +713,7 @@ class TaskCommands(object):
                     outcome = junit.JUnit.SUCCESS
                 test_suite.add_test(result["key"]["name"],
                                     result["full_duration"], outcome, message)
-            result = test_suite.to_xml()
+            result = [test_suite.to_xml()]
         else:
             print(_("Invalid output format: %s") % out_format, file=sys.stderr)
             return 1
@@ -713,11 +722,12 @@ class TaskCommands(object):
             output_file = os.path.expanduser(out)
 
             with open(output_file, "w+") as f:
-                f.write(result)
+                for piece in result:
+                    f.write(piece)
             if open_it:
                 webbrowser.open_new_tab("file://" + os.path.realpath(out))
         else:
-            print(result)
+            print("".join(result))
 
     @cliutils.args("--force", action="store_true", help="force delete")
     @cliutils.args("--uuid", type=str, dest="task_id", nargs="*",
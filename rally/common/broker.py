@@ -23,16 +23,26 @@ from rally.common import logging
 LOG = logging.getLogger(__name__)
 
 
-def _consumer(consume, queue):
+def _consumer(consume, queue, is_published=None):
     """Infinity worker that consumes tasks from queue.
 
     :param consume: method that consumes an object removed from the queue
     :param queue: deque object to popleft() objects from
+    :param is_published: optional threading.Event, that is set when all
+                         objects are put to the queue. If specified, the
+                         worker waits for new objects in the empty queue
+                         until the event is set
     """
     cache = {}
     while True:
+        # NOTE: the event must be checked before the queue, otherwise
+        #       objects published in between can be missed
+        published = is_published is None or is_published.is_set()
         if not queue:
-            break
+            if published:
+                break
+            is_published.wait(0.1)
+            continue
         else:
             try:
                 args = queue.popleft()
@@ -61,7 +71,7 @@ def _publisher(publish, queue):
             LOG.exception(e)
 
 
-def run(publish, consume, consumers_count=1):
+def run(publish, consume, consumers_count=1, pipeline=False):
     """Run broker.
 
     publish() put to queue, consume() process one element from queue.
@@ -72,15 +82,30 @@ def run(publish, consume, consumers_count=1):
     :param publish: Function that puts values to the queue
     :param consume: Function that processes a single value from the queue
     :param consumers_count: Number of consumers
+    :param pipeline: If True, consumers are started before publish() and
+                     process values while it is still putting them to the
+                     queue. Otherwise consumers are started when publish()
+                     is finished
     """
     queue = collections.deque()
-    _publisher(publish, queue)
+    is_published = None
+    if pipeline:
+        is_published = threading.Event()
+    else:
+        _publisher(publish, queue)
 
     consumers = []
     for i in range(consumers_count):
-        consumer = threading.Thread(target=_consumer, args=(consume, queue))
+        consumer = threading.Thread(target=_consumer,
+                                    args=(consume, queue, is_published))
         consumer.start()
         consumers.append(consumer)
 
+    if pipeline:
+        try:
+            _publisher(publish, queue)
+        finally:
+            is_published.set()
+
     for consumer in consumers:
         consumer.join()
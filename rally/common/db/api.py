@@ -65,6 +65,7 @@ def serialize(fn):
             return None
         if isinstance(data, (six.integer_types,
                              six.string_types,
+                             six.binary_type,
                              six.text_type,
                              dt.date,
                              dt.time,
@@ -154,13 +155,15 @@ def task_get_detailed_last():
     return get_impl().task_get_detailed_last()
 
 
-def task_get_detailed(uuid):
+def task_get_detailed(uuid, load_raw=True):
     """Returns task with results by uuid.
 
     :param uuid: UUID of the task.
+    :param load_raw: whether to load iterations of workloads. If False,
+                     results contain `workload_uuid' instead of `raw'.
     :returns: task dict with data on the task and its results.
     """
-    return get_impl().task_get_detailed(uuid)
+    return get_impl().task_get_detailed(uuid, load_raw=load_raw)
 
 
 def task_create(values):
@@ -234,16 +237,20 @@ def task_result_get_all_by_uuid(task_uuid):
     return get_impl().task_result_get_all_by_uuid(task_uuid)
 
 
-def subtask_create(task_uuid, title, description=None, context=None):
+def subtask_create(task_uuid, title, description=None, context=None,
+                   run_in_parallel=False):
     """Create a subtask.
 
     :param task_uuid: string with UUID of Task instance.
     :param title: subtask title.
     :param description: subtask description.
     :param context: subtask context dict.
+    :param run_in_parallel: whether the subtask is run concurrently with
+                            the neighbouring ones.
     :returns: a dict with data on the subtask.
     """
-    return get_impl().subtask_create(task_uuid, title, description, context)
+    return get_impl().subtask_create(task_uuid, title, description, context,
+                                     run_in_parallel)
 
 
 def subtask_update(subtask_uuid, values):
@@ -267,17 +274,35 @@ def workload_create(task_uuid, subtask_uuid, key):
     return get_impl().workload_create(task_uuid, subtask_uuid, key)
 
 
-def workload_data_create(task_uuid, workload_uuid, chunk_order, data):
+def workload_data_create(task_uuid, workload_uuid, chunk_order, data,
+                         compress=False):
     """Create a workload data.
 
     :param task_uuid: string with UUID of Task instance.
     :param workload_uuid: string with UUID of Workload instance.
     :param chunk_order: ordinal index of workload data.
     :param data: dict with record values on the workload data.
+    :param compress: whether to store raw data of the chunk compressed.
     :returns: a dict with data on the workload data.
     """
     return get_impl().workload_data_create(task_uuid, workload_uuid,
-                                           chunk_order, data)
+                                           chunk_order, data,
+                                           compress=compress)
+
+
+def workload_data_get_page(workload_uuid, chunk=0):
+    """Get raw data of a single chunk of a workload.
+
+    :param workload_uuid: string with UUID of Workload instance.
+    :param chunk: index of the chunk, in order of chunks
+    :returns: a dict with the following keys:
+        chunk - index of the chunk
+        offset - index of the first iteration of the chunk in the workload
+        iterations_count - number of iterations of the whole workload
+        iterations - list of iterations of the chunk
+        next_chunk - index of the next chunk or None if it is the last one
+    """
+    return get_impl().workload_data_get_page(workload_uuid, chunk=chunk)
 
 
 def workload_set_results(workload_uuid, data):
@@ -491,6 +516,33 @@ def verification_update(uuid, **properties):
     return get_impl().verification_update(uuid, properties)
 
 
+def verification_add_tests(verification_uuid, tests):
+    """Save results of verification tests and update totals of verification.
+
+    Already saved results of the same tests are replaced.
+
+    :param verification_uuid: verification UUID
+    :param tests: a dict with test ids as keys and dicts with test results
+                  (name, status, duration, tags, timestamp, reason, etc) as
+                  values
+    :raises ResourceNotFound: if verification does not exist
+    :returns: the updated dict with verification data
+    """
+    return get_impl().verification_add_tests(verification_uuid, tests)
+
+
+def verification_test_list(verification_uuid=None, name=None, status=None):
+    """List results of verification tests.
+
+    :param verification_uuid: verification UUID to filter tests by
+    :param name: test name (without tags) to filter tests by. Can be used to
+                 compare results of the test in different verifications
+    :param status: test status to filter tests by
+    :returns: a list of dicts with tests data
+    """
+    return get_impl().verification_test_list(verification_uuid, name, status)
+
+
 def register_worker(values):
     """Register a new worker service at the specified hostname.
 
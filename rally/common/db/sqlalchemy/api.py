@@ -21,6 +21,7 @@ import datetime as dt
 import json
 import os
 import time
+import zlib
 
 import alembic
 from alembic import config as alembic_config
@@ -30,7 +31,9 @@ from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
 from oslo_utils import timeutils
+from sqlalchemy import func
 from sqlalchemy import or_
+from sqlalchemy.orm import defer as sa_defer
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import load_only as sa_loadonly
 
@@ -219,11 +222,62 @@ class Connection(object):
             "verification_log": json.dumps(task.validation_result)
         }
 
-    def _make_old_task_result(self, workload, workload_data_list):
-        raw_data = [data
-                    for workload_data in workload_data_list
-                    for data in workload_data.chunk_data["raw"]]
-        return {
+    @staticmethod
+    def _encode_chunk_data(raw_data, compress=False):
+        """Encode raw data of a chunk.
+
+        :param raw_data: list of iterations
+        :param compress: whether to store zlib compressed json instead of
+                         plain list of iterations
+        :returns: dict with chunk_data, compressed_chunk_data, chunk_size
+                  and compressed_chunk_size values of the chunk. Sizes are
+                  in bytes: of json encoded raw data and of stored data
+        """
+        encoded = json.dumps(raw_data, separators=(",", ":")).encode("utf-8")
+        if not compress:
+            return {"chunk_data": {"raw": raw_data},
+                    "compressed_chunk_data": None,
+                    "chunk_size": len(encoded),
+                    "compressed_chunk_size": len(encoded)}
+        compressed = zlib.compress(encoded)
+        return {"chunk_data": {"compression": "zlib"},
+                "compressed_chunk_data": compressed,
+                "chunk_size": len(encoded),
+                "compressed_chunk_size": len(compressed)}
+
+    @staticmethod
+    def _get_raw_data(workload_data):
+        """Return list of iterations of a chunk, decompress it if needed."""
+        if workload_data.chunk_data.get("compression") == "zlib":
+            return json.loads(zlib.decompress(
+                workload_data.compressed_chunk_data).decode("utf-8"))
+        return workload_data.chunk_data["raw"]
+
+    @staticmethod
+    def _convert_atomic_actions(raw_data):
+        """Convert atomic actions of iterations from the old format."""
+        for itr in raw_data:
+            new_atomic_actions = []
+            started_at = itr["timestamp"]
+            for name, d in itr["atomic_actions"].items():
+                finished_at = started_at + d
+                new_atomic_actions.append(
+                    {"name": name, "children": [],
+                     "started_at": started_at,
+                     "finished_at": finished_at})
+                started_at = finished_at
+            itr["atomic_actions"] = new_atomic_actions
+
+    def _make_old_task_result(self, workload, workload_data_list=None):
+        """Make task result in old format from workload.
+
+        :param workload: models.Workload instance
+        :param workload_data_list: models.WorkloadData instances of the
+            workload. If None, then data contains `workload_uuid' instead of
+            `raw', so iterations can be loaded later chunk by chunk with
+            workload_data_get_page()
+        """
+        result = {
             "id": workload.id,
             "task_uuid": workload.task_uuid,
             "created_at": workload.created_at,
@@ -241,13 +295,20 @@ class Connection(object):
                 }
             },
             "data": {
-                "raw": raw_data,
                 "load_duration": workload.load_duration,
                 "full_duration": workload.full_duration,
                 "sla": workload.sla_results.get("sla", []),
-                "hooks": workload.hooks
+                "hooks": workload.hooks,
+                "statistics": workload.statistics
             }
         }
+        if workload_data_list is None:
+            result["data"]["workload_uuid"] = workload.uuid
+        else:
+            result["data"]["raw"] = [
+                data for workload_data in workload_data_list
+                for data in self._get_raw_data(workload_data)]
+        return result
 
     def _task_workload_data_get_all(self, workload_uuid):
         session = get_session()
@@ -255,39 +316,57 @@ class Connection(object):
             results = (self.model_query(models.WorkloadData, session=session).
                        filter_by(workload_uuid=workload_uuid).
                        order_by(models.WorkloadData.chunk_order.asc()))
-            if results.first() and results[0].chunk_data["raw"] and isinstance(
-                    results[0].chunk_data["raw"][0]["atomic_actions"], dict):
+            first_chunk = results.first()
+            raw_data = first_chunk and self._get_raw_data(first_chunk)
+            if raw_data and isinstance(raw_data[0]["atomic_actions"], dict):
                 # NOTE(andreykurilin): It is an old format of atomic actions.
                 #   We do not have migration yet, since it can take too much
                 #   time on the big databases. Let's lazy-migrate results which
                 #   user greps and force a migration after several releases.
 
                 for workload_data in results:
-                    chunk_data = copy.deepcopy(workload_data.chunk_data)
-                    for chunk in chunk_data["raw"]:
-                        new_atomic_actions = []
-                        started_at = chunk["timestamp"]
-                        for name, d in chunk["atomic_actions"].items():
-                            finished_at = started_at + d
-                            new_atomic_actions.append(
-                                {"name": name, "children": [],
-                                 "started_at": started_at,
-                                 "finished_at": finished_at})
-                            started_at = finished_at
-                        chunk["atomic_actions"] = new_atomic_actions
-                    workload_data.update({"chunk_data": chunk_data})
+                    raw_data = copy.deepcopy(self._get_raw_data(workload_data))
+                    self._convert_atomic_actions(raw_data)
+                    compress = (workload_data.chunk_data.get("compression") ==
+                                "zlib")
+                    workload_data.update(
+                        self._encode_chunk_data(raw_data, compress=compress))
 
         return results
 
+    def workload_data_get_page(self, workload_uuid, chunk=0):
+        chunks = (self.model_query(models.WorkloadData).
+                  options(sa_loadonly("id", "iteration_count")).
+                  filter_by(workload_uuid=workload_uuid).
+                  order_by(models.WorkloadData.chunk_order.asc()).all())
+        page = {"chunk": chunk,
+                "offset": sum(c.iteration_count for c in chunks[:chunk]),
+                "iterations_count": sum(c.iteration_count for c in chunks),
+                "iterations": [],
+                "next_chunk": chunk + 1 if chunk + 1 < len(chunks) else None}
+        if chunk >= len(chunks):
+            return page
+
+        # NOTE: only the requested chunk is loaded, so only a single chunk
+        #     is kept in memory while the caller processes it
+        workload_data = (self.model_query(models.WorkloadData).
+                         filter_by(id=chunks[chunk].id).first())
+        raw_data = self._get_raw_data(workload_data)
+        if raw_data and isinstance(raw_data[0]["atomic_actions"], dict):
+            self._convert_atomic_actions(raw_data)
+        page["iterations"] = raw_data
+        return page
+
     # @db_api.serialize
     def task_get(self, uuid):
         task = self._task_get(uuid)
         return self._make_old_task(task)
 
     # @db_api.serialize
-    def task_get_detailed(self, uuid):
+    def task_get_detailed(self, uuid, load_raw=True):
         task = self.task_get(uuid)
-        task["results"] = self._task_result_get_all_by_uuid(uuid)
+        task["results"] = self._task_result_get_all_by_uuid(
+            uuid, load_raw=load_raw)
         return task
 
     @db_api.serialize
@@ -411,15 +490,17 @@ class Connection(object):
                                                            actual=task.status)
                 raise exceptions.TaskNotFound(uuid=uuid)
 
-    def _task_result_get_all_by_uuid(self, uuid):
+    def _task_result_get_all_by_uuid(self, uuid, load_raw=True):
         results = []
 
         workloads = (self.model_query(models.Workload).
                      filter_by(task_uuid=uuid).all())
 
         for workload in workloads:
-            workload_data_list = self._task_workload_data_get_all(
-                workload.uuid)
+            workload_data_list = None
+            if load_raw:
+                workload_data_list = self._task_workload_data_get_all(
+                    workload.uuid)
 
             results.append(
                 self._make_old_task_result(workload, workload_data_list))
@@ -431,12 +512,14 @@ class Connection(object):
         return self._task_result_get_all_by_uuid(uuid)
 
     @db_api.serialize
-    def subtask_create(self, task_uuid, title, description=None, context=None):
+    def subtask_create(self, task_uuid, title, description=None, context=None,
+                       run_in_parallel=False):
         subtask = models.Subtask(task_uuid=task_uuid)
         subtask.update({
             "title": title,
             "description": description or "",
             "context": context or {},
+            "run_in_parallel": run_in_parallel,
         })
         subtask.save()
         return subtask
@@ -470,7 +553,7 @@ class Connection(object):
 
     @db_api.serialize
     def workload_data_create(self, task_uuid, workload_uuid, chunk_order,
-                             data):
+                             data, compress=False):
         workload_data = models.WorkloadData(task_uuid=task_uuid,
                                             workload_uuid=workload_uuid)
 
@@ -501,51 +584,72 @@ class Connection(object):
         if finished_at == 0:
             finished_at = now
 
+        workload_data.update(self._encode_chunk_data(raw_data, compress))
         workload_data.update({
             "task_uuid": task_uuid,
             "workload_uuid": workload_uuid,
             "chunk_order": chunk_order,
             "iteration_count": iter_count,
             "failed_iteration_count": failed_iter_count,
-            "chunk_data": {"raw": raw_data},
-            # TODO(ikhudoshyn)
-            "chunk_size": 0,
-            "compressed_chunk_size": 0,
+            "statistics": data.get("statistics", {}),
             "started_at": dt.datetime.fromtimestamp(started_at),
             "finished_at": dt.datetime.fromtimestamp(finished_at)
         })
         workload_data.save()
         return workload_data
 
-    @db_api.serialize
-    def workload_set_results(self, workload_uuid, data):
-        workload = self.model_query(models.Workload).filter_by(
-            uuid=workload_uuid).first()
-
-        workload_data_list = self._task_workload_data_get_all(workload.uuid)
+    def _workload_data_summary(self, workload_uuid):
+        """Roll up summary of workload from its chunks.
 
-        raw_data = [raw
-                    for workload_data in workload_data_list
-                    for raw in workload_data.chunk_data["raw"]]
-        iter_count = len(raw_data)
+        Chunks which have statistics are summed up without loading their
+        raw data, the raw data is processed only for chunks stored
+        without statistics.
+        """
+        workload_data_list = (
+            self.model_query(models.WorkloadData).
+            filter_by(workload_uuid=workload_uuid).
+            options(sa_defer("chunk_data"),
+                    sa_defer("compressed_chunk_data")))
 
+        iter_count = 0
         failed_iter_count = 0
-        max_duration = 0
-        min_duration = 0
+        durations = []
 
-        success = True
+        for workload_data in workload_data_list:
+            iter_count += workload_data.iteration_count
+            failed_iter_count += workload_data.failed_iteration_count
 
-        for d in raw_data:
-            if d.get("error"):
-                failed_iter_count += 1
+            total = workload_data.statistics.get("durations", {}).get("total")
+            if total is not None:
+                durations.extend(d for d in (total["min"], total["max"])
+                                 if d is not None)
+            else:
+                durations.extend(d.get("duration", 0)
+                                 for d in self._get_raw_data(workload_data)
+                                 if not d.get("error"))
+
+        min_duration = min(durations) if durations else 0
+        max_duration = max(durations) if durations else 0
 
-            duration = d.get("duration", 0)
+        return iter_count, failed_iter_count, min_duration, max_duration
 
-            if duration > max_duration:
-                max_duration = duration
+    @db_api.serialize
+    def workload_set_results(self, workload_uuid, data):
+        workload = self.model_query(models.Workload).filter_by(
+            uuid=workload_uuid).first()
 
-            if min_duration and min_duration > duration:
-                min_duration = duration
+        statistics = data.get("statistics", {})
+        if "durations" in statistics:
+            # NOTE: the statistics are rolled up from chunks while the
+            #       results are consumed, so raw data is not needed here
+            durations = statistics["durations"]
+            iter_count = durations["iterations_count"]
+            failed_iter_count = durations["iterations_failed"]
+            min_duration = durations["total"]["min"] or 0
+            max_duration = durations["total"]["max"] or 0
+        else:
+            iter_count, failed_iter_count, min_duration, max_duration = (
+                self._workload_data_summary(workload.uuid))
 
         sla = data.get("sla", [])
         # TODO(ikhudoshyn): if no SLA was specified and there are
@@ -563,7 +667,7 @@ class Connection(object):
             "task_uuid": workload.task_uuid,
             "subtask_uuid": workload.subtask_uuid,
             "sla_results": {"sla": sla},
-            "context_execution": {},
+            "context_execution": data.get("context_execution", {}),
             "hooks": data.get("hooks", []),
             "load_duration": data.get("load_duration", 0),
             "full_duration": data.get("full_duration", 0),
@@ -573,7 +677,7 @@ class Connection(object):
             "failed_iteration_count": failed_iter_count,
             # TODO(ikhudoshyn)
             "start_time": start,
-            "statistics": {},
+            "statistics": statistics,
             "pass_sla": success
         })
 
@@ -792,6 +896,10 @@ class Connection(object):
     def verification_delete(self, verification_uuid):
         session = get_session()
         with session.begin():
+            self.model_query(
+                models.VerificationTest, session=session).filter_by(
+                verification_uuid=verification_uuid).delete(
+                synchronize_session=False)
             count = self.model_query(
                 models.Verification, session=session).filter_by(
                 uuid=verification_uuid).delete(synchronize_session=False)
@@ -807,6 +915,75 @@ class Connection(object):
             verification.save()
         return verification
 
+    # NOTE: fields of test results which are stored in separate columns,
+    #       all other fields are stored in "details"
+    _VERIFICATION_TEST_FIELDS = ("name", "status", "duration", "tags",
+                                 "timestamp")
+
+    # NOTE: SQLite does not allow more than 999 variables in a query
+    _VERIFICATION_TESTS_CHUNK = 500
+
+    @db_api.serialize
+    def verification_add_tests(self, verification_uuid, tests):
+        session = get_session()
+        with session.begin():
+            verification = self._verification_get(verification_uuid,
+                                                  session=session)
+            test_ids = list(tests)
+            for i in range(0, len(test_ids), self._VERIFICATION_TESTS_CHUNK):
+                chunk = test_ids[i:i + self._VERIFICATION_TESTS_CHUNK]
+                self.model_query(
+                    models.VerificationTest, session=session).filter(
+                    models.VerificationTest.verification_uuid ==
+                    verification_uuid,
+                    models.VerificationTest.test_id.in_(chunk)).delete(
+                    synchronize_session=False)
+
+            for test_id, test in tests.items():
+                verification_test = models.VerificationTest()
+                verification_test.update({
+                    "verification_uuid": verification_uuid,
+                    "test_id": test_id,
+                    "name": test.get("name", test_id),
+                    "status": test["status"],
+                    "duration": float(test.get("duration") or 0),
+                    "tags": test.get("tags", []),
+                    "timestamp": test.get("timestamp"),
+                    "details": dict(
+                        (k, v) for k, v in test.items()
+                        if k not in self._VERIFICATION_TEST_FIELDS)})
+                session.add(verification_test)
+            session.flush()
+
+            statuses = dict(
+                session.query(models.VerificationTest.status,
+                              func.count(models.VerificationTest.id)).filter(
+                    models.VerificationTest.verification_uuid ==
+                    verification_uuid).group_by(
+                    models.VerificationTest.status).all())
+            verification.update({
+                "tests_count": sum(statuses.values()),
+                "failures": statuses.get("fail", 0),
+                "skipped": statuses.get("skip", 0),
+                "success": statuses.get("success", 0),
+                "unexpected_success": statuses.get("uxsuccess", 0),
+                "expected_failures": statuses.get("xfail", 0)})
+            verification.save(session=session)
+        return verification
+
+    @db_api.serialize
+    def verification_test_list(self, verification_uuid=None, name=None,
+                               status=None):
+        filter_by = {}
+        if verification_uuid:
+            filter_by["verification_uuid"] = verification_uuid
+        if name:
+            filter_by["name"] = name
+        if status:
+            filter_by["status"] = status
+        return self.model_query(models.VerificationTest).filter_by(
+            **filter_by).order_by(models.VerificationTest.id).all()
+
     @db_api.serialize
     def register_worker(self, values):
         try:
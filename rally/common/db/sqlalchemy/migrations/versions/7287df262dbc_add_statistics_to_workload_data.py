@@ -0,0 +1,61 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""add statistics to workload data
+
+Revision ID: 7287df262dbc
+Revises: 92aaaa2a6bb3
+Create Date: 2017-03-02 14:21:06.117398
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "7287df262dbc"
+down_revision = "92aaaa2a6bb3"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+workload_data_helper = sa.Table(
+    "workloaddata",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("statistics", sa_types.MutableJSONEncodedDict,
+              default={}, nullable=True)
+)
+
+
+def upgrade():
+    with op.batch_alter_table("workloaddata") as batch_op:
+        batch_op.add_column(
+            sa.Column("statistics", sa_types.MutableJSONEncodedDict,
+                      default={}))
+
+    # NOTE: statistics of existing chunks are not calculated, they are
+    #       considered as unknown and raw data is used instead.
+    op.execute(workload_data_helper.update().values(statistics={}))
+
+    with op.batch_alter_table("workloaddata") as batch_op:
+        batch_op.alter_column("statistics",
+                              existing_type=sa_types.MutableJSONEncodedDict,
+                              nullable=False)
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
@@ -0,0 +1,96 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""add verification tests table
+
+Revision ID: b2a4e7f2c1d3
+Revises: 7287df262dbc
+Create Date: 2017-03-20 12:42:17.365214
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "b2a4e7f2c1d3"
+down_revision = "7287df262dbc"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+verifications_helper = sa.Table(
+    "verifications",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("uuid", sa.String(36), nullable=False),
+    sa.Column("tests", sa_types.MutableJSONEncodedDict, default={}),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("updated_at", sa.DateTime)
+)
+
+KNOWN_FIELDS = ("name", "status", "duration", "tags", "timestamp")
+
+
+def upgrade():
+    verification_tests_table = op.create_table(
+        "verification_tests",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("verification_uuid", sa.String(36), nullable=False),
+        sa.Column("test_id", sa.Text, nullable=False),
+        sa.Column("name", sa.Text, nullable=False),
+        sa.Column("status", sa.String(36), nullable=False),
+        sa.Column("duration", sa.Float),
+        sa.Column("tags", sa_types.MutableJSONEncodedList),
+        sa.Column("timestamp", sa.String(36)),
+        sa.Column("details", sa_types.MutableJSONEncodedDict),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+        sa.ForeignKeyConstraint(["verification_uuid"], ["verifications.uuid"])
+    )
+
+    op.create_index("verification_test_verification_uuid_status",
+                    "verification_tests", ["verification_uuid", "status"])
+    op.create_index("verification_test_name", "verification_tests",
+                    ["name"], mysql_length=255)
+
+    connection = op.get_bind()
+    for verification in connection.execute(verifications_helper.select()):
+        rows = []
+        for test_id, test in (verification.tests or {}).items():
+            rows.append({
+                "verification_uuid": verification.uuid,
+                "test_id": test_id,
+                "name": test.get("name", test_id),
+                "status": test["status"],
+                "duration": float(test.get("duration") or 0),
+                "tags": test.get("tags", []),
+                "timestamp": test.get("timestamp"),
+                "details": dict((k, v) for k, v in test.items()
+                                if k not in KNOWN_FIELDS),
+                "created_at": verification.created_at,
+                "updated_at": verification.updated_at})
+        if rows:
+            op.bulk_insert(verification_tests_table, rows)
+
+    # NOTE: results of tests are moved to the verification_tests table, so
+    #     the old blob is not needed anymore
+    with op.batch_alter_table("verifications") as batch_op:
+        batch_op.drop_column("tests")
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
@@ -0,0 +1,43 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add compressed_chunk_data to workloaddata
+
+Revision ID: c5b1e62d4f7a
+Revises: b2a4e7f2c1d3
+Create Date: 2017-04-03 11:12:45.734018
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c5b1e62d4f7a"
+down_revision = "b2a4e7f2c1d3"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally import exceptions
+
+
+def upgrade():
+    with op.batch_alter_table("workloaddata") as batch_op:
+        batch_op.add_column(
+            sa.Column("compressed_chunk_data", sa.LargeBinary,
+                      nullable=True))
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
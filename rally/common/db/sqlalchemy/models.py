@@ -321,6 +321,11 @@ class WorkloadData(BASE, RallyBase):
                             nullable=False)
     chunk_data = sa.Column(
         sa_types.MutableJSONEncodedDict, default={}, nullable=False)
+    # NOTE: zlib compressed json of iterations, chunk_data keeps only the
+    #     compression method of such chunks
+    compressed_chunk_data = sa.Column(sa.LargeBinary, nullable=True)
+    statistics = sa.Column(
+        sa_types.MutableJSONEncodedDict, default={}, nullable=False)
 
 
 class Tag(BASE, RallyBase):
@@ -395,7 +400,31 @@ class Verification(BASE, RallyBase):
     expected_failures = sa.Column(sa.Integer, default=0)
     tests_duration = sa.Column(sa.Float, default=0.0)
 
-    tests = sa.Column(sa_types.MutableJSONEncodedDict, default={})
+
+class VerificationTest(BASE, RallyBase):
+    """Represents a result of a single test of a verification."""
+
+    __tablename__ = "verification_tests"
+    __table_args__ = (
+        sa.Index("verification_test_verification_uuid_status",
+                 "verification_uuid", "status"),
+        sa.Index("verification_test_name", "name", mysql_length=255),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+
+    verification_uuid = sa.Column(sa.String(36),
+                                  sa.ForeignKey(Verification.uuid),
+                                  nullable=False)
+
+    test_id = sa.Column(sa.Text, nullable=False)
+    name = sa.Column(sa.Text, nullable=False)
+    status = sa.Column(sa.String(36), nullable=False)
+    duration = sa.Column(sa.Float, default=0.0)
+    tags = sa.Column(sa_types.MutableJSONEncodedList, default=[])
+    timestamp = sa.Column(sa.String(36))
+    # NOTE: reason, traceback and other data of a test
+    details = sa.Column(sa_types.MutableJSONEncodedDict, default={})
 
 
 class Worker(BASE, RallyBase):
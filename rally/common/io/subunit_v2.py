@@ -14,6 +14,8 @@
 #    under the License.
 #
 
+import collections
+
 from oslo_utils import encodeutils
 from subunit import v2
 
@@ -58,10 +60,18 @@ def _parse_test_tags(test_id):
 class SubunitV2StreamResult(object):
 
     def __init__(self, expected_failures=None, skipped_tests=None, live=False,
-                 logger_name=None):
+                 logger_name=None, on_test_finished=None):
         self._tests = {}
         self._expected_failures = expected_failures or {}
         self._skipped_tests = skipped_tests or {}
+        # NOTE: a callable which accepts a test id and a dict with results of
+        #       the test. It is called when a test finishes, so the results
+        #       can be saved before the whole stream is parsed.
+        self._on_test_finished = on_test_finished
+        # NOTE: ids of tests which results are passed to `on_test_finished'
+        #       and ids of tests which are changed after that by _parse()
+        self._reported_tests = set()
+        self._changed_tests = set()
 
         self._live = live
         self._logger = logging.getLogger(logger_name or __name__)
@@ -76,60 +86,121 @@ class SubunitV2StreamResult(object):
         self._unknown_entities = {}
         self._is_parsed = False
 
+        # NOTE: the number of tests by statuses is updated on each change of
+        #       a status, so totals do not require to iterate over all tests.
+        self._statuses = collections.Counter()
+
     @staticmethod
     def _get_test_name(test_id):
         return test_id.split("[")[0] if test_id.find("[") > -1 else test_id
 
+    def _set_status(self, test_id, status):
+        test = self._tests[test_id]
+        if "status" in test:
+            self._statuses[test["status"]] -= 1
+        test["status"] = status
+        self._statuses[status] += 1
+
+    @staticmethod
+    def _add_attachment(entity, file_name, file_bytes):
+        # NOTE: attachments can be split into a lot of chunks, so they are
+        #       collected in lists and joined once instead of concatenating
+        #       bytes on each chunk.
+        value = entity.get(file_name)
+        if value is None:
+            entity[file_name] = [file_bytes]
+        elif isinstance(value, list):
+            value.append(file_bytes)
+        else:
+            entity[file_name] = [value, file_bytes]
+
+    @staticmethod
+    def _join_attachments(entity):
+        for file_name in ["traceback", "reason"]:
+            if isinstance(entity.get(file_name), list):
+                entity[file_name] = b"".join(entity[file_name])
+
     def _check_expected_failure(self, test_id):
         if (test_id in self._expected_failures or
                 self._get_test_name(test_id) in self._expected_failures):
             if self._tests[test_id]["status"] == "fail":
-                self._tests[test_id]["status"] = "xfail"
+                self._set_status(test_id, "xfail")
                 if self._expected_failures[test_id]:
                     self._tests[test_id]["reason"] = (
                         self._expected_failures[test_id])
             elif self._tests[test_id]["status"] == "success":
-                self._tests[test_id]["status"] = "uxsuccess"
+                self._set_status(test_id, "uxsuccess")
 
     def _process_skipped_tests(self):
         for t_id in self._skipped_tests.copy():
             if t_id not in self._tests:
                 status = "skip"
                 name = self._get_test_name(t_id)
-                self._tests[t_id] = {"status": status,
-                                     "name": name,
+                self._tests[t_id] = {"name": name,
                                      "duration": "%.3f" % 0,
                                      "tags": _parse_test_tags(t_id)}
+                self._set_status(t_id, status)
                 if self._skipped_tests[t_id]:
                     self._tests[t_id]["reason"] = self._skipped_tests[t_id]
                     status += ": %s" % self._tests[t_id]["reason"]
                 if self._live:
                     self._logger.info("{-} %s ... %s", name, status)
+                self._test_finished(t_id)
 
             self._skipped_tests.pop(t_id)
 
+    def _test_finished(self, test_id):
+        if not self._on_test_finished:
+            return
+        test = dict(self._tests[test_id])
+        self._join_attachments(test)
+        for file_name in ["traceback", "reason"]:
+            if file_name in test:
+                test[file_name] = encodeutils.safe_decode(test[file_name])
+        self._on_test_finished(test_id, test)
+        self._reported_tests.add(test_id)
+
+    def _get_tests_by_entities(self):
+        """Map unknown entities (modules, classes) to ids of their tests."""
+        tests_by_entities = dict((e, []) for e in self._unknown_entities)
+        for t_id in self._tests:
+            if t_id in tests_by_entities:
+                tests_by_entities[t_id].append(t_id)
+            # NOTE: the test belongs to the entity if the entity id is
+            #       a prefix of the test id which ends before a dot
+            dot = t_id.find(".")
+            while dot > -1:
+                prefix = t_id[:dot]
+                if prefix in tests_by_entities:
+                    tests_by_entities[prefix].append(t_id)
+                dot = t_id.find(".", dot + 1)
+        return tests_by_entities
+
     def _parse(self):
         # NOTE(andreykurilin): When whole test class is marked as skipped or
         # failed, there is only one event with reason and status. So we should
         # modify all tests of test class manually.
+        tests_by_entities = self._get_tests_by_entities()
         for test_id in self._unknown_entities:
-            known_test_ids = filter(lambda t:
-                                    t == test_id or t.startswith(
-                                        "%s." % test_id), self._tests)
-            for t_id in known_test_ids:
+            self._join_attachments(self._unknown_entities[test_id])
+            for t_id in tests_by_entities[test_id]:
                 if self._tests[t_id]["status"] == "init":
-                    self._tests[t_id]["status"] = (
-                        self._unknown_entities[test_id]["status"])
+                    self._set_status(
+                        t_id, self._unknown_entities[test_id]["status"])
+                    self._changed_tests.add(t_id)
 
                 if self._unknown_entities[test_id].get("reason"):
                     self._tests[t_id]["reason"] = (
                         self._unknown_entities[test_id]["reason"])
+                    self._changed_tests.add(t_id)
                 elif self._unknown_entities[test_id].get("traceback"):
                     self._tests[t_id]["traceback"] = (
                         self._unknown_entities[test_id]["traceback"])
+                    self._changed_tests.add(t_id)
 
         # decode data
         for test_id in self._tests:
+            self._join_attachments(self._tests[test_id])
             for file_name in ["traceback", "reason"]:
                 # TODO(andreykurilin): decode fields based on mime_type
                 if file_name in self._tests[test_id]:
@@ -145,6 +216,18 @@ class SubunitV2StreamResult(object):
             self._parse()
         return self._tests
 
+    @property
+    def unreported_tests(self):
+        """Tests which results differ from the ones passed to the callback.
+
+        These are tests which have not finished (so `on_test_finished' was
+        not called for them) and tests which were changed when the whole
+        stream was parsed (e.g. tests of a skipped or failed class).
+        """
+        return dict((test_id, test) for test_id, test in self.tests.items()
+                    if test_id not in self._reported_tests
+                    or test_id in self._changed_tests)
+
     @property
     def totals(self):
         td = 0
@@ -153,11 +236,11 @@ class SubunitV2StreamResult(object):
 
         return {"tests_count": len(self.tests),
                 "tests_duration": "%.3f" % td,
-                "failures": len(self.filter_tests("fail")),
-                "skipped": len(self.filter_tests("skip")),
-                "success": len(self.filter_tests("success")),
-                "unexpected_success": len(self.filter_tests("uxsuccess")),
-                "expected_failures": len(self.filter_tests("xfail"))}
+                "failures": self._statuses["fail"],
+                "skipped": self._statuses["skip"],
+                "success": self._statuses["success"],
+                "unexpected_success": self._statuses["uxsuccess"],
+                "expected_failures": self._statuses["xfail"]}
 
     @prepare_input_args
     def status(self, test_id=None, test_status=None, timestamp=None, tags=None,
@@ -169,10 +252,12 @@ class SubunitV2StreamResult(object):
             self._last_timestamp = timestamp
 
         if test_status == "exists":
-            self._tests[test_id] = {"status": "init",
-                                    "name": self._get_test_name(test_id),
+            if test_id in self._tests:
+                self._statuses[self._tests[test_id]["status"]] -= 1
+            self._tests[test_id] = {"name": self._get_test_name(test_id),
                                     "duration": "%.3f" % 0,
                                     "tags": tags if tags else []}
+            self._set_status(test_id, "init")
         elif test_id in self._tests:
             if test_status == "inprogress":
                 # timestamp of test start
@@ -182,23 +267,21 @@ class SubunitV2StreamResult(object):
             elif test_status:
                 self._tests[test_id]["duration"] = "%.3f" % (
                     timestamp - self._timestamps[test_id]).total_seconds()
-                self._tests[test_id]["status"] = test_status
+                self._join_attachments(self._tests[test_id])
+                self._set_status(test_id, test_status)
 
                 self._check_expected_failure(test_id)
+                self._test_finished(test_id)
             else:
                 if file_name in ["traceback", "reason"]:
-                    if file_name not in self._tests[test_id]:
-                        self._tests[test_id][file_name] = file_bytes
-                    else:
-                        self._tests[test_id][file_name] += file_bytes
+                    self._add_attachment(self._tests[test_id], file_name,
+                                         file_bytes)
         else:
             self._unknown_entities.setdefault(test_id, {"name": test_id})
             self._unknown_entities[test_id]["status"] = test_status
             if file_name in ["traceback", "reason"]:
-                if file_name not in self._unknown_entities[test_id]:
-                    self._unknown_entities[test_id][file_name] = file_bytes
-                else:
-                    self._unknown_entities[test_id][file_name] += file_bytes
+                self._add_attachment(self._unknown_entities[test_id],
+                                     file_name, file_bytes)
 
         if self._skipped_tests:
             self._process_skipped_tests()
@@ -217,6 +300,7 @@ class SubunitV2StreamResult(object):
                 if test_id in self._tests:
                     reason = self._tests[test_id].get("reason")
                 else:
+                    self._join_attachments(self._unknown_entities[test_id])
                     reason = self._unknown_entities[test_id].get("reason")
                 if reason:
                     status += ": %s" % reason
@@ -236,16 +320,16 @@ class SubunitV2StreamResult(object):
 
 
 def parse(stream, expected_failures=None, skipped_tests=None, live=False,
-          logger_name=None):
+          logger_name=None, on_test_finished=None):
     results = SubunitV2StreamResult(expected_failures, skipped_tests, live,
-                                    logger_name)
+                                    logger_name, on_test_finished)
     v2.ByteStreamToStreamResult(stream, "non-subunit").run(results)
 
     return results
 
 
 def parse_file(filename, expected_failures=None, skipped_tests=None,
-               live=False, logger_name=None):
+               live=False, logger_name=None, on_test_finished=None):
     with open(filename, "rb") as stream:
         return parse(stream, expected_failures, skipped_tests, live,
-                     logger_name)
+                     logger_name, on_test_finished)
@@ -13,8 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import datetime as dt
+import functools
 import uuid
 
 from rally.common import db
@@ -22,6 +22,7 @@ from rally.common.i18n import _LE
 from rally import consts
 from rally import exceptions
 from rally.task.processing import charts
+from rally.task.processing import utils as putils
 
 
 OUTPUT_SCHEMA = {
@@ -310,7 +311,9 @@ TASK_EXTENDED_RESULT_SCHEMA = {
                 "max_duration": {"type": "number"},
                 "tstamp_start": {"type": "number"},
                 "full_duration": {"type": "number"},
-                "load_duration": {"type": "number"}
+                "load_duration": {"type": "number"},
+                "rps": {"type": "array"},
+                "corrected_latency": {"type": "object"}
             }
         }
     },
@@ -385,8 +388,8 @@ class Task(object):
         return db_task
 
     @staticmethod
-    def get_detailed(task_id):
-        task_detail = db.api.task_get_detailed(task_id)
+    def get_detailed(task_id, load_raw=True):
+        task_detail = db.api.task_get_detailed(task_id, load_raw=load_raw)
         results = []
         for result in task_detail["results"]:
             result["created_at"] = result.get("created_at", "").strftime(
@@ -454,6 +457,11 @@ class Task(object):
         its future implementation as generator and gives ability to process
         arbitrary number of iterations with low memory usage.
 
+        Iterations (`raw') can be given as processing.utils.ChunkedIterations
+        or can be absent at all if `workload_uuid' is given instead - then
+        they are loaded from the database chunk by chunk, on each iteration
+        over them, and are never kept in memory as a whole.
+
         :param results: list of db.sqlalchemy.models.TaskResult
         :param serializable: bool, whether to convert json non-serializable
                              types (like datetime) to serializable ones
@@ -461,7 +469,9 @@ class Task(object):
                   key - dict, scenario input data
                   sla - list, SLA results
                   iterations - if serializable, then iterator with
-                               iterations data, otherwise a list
+                               iterations data, otherwise a list.
+                               Chunked iterations are kept as they are
+                               (ordered by chunks instead of timestamps)
                   created_at - str datetime,
                   updated_at - str datetime,
                   info:
@@ -477,95 +487,55 @@ class Task(object):
                       load_duration - float load scenario duration
         """
 
-        def _merge_atomic(atomic_actions):
-            merged_atomic = collections.OrderedDict()
-            for action in atomic_actions:
-                name = action["name"]
-                duration = action["finished_at"] - action["started_at"]
-                if name not in merged_atomic:
-                    merged_atomic[name] = {"duration": duration, "count": 1}
-                else:
-                    merged_atomic[name]["duration"] += duration
-                    merged_atomic[name]["count"] += 1
-            return merged_atomic
-
         extended = []
         for scenario_result in results:
             scenario = dict(scenario_result)
-            tstamp_start = 0
-            min_duration = 0
-            max_duration = 0
-            iterations_failed = 0
-            atomic = collections.OrderedDict()
-
-            for itr in scenario["data"]["raw"]:
-                merged_atomic = _merge_atomic(itr["atomic_actions"])
-                for name, value in merged_atomic.items():
-                    duration = value["duration"]
-                    count = value["count"]
-                    if name not in atomic or count > atomic[name]["count"]:
-                        atomic[name] = {"min_duration": duration,
-                                        "max_duration": duration,
-                                        "count": count}
-                    elif count == atomic[name]["count"]:
-                        if duration < atomic[name]["min_duration"]:
-                            atomic[name]["min_duration"] = duration
-                        if duration > atomic[name]["max_duration"]:
-                            atomic[name]["max_duration"] = duration
-
-                if not tstamp_start or itr["timestamp"] < tstamp_start:
-                    tstamp_start = itr["timestamp"]
-
-                if "output" not in itr:
-                    itr["output"] = {"additive": [], "complete": []}
-
-                    # NOTE(amaretskiy): Deprecated "scenario_output"
-                    #     is supported for backward compatibility
-                    if ("scenario_output" in itr
-                            and itr["scenario_output"]["data"]):
-                        itr["output"]["additive"].append(
-                            {"items": itr["scenario_output"]["data"].items(),
-                             "title": "Scenario output",
-                             "description": "",
-                             "chart": "OutputStackedAreaChart"})
-                        del itr["scenario_output"]
-
-                if itr["error"]:
-                    iterations_failed += 1
-                else:
-                    duration = itr["duration"] or 0
-                    if not min_duration or duration < min_duration:
-                        min_duration = duration
-                    if not max_duration or duration > max_duration:
-                        max_duration = duration
+
+            raw = scenario["data"].get("raw")
+            if raw is None:
+                raw = putils.ChunkedIterations(functools.partial(
+                    Workload.get_data_page,
+                    scenario["data"]["workload_uuid"]))
+            if isinstance(raw, putils.ChunkedIterations):
+                raw = putils.ChunkedIterations(raw.get_page,
+                                               putils.fix_output)
+
+            store = putils.IterationsStore()
+            for itr in raw:
+                store.add_iteration(putils.fix_output(itr))
+            info = store.get_info()
 
             for k in "created_at", "updated_at":
                 if scenario[k] and isinstance(scenario[k], dt.datetime):
                     scenario[k] = scenario[k].strftime("%Y-%d-%m %H:%M:%S")
 
             durations_stat = charts.MainStatsTable(
-                {"iterations_count": len(scenario["data"]["raw"]),
-                 "atomic": atomic})
-
-            for itr in scenario["data"]["raw"]:
-                durations_stat.add_iteration(itr)
-
-            scenario["info"] = {
-                "stat": durations_stat.render(),
-                "atomic": atomic,
-                "iterations_count": len(scenario["data"]["raw"]),
-                "iterations_failed": iterations_failed,
-                "min_duration": min_duration,
-                "max_duration": max_duration,
-                "tstamp_start": tstamp_start,
-                "full_duration": scenario["data"]["full_duration"],
-                "load_duration": scenario["data"]["load_duration"]}
-            iterations = sorted(scenario["data"]["raw"],
-                                key=lambda itr: itr["timestamp"])
-            if serializable:
-                scenario["iterations"] = list(iterations)
+                {"iterations_count": info["iterations_count"],
+                 "atomic": info["atomic"]})
+
+            statistics = scenario["data"].get("statistics") or {}
+            if "durations" in statistics:
+                stat = durations_stat.render_statistics(
+                    statistics["durations"])
+            else:
+                durations_stat.add_iterations_store(store)
+                stat = durations_stat.render()
+
+            scenario["info"] = dict(
+                info, stat=stat,
+                full_duration=scenario["data"]["full_duration"],
+                load_duration=scenario["data"]["load_duration"])
+            for key in ("rps", "corrected_latency"):
+                if key in statistics:
+                    scenario["info"][key] = statistics[key]
+            if isinstance(raw, putils.ChunkedIterations):
+                scenario["iterations"] = raw
             else:
-                scenario["iterations"] = iter(iterations)
+                iterations = sorted(raw, key=lambda itr: itr["timestamp"])
+                if serializable:
+                    scenario["iterations"] = list(iterations)
+                else:
+                    scenario["iterations"] = iter(iterations)
             scenario["sla"] = scenario["data"]["sla"]
             scenario["hooks"] = scenario["data"].get("hooks", [])
             del scenario["data"]
@@ -629,10 +599,14 @@ class Workload(object):
     def __getitem__(self, key):
         return self.workload[key]
 
-    def add_workload_data(self, chunk_order, workload_data):
+    def add_workload_data(self, chunk_order, workload_data, compress=False):
         db.workload_data_create(self.workload["task_uuid"],
                                 self.workload["uuid"], chunk_order,
-                                workload_data)
+                                workload_data, compress=compress)
 
     def set_results(self, data):
         db.workload_set_results(self.workload["uuid"], data)
+
+    @staticmethod
+    def get_data_page(workload_uuid, chunk=0):
+        return db.workload_data_get_page(workload_uuid, chunk=chunk)
@@ -33,17 +33,35 @@ class Verification(object):
         return self._db_entry[attr]
 
     def __getitem__(self, item):
+        if item == "tests":
+            return self.tests
         return self._db_entry[item]
 
-    def to_dict(self, item=None):
+    @property
+    def tests(self):
+        """Results of the tests saved so far.
+
+        Tests are saved while the verification is still running, so results
+        of finished tests are available even if the verification crashed.
+        """
+        return self.get_tests()
+
+    def to_dict(self, item=None, include_tests=True):
+        """Get a dict representation of the verification.
+
+        :param include_tests: whether to load results of all tests. Only
+                              totals are included otherwise
+        """
         data = {}
         formatters = ["created_at", "updated_at"]
         fields = ["deployment_uuid", "verifier_uuid", "uuid", "id",
-                  "unexpected_success", "status", "tests", "skipped",
+                  "unexpected_success", "status", "skipped",
                   "tags", "tests_duration", "run_args", "success",
                   "expected_failures", "tests_count", "failures"]
         for field in fields:
             data[field] = self._db_entry.get(field, "")
+        if include_tests:
+            data["tests"] = self.tests
         for field in formatters:
             data[field] = self._db_entry.get(field, "").strftime(
                 self.TIME_FORMAT)
@@ -74,13 +92,44 @@ class Verification(object):
     def update_status(self, status):
         self._update(status=status)
 
+    def add_tests(self, tests):
+        """Save results of the tests which have already finished."""
+        self._db_entry = db.verification_add_tests(self.uuid, tests)
+
+    def get_tests(self, status=None):
+        """Get results of the saved tests.
+
+        :param status: test status to filter tests by
+        :returns: a dict with test ids as keys and test results as values
+        """
+        tests = {}
+        for test in db.verification_test_list(self.uuid, status=status):
+            result = {"name": test["name"],
+                      "status": test["status"],
+                      "duration": "%.3f" % (test["duration"] or 0),
+                      "tags": test["tags"]}
+            if test["timestamp"]:
+                result["timestamp"] = test["timestamp"]
+            result.update(test["details"])
+            tests[test["test_id"]] = result
+        return tests
+
     def finish(self, totals, tests):
+        """Finish the verification.
+
+        :param totals: totals of the verification
+        :param tests: results of the tests which are not saved yet or which
+                      are changed since they were saved (e.g. tests which
+                      were skipped by class)
+        """
         if (totals.get("failures", 0) == 0 and
                 totals.get("unexpected_success", 0) == 0):
             status = consts.VerificationStatus.FINISHED
         else:
             status = consts.VerificationStatus.FAILED
-        self._update(status=status, tests=tests, **totals)
+        if tests:
+            db.verification_add_tests(self.uuid, tests)
+        self._update(status=status, **totals)
 
     def set_error(self, error_message):
         # TODO(andreykurilin): Save error message in the database.
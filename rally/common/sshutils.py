@@ -42,6 +42,20 @@ Execute local script on remote side:
     status, out, err = ssh.execute("/bin/sh -s arg1 arg2",
                                    stdin=open("~/myscript.sh", "r"))
 
+Reuse connections to the same server between SSH objects:
+
+    pool = sshclient.SSHPool()
+    for i in range(10):
+        ssh = sshclient.SSH("user", "example.com", pool=pool)
+        ssh.execute("uptime")
+    pool.close()
+
+Execute command on many servers concurrently:
+
+    clients = [sshclient.SSH("user", host) for host in hosts]
+    for status, out, err in sshclient.execute_many(clients, "uptime"):
+        print(out)
+
 Upload file:
 
     ssh = sshclient.SSH("user", "example.com")
@@ -57,25 +71,138 @@ Eventlet:
 
 """
 
+import multiprocessing.util
 import os
 import select
 import socket
+import threading
 import time
 
 import paramiko
 import six
 
+from rally.common import broker
 from rally.common import logging
 from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
 
+class SSHPool(object):
+    """Pool of ssh connections shared between SSH objects.
+
+    Connections are keyed by user, host, port and credentials, so SSH
+    objects created for the same server (e.g. by different iterations of a
+    scenario) reuse an already established transport instead of doing a
+    new handshake. Transports are thread-safe, so one connection can
+    execute commands of several threads at the same time.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, connect):
+        """Return alive pooled client or create a new one.
+
+        :param key: hashable connection key
+        :param connect: function that returns a new connected client
+        """
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                transport = client.get_transport()
+                if transport is not None and transport.is_active():
+                    return client
+                del self._clients[key]
+                client.close()
+        # NOTE: connecting can take a while, so it is done without the lock
+        #   to not block threads which work with other servers.
+        client = connect()
+        with self._lock:
+            pooled = self._clients.setdefault(key, client)
+        if pooled is not client:
+            client.close()
+        return pooled
+
+    def close(self, host=None):
+        """Close pooled connections.
+
+        :param host: close only connections to this host. All connections
+                     are closed if it is not specified
+        """
+        with self._lock:
+            keys = [key for key in self._clients
+                    if host is None or key[1] == host]
+            clients = [self._clients.pop(key) for key in keys]
+        for client in clients:
+            client.close()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+_POOLS_PID = None
+
+
+def _close_pools():
+    """Close all pools of the current process."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def get_pool(key):
+    """Return the pool of connections of a workload.
+
+    Servers of a workload are deleted with its contexts and their addresses
+    can be given to servers of other workloads (which can run at the same
+    time, e.g. in parallel subtasks), so each workload has its own pool,
+    which is closed by close_pool() when the workload ends.
+
+    Pools are per process. close_pool() is called in the main process, so
+    pools created in worker processes of runners are closed when these
+    processes exit.
+
+    :param key: hashable key of the pool, e.g. owner id of the workload
+    """
+    global _POOLS_PID
+
+    with _POOLS_LOCK:
+        if _POOLS_PID != os.getpid():
+            # NOTE: pools inherited from the parent process are not usable
+            #     here, since threads of their transports are not copied
+            #     by fork, and they are closed by the parent anyway.
+            _POOLS.clear()
+            _POOLS_PID = os.getpid()
+            # NOTE: worker processes run multiprocessing finalizers on exit
+            multiprocessing.util.Finalize(None, _close_pools, exitpriority=0)
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = SSHPool()
+        return pool
+
+
+def close_pool(key):
+    """Close connections of the pool returned by get_pool() and forget it.
+
+    :param key: key of the pool
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.pop(key, None)
+    if pool is not None:
+        pool.close()
+
+
 class SSH(object):
     """Represent ssh connection."""
 
+    # NOTE: size of chunks of stdin/stdout/stderr data read at a time
+    READ_BUFFER_SIZE = 65536
+
     def __init__(self, user, host, port=22, pkey=None,
-                 key_filename=None, password=None):
+                 key_filename=None, password=None, pool=None):
         """Initialize SSH client.
 
         :param user: ssh username
@@ -84,6 +211,7 @@ class SSH(object):
         :param pkey: RSA or DSS private key string or file object
         :param key_filename: private key filename
         :param password: password
+        :param pool: optional SSHPool object to get the connection from
         """
 
         self.user = user
@@ -92,6 +220,7 @@ class SSH(object):
         self.pkey = self._get_pkey(pkey) if pkey else None
         self.password = password
         self.key_filename = key_filename
+        self.pool = pool
         self._client = False
 
     def _get_pkey(self, key):
@@ -105,22 +234,33 @@ class SSH(object):
                 errors.append(e)
         raise exceptions.SSHError("Invalid pkey: %s" % (errors))
 
+    def _get_pool_key(self):
+        pkey = self.pkey.get_base64() if self.pkey else None
+        return (self.user, self.host, self.port, pkey, self.key_filename,
+                self.password)
+
     def _get_client(self):
         if self._client:
             return self._client
+        if self.pool is not None:
+            self._client = self.pool.get(self._get_pool_key(), self._connect)
+        else:
+            self._client = self._connect()
+        return self._client
+
+    def _connect(self):
         try:
-            self._client = paramiko.SSHClient()
-            self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            self._client.connect(self.host, username=self.user,
-                                 port=self.port, pkey=self.pkey,
-                                 key_filename=self.key_filename,
-                                 password=self.password, timeout=1)
-            return self._client
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.connect(self.host, username=self.user,
+                           port=self.port, pkey=self.pkey,
+                           key_filename=self.key_filename,
+                           password=self.password, timeout=1)
+            return client
         except Exception as e:
             message = ("Exception %(exception_type)s was raised "
                        "during connect to %(user)s@%(host)s:%(port)s. "
                        "Exception value is: %(exception)r")
-            self._client = False
             raise exceptions.SSHError(message % {"exception": e,
                                                  "user": self.user,
                                                  "host": self.host,
@@ -128,7 +268,10 @@ class SSH(object):
                                                  "exception_type": type(e)})
 
     def close(self):
-        self._client.close()
+        # NOTE: pooled connection can be used by other SSH objects, so it
+        #   is left open until the pool is closed.
+        if self.pool is None:
+            self._client.close()
         self._client = False
 
     def run(self, cmd, stdin=None, stdout=None, stderr=None,
@@ -180,14 +323,14 @@ class SSH(object):
             r, w, e = select.select([session], writes, [session], 1)
 
             if session.recv_ready():
-                data = session.recv(4096)
+                data = session.recv(self.READ_BUFFER_SIZE)
                 LOG.debug("stdout: %r" % data)
                 if stdout is not None:
                     stdout.write(data.decode("utf8"))
                 continue
 
             if session.recv_stderr_ready():
-                stderr_data = session.recv_stderr(4096)
+                stderr_data = session.recv_stderr(self.READ_BUFFER_SIZE)
                 LOG.debug("stderr: %r" % stderr_data)
                 if stderr is not None:
                     stderr.write(stderr_data.decode("utf8"))
@@ -196,7 +339,7 @@ class SSH(object):
             if session.send_ready():
                 if stdin is not None and not stdin.closed:
                     if not data_to_send:
-                        data_to_send = stdin.read(4096)
+                        data_to_send = stdin.read(self.READ_BUFFER_SIZE)
                         if not data_to_send:
                             stdin.close()
                             session.shutdown_write()
@@ -288,3 +431,39 @@ class SSH(object):
             self._put_file_sftp(localpath, remotepath, mode=mode)
         except (paramiko.SSHException, socket.error):
             self._put_file_shell(localpath, remotepath, mode=mode)
+
+
+def execute_many(clients, cmd, stdin=None, timeout=3600, workers=None):
+    """Execute the command on many servers concurrently.
+
+    :param clients: list of SSH objects
+    :param cmd: command to be executed, can be a list
+    :param stdin: string to be sent on process stdin
+    :param timeout: timeout for execution of the command
+    :param workers: maximum number of commands executed at the same time.
+                    All commands are executed at once if not specified
+
+    :returns: list of (exit_status, stdout, stderr) tuples in the order of
+              clients. If the command failed on some server, the raised
+              exception is returned instead of a tuple
+    """
+    results = [None] * len(clients)
+
+    def publish(queue):
+        for i, client in enumerate(clients):
+            queue.append((i, client))
+
+    def consume(cache, args):
+        i, client = args
+        try:
+            results[i] = client.execute(cmd, stdin=stdin, timeout=timeout)
+        except Exception as e:
+            LOG.debug("Failed to execute %r on %s: %r" % (cmd, client.host,
+                                                          e))
+            results[i] = e
+
+    if clients:
+        broker.run(publish, consume,
+                   consumers_count=min(workers or len(clients),
+                                       len(clients)))
+    return results
@@ -20,8 +20,6 @@ import math
 
 import six
 
-from rally.task.processing import utils
-
 
 @six.add_metaclass(abc.ABCMeta)
 class StreamingAlgorithm(object):
@@ -154,42 +152,168 @@ class MaxComputation(StreamingAlgorithm):
 
 
 class PercentileComputation(StreamingAlgorithm):
-    """Compute percentile value from a stream of numbers."""
+    """Compute percentile value from a stream of numbers.
+
+    Values are stored as is until there are more than `exact_size` of them,
+    so the result is exact for short streams. After that the values are
+    moved into a logarithmic histogram (a DDSketch, see
+    https://arxiv.org/abs/1908.10693): each bucket holds values which differ
+    from the bucket representative by not more than `relative_error` of
+    their magnitude. So the result differs from the exact percentile by not
+    more than `relative_error` of its value, memory is bounded by the number
+    of buckets (not more than `max_buckets` per sign) and the length of the
+    stream does not need to be known in advance.
+
+    Instances with the same `relative_error` can be merged, which allows to
+    compute percentiles per process or per chunk and combine them later.
+    """
 
-    def __init__(self, percent, length):
+    # NOTE: values which are closer to zero than this are counted as zeros
+    #       by the histogram
+    _MIN_VALUE = 1e-9
+
+    def __init__(self, percent, length=None, relative_error=0.01,
+                 exact_size=10000, max_buckets=2048):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: deprecated and ignored, the length of the stream
+                       is not needed anymore
+        :param relative_error: max relative error of the result (from 0 to 1)
+                               after switching to the histogram
+        :param exact_size: max number of values which are stored as is
+        :param max_buckets: max number of histogram buckets per sign, lowest
+                            buckets are collapsed if there are more of them
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
+        if not 0 < relative_error < 1:
+            raise ValueError("Unexpected relative error: %s" % relative_error)
         self._percent = percent
+        self._relative_error = relative_error
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self._exact_size = exact_size
+        self._max_buckets = max_buckets
 
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+        self._values = []
+        self._count = 0
+        self._positive = {}
+        self._negative = {}
+        self._zero_count = 0
+        self._min = None
+        self._max = None
+
+    def _bucket_index(self, value):
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def _bucket_value(self, index):
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def _add_to_buckets(self, buckets, index, count):
+        buckets[index] = buckets.get(index, 0) + count
+        if len(buckets) > self._max_buckets:
+            indexes = sorted(buckets)
+            collapsed = sum(buckets.pop(idx)
+                            for idx in indexes[:-self._max_buckets])
+            buckets[indexes[-self._max_buckets]] += collapsed
+
+    def _add_to_histogram(self, value, count=1):
+        if value > self._MIN_VALUE:
+            self._add_to_buckets(self._positive,
+                                 self._bucket_index(value), count)
+        elif value < -self._MIN_VALUE:
+            self._add_to_buckets(self._negative,
+                                 self._bucket_index(-value), count)
+        else:
+            self._zero_count += count
+
+    def _switch_to_histogram(self):
+        for value in self._values:
+            self._add_to_histogram(value)
+        self._values = None
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        value = self._cast_to_float(value)
+        self._count += 1
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+        if self._values is None:
+            self._add_to_histogram(value)
+        else:
+            self._values.append(value)
+            if len(self._values) > self._exact_size:
+                self._switch_to_histogram()
 
     def merge(self, other):
-        # TODO(ikhudoshyn): Implement me
-        raise NotImplementedError()
+        if self._relative_error != other._relative_error:
+            raise ValueError("Unable to merge percentile computations with "
+                             "different relative errors.")
+        if not other._count:
+            return
+
+        if (self._values is not None and other._values is not None
+                and self._count + other._count <= self._exact_size):
+            self._values.extend(other._values)
+        else:
+            if self._values is not None:
+                self._switch_to_histogram()
+            if other._values is not None:
+                for value in other._values:
+                    self._add_to_histogram(value)
+            else:
+                for index, count in other._positive.items():
+                    self._add_to_buckets(self._positive, index, count)
+                for index, count in other._negative.items():
+                    self._add_to_buckets(self._negative, index, count)
+                self._zero_count += other._zero_count
+
+        self._count += other._count
+        for value in (other._min, other._max):
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def _get_value(self, rank):
+        """Return the value with the given rank from the histogram."""
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._bucket_value(index)
+        seen += self._zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._bucket_value(index)
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if results:
+        if not self._count:
+            return None
+
+        if self._values is not None:
             # NOTE(amaretskiy): Calculate percentile of a list of values
-            results.sort()
-            k = (len(results) - 1) * self._percent
-            f = math.floor(k)
-            c = math.ceil(k)
-            if f == c:
-                return results[int(k)]
-            d0 = results[int(f)] * (c - k)
-            d1 = results[int(c)] * (k - f)
-            return (d0 + d1)
-        return None
+            results = sorted(self._values)
+            get_value = results.__getitem__
+        else:
+            get_value = self._get_value
+
+        k = (self._count - 1) * self._percent
+        f = math.floor(k)
+        c = math.ceil(k)
+        if f == c:
+            value = get_value(int(k))
+        else:
+            d0 = get_value(int(f)) * (c - k)
+            d1 = get_value(int(c)) * (k - f)
+            value = d0 + d1
+        return min(max(value, self._min), self._max)
 
 
 class IncrementComputation(StreamingAlgorithm):
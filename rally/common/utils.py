@@ -27,6 +27,7 @@ import shutil
 import string
 import sys
 import tempfile
+import threading
 import time
 import uuid
 
@@ -558,7 +559,8 @@ def timeout_thread(queue):
     where `thread_ident` is Thread.ident value of thread to watch, and
     `deadline` is timestamp when thread should be terminated. Also tuple
     (None, None) should be put when all threads are exited and no more
-    threads to watch.
+    threads to watch. If the watched object has `terminate` method, it is
+    called instead of terminating the thread by its ident.
 
     :param queue: Queue object to communicate with parent thread.
     """
@@ -576,7 +578,12 @@ def timeout_thread(queue):
         except (moves.queue.Empty, ValueError):
             # NOTE(rvasilets) Empty means that timeout was occurred.
             # ValueError means that timeout lower than 0.
-            if thread.isAlive():
+            if hasattr(thread, "terminate"):
+                # NOTE: objects which are not threads themselves (e.g. a
+                #   single iteration of a long-lived thread) check that
+                #   they are still alive and terminate atomically
+                thread.terminate()
+            elif thread.isAlive():
                 LOG.info("Thread %s is timed out. Terminating." % thread.ident)
                 terminate_thread(thread.ident)
             all_threads.popleft()
@@ -632,6 +639,9 @@ class LockedDict(dict):
             return obj
         return copy.deepcopy(unlock(self), memo=memo)
 
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
     def __enter__(self, *args):
         if self._is_ready_to_be_unlocked:
             self._is_locked = False
@@ -669,6 +679,58 @@ class LockedDict(dict):
         return super(LockedDict, self).clear(*args, **kwargs)
 
 
+class CallCache(object):
+    """Thread-safe cache of results of calls.
+
+    The result for a key is calculated only once even if several threads
+    ask for it at the same time. Failed calls are not cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._cache = {}
+
+    def _get_cached(self, key):
+        """Returns cached result or raises KeyError. Called under lock."""
+        return self._cache[key]
+
+    def _set_cached(self, key, value):
+        """Caches the result of the call. Called under lock."""
+        self._cache[key] = value
+
+    def get(self, key, func, *args, **kwargs):
+        """Returns cached result of func or calls it and caches the result.
+
+        :param key: Hashable key which identifies the result of the call
+        :param func: Function to call if the result is not cached yet
+        """
+        with self._lock:
+            try:
+                return self._get_cached(key)
+            except KeyError:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                try:
+                    return self._get_cached(key)
+                except KeyError:
+                    pass
+            try:
+                value = func(*args, **kwargs)
+                with self._lock:
+                    self._set_cached(key, value)
+            finally:
+                # NOTE: threads which are already waiting for the key lock
+                #   find the result in the cache, so the lock is not needed
+                #   anymore
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+        return value
+
+
 def format_float_to_str(num):
     """Format number into human-readable float format.
 
@@ -691,6 +753,47 @@ def format_float_to_str(num):
     return num_str.split(".")[0] + "." + float_part
 
 
+class WaitableDeque(collections.deque):
+    """collections.deque which allows to wait for new items.
+
+    Consumers can block in wait() until somebody appends an item instead of
+    polling the deque with sleeps in between.
+    """
+
+    def __init__(self, iterable=(), maxlen=None):
+        super(WaitableDeque, self).__init__(iterable, maxlen)
+        self._cond = threading.Condition()
+
+    def append(self, item):
+        with self._cond:
+            super(WaitableDeque, self).append(item)
+            self._cond.notify_all()
+
+    def extend(self, iterable):
+        with self._cond:
+            super(WaitableDeque, self).extend(iterable)
+            self._cond.notify_all()
+
+    def wait(self, stop_event=None, timeout=None):
+        """Block until the deque is not empty.
+
+        :param stop_event: optional threading.Event. Waiting is not started
+            if it is set. Call interrupt() after setting the event to wake
+            up consumers which are already waiting
+        :param timeout: optional number of seconds to wait
+        :returns: True if the deque is not empty
+        """
+        with self._cond:
+            if not self and not (stop_event and stop_event.is_set()):
+                self._cond.wait(timeout)
+            return bool(self)
+
+    def interrupt(self):
+        """Wake up all consumers waiting for new items."""
+        with self._cond:
+            self._cond.notify_all()
+
+
 class DequeAsQueue(object):
     """Allows to use some of Queue methods on collections.deque."""
 
@@ -20,6 +20,7 @@ import six
 
 from rally.common import logging
 from rally.common.plugin import plugin
+from rally.common import utils
 from rally import exceptions
 
 configure = plugin.configure
@@ -32,6 +33,10 @@ LOG = logging.getLogger(__name__)
 @six.add_metaclass(abc.ABCMeta)
 class Validator(plugin.Plugin):
 
+    # NOTE: ValidationSession which is shared by validators during the
+    #       validation of one task, it is set by ValidatablePluginMixin
+    session = None
+
     def __init__(self):
         pass
 
@@ -49,6 +54,16 @@ class Validator(plugin.Plugin):
     def fail(self, msg):
         return ValidationResult(False, msg=msg)
 
+    def _cached(self, key, func, *args, **kwargs):
+        """Call func or take its result from the validation session.
+
+        :param key: Hashable key which identifies the result of the call
+        :param func: Function to call if the result is not cached yet
+        """
+        if self.session is None:
+            return func(*args, **kwargs)
+        return self.session.get(key, func, *args, **kwargs)
+
     @classmethod
     def _get_doc(cls):
         doc = ""
@@ -168,6 +183,15 @@ class ValidationResult(object):
         return self.msg
 
 
+class ValidationSession(utils.CallCache):
+    """Cache of lookups shared by validators during a task validation.
+
+    Workloads are validated concurrently, so each value is calculated only
+    once even if several validators ask for it at the same time. Failed
+    calls are not cached.
+    """
+
+
 class ValidatablePluginMixin(object):
 
     @staticmethod
@@ -178,7 +202,8 @@ class ValidatablePluginMixin(object):
 
     @classmethod
     def validate(cls, name, credentials, config, plugin_cfg,
-                 namespace=None, allow_hidden=False, vtype=None):
+                 namespace=None, allow_hidden=False, vtype=None,
+                 session=None):
         """Execute all validators stored in meta of plugin.
 
         Iterate during all validators stored in the meta of Validator
@@ -194,6 +219,8 @@ class ValidatablePluginMixin(object):
         :param vtype: Type of validation. Allowed types: syntax, platform,
             semantic. HINT: To specify several types use tuple or list with
             types
+        :param session: ValidationSession to share lookups between
+            validators
         :returns: list of ValidationResult(is_valid=False) instances
         """
         try:
@@ -246,6 +273,7 @@ class ValidatablePluginMixin(object):
             for validator_cls, args, kwargs in validators:
                 try:
                     validator = validator_cls(*args, **kwargs)
+                    validator.session = session
 
                     # NOTE(amaretskiy): validator is successful by default
                     result = (validator.validate(credentials=credentials,
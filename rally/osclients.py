@@ -14,6 +14,9 @@
 #    under the License.
 
 import abc
+import collections
+import functools
+import json
 import os
 
 from oslo_config import cfg
@@ -23,6 +26,7 @@ from rally.cli import envutils
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common.plugin import plugin
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 
@@ -40,6 +44,54 @@ CONF.register_opts(OSCLIENTS_OPTS)
 _NAMESPACE = "openstack"
 
 
+class SessionCache(utils.CallCache):
+    """Keystone sessions shared by all clients of the current process.
+
+    Scenario iterations create new Clients objects, so without this cache
+    each of them authenticates (and discovers the Keystone version) again.
+    Sessions are keyed by credential and Keystone version, so users do not
+    share tokens. Identity plugins of the sessions keep the tokens and
+    re-authenticate when a token is about to expire.
+
+    At most `max_size` sessions are kept, the least recently used ones are
+    dropped first, so sessions of users of finished workloads do not pile
+    up in a long-living process.
+    """
+
+    def __init__(self, max_size=256):
+        super(SessionCache, self).__init__()
+        self.max_size = max_size
+        self._cache = collections.OrderedDict()
+        self._pid = os.getpid()
+
+    def _check_pid(self):
+        # NOTE: connections of sessions created by the parent process can
+        #   not be shared with forked runner workers.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._key_locks = {}
+            self._cache = collections.OrderedDict()
+
+    def _get_cached(self, key):
+        self._check_pid()
+        # NOTE: the session becomes the most recently used one
+        self._cache[key] = self._cache.pop(key)
+        return self._cache[key]
+
+    def _set_cached(self, key, value):
+        self._cache[key] = value
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._key_locks = {}
+            self._cache = collections.OrderedDict()
+
+
+SESSION_CACHE = SessionCache()
+
+
 def configure(name, default_version=None, default_service_type=None,
               supported_versions=None):
     """OpenStack client class wrapper.
@@ -231,57 +283,75 @@ class Keystone(OSClient):
 
     @property
     def auth_ref(self):
-        if "keystone_auth_ref" not in self.cache:
-            sess, plugin = self.get_session()
-            self.cache["keystone_auth_ref"] = plugin.get_access(sess)
+        sess, plugin = self.get_session()
+        # NOTE: the plugin returns the token it already has and requests
+        #   a new one only if the token is about to expire.
+        self.cache["keystone_auth_ref"] = plugin.get_access(sess)
         return self.cache["keystone_auth_ref"]
 
-    def get_session(self, version=None):
+    def get_session(self, version=None, shared=True):
+        """Returns Keystone session and identity plugin.
+
+        :param version: Keystone API version
+        :param shared: whether to take the session from the session cache
+            of the process. A not shared session is created every time, so
+            it authenticates again, which is what authentication benchmarks
+            have to measure.
+        """
+        if not shared:
+            return self._create_session(self.choose_version(version))
         key = "keystone_session_and_plugin_%s" % version
         if key not in self.cache:
-            from keystoneauth1 import discover
-            from keystoneauth1 import identity
-            from keystoneauth1 import session
-
             version = self.choose_version(version)
-            auth_url = self.credential.auth_url
-            if version is not None:
-                auth_url = self._remove_url_version()
-
-            password_args = {
-                "auth_url": auth_url,
-                "username": self.credential.username,
-                "password": self.credential.password,
-                "tenant_name": self.credential.tenant_name
-            }
-
-            if version is None:
-                # NOTE(rvasilets): If version not specified than we discover
-                # available version with the smallest number. To be able to
-                # discover versions we need session
-                temp_session = session.Session(
-                    verify=(self.credential.https_cacert or
-                            not self.credential.https_insecure),
-                    timeout=CONF.openstack_client_http_timeout)
-                version = str(discover.Discover(
-                    temp_session,
-                    password_args["auth_url"]).version_data()[0]["version"][0])
-
-            if "v2.0" not in password_args["auth_url"] and (
-                    version != "2"):
-                password_args.update({
-                    "user_domain_name": self.credential.user_domain_name,
-                    "domain_name": self.credential.domain_name,
-                    "project_domain_name": self.credential.project_domain_name,
-                })
-            identity_plugin = identity.Password(**password_args)
-            sess = session.Session(
-                auth=identity_plugin,
+            credential_key = json.dumps(self.credential.to_dict(),
+                                        sort_keys=True, default=str)
+            self.cache[key] = SESSION_CACHE.get(
+                (credential_key, version),
+                functools.partial(self._create_session, version))
+        return self.cache[key]
+
+    def _create_session(self, version):
+        from keystoneauth1 import discover
+        from keystoneauth1 import identity
+        from keystoneauth1 import session
+
+        auth_url = self.credential.auth_url
+        if version is not None:
+            auth_url = self._remove_url_version()
+
+        password_args = {
+            "auth_url": auth_url,
+            "username": self.credential.username,
+            "password": self.credential.password,
+            "tenant_name": self.credential.tenant_name
+        }
+
+        if version is None:
+            # NOTE(rvasilets): If version not specified than we discover
+            # available version with the smallest number. To be able to
+            # discover versions we need session
+            temp_session = session.Session(
                 verify=(self.credential.https_cacert or
                         not self.credential.https_insecure),
                 timeout=CONF.openstack_client_http_timeout)
-            self.cache[key] = (sess, identity_plugin)
-        return self.cache[key]
+            version = str(discover.Discover(
+                temp_session,
+                password_args["auth_url"]).version_data()[0]["version"][0])
+
+        if "v2.0" not in password_args["auth_url"] and (
+                version != "2"):
+            password_args.update({
+                "user_domain_name": self.credential.user_domain_name,
+                "domain_name": self.credential.domain_name,
+                "project_domain_name": self.credential.project_domain_name,
+            })
+        identity_plugin = identity.Password(**password_args)
+        sess = session.Session(
+            auth=identity_plugin,
+            verify=(self.credential.https_cacert or
+                    not self.credential.https_insecure),
+            timeout=CONF.openstack_client_http_timeout)
+        return sess, identity_plugin
 
     def _remove_url_version(self):
         """Remove any version from the auth_url.
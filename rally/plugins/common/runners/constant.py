@@ -14,29 +14,118 @@
 #    under the License.
 
 import collections
+import ctypes
 import multiprocessing
 import threading
 import time
 
 from six.moves import queue as Queue
 
+from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally import consts
+from rally import exceptions
 from rally.task import runner
 from rally.task import utils as butils
 
 
+LOG = logging.getLogger(__name__)
+
+
+class _IterationHandle(object):
+    """Handle which tracks a single iteration run by a pooled thread.
+
+    ``utils.timeout_thread`` terminates the iteration via ``terminate()``,
+    so it does not touch the following iterations executed by the same
+    long-lived thread. The check that the iteration is still running and
+    the termination are done under the same lock as ``finish()``.
+    """
+
+    def __init__(self, ident):
+        self.ident = ident
+        self._lock = threading.Lock()
+        self._finished = False
+        self._terminated = False
+
+    def finish(self):
+        with self._lock:
+            self._finished = True
+            if self._terminated:
+                # NOTE: the exception can still be pending if the iteration
+                #   has finished right after it was sent. Clear it, so it
+                #   does not interrupt the next iteration of the thread.
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                    ctypes.c_long(self.ident), None)
+
+    def terminate(self):
+        with self._lock:
+            if not self._finished and not self._terminated:
+                LOG.info("Iteration of thread %s is timed out. "
+                         "Terminating." % self.ident)
+                self._terminated = True
+                utils.terminate_thread(self.ident)
+
+    def isAlive(self):
+        return not self._finished
+
+
+def _pooled_worker_thread(queue, iteration_gen, times, timeout, timeout_queue,
+                          context, cls, method_name, args, event_queue,
+                          aborted):
+    """Run scenario iterations one by one until all of them are taken.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator shared between all
+                          threads and processes
+    :param times: total number of scenario iterations to be run
+    :param timeout: operation's timeout
+    :param timeout_queue: queue of ``utils.timeout_thread`` or None
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    """
+    ident = threading.current_thread().ident
+    while not aborted.is_set():
+        try:
+            iteration = next(iteration_gen)
+            if iteration >= times:
+                break
+            scenario_context = runner._get_scenario_context(iteration,
+                                                            context)
+            handle = _IterationHandle(ident)
+            if timeout:
+                timeout_queue.put((handle, time.time() + timeout))
+            try:
+                runner._worker_thread(queue, cls, method_name,
+                                      scenario_context, args, event_queue)
+            finally:
+                handle.finish()
+        except StopIteration:
+            break
+        except exceptions.ThreadTimeoutException:
+            # NOTE: the exception can be raised after the iteration result is
+            #     sent, but before the handle is finished. The next iteration
+            #     is not taken yet, so just keep on working.
+            LOG.debug("Thread %s is interrupted between iterations." % ident)
+
+
 def _worker_process(queue, iteration_gen, timeout, concurrency, times,
                     context, cls, method_name, args, event_queue, aborted,
                     info):
     """Start the scenario within threads.
 
-    Spawn threads to support scenario execution for a fixed number of times.
-    This generates a constant load on the cloud under test by executing each
-    scenario iteration without pausing between iterations. Each thread runs
-    the scenario method once with passed scenario arguments and context.
-    After execution the result is appended to the queue.
+    Spawn a pool of long-lived threads to support scenario execution for
+    a fixed number of times. This generates a constant load on the cloud
+    under test by executing each scenario iteration without pausing between
+    iterations. Each thread takes the next iteration number from the shared
+    generator, runs the scenario method with passed scenario arguments and
+    context and appends the result to the queue, until all iterations are
+    taken or load generation is aborted.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -54,13 +143,13 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
     """
 
     pool = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
+    queue = runner._BatchQueue(queue, context["task"])
 
     runner._log_worker_info(times=times, concurrency=concurrency,
                             timeout=timeout, cls=cls, method_name=method_name,
                             args=args)
 
+    timeout_queue = None
     if timeout:
         timeout_queue = Queue.Queue()
         collector_thr_by_timeout = threading.Thread(
@@ -69,43 +158,13 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
         )
         collector_thr_by_timeout.start()
 
-    iteration = next(iteration_gen)
-    while iteration < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(iteration, context)
-        worker_args = (
-            queue, cls, method_name, scenario_context, args, event_queue)
-
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
-
+    for i in range(min(concurrency, times)):
+        thread = threading.Thread(
+            target=_pooled_worker_thread,
+            args=(queue, iteration_gen, times, timeout, timeout_queue,
+                  context, cls, method_name, args, event_queue, aborted))
         thread.start()
-        if timeout:
-            timeout_queue.put((thread, time.time() + timeout))
         pool.append(thread)
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for t in pool:
-                if not t.isAlive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0].isAlive():
-                    pool.popleft().join()
-                    finished_threads_in_pool -= 1
-                break
-
-            # we should wait to not create big noise with these checks
-            time.sleep(0.001)
-        iteration = next(iteration_gen)
 
     # Wait until all threads are done
     while pool:
@@ -115,6 +174,8 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
         timeout_queue.put((None, None,))
         collector_thr_by_timeout.join()
 
+    queue.flush()
+
 
 @validation.configure("check_constant")
 class CheckConstantValidator(validation.Validator):
@@ -318,14 +379,10 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
         pool = multiprocessing.Pool(concurrency)
         manager = multiprocessing.Manager()
         event_queue = manager.Queue()
-        stop_event_listener = threading.Event()
 
         def event_listener():
-            while not stop_event_listener.isSet():
-                while not event_queue.empty():
-                    self.send_event(**event_queue.get())
-                else:
-                    time.sleep(0.01)
+            for event in iter(event_queue.get, None):
+                self.send_event(**event)
 
         event_listener_thread = threading.Thread(target=event_listener)
         event_listener_thread.start()
@@ -349,7 +406,7 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
             if time.time() - start > duration:
                 break
 
-        stop_event_listener.set()
+        event_queue.put(None)
         event_listener_thread.join()
         pool.terminate()
         pool.join()
@@ -0,0 +1,128 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+
+from rally.common import utils
+from rally import consts
+from rally.task import runner
+
+
+def _worker_process(queue, iteration_gen, times, context, cls, method_name,
+                    args, event_queue, aborted, info):
+    """Run scenario iterations one by one until all of them are taken.
+
+    The context is passed to the process only once, when it is started,
+    and each iteration gets its own copy of it.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator shared between all
+                          processes
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+    queue = runner._BatchQueue(queue, context["task"])
+    runner._log_worker_info(times=times, cls=cls, method_name=method_name,
+                            args=args, **info)
+
+    while not aborted.is_set():
+        try:
+            iteration = next(iteration_gen)
+        except StopIteration:
+            break
+        if iteration >= times:
+            break
+        queue.put(runner._run_scenario_once(
+            cls, method_name, runner._get_scenario_context(iteration, context),
+            args, event_queue))
+
+    queue.flush()
+
+
+@runner.configure(name="process_pool")
+class ProcessPoolScenarioRunner(runner.ScenarioRunner):
+    """Scenario runner that executes iterations in a pool of processes.
+
+    Each process of the pool executes iterations one-by-one like the serial
+    runner does, so this runner is intended for scenarios which spend most
+    of the time on the client side (template rendering, data generation,
+    etc) and are limited by one CPU when they are run by threads of a
+    single process. The processes are started once per workload, so the
+    context is passed to each of them only once.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string",
+                "description": "Type of Runner."
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Total number of iteration executions."
+            },
+            "processes": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The number of processes to run iterations "
+                               "in. Defaults to the number of CPUs."
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        times = self.config.get("times", 1)
+        processes = self.config.get("processes",
+                                    multiprocessing.cpu_count())
+        processes_to_start = min(processes, times)
+        iteration_gen = utils.RAMInt()
+
+        self._log_debug_info(times=times, processes=processes,
+                             processes_to_start=processes_to_start)
+
+        result_queue = multiprocessing.Queue()
+        event_queue = multiprocessing.Queue()
+
+        def worker_args_gen():
+            while True:
+                yield (result_queue, iteration_gen, times, context, cls,
+                       method_name, args, event_queue, self.aborted)
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process, worker_args_gen())
+        self._join_processes(process_pool, result_queue, event_queue)
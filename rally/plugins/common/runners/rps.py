@@ -15,6 +15,7 @@
 
 import collections
 import multiprocessing
+import random
 import threading
 import time
 
@@ -24,6 +25,7 @@ from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally import consts
+from rally.task.processing import utils as putils
 from rally.task import runner
 
 LOG = logging.getLogger(__name__)
@@ -57,6 +59,7 @@ def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
     """
 
     pool = collections.deque()
+    queue = runner._BatchQueue(queue, context["task"])
     if isinstance(rps_cfg, dict):
         rps = rps_cfg["start"]
     else:
@@ -120,6 +123,137 @@ def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
         timeout_queue.put((None, None,))
         collector_thr_by_timeout.join()
 
+    queue.flush()
+
+
+def _get_arrival_schedule(rps_cfg, times, arrival):
+    """Calculate arrival offsets of all iterations for the open-loop mode.
+
+    :param rps_cfg: rps section from task config. A number means a constant
+                    rate, a dict means a rate which is increased by `step`
+                    each `duration` seconds from `start` up to `end`
+    :param times: total number of scenario iterations to be run
+    :param arrival: "constant" for equal gaps between arrivals or "poisson"
+                    for exponentially distributed gaps
+    :returns: list of offsets (in seconds) from the beginning of the load
+    """
+    if isinstance(rps_cfg, dict):
+        def rate(offset):
+            stage = int(offset // rps_cfg.get("duration", 1))
+            return float(min(rps_cfg["start"] + rps_cfg["step"] * stage,
+                             rps_cfg["end"]))
+    else:
+        def rate(offset):
+            return float(rps_cfg)
+
+    schedule = []
+    offset = 0.0
+    for i in range(times):
+        schedule.append(offset)
+        if arrival == "poisson":
+            offset += random.expovariate(rate(offset))
+        else:
+            offset += 1.0 / rate(offset)
+    return schedule
+
+
+def _open_loop_worker_thread(queue, slots, scheduled_at, cls, method_name,
+                             context_obj, scenario_kwargs, event_queue):
+    try:
+        result = runner._run_scenario_once(cls, method_name, context_obj,
+                                           scenario_kwargs, event_queue)
+    finally:
+        slots.release()
+
+    result["scheduled_timestamp"] = scheduled_at
+    queue.put(result)
+
+
+def _open_loop_worker_process(queue, iteration_gen, timeout, schedule,
+                              max_concurrent, context, cls, method_name, args,
+                              event_queue, aborted, start_at, started, info):
+    """Start scenario within threads at precomputed arrival times.
+
+    Unlike `_worker_process`, the pace does not depend on how fast previous
+    iterations finish: each iteration is started as close as possible to its
+    slot in the schedule. If all `max_concurrent` threads are busy, the
+    iteration waits for a free one and the delay is recorded in the result
+    via `scheduled_timestamp`, so it is not hidden from the statistics.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: operation's timeout
+    :param schedule: offsets (in seconds from `start_at`) of iterations
+                     which should be started by this process
+    :param max_concurrent: maximum worker concurrency
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param start_at: multiprocessing.Value with timestamp of the beginning
+                     of the load. It is set when all worker processes are
+                     spawned
+    :param started: multiprocessing.Event which is set after `start_at`
+    :param info: info about all processes count and counter of runned process
+    """
+
+    pool = collections.deque()
+    slots = threading.BoundedSemaphore(max_concurrent)
+    queue = runner._BatchQueue(queue, context["task"])
+
+    started.wait()
+    start_at = start_at.value
+
+    runner._log_worker_info(times=len(schedule), timeout=timeout,
+                            max_concurrent=max_concurrent, cls=cls,
+                            method_name=method_name, args=args)
+
+    timeout_queue = Queue.Queue()
+    if timeout:
+        collector_thr_by_timeout = threading.Thread(
+            target=utils.timeout_thread,
+            args=(timeout_queue, )
+        )
+        collector_thr_by_timeout.start()
+
+    for offset in schedule:
+        scheduled_at = start_at + offset
+        delay = scheduled_at - time.time()
+        # NOTE: Event.wait() blocks precisely until the slot and wakes up
+        #     immediately if the load generation is aborted.
+        if (delay > 0 and aborted.wait(delay)) or aborted.is_set():
+            break
+        slots.acquire()
+        if aborted.is_set():
+            slots.release()
+            break
+
+        scenario_context = runner._get_scenario_context(next(iteration_gen),
+                                                        context)
+        thread = threading.Thread(
+            target=_open_loop_worker_thread,
+            args=(queue, slots, scheduled_at, cls, method_name,
+                  scenario_context, args, event_queue))
+        thread.start()
+        if timeout:
+            timeout_queue.put((thread, time.time() + timeout))
+        pool.append(thread)
+
+        while pool and not pool[0].isAlive():
+            pool.popleft().join()
+
+    while pool:
+        pool.popleft().join()
+
+    if timeout:
+        timeout_queue.put((None, None,))
+        collector_thr_by_timeout.join()
+
+    queue.flush()
+
 
 @validation.configure("check_rps")
 class CheckPRSValidator(validation.Validator):
@@ -144,6 +278,16 @@ class RPSScenarioRunner(runner.ScenarioRunner):
     An example of a rps scenario is booting 1 VM per second. This
     execution type is thus very helpful in understanding the maximal load that
     a certain cloud can handle.
+
+    If `arrival` is specified, the runner works in the open-loop mode: start
+    times of all iterations are calculated in advance (with constant or
+    exponentially distributed gaps) and iterations are started at these
+    times regardless of how long the previous ones take. Each iteration
+    result then contains `scheduled_timestamp` next to the actual
+    `timestamp`, and requested and achieved rps for each second are saved
+    in the "rps" statistics of the workload. Latency of iterations counted
+    from their scheduled start (i.e. corrected for coordinated omission) is
+    saved in the "corrected_latency" statistics.
     """
 
     CONFIG_SCHEMA = {
@@ -203,6 +347,12 @@ class RPSScenarioRunner(runner.ScenarioRunner):
             "max_cpu_count": {
                 "type": "integer",
                 "minimum": 1
+            },
+            "arrival": {
+                "enum": ["constant", "poisson"],
+                "description": "Enable the open-loop mode with the given "
+                               "distribution of gaps between iterations "
+                               "starts."
             }
         },
         "required": ["type", "times", "rps"],
@@ -265,6 +415,37 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         result_queue = multiprocessing.Queue()
         event_queue = multiprocessing.Queue()
 
+        if self.config.get("arrival"):
+            schedule = _get_arrival_schedule(
+                self.config["rps"], times, self.config["arrival"])
+            start_at = multiprocessing.Value("d", 0.0)
+            started = multiprocessing.Event()
+            self._open_loop_starts = collections.Counter()
+            self._open_loop_latency = putils.DurationStats()
+
+            def open_loop_args_gen(concurrency_overhead):
+                for i in range(processes_to_start):
+                    yield (
+                        result_queue, iteration_gen, timeout,
+                        schedule[i::processes_to_start],
+                        concurrency_per_worker + (concurrency_overhead and 1),
+                        context, cls, method_name, args, event_queue,
+                        self.aborted, start_at, started
+                    )
+                    if concurrency_overhead:
+                        concurrency_overhead -= 1
+
+            process_pool = self._create_process_pool(
+                processes_to_start, _open_loop_worker_process,
+                open_loop_args_gen(concurrency_overhead))
+            # NOTE: the load starts only when all workers are spawned, so
+            #     the time spent on spawning does not make first slots late.
+            start_at.value = self._open_loop_start = time.time()
+            started.set()
+            self._join_processes(process_pool, result_queue, event_queue)
+            self._save_open_loop_statistics(schedule)
+            return
+
         def worker_args_gen(times_overhead, concurrency_overhead):
             """Generate arguments for process worker.
 
@@ -296,3 +477,44 @@ class RPSScenarioRunner(runner.ScenarioRunner):
             processes_to_start, _worker_process,
             worker_args_gen(times_overhead, concurrency_overhead))
         self._join_processes(process_pool, result_queue, event_queue)
+
+    def _send_results_batch(self, batch):
+        for result in batch.results:
+            if "scheduled_timestamp" in result:
+                second = int(result["timestamp"] - self._open_loop_start)
+                self._open_loop_starts[second] += 1
+                # NOTE: the delay of the start of an iteration is a part
+                #     of its latency, otherwise an overloaded cloud hides
+                #     slow responses by making the load smaller
+                self._open_loop_latency.add(
+                    result["timestamp"] + result["duration"]
+                    - result["scheduled_timestamp"],
+                    not result["error"])
+        super(RPSScenarioRunner, self)._send_results_batch(batch)
+
+    def _save_open_loop_statistics(self, schedule):
+        """Save and log achieved rps and corrected latency of the load.
+
+        Requested and achieved rps are saved for each second, latency of
+        iterations counted from their scheduled start is saved as
+        processing.utils.DurationStats result.
+        """
+        requested = collections.Counter(int(offset) for offset in schedule)
+        seconds = sorted(set(requested) | set(self._open_loop_starts))
+        self.statistics["rps"] = [
+            [second, requested[second], self._open_loop_starts[second]]
+            for second in seconds]
+        LOG.info("Task %(task)s | Open-loop rps per second (second: "
+                 "requested/achieved):\n\t%(rps)s"
+                 % {"task": self.task["uuid"],
+                    "rps": "\n\t".join("%d: %d/%d" % tuple(row)
+                                       for row in self.statistics["rps"])})
+
+        self.statistics["corrected_latency"] = (
+            self._open_loop_latency.result())
+        LOG.info("Task %(task)s | Open-loop latency corrected for "
+                 "coordinated omission: %(latency)s"
+                 % {"task": self.task["uuid"],
+                    "latency": ", ".join(
+                        "%s: %s" % item for item in
+                        self.statistics["corrected_latency"].items())})
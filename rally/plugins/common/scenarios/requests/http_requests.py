@@ -12,6 +12,7 @@
 
 import random
 
+from rally.common import validation
 from rally.plugins.common.scenarios.requests import utils
 from rally.task import scenario
 
@@ -19,10 +20,11 @@ from rally.task import scenario
 """Scenarios for HTTP requests."""
 
 
+@validation.add("check_request_pool")
 @scenario.configure(name="HttpRequests.check_request")
 class HttpRequestsCheckRequest(utils.RequestScenario):
 
-    def run(self, url, method, status_code, **kwargs):
+    def run(self, url, method, status_code, pool=None, **kwargs):
         """Standard way to benchmark web services.
 
         This benchmark is used to make request and check it with expected
@@ -31,16 +33,22 @@ class HttpRequestsCheckRequest(utils.RequestScenario):
         :param url: url for the Request object
         :param method: method for the Request object
         :param status_code: expected response code
+        :param pool: optional connection pool settings (dict with "size"
+                     and "keep_alive" keys). If specified, requests of each
+                     worker process reuse connections of a single session
         :param kwargs: optional additional request parameters
         """
 
+        if pool is not None:
+            kwargs["pool"] = pool
         self._check_request(url, method, status_code, **kwargs)
 
 
+@validation.add("check_request_pool")
 @scenario.configure(name="HttpRequests.check_random_request")
 class HttpRequestsCheckRandomRequest(utils.RequestScenario):
 
-    def run(self, requests, status_code):
+    def run(self, requests, status_code, pool=None):
         """Benchmark the list of requests
 
         This scenario takes random url from list of requests, and raises
@@ -49,8 +57,12 @@ class HttpRequestsCheckRandomRequest(utils.RequestScenario):
         :param requests: List of request dicts
         :param status_code: Expected Response Code it will
         be used only if we doesn't specified it in request proper
+        :param pool: optional connection pool settings (dict with "size"
+                     and "keep_alive" keys), see HttpRequests.check_request
         """
 
         request = random.choice(requests)
         request.setdefault("status_code", status_code)
+        if pool is not None:
+            request.setdefault("pool", pool)
         self._check_request(**request)
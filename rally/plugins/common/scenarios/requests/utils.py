@@ -10,30 +10,172 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import threading
+
+import jsonschema
 import requests
+from requests import adapters
 
 from rally.common.i18n import _
+from rally.common import validation
 from rally.task import atomic
 from rally.task import scenario
 
 
+POOL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "size": {"type": "integer", "minimum": 1},
+        "keep_alive": {"type": "boolean"}
+    },
+    "additionalProperties": False
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# NOTE: the scenario which sends a request in the current thread, new
+#       connections established for the request are timed as its atomic
+#       actions
+_local = threading.local()
+_timed_connection_classes = {}
+
+
+def _get_timed_connection_cls(connection_cls):
+    """Return subclass of the connection class which times connect()."""
+    if connection_cls not in _timed_connection_classes:
+        class TimedConnection(connection_cls):
+            _rally_timed = True
+
+            def connect(self):
+                scenario = getattr(_local, "scenario", None)
+                if scenario is None:
+                    return super(TimedConnection, self).connect()
+                with atomic.ActionTimer(scenario, "requests.connect"):
+                    return super(TimedConnection, self).connect()
+
+        _timed_connection_classes[connection_cls] = TimedConnection
+    return _timed_connection_classes[connection_cls]
+
+
+class TimedHTTPAdapter(adapters.HTTPAdapter):
+    """Transport adapter which times establishing of new connections.
+
+    Connections of the pools returned by the adapter record the time spent
+    in connect() (TCP and TLS handshakes) as "requests.connect" atomic
+    action of the scenario which sends the request, so it is not hidden in
+    the time of the whole request.
+    """
+
+    def get_connection(self, url, proxies=None):
+        conn_pool = super(TimedHTTPAdapter, self).get_connection(url,
+                                                                 proxies)
+        if not getattr(conn_pool.ConnectionCls, "_rally_timed", False):
+            conn_pool.ConnectionCls = _get_timed_connection_cls(
+                conn_pool.ConnectionCls)
+        return conn_pool
+
+
+def get_session(size=10, keep_alive=True):
+    """Return requests session of the current worker process.
+
+    Sessions are created once per process and pool settings and are shared
+    by its threads (e.g. the rps runner starts a thread per iteration), so
+    iterations reuse already established connections.
+
+    :param size: maximum number of connections kept in the pool per host
+    :param keep_alive: whether connections should be kept open between
+                       requests
+    :returns: requests.Session object
+    """
+    # NOTE: connections of the parent process must not be shared with
+    #       forked worker processes
+    key = (os.getpid(), size, keep_alive)
+    with _sessions_lock:
+        if key not in _sessions:
+            session = requests.Session()
+            adapter = TimedHTTPAdapter(pool_connections=size,
+                                       pool_maxsize=size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if not keep_alive:
+                session.headers["Connection"] = "close"
+            _sessions[key] = session
+        return _sessions[key]
+
+
+@validation.configure("check_request_pool")
+class CheckRequestPoolValidator(validation.Validator):
+    """Validates connection pool settings of requests scenarios.
+
+    Settings are taken from the `pool' argument and from `pool' keys of
+    the dicts in the `requests' argument.
+    """
+
+    def validate(self, credentials, config, plugin_cls, plugin_cfg):
+        args = config.get("args", {})
+        pools = [args.get("pool")]
+        requests_list = args.get("requests")
+        if isinstance(requests_list, list):
+            pools.extend(r.get("pool") for r in requests_list
+                         if isinstance(r, dict))
+        for pool in pools:
+            if pool is None:
+                continue
+            try:
+                jsonschema.validate(pool, POOL_SCHEMA)
+            except jsonschema.ValidationError as e:
+                return self.fail("Invalid connection pool settings %s: %s"
+                                 % (pool, e.message))
+
+
 class RequestScenario(scenario.Scenario):
     """Base class for Request scenarios with basic atomic actions."""
 
     @atomic.action_timer("requests.check_request")
-    def _check_request(self, url, method, status_code, **kwargs):
+    def _check_request(self, url, method, status_code, pool=None, **kwargs):
         """Compare request status code with specified code
 
         :param status_code: Expected status code of request
         :param url: Uniform resource locator
         :param method: Type of request method (GET | POST ..)
+        :param pool: Optional dict with "size" and "keep_alive" keys. If
+                     specified, the request is sent via pooled session of
+                     the worker process instead of a new connection
         :param kwargs: Optional additional request parameters
         :raises ValueError: if return http status code
                             not equal to expected status code
         """
 
-        resp = requests.request(method, url, **kwargs)
+        if pool is None:
+            resp = requests.request(method, url, **kwargs)
+        else:
+            resp = self._send_pooled_request(url, method, pool, **kwargs)
         if status_code != resp.status_code:
             error_msg = _("Expected HTTP request code is `%s` actual `%s`")
             raise ValueError(
                 error_msg % (status_code, resp.status_code))
+
+    def _send_pooled_request(self, url, method, pool, **kwargs):
+        """Send request via pooled session and read the whole response.
+
+        Sending the request and reading the response body are measured as
+        separate atomic actions. If the pool has no idle connection, the
+        time of establishing a new one is measured as a nested
+        "requests.connect" action of the sending.
+        """
+        session = get_session(**pool)
+        stream = kwargs.pop("stream", False)
+        with atomic.ActionTimer(self, "requests.send_request"):
+            _local.scenario = self
+            try:
+                resp = session.request(method, url, stream=True, **kwargs)
+            finally:
+                _local.scenario = None
+        if not stream:
+            with atomic.ActionTimer(self, "requests.read_response"):
+                # NOTE: reading the content releases the connection back
+                #   to the pool, so the next iteration can reuse it.
+                resp.content
+        return resp
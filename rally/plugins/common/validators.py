@@ -28,9 +28,25 @@ LOG = logging.getLogger(__name__)
 class JsonSchemaValidator(validation.Validator):
     """JSON schema validator"""
 
+    # NOTE: compiled validators of CONFIG_SCHEMA by plugin classes. Checking
+    #       of a schema itself is much slower than validation of a config,
+    #       so it is done only once per plugin class.
+    _schema_validators = {}
+
+    @classmethod
+    def _get_schema_validator(cls, plugin_cls):
+        schema = plugin_cls.CONFIG_SCHEMA
+        cached = cls._schema_validators.get(plugin_cls)
+        if cached is None or cached[0] is not schema:
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validator_cls.check_schema(schema)
+            cached = (schema, validator_cls(schema))
+            cls._schema_validators[plugin_cls] = cached
+        return cached[1]
+
     def validate(self, credentials, config, plugin_cls, plugin_cfg):
         try:
-            jsonschema.validate(plugin_cfg, plugin_cls.CONFIG_SCHEMA)
+            self._get_schema_validator(plugin_cls).validate(plugin_cfg)
         except jsonschema.ValidationError as err:
             return self.fail(str(err))
 
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import multiprocessing
 import os
 import re
 import shutil
@@ -20,6 +21,7 @@ import subprocess
 from rally.common.i18n import _LE
 from rally.common.io import subunit_v2
 from rally.common import logging
+from rally.common import objects
 from rally.common import utils as common_utils
 from rally import exceptions
 from rally.verification import context
@@ -31,6 +33,10 @@ LOG = logging.getLogger(__name__)
 
 TEST_NAME_RE = re.compile(r"^[a-zA-Z_.0-9]+(\[[a-zA-Z-_,=0-9]*\])?$")
 
+# The number of finished tests which are saved to the database at once while
+# tests are running.
+TESTS_BATCH_SIZE = 50
+
 
 @context.configure("testr", order=999)
 class TestrContext(context.VerifierContext):
@@ -59,6 +65,12 @@ class TestrContext(context.VerifierContext):
             if not load_list:
                 load_list = self.verifier.manager.list_tests()
             load_list = set(load_list) - set(skip_list)
+        if concurrency != 1:
+            # NOTE: the set of tests is not known in advance if it is
+            #       filtered by testr itself
+            known = not (run_args.get("failed") or run_args.get("pattern"))
+            self._balance_workers(concurrency or multiprocessing.cpu_count(),
+                                  load_list if known else None)
         if load_list:
             load_list_file = common_utils.generate_random_path()
             with open(load_list_file, "w") as f:
@@ -72,6 +84,55 @@ class TestrContext(context.VerifierContext):
         if run_args.get("pattern"):
             self.context["testr_cmd"].append(run_args.get("pattern"))
 
+    def _get_tests_durations(self):
+        """Collect durations of tests from previous verifications.
+
+        Only verifications of the same verifier and deployment are taken
+        into account. If a test was launched several times, the duration
+        from the latest verification is used.
+        """
+        durations = {}
+        verifications = objects.Verification.list(
+            verifier_id=self.verifier.uuid,
+            deployment_id=self.verifier.deployment["uuid"])
+        for verification in verifications:
+            for test_id, test in (verification.tests or {}).items():
+                if test.get("status") != "skip" and test.get("duration"):
+                    durations[test_id] = float(test["duration"])
+        return durations
+
+    def _balance_workers(self, workers, load_list=None):
+        """Let testr balance workers by durations of previous runs.
+
+        testr splits tests between workers by durations stored in its
+        repository and gives tests without stored durations to workers in
+        round-robin manner. Durations from previous verifications are added
+        to the repository, so tests are balanced even if testr does not
+        know them (e.g. after reinstallation of the verifier).
+
+        testr gives the longest tests to the least loaded workers first, so
+        the run is expected to take the total duration of tests divided by
+        the number of workers, but not less than the longest test.
+
+        :param workers: number of testr workers
+        :param load_list: tests which are going to be launched. The duration
+            of the run is predicted only if they are known
+        """
+        durations = self._get_tests_durations()
+        if not durations:
+            return
+        self.verifier.manager.seed_tests_durations(durations)
+
+        if not load_list:
+            return
+        durations = [durations[t] for t in load_list if t in durations]
+        if not durations:
+            return
+        predicted = max(sum(durations) / workers, max(durations))
+        LOG.debug("Tests are expected to take %.3f seconds on %d workers."
+                  % (predicted, workers))
+        self.context["predicted_tests_duration"] = predicted
+
     def cleanup(self):
         for f in self._tmp_files:
             if os.path.exists(f):
@@ -105,6 +166,31 @@ class TestrLauncher(manager.VerifierManager):
         super(TestrLauncher, self).install()
         self._init_testr()
 
+    def seed_tests_durations(self, durations):
+        """Add durations of tests unknown to the testr repository.
+
+        Durations stored by testr itself are kept untouched.
+
+        :param durations: dict with test ids as keys and durations as values
+        """
+        try:
+            import anydbm as dbm
+        except ImportError:
+            import dbm
+
+        times_db = os.path.join(self.repo_dir, ".testrepository", "times.dbm")
+        try:
+            db = dbm.open(times_db, "c")
+            try:
+                for test_id, duration in durations.items():
+                    if test_id not in db:
+                        db[test_id] = str(duration)
+            finally:
+                db.close()
+        except Exception as e:
+            LOG.debug("Failed to add tests durations to the testr "
+                      "repository: %s" % e)
+
     def list_tests(self, pattern=""):
         """List all tests."""
         output = utils.check_output(["testr", "list-tests", pattern],
@@ -123,11 +209,32 @@ class TestrLauncher(manager.VerifierManager):
                                   stderr=subprocess.STDOUT)
         xfail_list = run_args.get("xfail_list")
         skip_list = run_args.get("skip_list")
-        results = subunit_v2.parse(stream.stdout, live=True,
-                                   expected_failures=xfail_list,
-                                   skipped_tests=skip_list,
-                                   logger_name=self.verifier.name)
-        stream.wait()
+
+        verification = context.get("verification")
+        finished_tests = {}
+
+        def on_test_finished(test_id, test):
+            # NOTE: results are saved by batches to not hit the database
+            #       after each test
+            finished_tests[test_id] = test
+            if len(finished_tests) >= TESTS_BATCH_SIZE:
+                verification.add_tests(finished_tests)
+                finished_tests.clear()
+
+        with common_utils.Timer() as timer:
+            results = subunit_v2.parse(
+                stream.stdout, live=True, expected_failures=xfail_list,
+                skipped_tests=skip_list, logger_name=self.verifier.name,
+                on_test_finished=on_test_finished if verification else None)
+            stream.wait()
+        if finished_tests:
+            verification.add_tests(finished_tests)
+
+        predicted = context.get("predicted_tests_duration")
+        if predicted is not None:
+            LOG.info("Tests took %.3f seconds (%.3f seconds were predicted "
+                     "by durations of previous verifications).",
+                     timer.duration(), predicted)
 
         return results
 
@@ -19,5 +19,8 @@ OPTS = {"cleanup": [
     cfg.IntOpt("resource_deletion_timeout", default=600,
                help="A timeout in seconds for deleting resources"),
     cfg.IntOpt("cleanup_threads", default=20,
-               help="Number of cleanup threads to run")
+               help="Number of cleanup threads to run"),
+    cfg.IntOpt("max_api_calls_per_service", default=0,
+               help="Maximum number of concurrent API calls to a single "
+                    "service, made by all cleanup threads. 0 means no limit")
 ]}
@@ -46,7 +46,8 @@ class NoName(object):
 def resource(service, resource, order=0, admin_required=False,
              perform_for_admin_only=False, tenant_resource=False,
              max_attempts=3, timeout=CONF.cleanup.resource_deletion_timeout,
-             interval=1, threads=CONF.cleanup.cleanup_threads):
+             interval=1, threads=CONF.cleanup.cleanup_threads,
+             independent=False, batch_deletion_check=False):
     """Decorator that overrides resource specification.
 
     Just put it on top of your resource class and specify arguments that you
@@ -57,7 +58,8 @@ def resource(service, resource, order=0, admin_required=False,
     :param resource: Client manager name for resource. E.g. in case of
                      nova.servers you should write here "servers"
     :param order: Used to adjust priority of cleanup for different resource
-                  types
+                  types. Resources with the same order are cleaned up
+                  concurrently
     :param admin_required: Admin user is required
     :param perform_for_admin_only: Perform cleanup for admin user only
     :param tenant_resource: Perform deletion only 1 time per tenant
@@ -66,6 +68,13 @@ def resource(service, resource, order=0, admin_required=False,
     :param interval: Resource status pooling interval
     :param threads: Amount of threads (workers) that are deleting resources
                     simultaneously
+    :param independent: Resources do not depend on any other resources, so
+                        they can be deleted concurrently with all the others
+                        regardless of the order
+    :param batch_deletion_check: Check deletion of resources with a single
+                                 list() call per tenant instead of calling
+                                 is_deleted() for each resource. list() should
+                                 return all existing resources of the tenant
     """
 
     def inner(cls):
@@ -80,6 +89,8 @@ def resource(service, resource, order=0, admin_required=False,
         cls._interval = interval
         cls._threads = threads
         cls._tenant_resource = tenant_resource
+        cls._independent = independent
+        cls._batch_deletion_check = batch_deletion_check
 
         return cls
 
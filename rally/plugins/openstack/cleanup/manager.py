@@ -13,24 +13,33 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import functools
+import itertools
+import threading
 import time
 
+from oslo_config import cfg
+
 from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common.plugin import discover
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
+from rally import exceptions
 from rally.plugins.openstack.cleanup import base
+from rally.task import utils as task_utils
 
 
 LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
 
 
 class SeekAndDestroy(object):
 
     def __init__(self, manager_cls, admin, users, api_versions=None,
-                 resource_classes=None, task_id=None):
+                 resource_classes=None, task_id=None, api_semaphore=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -43,6 +52,8 @@ class SeekAndDestroy(object):
         :param resource_classes: Resource classes to match resource names
                                  against
         :param task_id: The UUID of task to match resource names against
+        :param api_semaphore: Optional semaphore that limits number of
+                              concurrent API calls to the service
         """
         self.manager_cls = manager_cls
         self.admin = admin
@@ -51,6 +62,15 @@ class SeekAndDestroy(object):
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.task_id = task_id
+        self.api_semaphore = api_semaphore
+        self._listers = {}
+
+    def _call_api(self, func, *args):
+        """Call func, respecting the limit of concurrent API calls."""
+        if self.api_semaphore is None:
+            return func(*args)
+        with self.api_semaphore:
+            return func(*args)
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -83,7 +103,8 @@ class SeekAndDestroy(object):
             msg_kw)
 
         try:
-            rutils.retry(resource._max_attempts, resource.delete)
+            self._call_api(rutils.retry, resource._max_attempts,
+                           resource.delete)
         except Exception as e:
             msg_kw["reason"] = e
             LOG.warning(
@@ -93,32 +114,66 @@ class SeekAndDestroy(object):
             if logging.is_debug():
                 LOG.exception(e)
         else:
-            started = time.time()
-            failures_count = 0
-            while time.time() - started < resource._timeout:
-                try:
-                    if resource.is_deleted():
-                        return
-                except Exception as e:
-                    LOG.warning(
-                        _("Seems like %s.%s.is_deleted(self) method is broken "
-                          "It shouldn't raise any exceptions.")
-                        % (resource.__module__, type(resource).__name__))
-                    LOG.exception(e)
-
-                    # NOTE(boris-42): Avoid LOG spamming in case of bad
-                    #                 is_deleted() method
-                    failures_count += 1
-                    if failures_count > resource._max_attempts:
-                        break
-
-                finally:
-                    rutils.interruptable_sleep(resource._interval)
+            if resource._batch_deletion_check:
+                if self._wait_for_deletion(resource):
+                    return
+            else:
+                started = time.time()
+                failures_count = 0
+                while time.time() - started < resource._timeout:
+                    try:
+                        if self._call_api(resource.is_deleted):
+                            return
+                    except Exception as e:
+                        LOG.warning(
+                            _("Seems like %s.%s.is_deleted(self) method is "
+                              "broken It shouldn't raise any exceptions.")
+                            % (resource.__module__, type(resource).__name__))
+                        LOG.exception(e)
+
+                        # NOTE(boris-42): Avoid LOG spamming in case of bad
+                        #                 is_deleted() method
+                        failures_count += 1
+                        if failures_count > resource._max_attempts:
+                            break
+
+                    finally:
+                        rutils.interruptable_sleep(resource._interval)
 
             LOG.warning(_("Resource deletion failed, timeout occurred for "
                           "%(service)s.%(resource)s: %(uuid)s.")
                         % msg_kw)
 
+    def _get_lister(self, resource):
+        """Returns a shared function that lists resources of the tenant."""
+        if resource.tenant_uuid not in self._listers:
+            lister = self.manager_cls(admin=resource.admin,
+                                      user=resource.user,
+                                      tenant_uuid=resource.tenant_uuid)
+            self._listers.setdefault(
+                resource.tenant_uuid,
+                functools.partial(self._call_api, lister.list))
+        return self._listers[resource.tenant_uuid]
+
+    def _wait_for_deletion(self, resource):
+        """Wait for deletion of resource with the shared status watcher.
+
+        Deletion of all the resources of the tenant is checked with a single
+        list() call.
+
+        :returns: True if the resource is deleted, otherwise False
+        """
+        try:
+            task_utils.get_status_watcher().watch(
+                resource.raw_resource, self._get_lister(resource),
+                ready_statuses=["DELETED", "DELETE_COMPLETE"],
+                check_deletion=True,
+                timeout=resource._timeout,
+                check_interval=resource._interval).result()
+        except exceptions.TimeoutException:
+            return False
+        return True
+
     def _publisher(self, queue):
         """Publisher for deletion jobs.
 
@@ -133,7 +188,8 @@ class SeekAndDestroy(object):
         """
         def _publish(admin, user, manager):
             try:
-                for raw_resource in rutils.retry(3, manager.list):
+                for raw_resource in self._call_api(rutils.retry, 3,
+                                                   manager.list):
                     queue.append((admin, user, raw_resource))
             except Exception as e:
                 LOG.warning(
@@ -183,7 +239,7 @@ class SeekAndDestroy(object):
         """Delete all resources for passed users, admin and resource_mgr."""
 
         broker.run(self._publisher, self._consumer,
-                   consumers_count=self.manager_cls._threads)
+                   consumers_count=self.manager_cls._threads, pipeline=True)
 
 
 def list_resource_names(admin_required=None):
@@ -243,6 +299,41 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+class _CleanupThreads(object):
+    """Run cleanup of several resource managers concurrently."""
+
+    def __init__(self, managers, cleanup_func):
+        self._errors = []
+        self._threads = [
+            threading.Thread(target=self._run, args=(cleanup_func, manager))
+            for manager in managers]
+
+    def _run(self, cleanup_func, manager):
+        try:
+            cleanup_func(manager)
+        except Exception as e:
+            LOG.exception(
+                _("Cleanup of %(service)s.%(resource)s failed: %(e)s")
+                % {"service": manager._service,
+                   "resource": manager._resource, "e": e})
+            self._errors.append(e)
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def join(self, reraise=True):
+        """Wait for all threads and re-raise the first error if any.
+
+        :param reraise: If False, errors are only logged (e.g. the caller is
+                        already handling another error)
+        """
+        for thread in self._threads:
+            thread.join()
+        if self._errors and reraise:
+            raise self._errors[0]
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None,
             api_versions=None, superclass=plugin.Plugin, task_id=None):
     """Generic cleaner.
@@ -273,17 +364,64 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
                        ``rally.task.scenario.Scenario`` to cleanup all
                        Scenario resources.
     :param task_id: The UUID of task
+    :returns: OrderedDict with durations of cleanup in seconds, where keys
+              are "<service>.<resource>" names of resource managers
     """
     resource_classes = [cls for cls in discover.itersubclasses(superclass)
                         if issubclass(cls, rutils.RandomNameGeneratorMixin)]
     if not resource_classes and issubclass(superclass,
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
-    for manager in find_resource_managers(names, admin_required):
+
+    resource_managers = find_resource_managers(names, admin_required)
+
+    api_semaphores = {}
+    if CONF.cleanup.max_api_calls_per_service > 0:
+        for manager in resource_managers:
+            if manager._service not in api_semaphores:
+                api_semaphores[manager._service] = threading.BoundedSemaphore(
+                    CONF.cleanup.max_api_calls_per_service)
+
+    durations = {}
+
+    def _cleanup(manager):
+        name = "%s.%s" % (manager._service, manager._resource)
         LOG.debug("Cleaning up %(service)s %(resource)s objects" %
                   {"service": manager._service,
                    "resource": manager._resource})
+        started_at = time.time()
         SeekAndDestroy(manager, admin, users,
                        api_versions=api_versions,
                        resource_classes=resource_classes,
-                       task_id=task_id).exterminate()
+                       task_id=task_id,
+                       api_semaphore=api_semaphores.get(
+                           manager._service)).exterminate()
+        durations[name] = time.time() - started_at
+        LOG.info(_("Cleanup of %(name)s objects took %(duration).3f sec")
+                 % {"name": name, "duration": durations[name]})
+
+    # NOTE: independent managers are processed concurrently with all the
+    #       others. The rest are processed in order, managers with the same
+    #       order are processed concurrently
+    independent = _CleanupThreads(
+        [m for m in resource_managers if m._independent], _cleanup)
+    independent.start()
+    try:
+        for order, managers in itertools.groupby(
+                [m for m in resource_managers if not m._independent],
+                key=lambda m: m._order):
+            managers = list(managers)
+            if len(managers) == 1:
+                _cleanup(managers[0])
+            else:
+                group = _CleanupThreads(managers, _cleanup)
+                group.start()
+                group.join()
+    except Exception:
+        independent.join(reraise=False)
+        raise
+    independent.join()
+
+    names = ["%s.%s" % (m._service, m._resource) for m in resource_managers]
+    return collections.OrderedDict(
+        (name, durations[name]) for name in names if name in durations)
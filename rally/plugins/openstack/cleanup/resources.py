@@ -149,7 +149,7 @@ _nova_order = get_order(200)
 
 
 @base.resource("nova", "servers", order=next(_nova_order),
-               tenant_resource=True)
+               tenant_resource=True, batch_deletion_check=True)
 class NovaServer(base.ResourceManager):
     def list(self):
         """List all servers."""
@@ -488,7 +488,7 @@ _cinder_order = get_order(400)
 
 
 @base.resource("cinder", "backups", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, batch_deletion_check=True)
 class CinderVolumeBackup(base.ResourceManager):
     pass
 
@@ -500,7 +500,7 @@ class CinderVolumeType(base.ResourceManager):
 
 
 @base.resource("cinder", "volume_snapshots", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, batch_deletion_check=True)
 class CinderVolumeSnapshot(base.ResourceManager):
     pass
 
@@ -512,7 +512,7 @@ class CinderVolumeTransfer(base.ResourceManager):
 
 
 @base.resource("cinder", "volumes", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, batch_deletion_check=True)
 class CinderVolume(base.ResourceManager):
     pass
 
@@ -663,7 +663,8 @@ class SaharaNodeGroup(SynchronizedDeletion, base.ResourceManager):
 
 # CEILOMETER
 
-@base.resource("ceilometer", "alarms", order=700, tenant_resource=True)
+@base.resource("ceilometer", "alarms", order=700, tenant_resource=True,
+               independent=True)
 class CeilometerAlarms(SynchronizedDeletion, base.ResourceManager):
 
     def id(self):
@@ -680,7 +681,7 @@ class CeilometerAlarms(SynchronizedDeletion, base.ResourceManager):
 
 # ZAQAR
 
-@base.resource("zaqar", "queues", order=800)
+@base.resource("zaqar", "queues", order=800, independent=True)
 class ZaqarQueues(SynchronizedDeletion, base.ResourceManager):
 
     def list(self):
@@ -14,7 +14,6 @@
 
 from rally.common.i18n import _
 from rally.common import logging
-from rally.common import utils as rutils
 from rally import consts
 from rally import osclients
 from rally.plugins.openstack.cleanup import manager as resource_manager
@@ -64,19 +63,29 @@ class VolumeGenerator(context.Context):
         volume_type = self.config.get("type", None)
         volumes_per_tenant = self.config["volumes_per_tenant"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        def setup_tenant(cache, user, tenant_id):
             self.context["tenants"][tenant_id].setdefault("volumes", [])
             clients = osclients.Clients(
                 user["credential"],
                 api_info=self.context["config"].get("api_versions"))
             cinder_service = block.BlockStorage(
                 clients, name_generator=self.generate_random_name)
+            volumes = []
             for i in range(volumes_per_tenant):
                 vol = cinder_service.create_volume(size,
                                                    volume_type=volume_type)
+                volumes.append(vol)
                 self.context["tenants"][tenant_id]["volumes"].append(
                     vol._asdict())
+            return cinder_service, volumes
+
+        def rollback_tenant(user, tenant_id, result):
+            cinder_service, volumes = result
+            self.context["tenants"][tenant_id].pop("volumes", None)
+            for vol in volumes:
+                cinder_service.delete_volume(vol)
+
+        self._setup_per_tenant(setup_tenant, rollback_tenant)
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Volumes`"))
     def cleanup(self):
@@ -29,13 +29,14 @@ LOG = logging.getLogger(__name__)
 
 @validation.add(name="check_cleanup_resources", admin_required=True)
 # NOTE(amaretskiy): Set order to run this just before UserCleanup
-@context.configure(name="admin_cleanup", order=(sys.maxsize - 1), hidden=True)
+@context.configure(name="admin_cleanup", order=(sys.maxsize - 1), hidden=True,
+                   per_workload=True)
 class AdminCleanup(base.CleanupMixin, context.Context):
     """Context class for admin resources cleanup."""
 
     @logging.log_task_wrapper(LOG.info, _("admin resources cleanup"))
     def cleanup(self):
-        manager.cleanup(
+        durations = manager.cleanup(
             names=self.config,
             admin_required=True,
             admin=self.context["admin"],
@@ -43,3 +44,4 @@ class AdminCleanup(base.CleanupMixin, context.Context):
             api_versions=self.context["config"].get("api_versions"),
             superclass=scenario.OpenStackScenario,
             task_id=self.get_owner_id())
+        self.context.setdefault("cleanup_durations", {}).update(durations)
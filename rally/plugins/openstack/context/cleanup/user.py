@@ -29,13 +29,14 @@ LOG = logging.getLogger(__name__)
 
 @validation.add(name="check_cleanup_resources", admin_required=False)
 # NOTE(amaretskiy): Set maximum order to run this last
-@context.configure(name="cleanup", order=sys.maxsize, hidden=True)
+@context.configure(name="cleanup", order=sys.maxsize, hidden=True,
+                   per_workload=True)
 class UserCleanup(base.CleanupMixin, context.Context):
     """Context class for user resources cleanup."""
 
     @logging.log_task_wrapper(LOG.info, _("user resources cleanup"))
     def cleanup(self):
-        manager.cleanup(
+        durations = manager.cleanup(
             names=self.config,
             admin_required=False,
             users=self.context.get("users", []),
@@ -43,3 +44,4 @@ class UserCleanup(base.CleanupMixin, context.Context):
             superclass=scenario.OpenStackScenario,
             task_id=self.get_owner_id()
         )
+        self.context.setdefault("cleanup_durations", {}).update(durations)
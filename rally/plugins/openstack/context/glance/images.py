@@ -168,8 +168,7 @@ class ImageGenerator(context.Context):
         if "image_name" in self.config and images_per_tenant == 1:
             image_name = self.config["image_name"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        def setup_tenant(cache, user, tenant_id):
             current_images = []
             clients = osclients.Clients(
                 user["credential"],
@@ -189,6 +188,14 @@ class ImageGenerator(context.Context):
                 current_images.append(image_obj.id)
 
             self.context["tenants"][tenant_id]["images"] = current_images
+            return image_service
+
+        def rollback_tenant(user, tenant_id, image_service):
+            for image_id in self.context["tenants"][tenant_id].pop("images",
+                                                                   []):
+                image_service.delete_image(image_id)
+
+        self._setup_per_tenant(setup_tenant, rollback_tenant)
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Images`"))
     def cleanup(self):
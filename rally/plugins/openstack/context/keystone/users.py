@@ -261,6 +261,10 @@ class UserGenerator(context.Context):
         self.context["users"] = self._create_users()
         for user in self.context["users"]:
             self.context["tenants"][user["tenant_id"]]["users"].append(user)
+        # NOTE: the order of tenants for round-robin choice of users is
+        #   calculated once instead of sorting tenants for each iteration.
+        self.context["sorted_tenant_ids"] = tuple(
+            sorted(self.context["tenants"]))
 
         if len(self.context["users"]) < users_num:
             raise exceptions.ContextSetupFailure(
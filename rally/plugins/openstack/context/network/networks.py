@@ -15,7 +15,6 @@
 
 from rally.common.i18n import _
 from rally.common import logging
-from rally.common import utils
 from rally.common import validation
 from rally import consts
 from rally import osclients
@@ -79,14 +78,18 @@ class Network(context.Context):
         #               multithreading/multiprocessing, it is likely the
         #               sockets are left open. This problem is eliminated by
         #               creating a connection in setup and cleanup separately.
-        net_wrapper = network_wrapper.wrap(
-            osclients.Clients(self.context["admin"]["credential"]),
-            self, config=self.config)
         kwargs = {}
         if self.config["dns_nameservers"] is not None:
             kwargs["dns_nameservers"] = self.config["dns_nameservers"]
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
+
+        def setup_tenant(cache, user, tenant_id):
+            # NOTE: tenants are set up concurrently, so each worker has its
+            #       own connection
+            if "net_wrapper" not in cache:
+                cache["net_wrapper"] = network_wrapper.wrap(
+                    osclients.Clients(self.context["admin"]["credential"]),
+                    self, config=self.config)
+            net_wrapper = cache["net_wrapper"]
             self.context["tenants"][tenant_id]["networks"] = []
             for i in range(self.config["networks_per_tenant"]):
                 # NOTE(amaretskiy): add_router and subnets_num take effect
@@ -99,6 +102,14 @@ class Network(context.Context):
                     network_create_args=network_create_args,
                     **kwargs)
                 self.context["tenants"][tenant_id]["networks"].append(network)
+            return net_wrapper
+
+        def rollback_tenant(user, tenant_id, net_wrapper):
+            for network in self.context["tenants"][tenant_id].pop(
+                    "networks", []):
+                net_wrapper.delete_network(network)
+
+        self._setup_per_tenant(setup_tenant, rollback_tenant)
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `network`"))
     def cleanup(self):
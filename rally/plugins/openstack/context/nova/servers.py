@@ -102,15 +102,18 @@ class ServerGenerator(context.Context):
         flavor_id = types.Flavor.transform(clients=clients,
                                            resource_config=flavor)
 
-        for iter_, (user, tenant_id) in enumerate(rutils.iterate_per_tenants(
-                self.context["users"])):
+        tenant_iterations = dict(
+            (tenant_id, iter_) for iter_, (user, tenant_id) in enumerate(
+                rutils.iterate_per_tenants(self.context["users"])))
+
+        def setup_tenant(cache, user, tenant_id):
             LOG.debug("Booting servers for user tenant %s "
                       % (user["tenant_id"]))
             tmp_context = {"user": user,
                            "tenant": self.context["tenants"][tenant_id],
                            "task": self.context["task"],
                            "owner_id": self.context["owner_id"],
-                           "iteration": iter_}
+                           "iteration": tenant_iterations[tenant_id]}
             nova_scenario = nova_utils.NovaScenario(tmp_context)
 
             LOG.debug("Calling _boot_servers with image_id=%(image_id)s "
@@ -132,6 +135,14 @@ class ServerGenerator(context.Context):
 
             self.context["tenants"][tenant_id][
                 "servers"] = current_servers
+            return nova_scenario, servers
+
+        def rollback_tenant(user, tenant_id, result):
+            nova_scenario, servers = result
+            self.context["tenants"][tenant_id].pop("servers", None)
+            nova_scenario._delete_servers(servers)
+
+        self._setup_per_tenant(setup_tenant, rollback_tenant)
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Servers`"))
     def cleanup(self):
@@ -0,0 +1,42 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common.i18n import _
+from rally.common import logging
+from rally.common import sshutils
+from rally.task import context
+
+
+LOG = logging.getLogger(__name__)
+
+
+@context.configure(name="ssh_pool", order=330, hidden=True,
+                   per_workload=True)
+class SSHPool(context.Context):
+    """Closes pooled ssh connections of VM scenarios of the workload.
+
+    Servers of the workload are deleted with its contexts and their
+    addresses can be given to new servers, so pooled ssh connections must
+    not outlive the workload. Pools of worker processes of runners are
+    closed by these processes on exit, this context closes the pool of
+    scenarios run in the main process.
+    """
+
+    def setup(self):
+        pass
+
+    @logging.log_task_wrapper(LOG.info, _("Exit context: `ssh_pool`"))
+    def cleanup(self):
+        sshutils.close_pool(self.get_owner_id())
@@ -71,17 +71,22 @@ class OpenStackScenario(scenario.Scenario):
             tenant = context["tenants"][user["tenant_id"]]
         else:
             # Second and last case - 'round_robin'.
-            tenants_amount = len(context["tenants"])
+            tenant_ids = context.get("sorted_tenant_ids")
+            if tenant_ids is None:
+                tenant_ids = sorted(context["tenants"].keys())
+            tenants_amount = len(tenant_ids)
             # NOTE(amaretskiy): iteration is subtracted by `1' because it
             #                   starts from `1' but we count from `0'
             iteration = context["iteration"] - 1
             tenant_index = int(iteration % tenants_amount)
-            tenant_id = sorted(context["tenants"].keys())[tenant_index]
+            tenant_id = tenant_ids[tenant_index]
             tenant = context["tenants"][tenant_id]
             users = context["tenants"][tenant_id]["users"]
             user_index = int((iteration / tenants_amount) % len(users))
             user = users[user_index]
 
+        # NOTE: users and tenants are shared by all iterations and locked
+        #       for changes by the runner, so they are handed out as is
         context["user"], context["tenant"] = user, tenant
 
     def clients(self, client_type, version=None):
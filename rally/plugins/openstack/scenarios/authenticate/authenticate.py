@@ -28,6 +28,10 @@ class Keystone(scenario.OpenStackScenario):
     @atomic.action_timer("authenticate.keystone")
     def run(self):
         """Check Keystone Client."""
+        # NOTE: Keystone sessions are shared by all clients of the process,
+        #   so a new session is used to measure a real authentication
+        sess, plugin = self._clients.keystone.get_session(shared=False)
+        plugin.get_access(sess)
         self.clients("keystone")
 
 
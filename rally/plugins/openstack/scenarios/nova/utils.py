@@ -84,7 +84,9 @@ class NovaScenario(scenario.OpenStackScenario):
         server = utils.wait_for_status(
             server,
             ready_statuses=["ACTIVE"],
-            update_resource=utils.get_from_manager(),
+            failure_statuses=["ERROR"],
+            list_resources=self._list_servers_for_status,
+            group_key=self._servers_status_group(),
             timeout=CONF.benchmark.nova_server_boot_timeout,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval
         )
@@ -368,8 +370,10 @@ class NovaScenario(scenario.OpenStackScenario):
             utils.wait_for_status(
                 server,
                 ready_statuses=["deleted"],
+                failure_statuses=["ERROR"],
                 check_deletion=True,
-                update_resource=utils.get_from_manager(),
+                list_resources=self._list_servers_for_status,
+                group_key=self._servers_status_group(),
                 timeout=CONF.benchmark.nova_server_delete_timeout,
                 check_interval=CONF.benchmark.nova_server_delete_poll_interval
             )
@@ -388,16 +392,33 @@ class NovaScenario(scenario.OpenStackScenario):
                 else:
                     server.delete()
 
-            for server in servers:
-                utils.wait_for_status(
-                    server,
-                    ready_statuses=["deleted"],
-                    check_deletion=True,
-                    update_resource=utils.get_from_manager(),
-                    timeout=CONF.benchmark.nova_server_delete_timeout,
-                    check_interval=CONF.
-                    benchmark.nova_server_delete_poll_interval
-                )
+            utils.wait_for_statuses(
+                servers,
+                ready_statuses=["deleted"],
+                list_resources=self._list_servers_for_status,
+                group_key=self._servers_status_group(),
+                check_deletion=True,
+                timeout=CONF.benchmark.nova_server_delete_timeout,
+                check_interval=CONF.benchmark.nova_server_delete_poll_interval
+            )
+
+    def _list_servers_for_status(self):
+        """List servers of the tenant to refresh their statuses at once."""
+        return self.clients("nova").servers.list()
+
+    def _servers_status_group(self):
+        """Key of the servers whose statuses are refreshed together.
+
+        Servers of the same tenant are awaited by all the iterations with a
+        single list call, whichever scenario instance has started waiting.
+
+        :returns: (tenant id, "nova.servers") or None if the tenant is
+                  unknown, so that servers are grouped per scenario instance
+        """
+        tenant_id = (self.context.get("tenant", {}).get("id")
+                     or self.context.get("user", {}).get("tenant_id"))
+        if tenant_id:
+            return tenant_id, "nova.servers"
 
     @atomic.action_timer("nova.create_server_group")
     def _create_server_group(self, **kwargs):
@@ -567,15 +588,15 @@ class NovaScenario(scenario.OpenStackScenario):
         servers = [s for s in self.clients("nova").servers.list()
                    if s.name.startswith(name_prefix)]
         self.sleep_between(CONF.benchmark.nova_server_boot_prepoll_delay)
-        servers = [utils.wait_for_status(
-            server,
+        return utils.wait_for_statuses(
+            servers,
             ready_statuses=["ACTIVE"],
-            update_resource=utils.
-            get_from_manager(),
+            list_resources=self._list_servers_for_status,
+            group_key=self._servers_status_group(),
+            failure_statuses=["ERROR"],
             timeout=CONF.benchmark.nova_server_boot_timeout,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval
-        ) for server in servers]
-        return servers
+        )
 
     @atomic.action_timer("nova.associate_floating_ip")
     def _associate_floating_ip(self, server, address, fixed_address=None):
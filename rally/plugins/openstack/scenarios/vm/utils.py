@@ -182,7 +182,14 @@ class VMScenario(nova_utils.NovaScenario):
                 network_wrapper.wrap(self.clients, self).delete_floating_ip(
                     fip["id"], wait=True)
 
+    def _get_ssh_pool(self):
+        """Return the pool of ssh connections shared by the workload."""
+        return sshutils.get_pool(self.context.get("owner_id"))
+
     def _delete_server_with_fip(self, server, fip, force_delete=False):
+        # NOTE: the address can be given to a new server later, so pooled
+        #   connections to the deleted one should not be reused.
+        self._get_ssh_pool().close(host=fip["ip"])
         if fip["is_floating"]:
             self._delete_floating_ip(server, fip)
         return self._delete_server(server, force=force_delete)
@@ -206,10 +213,10 @@ class VMScenario(nova_utils.NovaScenario):
                      pkey=None, timeout=120, interval=1):
         """Run command via SSH on server.
 
-        Create SSH connection for server, wait for server to become available
-        (there is a delay between server being set to ACTIVE and sshd being
-        available). Then call run_command_over_ssh to actually execute the
-        command.
+        Get SSH connection for server from the pool of the workload,
+        wait for server to become available (there is a delay between server
+        being set to ACTIVE and sshd being available). Then call
+        run_command_over_ssh to actually execute the command.
 
         :param server_ip: server ip address
         :param port: ssh port for SSH connection
@@ -226,6 +233,7 @@ class VMScenario(nova_utils.NovaScenario):
         """
         pkey = pkey if pkey else self.context["user"]["keypair"]["private"]
         ssh = sshutils.SSH(username, server_ip, port=port,
-                           pkey=pkey, password=password)
+                           pkey=pkey, password=password,
+                           pool=self._get_ssh_pool())
         self._wait_for_ssh(ssh, timeout, interval)
         return self._run_command_over_ssh(ssh, command)
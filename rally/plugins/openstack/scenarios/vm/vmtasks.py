@@ -16,6 +16,8 @@
 import json
 import pkgutil
 
+import six
+
 from rally.common import logging
 from rally.common import sshutils
 from rally import consts
@@ -49,7 +51,8 @@ LOG = logging.getLogger(__name__)
                 param_name="image", ctx_name="image_command_customizer")
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(context={"cleanup": ["nova", "cinder"],
-                             "keypair": {}, "allow_ssh": None},
+                             "keypair": {}, "allow_ssh": None,
+                             "ssh_pool": None},
                     name="VMTasks.boot_runcommand_delete")
 class BootRuncommandDelete(vm_utils.VMScenario, cinder_utils.CinderBasic):
 
@@ -206,7 +209,8 @@ class BootRuncommandDelete(vm_utils.VMScenario, cinder_utils.CinderBasic):
 
 
 @scenario.configure(context={"cleanup": ["nova", "heat"],
-                             "keypair": {}, "network": {}},
+                             "keypair": {}, "network": {},
+                             "ssh_pool": None},
                     name="VMTasks.runcommand_heat")
 class RuncommandHeat(vm_utils.VMScenario):
 
@@ -225,7 +229,8 @@ class RuncommandHeat(vm_utils.VMScenario):
 
          Given file will be uploaded to `gate_node` and started. This script
          should print `key` `value` pairs separated by colon. These pairs will
-         be presented in results.
+         be presented in results. `gate_node` output may also be a list of
+         addresses, then the workload is run on all of them concurrently.
 
          Gate node should be accessible via ssh with keypair `key_name`, so
          heat template should accept parameter `key_name`.
@@ -245,30 +250,44 @@ class RuncommandHeat(vm_utils.VMScenario):
         self.stack.create()
         for output in self.stack.stack.outputs:
             if output["output_key"] == "gate_node":
-                ip = output["output_value"]
+                ips = output["output_value"]
                 break
-        ssh = sshutils.SSH(workload["username"], ip, pkey=keypair["private"])
-        ssh.wait()
+        if isinstance(ips, six.string_types):
+            ips = [ips]
+        clients = []
+        for ip in ips:
+            ssh = sshutils.SSH(workload["username"], ip,
+                               pkey=keypair["private"],
+                               pool=self._get_ssh_pool())
+            ssh.wait()
+            clients.append(ssh)
         script = workload.get("resource")
         if script:
             script = pkgutil.get_data(*script)
         else:
             script = open(workload["file"]).read()
-        ssh.execute("cat > /tmp/.rally-workload", stdin=script)
-        ssh.execute("chmod +x /tmp/.rally-workload")
+        self._execute_many(clients, "cat > /tmp/.rally-workload",
+                           stdin=script)
+        self._execute_many(clients, "chmod +x /tmp/.rally-workload")
         with atomic.ActionTimer(self, "runcommand_heat.workload"):
-            status, out, err = ssh.execute(
-                "/tmp/.rally-workload",
+            results = self._execute_many(
+                clients, "/tmp/.rally-workload",
                 stdin=json.dumps(self.stack.stack.outputs))
         rows = []
-        for line in out.splitlines():
-            row = line.split(":")
-            if len(row) != 2:
-                raise exceptions.ScriptError("Invalid data '%s'" % line)
-            rows.append(row)
+        errors = []
+        for ip, (status, out, err) in zip(ips, results):
+            for line in out.splitlines():
+                row = line.split(":")
+                if len(row) != 2:
+                    raise exceptions.ScriptError("Invalid data '%s'" % line)
+                if len(ips) > 1:
+                    row[0] = "%s (%s)" % (row[0], ip)
+                rows.append(row)
+            if err:
+                errors.append(err)
         if not rows:
             raise exceptions.ScriptError("No data returned. Original error "
-                                         "message is %s" % err)
+                                         "message is %s" % "\n".join(errors))
         self.add_output(
             complete={"title": "Workload summary",
                       "description": "Data generated by workload",
@@ -278,6 +297,14 @@ class RuncommandHeat(vm_utils.VMScenario):
                           "rows": rows}}
         )
 
+    @staticmethod
+    def _execute_many(clients, cmd, stdin=None):
+        results = sshutils.execute_many(clients, cmd, stdin=stdin)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
 BASH_DD_LOAD_TEST = """
 #!/bin/sh
 # Load server and output JSON results ready to be processed
@@ -405,7 +432,8 @@ EOF
                                                consts.Service.CINDER])
 @validation.add("required_platform", platform="openstack", users=True)
 @scenario.configure(context={"cleanup": ["nova", "cinder"],
-                             "keypair": {}, "allow_ssh": None},
+                             "keypair": {}, "allow_ssh": None,
+                             "ssh_pool": None},
                     name="VMTasks.dd_load_test")
 class DDLoadTest(BootRuncommandDelete):
 
@@ -180,7 +180,10 @@ class KeystoneMixin(object):
         with atomic.ActionTimer(self, aname):
             clients = osclients.Clients(credential=cred,
                                         api_info=self._clients.api_info)
-            return clients.keystone.auth_ref.auth_token
+            # NOTE: the shared session of the user already has a token, so
+            #   a new session is used to measure a real authentication
+            sess, plugin = clients.keystone.get_session(shared=False)
+            return plugin.get_access(sess).auth_token
 
     def validate_token(self, token):
         """Validate user token.
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import os
 import re
 import six
@@ -32,6 +33,24 @@ LOG = logging.getLogger(__name__)
 ValidationResult = validation.ValidationResult
 
 
+def _make_key(name, credential, resource_config=None):
+    """Returns a key to cache a cloud lookup in the validation session."""
+    return (name, credential,
+            json.dumps(resource_config, sort_keys=True, default=str))
+
+
+def _get_image(clients, image_args):
+    image_id = openstack_types.GlanceImage.transform(
+        clients=clients, resource_config=image_args)
+    return clients.glance().images.get(image_id)
+
+
+def _get_flavor(clients, flavor_value):
+    flavor_id = openstack_types.Flavor.transform(
+        clients=clients, resource_config=flavor_value)
+    return clients.nova().flavors.get(flavor=flavor_id)
+
+
 @validation.add("required_platform", platform="openstack", users=True)
 @validation.configure(name="image_exists", namespace="openstack")
 class ImageExistsValidator(validation.Validator):
@@ -71,10 +90,9 @@ class ImageExistsValidator(validation.Validator):
                 return
         try:
             for user in credentials["openstack"]["users"]:
-                clients = user.get("credential", {}).clients()
-                image_id = openstack_types.GlanceImage.transform(
-                    clients=clients, resource_config=image_args)
-                clients.glance().images.get(image_id)
+                creds = user.get("credential", {})
+                self._cached(_make_key("image", creds, image_args),
+                             _get_image, creds.clients(), image_args)
         except (glance_exc.HTTPNotFound, exceptions.InvalidScenarioArgument):
             message = ("Image '%s' not found") % image_args
             return self.fail(message)
@@ -103,7 +121,9 @@ class ExternalNetworkExistsValidator(validation.Validator):
         for user in users:
             creds = user["credential"]
 
-            networks = creds.clients().neutron().list_networks()["networks"]
+            networks = self._cached(
+                _make_key("networks", creds),
+                lambda: creds.clients().neutron().list_networks()["networks"])
             external_networks = [net["name"] for net in networks if
                                  net.get("router:external", False)]
             if ext_network not in external_networks:
@@ -142,8 +162,10 @@ class RequiredNeutronExtensionsValidator(validation.Validator):
             self.req_ext.extend(args)
 
     def validate(self, config, credentials, plugin_cls, plugin_cfg):
-        clients = credentials["openstack"]["users"][0]["credential"].clients()
-        extensions = clients.neutron().list_extensions()["extensions"]
+        creds = credentials["openstack"]["users"][0]["credential"]
+        extensions = self._cached(
+            _make_key("neutron_extensions", creds),
+            lambda: creds.clients().neutron().list_extensions()["extensions"])
         aliases = [x["alias"] for x in extensions]
         for extension in self.req_ext:
             if extension not in aliases:
@@ -201,9 +223,9 @@ class ImageValidOnFlavorValidator(validation.Validator):
                 }
                 return (ValidationResult(True), image)
         try:
-            image_id = openstack_types.GlanceImage.transform(
-                clients=clients, resource_config=image_args)
-            image = clients.glance().images.get(image_id)
+            image = self._cached(
+                _make_key("image", clients.credential, image_args),
+                _get_image, clients, image_args)
             if hasattr(image, "to_dict"):
                 # NOTE(stpierre): Glance v1 images are objects that can be
                 # converted to dicts; Glance v2 images are already
@@ -238,9 +260,9 @@ class ImageValidOnFlavorValidator(validation.Validator):
             msg = "Parameter %s is not specified." % param_name
             return (ValidationResult(False, msg), None)
         try:
-            flavor_id = openstack_types.Flavor.transform(
-                clients=clients, resource_config=flavor_value)
-            flavor = clients.nova().flavors.get(flavor=flavor_id)
+            flavor = self._cached(
+                _make_key("flavor", clients.credential, flavor_value),
+                _get_flavor, clients, flavor_value)
             return (ValidationResult(True), flavor)
         except (nova_exc.NotFound, exceptions.InvalidScenarioArgument):
             try:
@@ -373,7 +395,9 @@ class RequiredServicesValidator(validation.Validator):
         creds = (credentials["openstack"].get("admin")
                  or credentials["openstack"]["users"][0]["credential"])
 
-        available_services = creds.clients().services().values()
+        available_services = self._cached(
+            _make_key("services", creds),
+            lambda: list(creds.clients().services().values()))
         if consts.Service.NOVA_NET in self.services:
             LOG.warning("We are sorry, but Nova-network was deprecated for "
                         "a long time and latest novaclient doesn't support "
@@ -462,8 +486,11 @@ class RequiredCinderServicesValidator(validation.Validator):
 
     def validate(self, config, credentials, plugin_cls, plugin_cfg):
 
-        clients = credentials["openstack"]["admin"].clients().cinder()
-        for service in clients.services.list():
+        creds = credentials["openstack"]["admin"]
+        services = self._cached(
+            _make_key("cinder_services", creds),
+            lambda: list(creds.clients().cinder().services.list()))
+        for service in services:
             if (service.binary == six.text_type(self.services)
                     and service.state == six.text_type("up")):
                 return
@@ -540,8 +567,10 @@ class VolumeTypeExistsValidator(validation.Validator):
         if volume_type:
             for user in credentials["openstack"]["users"]:
                 clients = user["credential"].clients()
-                vt_names = [vt.name for vt in
-                            clients.cinder().volume_types.list()]
+                vt_names = self._cached(
+                    _make_key("volume_types", user["credential"]),
+                    lambda: [vt.name for vt in
+                             clients.cinder().volume_types.list()])
                 volume_types_ctx = config.get(
                     "context", {}).get("volume_types", [])
                 if volume_type not in vt_names + volume_types_ctx:
@@ -14,9 +14,15 @@
 #    under the License.
 
 import abc
+import copy
+import itertools
+import threading
+import time
 
+from oslo_config import cfg
 import six
 
+from rally.common import broker
 from rally.common import logging
 from rally.common.plugin import plugin
 from rally.common import utils
@@ -26,8 +32,18 @@ from rally.task import functional
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
 
-def configure(name, order, namespace="default", hidden=False):
+CONTEXT_OPTS = [
+    cfg.IntOpt("context_setup_workers", default=20, min=1,
+               help="Number of concurrent workers that set up resources of "
+                    "contexts per tenant"),
+]
+CONF.register_opts(CONTEXT_OPTS)
+
+
+def configure(name, order, namespace="default", hidden=False,
+              per_workload=False):
     """Context class wrapper.
 
     Each context class has to be wrapped by configure() wrapper. It
@@ -40,11 +56,15 @@ def configure(name, order, namespace="default", hidden=False):
                   Contexts with smaller order are run first
     :param hidden: If it is true you won't be able to specify context via
                    task config
+    :param per_workload: If it is true the context is set up and cleaned up
+                         for each workload even when the other contexts are
+                         reused by consecutive workloads of a subtask
     """
     def wrapper(cls):
         cls = plugin.configure(name=name, namespace=namespace,
                                hidden=hidden)(cls)
         cls._meta_set("order", order)
+        cls._meta_set("per_workload", per_workload)
         return cls
 
     return wrapper
@@ -105,6 +125,10 @@ class BaseContext(plugin.Plugin, functional.FunctionalMixin,
     def get_order(cls):
         return cls._meta_get("order")
 
+    @classmethod
+    def is_per_workload(cls):
+        return cls._meta_get("per_workload", False)
+
     @abc.abstractmethod
     def setup(self):
         """Prepare environment for test.
@@ -149,55 +173,184 @@ class Context(BaseContext, validation.ValidatablePluginMixin):
             return self.context["owner_id"]
         return super(Context, self).get_owner_id()
 
+    def _setup_per_tenant(self, setup_tenant, rollback_tenant=None,
+                          workers=None):
+        """Set up resources for each tenant concurrently.
+
+        :param setup_tenant: Function that takes a cache dict of the worker,
+                             a user and an id of the tenant and sets up
+                             resources for the tenant
+        :param rollback_tenant: Function that takes a user, an id of the
+                                tenant and the result of setup_tenant() and
+                                removes resources of the tenant. If setup of
+                                some tenant fails, it is called for all the
+                                tenants which are set up successfully
+        :param workers: Number of concurrent workers, defaults to
+                        CONF.context_setup_workers
+        :raises Exception: The first exception raised by setup_tenant()
+        """
+        workers = workers or CONF.context_setup_workers
+        tenants = list(utils.iterate_per_tenants(
+            self.context.get("users", [])))
+        lock = threading.Lock()
+        results = []
+        errors = []
+        log_every = max(len(tenants) // 10, 1)
+
+        def publish(queue):
+            for user, tenant_id in tenants:
+                queue.append((user, tenant_id))
+
+        def consume(cache, args):
+            if errors:
+                # NOTE: do not create new resources if setup has failed
+                return
+            user, tenant_id = args
+            try:
+                result = setup_tenant(cache, user, tenant_id)
+            except Exception as e:
+                LOG.debug("Context %s: setup of tenant %s failed: %s"
+                          % (self.get_name(), tenant_id, e))
+                with lock:
+                    errors.append(e)
+                return
+            with lock:
+                results.append((user, tenant_id, result))
+                done = len(results)
+            if done % log_every == 0 or done == len(tenants):
+                LOG.info("Context %(name)s: %(done)d of %(total)d tenants "
+                         "are set up" % {"name": self.get_name(),
+                                         "done": done,
+                                         "total": len(tenants)})
+
+        broker.run(publish, consume, min(workers, len(tenants) or 1))
+
+        if errors:
+            if rollback_tenant:
+                LOG.info("Context %s: rolling back setup of %d tenants"
+                         % (self.get_name(), len(results)))
+
+                def publish_rollback(queue):
+                    queue.extend(results)
+
+                def consume_rollback(cache, args):
+                    with logging.ExceptionLogger(
+                            LOG, "Context %s: rollback of tenant %s failed"
+                                 % (self.get_name(), args[1])):
+                        rollback_tenant(*args)
+
+                broker.run(publish_rollback, consume_rollback,
+                           min(workers, len(results) or 1))
+            raise errors[0]
+
 
 class ContextManager(object):
-    """Create context environment and run method inside it."""
+    """Create context environment and run method inside it.
+
+    Contexts with the same order do not depend on each other, so they are
+    set up and cleaned up concurrently. Durations of setup and cleanup of
+    each context are stored to the "context_execution" key of the context
+    object.
+
+    :param context_obj: Context object
+    :param per_workload: If it is None, all contexts from the config are
+                         managed. Otherwise only contexts which are (True) or
+                         are not (False) configured as per workload ones
+    """
 
-    def __init__(self, context_obj):
+    def __init__(self, context_obj, per_workload=None):
         self._visited = []
         self.context_obj = context_obj
+        self.per_workload = per_workload
+
+    def _find_context(self, ctx_name):
+        # TODO(andreykurilin): move this logic to some "find" method
+        if "@" in ctx_name:
+            ctx_name, ctx_namespace = ctx_name.split("@", 1)
+            return Context.get(ctx_name, namespace=ctx_namespace,
+                               fallback_to_default=False, allow_hidden=True)
+
+        potential_result = Context.get_all(name=ctx_name, allow_hidden=True)
+        if len(potential_result) == 1:
+            return potential_result[0]
+        elif len(potential_result) > 1:
+            scen_namespace = self.context_obj["scenario_namespace"]
+            another_attempt = [c for c in potential_result
+                               if c.get_namespace() == scen_namespace]
+            if another_attempt:
+                return another_attempt[0]
+            another_attempt = [c for c in potential_result
+                               if c.get_namespace() == "default"]
+            if another_attempt:
+                return another_attempt[0]
+
+        raise exceptions.PluginNotFound(name=ctx_name, namespace="any of")
+
+    def _get_contexts(self):
+        """Returns a dict with context classes by names from the config."""
+        contexts = {}
+        for ctx_name in self.context_obj["config"].keys():
+            ctx_cls = self._find_context(ctx_name)
+            if (self.per_workload is None
+                    or ctx_cls.is_per_workload() == self.per_workload):
+                contexts[ctx_name] = ctx_cls
+        return contexts
 
     def _get_sorted_context_lst(self):
-        context_list = []
-        for ctx_name in self.context_obj["config"].keys():
-            # TODO(andreykurilin): move this logic to some "find" method
-            if "@" in ctx_name:
-                ctx_name, ctx_namespace = ctx_name.split("@", 1)
-                context_list.append(Context.get(ctx_name,
-                                                namespace=ctx_namespace,
-                                                fallback_to_default=False,
-                                                allow_hidden=True))
-            else:
-                potential_result = Context.get_all(name=ctx_name,
-                                                   allow_hidden=True)
-                if len(potential_result) == 1:
-                    context_list.append(potential_result[0])
-                    continue
-                elif len(potential_result) > 1:
-                    scen_namespace = self.context_obj["scenario_namespace"]
-                    another_attempt = [c for c in potential_result
-                                       if c.get_namespace() == scen_namespace]
-                    if another_attempt:
-                        context_list.append(another_attempt[0])
-                        continue
-                    another_attempt = [c for c in potential_result
-                                       if c.get_namespace() == "default"]
-                    if another_attempt:
-                        context_list.append(another_attempt[0])
-                        continue
-
-                raise exceptions.PluginNotFound(name=ctx_name,
-                                                namespace="any of")
-
-        return sorted([ctx(self.context_obj) for ctx in context_list])
+        return sorted([ctx(self.context_obj)
+                       for ctx in self._get_contexts().values()])
+
+    def get_config(self):
+        """Returns a copy of the config of managed contexts."""
+        config = self.context_obj["config"]
+        return dict((name, copy.deepcopy(config[name]))
+                    for name in self._get_contexts())
+
+    @staticmethod
+    def _group_by_order(ctxlst):
+        return [list(group) for order, group in itertools.groupby(
+            ctxlst, key=lambda ctx: ctx.get_order())]
+
+    def _run(self, ctxlst, method):
+        """Call the method of contexts concurrently and measure durations.
+
+        :param ctxlst: List of independent contexts
+        :param method: Name of the method to call, "setup" or "cleanup"
+        :returns: List of exceptions raised by the contexts
+        """
+        execution = self.context_obj.setdefault("context_execution", {})
+        errors = []
+
+        def run(ctx):
+            started_at = time.time()
+            try:
+                getattr(ctx, method)()
+            except Exception as e:
+                errors.append((ctx, e))
+            finally:
+                execution.setdefault(ctx.get_name(), {})[method] = (
+                    time.time() - started_at)
+
+        if len(ctxlst) == 1:
+            run(ctxlst[0])
+        else:
+            threads = [threading.Thread(target=run, args=(ctx,))
+                       for ctx in ctxlst]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return errors
 
     def setup(self):
         """Creates benchmark environment from config."""
 
         self._visited = []
-        for ctx in self._get_sorted_context_lst():
-            self._visited.append(ctx)
-            ctx.setup()
+        for group in self._group_by_order(self._get_sorted_context_lst()):
+            self._visited.extend(group)
+            errors = self._run(group, "setup")
+            if errors:
+                raise errors[0][1]
 
         return self.context_obj
 
@@ -205,10 +358,8 @@ class ContextManager(object):
         """Destroys benchmark environment."""
 
         ctxlst = self._visited or self._get_sorted_context_lst()
-        for ctx in ctxlst[::-1]:
-            try:
-                ctx.cleanup()
-            except Exception as e:
+        for group in self._group_by_order(ctxlst[::-1]):
+            for ctx, e in self._run(group, "cleanup"):
                 LOG.error("Context %s failed during cleanup." % ctx.get_name())
                 LOG.exception(e)
 
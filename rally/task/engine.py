@@ -23,16 +23,19 @@ import traceback
 import jsonschema
 from oslo_config import cfg
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import objects
 from rally.common import utils
+from rally.common import validation
 from rally import consts
 from rally import exceptions
 # TODO(andreykurilin): remove openstack specific import after Rally 0.10.0
 from rally.plugins.openstack import scenario as os_scenario
 from rally.task import context
 from rally.task import hook
+from rally.task.processing import utils as putils
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
@@ -46,6 +49,10 @@ CONF = cfg.CONF
 TASK_ENGINE_OPTS = [
     cfg.IntOpt("raw_result_chunk_size", default=1000, min=1,
                help="Size of raw result chunk in iterations"),
+    cfg.BoolOpt("raw_result_chunk_compression", default=False,
+                help="Store raw result chunks zlib compressed"),
+    cfg.IntOpt("validation_workers", default=10, min=1,
+               help="Number of workloads of a task validated concurrently"),
 ]
 CONF.register_opts(TASK_ENGINE_OPTS)
 
@@ -58,7 +65,7 @@ class ResultConsumer(object):
     """
 
     def __init__(self, key, task, subtask, workload, runner,
-                 abort_on_sla_failure):
+                 abort_on_sla_failure, context_obj=None):
         """ResultConsumer constructor.
 
         :param key: Scenario identifier
@@ -69,6 +76,8 @@ class ResultConsumer(object):
                        consumed
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param context_obj: Context of the workload. Durations of resources
+                            cleanup are taken from it on exit
         """
 
         self.key = key
@@ -76,16 +85,21 @@ class ResultConsumer(object):
         self.subtask = subtask
         self.workload = workload
         self.runner = runner
+        self.context_obj = {} if context_obj is None else context_obj
         self.load_started_at = float("inf")
         self.load_finished_at = 0
         self.workload_data_count = 0
+        self.stats = putils.WorkloadStats()
 
         self.sla_checker = sla.SLAChecker(key["kw"])
         self.hook_executor = hook.HookExecutor(key["kw"], self.task)
         self.abort_on_sla_failure = abort_on_sla_failure
         self.is_done = threading.Event()
         self.unexpected_failure = {}
-        self.results = []
+        # NOTE: batches of results (see runner.ResultsBatch) to be saved
+        #     as the next chunk
+        self.batches = []
+        self.results_count = 0
         self.thread = threading.Thread(target=self._consume_results)
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
         if "hooks" in self.key["kw"]:
@@ -103,9 +117,8 @@ class ResultConsumer(object):
         task_aborted = False
         while True:
             if self.runner.result_queue:
-                results = self.runner.result_queue.popleft()
-                self.results.extend(results)
-                for r in results:
+                batch = self.runner.result_queue.popleft()
+                for r in batch.results:
                     self.load_started_at = min(r["timestamp"],
                                                self.load_started_at)
                     self.load_finished_at = max(r["duration"] + r["timestamp"],
@@ -121,19 +134,48 @@ class ResultConsumer(object):
                         task_aborted = True
 
                 # save results chunks
+                # NOTE: chunks are made of whole batches, so their
+                #     statistics are merged from the ones of the batches
                 chunk_size = CONF.raw_result_chunk_size
-                while len(self.results) >= chunk_size:
-                    results_chunk = self.results[:chunk_size]
-                    self.results = self.results[chunk_size:]
-                    results_chunk.sort(key=lambda x: x["timestamp"])
-                    self.workload.add_workload_data(self.workload_data_count,
-                                                    {"raw": results_chunk})
-                    self.workload_data_count += 1
+                if (self.batches and
+                        self.results_count + len(batch) > chunk_size):
+                    self._save_results_chunk()
+                self.batches.append(batch)
+                self.results_count += len(batch)
+                if self.results_count >= chunk_size:
+                    self._save_results_chunk()
 
             elif self.is_done.isSet():
                 break
             else:
-                time.sleep(0.1)
+                self.runner.result_queue.wait(self.is_done)
+
+    def _save_results_chunk(self):
+        """Store pending batches of results as a chunk with its statistics.
+
+        Statistics of the batches are aggregated by the runner (by its
+        worker processes), so they are only merged here. Statistics of the
+        chunk are also merged into the workload ones, so they are rolled up
+        without processing of stored chunks.
+        """
+        results_chunk = []
+        chunk_stats = putils.WorkloadStats()
+        for batch in self.batches:
+            results_chunk.extend(batch.results)
+            chunk_stats.merge(batch.stats)
+        self.batches = []
+        self.results_count = 0
+        self.stats.merge(chunk_stats)
+
+        # NOTE(boris-42): Sort in order of starting
+        #                 instead of order of ending
+        results_chunk.sort(key=lambda x: x["timestamp"])
+        self.workload.add_workload_data(
+            self.workload_data_count,
+            {"raw": results_chunk,
+             "statistics": {"durations": chunk_stats.result()}},
+            compress=CONF.raw_result_chunk_compression)
+        self.workload_data_count += 1
 
     def _consume_events(self):
         while not self.is_done.isSet() or self.runner.event_queue:
@@ -142,11 +184,13 @@ class ResultConsumer(object):
                 self.hook_executor.on_event(
                     event_type=event["type"], value=event["value"])
             else:
-                time.sleep(0.01)
+                self.runner.event_queue.wait(self.is_done)
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
         self.is_done.set()
+        self.runner.result_queue.interrupt()
+        self.runner.event_queue.interrupt()
         self.aborting_checker.join()
         self.thread.join()
 
@@ -166,22 +210,26 @@ class ResultConsumer(object):
         LOG.info("Full duration is: %s" % utils.format_float_to_str(
             self.finish - self.start))
 
+        if self.batches:
+            self._save_results_chunk()
+
         results = {
             "load_duration": load_duration,
             "full_duration": self.finish - self.start,
             "sla": self.sla_checker.results(),
+            "statistics": {"durations": self.stats.result()}
         }
+        results["statistics"].update(self.runner.statistics)
+        if self.context_obj.get("context_execution"):
+            results["context_execution"] = self.context_obj[
+                "context_execution"]
+        if self.context_obj.get("cleanup_durations"):
+            results["statistics"]["cleanup"] = (
+                self.context_obj["cleanup_durations"])
         if "hooks" in self.key["kw"]:
             self.event_thread.join()
             results["hooks"] = self.hook_executor.results()
 
-        if self.results:
-            # NOTE(boris-42): Sort in order of starting
-            #                 instead of order of ending
-            self.results.sort(key=lambda x: x["timestamp"])
-            self.workload.add_workload_data(self.workload_data_count,
-                                            {"raw": self.results})
-
         self.workload.set_results(results)
 
     @staticmethod
@@ -211,7 +259,7 @@ class ResultConsumer(object):
                 self.runner.abort()
                 self.task.update_status(consts.TaskStatus.ABORTED)
                 break
-            time.sleep(2.0)
+            self.is_done.wait(2.0)
 
 
 class TaskAborted(Exception):
@@ -221,6 +269,133 @@ class TaskAborted(Exception):
     """
 
 
+class ParallelRunners(object):
+    """Keeps runners of subtasks which are run in parallel.
+
+    Once one of the subtasks fails, runners of the other ones are aborted
+    and no new workloads of the group are started.
+    """
+
+    def __init__(self):
+        self.aborted = threading.Event()
+        self._runners = set()
+        self._lock = threading.Lock()
+
+    def add(self, runner_obj):
+        """Register the runner of a starting workload.
+
+        :raises TaskAborted: if the group is already aborted
+        """
+        with self._lock:
+            if self.aborted.is_set():
+                raise TaskAborted()
+            self._runners.add(runner_obj)
+
+    def remove(self, runner_obj):
+        with self._lock:
+            self._runners.discard(runner_obj)
+
+    def abort(self):
+        """Abort all the registered runners and the further workloads."""
+        with self._lock:
+            self.aborted.set()
+            for runner_obj in self._runners:
+                runner_obj.abort()
+
+
+class SharedContexts(object):
+    """Keeps contexts set up between consecutive workloads of a subtask.
+
+    The next workload reuses contexts of the previous one if both of them
+    belong to the same scenario namespace and have equal configs of shared
+    contexts. Contexts configured as per workload ones (cleanup of resources
+    created by iterations) are never shared: each workload sets up and
+    cleans up them with its own owner id, so resources created by iterations
+    of one workload are not visible to the next one.
+
+    Shared contexts are set up with an owner id of their own, so cleanup of
+    resources of one workload never matches resources of shared contexts
+    which the next workloads still use.
+
+    :param owner_id: Owner id of resources of the shared contexts, e.g.
+                     uuid of the subtask
+    """
+
+    # NOTE: keys of context object which belong to the workload and are
+    #       not copied from the shared contexts
+    WORKLOAD_KEYS = ("owner_id", "scenario_name", "config",
+                     "context_execution", "cleanup_durations")
+
+    def __init__(self, owner_id):
+        self.owner_id = owner_id
+        self._key = None
+        self._manager = None
+
+    def _get_manager(self, context_obj):
+        """Return key and manager of shared contexts of the workload."""
+        shared = dict(context_obj)
+        shared["owner_id"] = self.owner_id
+        manager = context.ContextManager(shared, per_workload=False)
+        return (context_obj["scenario_namespace"],
+                manager.get_config()), manager
+
+    def is_reused_by(self, context_obj):
+        """Check whether the workload would reuse the current contexts.
+
+        :param context_obj: Context object of the workload
+        """
+        return (self._manager is not None
+                and self._get_manager(context_obj)[0] == self._key)
+
+    def setup(self, context_obj):
+        """Set up (or reuse) shared contexts and fill the context object.
+
+        :param context_obj: Context object of the workload
+        """
+        key, manager = self._get_manager(context_obj)
+        if self._manager is not None and key == self._key:
+            LOG.info("Reusing contexts of the previous workload.")
+            shared = self._manager.context_obj
+        else:
+            self.cleanup()
+            try:
+                manager.setup()
+            except Exception:
+                manager.cleanup()
+                raise
+            self._key, self._manager = key, manager
+            shared = manager.context_obj
+            context_obj.setdefault("context_execution", {}).update(
+                shared.get("context_execution", {}))
+
+        for name, value in shared.items():
+            if name not in self.WORKLOAD_KEYS:
+                context_obj[name] = value
+
+    def cleanup(self, context_obj=None):
+        """Clean up shared contexts if any.
+
+        :param context_obj: Context object of the last workload which used
+                            the contexts. Durations of the cleanup are
+                            saved to it as for per workload contexts
+        """
+        if self._manager is not None:
+            manager, self._key, self._manager = self._manager, None, None
+            manager.cleanup()
+            if context_obj is None:
+                return
+            shared = manager.context_obj
+            execution = context_obj.setdefault("context_execution", {})
+            for name, durations in shared.get("context_execution",
+                                              {}).items():
+                if "cleanup" in durations:
+                    execution.setdefault(name, {})["cleanup"] = (
+                        durations["cleanup"])
+            if shared.get("cleanup_durations"):
+                context_obj.setdefault("cleanup_durations", {}).update(
+                    shared["cleanup_durations"])
+
+
 class TaskEngine(object):
     """The Task engine class is used to execute benchmark scenarios.
 
@@ -263,7 +438,8 @@ class TaskEngine(object):
         self.deployment = deployment
         self.abort_on_sla_failure = abort_on_sla_failure
 
-    def _validate_workload(self, workload, credentials=None, vtype=None):
+    def _validate_workload(self, workload, credentials=None, vtype=None,
+                           session=None):
         scenario_cls = scenario.Scenario.get(workload.name)
         namespace = scenario_cls.get_namespace()
         scenario_context = copy.deepcopy(scenario_cls.get_default_context())
@@ -275,7 +451,8 @@ class TaskEngine(object):
             credentials=credentials,
             config=workload.to_dict(),
             plugin_cfg=None,
-            vtype=vtype))
+            vtype=vtype,
+            session=session))
 
         if workload.runner:
             results.extend(runner.ScenarioRunner.validate(
@@ -284,7 +461,8 @@ class TaskEngine(object):
                 config=None,
                 plugin_cfg=workload.runner,
                 namespace=namespace,
-                vtype=vtype))
+                vtype=vtype,
+                session=session))
 
         for context_name, context_conf in workload.context.items():
             results.extend(context.Context.validate(
@@ -293,7 +471,8 @@ class TaskEngine(object):
                 config=None,
                 plugin_cfg=context_conf,
                 namespace=namespace,
-                vtype=vtype))
+                vtype=vtype,
+                session=session))
 
         for context_name, context_conf in scenario_context.items():
             results.extend(context.Context.validate(
@@ -303,7 +482,8 @@ class TaskEngine(object):
                 plugin_cfg=context_conf,
                 namespace=namespace,
                 allow_hidden=True,
-                vtype=vtype))
+                vtype=vtype,
+                session=session))
 
         for sla_name, sla_conf in workload.sla.items():
             results.extend(sla.SLA.validate(
@@ -311,7 +491,8 @@ class TaskEngine(object):
                 credentials=credentials,
                 config=None,
                 plugin_cfg=sla_conf,
-                vtype=vtype))
+                vtype=vtype,
+                session=session))
 
         for hook_conf in workload.hooks:
             results.extend(hook.Hook.validate(
@@ -319,7 +500,8 @@ class TaskEngine(object):
                 credentials=credentials,
                 config=None,
                 plugin_cfg=hook_conf["args"],
-                vtype=vtype))
+                vtype=vtype,
+                session=session))
 
             trigger_conf = hook_conf["trigger"]
             results.extend(trigger.Trigger.validate(
@@ -327,41 +509,71 @@ class TaskEngine(object):
                 credentials=credentials,
                 config=None,
                 plugin_cfg=trigger_conf["args"],
-                vtype=vtype))
+                vtype=vtype,
+                session=session))
 
         if results:
             msg = "\n ".join([str(r) for r in results])
             kw = workload.make_exception_args(msg)
             raise exceptions.InvalidTaskConfig(**kw)
 
+    def _validate_workloads(self, workloads, **kwargs):
+        """Validate workloads concurrently.
+
+        If several workloads are invalid, the error of the first of them
+        is raised.
+
+        :param workloads: List of workloads to validate
+        :param kwargs: Arguments for _validate_workload()
+        """
+        errors = {}
+
+        def publish(queue):
+            for pos, workload in enumerate(workloads):
+                queue.append((pos, workload))
+
+        def consume(cache, args):
+            pos, workload = args
+            try:
+                self._validate_workload(workload, **kwargs)
+            except Exception as e:
+                errors[pos] = e
+
+        broker.run(publish, consume,
+                   min(CONF.validation_workers, len(workloads)))
+        if errors:
+            raise errors[min(errors)]
+
+    @staticmethod
+    def _get_workloads(config):
+        return [workload for subtask in config.subtasks
+                for workload in subtask.workloads]
+
     @logging.log_task_wrapper(LOG.info, _("Task validation of syntax."))
-    def _validate_config_syntax(self, config):
-        for subtask in config.subtasks:
-            for workload in subtask.workloads:
-                self._validate_workload(workload, vtype="syntax")
+    def _validate_config_syntax(self, config, session=None):
+        self._validate_workloads(self._get_workloads(config),
+                                 vtype="syntax", session=session)
 
     @logging.log_task_wrapper(LOG.info, _("Task validation of required "
                                           "platforms."))
-    def _validate_config_platforms(self, config):
+    def _validate_config_platforms(self, config, session=None):
         credentials = self.deployment.get_all_credentials()
         credentials = dict((p, creds[0]) for p, creds in credentials.items())
-        for subtask in config.subtasks:
-            for workload in subtask.workloads:
-                self._validate_workload(workload, vtype="platform",
-                                        credentials=credentials)
+        self._validate_workloads(self._get_workloads(config),
+                                 vtype="platform", credentials=credentials,
+                                 session=session)
 
     def _validate_config_semantic_helper(self, admin, user_context,
-                                         workloads, platform):
+                                         workloads, platform, session=None):
         with user_context as ctx:
             ctx.setup()
             users = ctx.context["users"]
-            for workload in workloads:
-                credentials = {platform: {"admin": admin, "users": users}}
-                self._validate_workload(workload, credentials=credentials,
-                                        vtype="semantic")
+            credentials = {platform: {"admin": admin, "users": users}}
+            self._validate_workloads(workloads, credentials=credentials,
+                                     vtype="semantic", session=session)
 
     @logging.log_task_wrapper(LOG.info, _("Task validation of semantic."))
-    def _validate_config_semantic(self, config):
+    def _validate_config_semantic(self, config, session=None):
         # map workloads to platforms
         platforms = collections.defaultdict(list)
         for subtask in config.subtasks:
@@ -421,7 +633,8 @@ class TaskEngine(object):
                     allow_hidden=True)(ctx_conf)
 
                 self._validate_config_semantic_helper(
-                    admin, user_context, workloads_with_users, platform)
+                    admin, user_context, workloads_with_users, platform,
+                    session=session)
 
             if workloads_with_existing_users:
                 ctx_conf = {"task": self.task,
@@ -434,7 +647,7 @@ class TaskEngine(object):
 
                 self._validate_config_semantic_helper(
                     admin, user_context, workloads_with_existing_users,
-                    platform)
+                    platform, session=session)
 
     @logging.log_task_wrapper(LOG.info, _("Task validation."))
     def validate(self, only_syntax=False):
@@ -443,12 +656,15 @@ class TaskEngine(object):
         :param only_syntax: Check only syntax of task configuration
         """
         self.task.update_status(consts.TaskStatus.VALIDATING)
+        # NOTE: cloud lookups of validators (images, flavors, services,
+        #       etc) are cached for the time of the validation
+        session = validation.ValidationSession()
         try:
-            self._validate_config_syntax(self.config)
+            self._validate_config_syntax(self.config, session=session)
             if only_syntax:
                 return
-            self._validate_config_platforms(self.config)
-            self._validate_config_semantic(self.config)
+            self._validate_config_platforms(self.config, session=session)
+            self._validate_config_semantic(self.config, session=session)
         except Exception as e:
             exception_info = json.dumps(traceback.format_exc(), indent=2,
                                         separators=(",", ": "))
@@ -502,8 +718,11 @@ class TaskEngine(object):
         self.task.update_status(consts.TaskStatus.RUNNING)
 
         try:
-            for subtask in self.config.subtasks:
-                self._run_subtask(subtask)
+            for subtasks in self._group_subtasks(self.config.subtasks):
+                if len(subtasks) == 1:
+                    self._run_subtask(subtasks[0])
+                else:
+                    self._run_subtasks_in_parallel(subtasks)
         except TaskAborted:
             LOG.info("Received aborting signal.")
             self.task.update_status(consts.TaskStatus.ABORTED)
@@ -512,13 +731,74 @@ class TaskEngine(object):
                     self.task["uuid"]) != consts.TaskStatus.ABORTED:
                 self.task.update_status(consts.TaskStatus.FINISHED)
 
-    def _run_subtask(self, subtask):
+    @staticmethod
+    def _group_subtasks(subtasks):
+        """Split subtasks into groups which should be run together.
+
+        Consecutive subtasks with `run_in_parallel` flag form one group, any
+        other subtask is a group on its own.
+        """
+        groups = []
+        for subtask in subtasks:
+            if (subtask.run_in_parallel and groups
+                    and groups[-1][-1].run_in_parallel):
+                groups[-1].append(subtask)
+            else:
+                groups.append([subtask])
+        return groups
+
+    def _run_subtasks_in_parallel(self, subtasks):
+        """Run subtasks simultaneously, each one in a separate thread.
+
+        Every workload still gets its own runner, context manager and
+        result consumer, so only the generated load is combined. The first
+        failed subtask aborts runners of the other ones. Errors are
+        re-raised once all the subtasks are finished, the first failure
+        before TaskAborted.
+        """
+        errors = []
+        parallel_runners = ParallelRunners()
+
+        def run_subtask(subtask):
+            try:
+                self._run_subtask(subtask, parallel_runners=parallel_runners)
+            except Exception as e:
+                errors.append(e)
+                if not isinstance(e, TaskAborted):
+                    parallel_runners.abort()
+
+        threads = [threading.Thread(target=run_subtask, args=(subtask,))
+                   for subtask in subtasks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for e in errors:
+            if not isinstance(e, TaskAborted):
+                raise e
+        if errors:
+            raise errors[0]
+
+    def _run_subtask(self, subtask, parallel_runners=None):
         subtask_obj = self.task.add_subtask(**subtask.to_dict())
+        shared_contexts = (SharedContexts(subtask_obj["uuid"])
+                           if subtask.reuse_context else None)
 
         try:
             # TODO(astudenov): add subtask context here
-            for workload in subtask.workloads:
-                self._run_workload(subtask_obj, workload)
+            try:
+                workloads = subtask.workloads
+                for i, workload in enumerate(workloads):
+                    next_workload = (workloads[i + 1]
+                                     if i + 1 < len(workloads) else None)
+                    self._run_workload(subtask_obj, workload,
+                                       shared_contexts=shared_contexts,
+                                       next_workload=next_workload,
+                                       parallel_runners=parallel_runners)
+            finally:
+                if shared_contexts:
+                    shared_contexts.cleanup()
         except TaskAborted:
             subtask_obj.update_status(consts.SubtaskStatus.ABORTED)
             raise
@@ -534,9 +814,12 @@ class TaskEngine(object):
         else:
             subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
 
-    def _run_workload(self, subtask_obj, workload):
+    def _run_workload(self, subtask_obj, workload, shared_contexts=None,
+                      next_workload=None, parallel_runners=None):
         if ResultConsumer.is_task_in_aborting_status(self.task["uuid"]):
             raise TaskAborted()
+        if parallel_runners is not None and parallel_runners.aborted.is_set():
+            raise TaskAborted()
 
         key = workload.make_key()
         workload_obj = subtask_obj.add_workload(key)
@@ -545,16 +828,37 @@ class TaskEngine(object):
         runner_obj = self._get_runner(workload.runner)
         context_obj = self._prepare_context(
             workload.context, workload.name, workload_obj["uuid"])
+        if parallel_runners is not None:
+            parallel_runners.add(runner_obj)
         try:
             with ResultConsumer(key, self.task, subtask_obj, workload_obj,
-                                runner_obj, self.abort_on_sla_failure):
-                with context.ContextManager(context_obj):
+                                runner_obj, self.abort_on_sla_failure,
+                                context_obj=context_obj):
+                if shared_contexts is None:
+                    ctx_manager = context.ContextManager(context_obj)
+                else:
+                    shared_contexts.setup(context_obj)
+                    ctx_manager = context.ContextManager(context_obj,
+                                                         per_workload=True)
+                with ctx_manager:
                     runner_obj.run(workload.name, context_obj,
                                    workload.args)
+                if shared_contexts is not None and not (
+                        next_workload and shared_contexts.is_reused_by(
+                            self._prepare_context(next_workload.context,
+                                                  next_workload.name,
+                                                  None))):
+                    # NOTE: shared contexts are cleaned up by the last
+                    #       workload which uses them, so durations of the
+                    #       cleanup are saved with its results
+                    shared_contexts.cleanup(context_obj)
         except Exception as e:
             LOG.debug(traceback.format_exc())
             LOG.exception(e)
             # TODO(astudenov): save error to DB
+        finally:
+            if parallel_runners is not None:
+                parallel_runners.remove(runner_obj)
 
 
 class TaskConfig(object):
@@ -640,6 +944,7 @@ class TaskConfig(object):
                         },
 
                         "run_in_parallel": {"type": "boolean"},
+                        "reuse_context": {"type": "boolean"},
                         "workloads": {
                             "type": "array",
                             "minItems": 1,
@@ -753,12 +1058,15 @@ class SubTask(object):
         self.workloads = [Workload(wconf, pos)
                           for pos, wconf in enumerate(config["workloads"])]
         self.context = config.get("context", {})
+        self.run_in_parallel = config.get("run_in_parallel", False)
+        self.reuse_context = config.get("reuse_context", False)
 
     def to_dict(self):
         return {
             "title": self.title,
             "description": self.description,
             "context": self.context,
+            "run_in_parallel": self.run_in_parallel,
         }
 
 
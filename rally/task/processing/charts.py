@@ -65,6 +65,22 @@ class Chart(plugin.Plugin):
                                                      self.zipped_size)
             self._data[name].add_point(value)
 
+    def add_iterations_store(self, store):
+        """Add data of all iterations at once.
+
+        This is an alternative to add_iteration() that processes
+        iterations column by column, so it must not be mixed with it.
+
+        :param store: processing.utils.IterationsStore instance
+        """
+        for name, values in self._map_store_columns(store):
+            if name not in self._data:
+                self._data[name] = utils.GraphZipper(self.base_size,
+                                                     self.zipped_size)
+            add_point = self._data[name].add_point
+            for value in values:
+                add_point(value)
+
     def render(self):
         """Generate chart data ready for drawing."""
         return [(name, points.get_zipped_graph())
@@ -81,19 +97,38 @@ class Chart(plugin.Plugin):
             atomic_actions.setdefault(name, 0)
         return atomic_actions
 
+    @property
+    def _atomic_merger(self):
+        if not hasattr(self, "_atomic_merger_ins"):
+            self._atomic_merger_ins = utils.AtomicMerger(
+                self._workload_info["atomic"])
+        return self._atomic_merger_ins
+
     def _get_atomic_names(self):
-        atomic_merger = utils.AtomicMerger(self._workload_info["atomic"])
-        return atomic_merger.get_merged_names()
+        return self._atomic_merger.get_merged_names()
 
     def _merge_atomic_actions(self, atomic_actions):
-        atomic_merger = utils.AtomicMerger(self._workload_info["atomic"])
-        return atomic_merger.merge_atomic_actions(
-            atomic_actions)
+        return self._atomic_merger.merge_atomic_actions(atomic_actions)
 
     @abc.abstractmethod
     def _map_iteration_values(self, iteration):
         """Get values for processing, from given iteration."""
 
+    def _map_store_columns(self, store):
+        """Get columns for processing, from given iterations store.
+
+        By default iterations are restored from the store and mapped one
+        by one with _map_iteration_values(), so charts which do not
+        override this method can process the store as well.
+
+        :returns: list of tuples (name, sequence of values)
+        """
+        columns = collections.OrderedDict()
+        for iteration in store.iterations():
+            for name, value in self._map_iteration_values(iteration):
+                columns.setdefault(name, []).append(value)
+        return list(columns.items())
+
 
 class MainStackedAreaChart(Chart):
 
@@ -113,6 +148,19 @@ class MainStackedAreaChart(Chart):
                 result.append(("failed_duration", 0))
         return result
 
+    def _map_store_columns(self, store):
+        columns = [
+            ("duration", [0 if e else d
+                          for d, e in zip(store.duration, store.error)]),
+            ("idle_duration", [0 if e else d for d, e in
+                               zip(store.idle_duration, store.error)])]
+        if self._workload_info["iterations_failed"]:
+            columns.append(
+                ("failed_duration",
+                 [d + i if e else 0 for d, i, e in
+                  zip(store.duration, store.idle_duration, store.error)]))
+        return columns
+
 
 class AtomicStackedAreaChart(Chart):
 
@@ -133,6 +181,21 @@ class AtomicStackedAreaChart(Chart):
             atomics.append(("failed_duration", failed_duration))
         return atomics
 
+    def _map_store_columns(self, store):
+        atomics = store.atomic_columns(missed=0)
+        if self._workload_info["iterations_failed"]:
+            if atomics:
+                atomics_sums = [sum(values) for values in
+                                zip(*[column for name, column in atomics])]
+            else:
+                atomics_sums = [0] * len(store)
+            atomics.append(
+                ("failed_duration",
+                 [d + i - s if e else 0 for d, i, s, e in
+                  zip(store.duration, store.idle_duration,
+                      atomics_sums, store.error)]))
+        return atomics
+
 
 class AvgChart(Chart):
     """Base class for charts with average results."""
@@ -145,6 +208,14 @@ class AvgChart(Chart):
                 self._data[name] = streaming.MeanComputation()
             self._data[name].add(value or 0)
 
+    def add_iterations_store(self, store):
+        for name, values in self._map_store_columns(store):
+            if name not in self._data:
+                self._data[name] = streaming.MeanComputation()
+            add = self._data[name].add
+            for value in values:
+                add(value or 0)
+
     def render(self):
         return [(k, v.result()) for k, v in self._data.items()]
 
@@ -157,6 +228,9 @@ class AtomicAvgChart(AvgChart):
         atomic_actions = self._fix_atomic_actions(atomic_actions)
         return list(atomic_actions.items())
 
+    def _map_store_columns(self, store):
+        return store.atomic_columns(missed=0)
+
 
 class LoadProfileChart(Chart):
     """Chart for parallel durations."""
@@ -189,7 +263,13 @@ class LoadProfileChart(Chart):
         return (iteration["timestamp"], iteration["duration"])
 
     def add_iteration(self, iteration):
-        timestamp, duration = self._map_iteration_values(iteration)
+        self._add_point(*self._map_iteration_values(iteration))
+
+    def add_iterations_store(self, store):
+        for timestamp, duration in zip(store.timestamp, store.duration):
+            self._add_point(timestamp, duration)
+
+    def _add_point(self, timestamp, duration):
         ts_start = timestamp - self._tstamp_start
         started_idx = bisect.bisect(self._time_axis, ts_start)
         ended_idx = bisect.bisect(self._time_axis, ts_start + duration)
@@ -249,6 +329,20 @@ class HistogramChart(Chart):
                         self._data[name]["views"][i]["y"][bin_i] += 1
                         break
 
+    def add_iterations_store(self, store):
+        for name, values in self._map_store_columns(store):
+            if name not in self._data:
+                raise KeyError("Unexpected histogram name: %s" % name)
+            for view in self._data[name]["views"]:
+                # NOTE: bins are sorted, so the first bin that is not
+                #     less than value can be found with bisect
+                x_axis, y_axis = view["x"], view["y"]
+                bins = len(x_axis)
+                for value in values:
+                    bin_i = bisect.bisect_left(x_axis, value or 0)
+                    if bin_i < bins:
+                        y_axis[bin_i] += 1
+
     def render(self):
         data = []
         for name, hist in self._data.items():
@@ -277,15 +371,18 @@ class MainHistogramChart(HistogramChart):
     def _map_iteration_values(self, iteration):
         return [("task", 0 if iteration["error"] else iteration["duration"])]
 
+    def _map_store_columns(self, store):
+        return [("task", [0 if e else d
+                          for d, e in zip(store.duration, store.error)])]
+
 
 class AtomicHistogramChart(HistogramChart):
 
     def __init__(self, workload_info):
         super(AtomicHistogramChart, self).__init__(workload_info)
-        atomic_merger = utils.AtomicMerger(self._workload_info["atomic"])
         for i, name in enumerate(self._workload_info["atomic"]):
             value = self._workload_info["atomic"][name]
-            self._data[atomic_merger.get_merged_name(name)] = {
+            self._data[self._atomic_merger.get_merged_name(name)] = {
                 "views": self._init_views(value["min_duration"],
                                           value["max_duration"]),
                 "disabled": i}
@@ -296,6 +393,9 @@ class AtomicHistogramChart(HistogramChart):
         atomic_actions = self._fix_atomic_actions(atomic_actions)
         return list(atomic_actions.items())
 
+    def _map_store_columns(self, store):
+        return store.atomic_columns(missed=0)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Table(Chart):
@@ -372,13 +472,12 @@ class MainStatsTable(Table):
 
     def __init__(self, *args, **kwargs):
         super(MainStatsTable, self).__init__(*args, **kwargs)
-        iters_num = self._workload_info["iterations_count"]
         for name in (self._get_atomic_names() + ["total"]):
             self._data[name] = [
                 [streaming.MinComputation(), None],
-                [streaming.PercentileComputation(0.5, iters_num), None],
-                [streaming.PercentileComputation(0.9, iters_num), None],
-                [streaming.PercentileComputation(0.95, iters_num), None],
+                [streaming.PercentileComputation(0.5), None],
+                [streaming.PercentileComputation(0.9), None],
+                [streaming.PercentileComputation(0.95), None],
                 [streaming.MaxComputation(), None],
                 [streaming.MeanComputation(), None],
                 [streaming.MeanComputation(),
@@ -402,6 +501,51 @@ class MainStatsTable(Table):
                 for idx, dummy in enumerate(self._data[name][:-2]):
                     self._data[name][idx][0].add(value)
 
+    def _map_store_columns(self, store):
+        # NOTE: missed atomic actions are None, they are not counted at all
+        return store.atomic_columns() + [("total", store.duration)]
+
+    def add_iterations_store(self, store):
+        for name, values in self._map_store_columns(store):
+            algorithms = [ins for ins, fn in self._data[name][:-2]]
+            success = self._data[name][-2][0]
+            count = self._data[name][-1][0]
+            for value, error in zip(values, store.error):
+                if value is None:
+                    continue
+                count.add()
+                if error:
+                    success.add(0)
+                else:
+                    success.add(1)
+                    for ins in algorithms:
+                        ins.add(value)
+
+    def render_statistics(self, durations):
+        """Generate table data from the already aggregated statistics.
+
+        This gives the same result as processing of all iterations with
+        add_iteration(), but does not need the iterations at all.
+
+        :param durations: dict, result of processing.utils.WorkloadStats
+        :returns: dict, the same as render() returns
+        """
+        rows = []
+        for name in (self._get_atomic_names() + ["total"]):
+            if name == "total":
+                stats = durations["total"]
+            else:
+                stats = durations["atomics"].get(name, {})
+            has_result = stats.get("min") is not None
+            row = [name]
+            for key in ("min", "median", "90%ile", "95%ile", "max", "avg"):
+                row.append(round(stats[key], 3) if has_result else "n/a")
+            row.append("%.1f%%" % (stats["success"] * 100)
+                       if has_result else "n/a")
+            row.append(stats.get("count", 0))
+            rows.append(row)
+        return {"cols": self.columns, "rows": rows}
+
 
 class OutputChart(Chart):
     """Base class for charts related to scenario output."""
@@ -574,12 +718,11 @@ class OutputStatsTable(OutputTable):
     def add_iteration(self, iteration):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
-                iters_num = self._workload_info["iterations_count"]
                 self._data[name] = [
                     [streaming.MinComputation(), None],
-                    [streaming.PercentileComputation(0.5, iters_num), None],
-                    [streaming.PercentileComputation(0.9, iters_num), None],
-                    [streaming.PercentileComputation(0.95, iters_num), None],
+                    [streaming.PercentileComputation(0.5), None],
+                    [streaming.PercentileComputation(0.9), None],
+                    [streaming.PercentileComputation(0.95), None],
                     [streaming.MaxComputation(), None],
                     [streaming.MeanComputation(), None],
                     [streaming.IncrementComputation(),
@@ -24,6 +24,7 @@ from rally.common import objects
 from rally.common.plugin import plugin
 from rally.common import version
 from rally.task.processing import charts
+from rally.task.processing import utils
 from rally.ui import utils as ui_utils
 
 
@@ -82,20 +83,70 @@ def _process_hooks(hooks):
     return hooks_ctx
 
 
-def _process_scenario(data, pos):
-    main_area = charts.MainStackedAreaChart(data["info"])
-    main_hist = charts.MainHistogramChart(data["info"])
-    main_stat = charts.MainStatsTable(data["info"])
-    load_profile = charts.LoadProfileChart(data["info"])
-    atomic_pie = charts.AtomicAvgChart(data["info"])
-    atomic_area = charts.AtomicStackedAreaChart(data["info"])
-    atomic_hist = charts.AtomicHistogramChart(data["info"])
+def _process_rps(rps):
+    """Make chart of requested and achieved rps for each second of the load.
+
+    :param rps: list of [second, requested rps, achieved rps] lists
+    """
+    chart = charts.OutputLinesChart(
+        {"iterations_count": len(rps)},
+        title="Requested and achieved rps",
+        description="Numbers of iterations which should be started and "
+                    "which are actually started in each second of the load.",
+        label="Iterations per second", axis_label="Second of the load")
+    for second, requested, achieved in rps:
+        chart.add_iteration([["requested", requested],
+                             ["achieved", achieved]])
+    return chart.render()
+
+
+def _process_corrected_latency(latency):
+    """Make table of latency of iterations counted from scheduled start.
+
+    :param latency: dict, result of processing.utils.DurationStats
+    """
+    has_result = latency["min"] is not None
+    row = ["corrected latency"]
+    for key in ("min", "median", "90%ile", "95%ile", "max", "avg"):
+        row.append(round(latency[key], 3) if has_result else "n/a")
+    row.append("%.1f%%" % (latency["success"] * 100)
+               if has_result else "n/a")
+    row.append(latency["count"])
+    return {"title": "Latency corrected for coordinated omission",
+            "description": "Time from the scheduled start of an iteration "
+                           "to its end, so the delay of late iterations is "
+                           "counted as well.",
+            "widget": charts.MainStatsTable.widget,
+            "data": {"cols": charts.MainStatsTable.columns, "rows": [row]},
+            "label": "", "axis_label": ""}
+
+
+def _process_workload(workload, pos):
+    """Process results of the workload in a single pass over iterations.
+
+    Iterations are given by `result' of the workload results in old format
+    (a list, or processing.utils.ChunkedIterations which loads them chunk
+    by chunk). Info about the workload and columns of charts are collected
+    by processing.utils.IterationsStore at the same time with outputs and
+    errors, so iterations are loaded only once.
+
+    :param workload: results of the workload in old format
+    :param pos: int, position of the workload among workloads of the same
+                scenario
+    :returns: dict, report data of the workload
+    """
+    iterations = workload["result"]
+    if isinstance(iterations, list):
+        iterations = sorted(iterations, key=lambda itr: itr["timestamp"])
 
     errors = []
     output_errors = []
     additive_output_charts = []
     complete_output = []
-    for idx, itr in enumerate(data["iterations"], 1):
+    store = utils.IterationsStore()
+    for idx, itr in enumerate(iterations, 1):
+        itr = utils.fix_output(itr)
+        store.add_iteration(itr)
         if itr["error"]:
             typ, msg, trace = itr["error"]
             errors.append({"iteration": idx,
@@ -106,8 +157,11 @@ def _process_scenario(data, pos):
                 additive_output_charts[i].add_iteration(additive["data"])
             except IndexError:
                 chart_cls = plugin.Plugin.get(additive["chart_plugin"])
+                # NOTE: number of iterations is known since the first
+                #     chunk of them is loaded
                 chart = chart_cls(
-                    data["info"], title=additive["title"],
+                    {"iterations_count": len(iterations)},
+                    title=additive["title"],
                     description=additive.get("description", ""),
                     label=additive.get("label", ""),
                     axis_label=additive.get("axis_label",
@@ -123,14 +177,34 @@ def _process_scenario(data, pos):
             complete_charts.append(complete_chart)
         complete_output.append(complete_charts)
 
-        for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist):
-            chart.add_iteration(itr)
-
-    kw = data["key"]["kw"]
-    cls, method = data["key"]["name"].split(".")
+    info = dict(store.get_info(),
+                full_duration=workload["full_duration"],
+                load_duration=workload["load_duration"])
+    main_area = charts.MainStackedAreaChart(info)
+    main_hist = charts.MainHistogramChart(info)
+    main_stat = charts.MainStatsTable(info)
+    load_profile = charts.LoadProfileChart(info)
+    atomic_pie = charts.AtomicAvgChart(info)
+    atomic_area = charts.AtomicStackedAreaChart(info)
+    atomic_hist = charts.AtomicHistogramChart(info)
+    for chart in (main_area, main_hist, main_stat, load_profile,
+                  atomic_pie, atomic_area, atomic_hist):
+        chart.add_iterations_store(store)
+
+    kw = workload["key"]["kw"]
+    cls, method = workload["key"]["name"].split(".")
     additive_output = [chart.render() for chart in additive_output_charts]
-    iterations_count = data["info"]["iterations_count"]
+    statistics = workload.get("statistics") or {}
+    if statistics.get("rps"):
+        additive_output.append(_process_rps(statistics["rps"]))
+    if statistics.get("corrected_latency"):
+        additive_output.append(
+            _process_corrected_latency(statistics["corrected_latency"]))
+    iterations_count = info["iterations_count"]
+    created_at = workload.get("created_at")
+    if isinstance(created_at, dt.datetime):
+        created_at = created_at.strftime("%Y-%d-%m %H:%M:%S")
+    sla = workload["sla"]
 
     return {
         "cls": cls,
@@ -138,13 +212,12 @@ def _process_scenario(data, pos):
         "pos": str(pos),
         "name": method + (pos and " [%d]" % (pos + 1) or ""),
         "runner": kw["runner"]["type"],
-        "config": json.dumps({data["key"]["name"]: [kw]}, indent=2),
-        "hooks": _process_hooks(data["hooks"]),
-        "description": data["key"].get("description", ""),
+        "config": json.dumps({workload["key"]["name"]: [kw]}, indent=2),
+        "hooks": _process_hooks(workload.get("hooks") or []),
+        "description": workload["key"].get("description", ""),
         "iterations": {
             "iter": main_area.render(),
-            "pie": [("success", (data["info"]["iterations_count"]
-                                 - len(errors))),
+            "pie": [("success", iterations_count - len(errors)),
                     ("errors", len(errors))],
             "histogram": main_hist.render()},
         "load_profile": load_profile.render(),
@@ -157,29 +230,37 @@ def _process_scenario(data, pos):
         "has_output": any(additive_output) or any(complete_output),
         "output_errors": output_errors,
         "errors": errors,
-        "load_duration": data["info"]["load_duration"],
-        "full_duration": data["info"]["full_duration"],
-        "created_at": data["created_at"],
-        "sla": data["sla"],
-        "sla_success": all([s["success"] for s in data["sla"]]),
+        "load_duration": info["load_duration"],
+        "full_duration": info["full_duration"],
+        "created_at": created_at,
+        "sla": sla,
+        "sla_success": all([s["success"] for s in sla]),
         "iterations_count": iterations_count,
     }
 
 
 def _process_tasks(tasks_results):
-    tasks = []
+    """Order workloads for report and make the report source.
+
+    :param tasks_results: tasks results list in old format
+    :returns: tuple of JSON source of workloads configs and iterator over
+              report data of workloads, each workload is processed only
+              when the next item is requested
+    """
+    workloads = []
     source_dict = collections.defaultdict(list)
     position = collections.defaultdict(lambda: -1)
 
-    for scenario in tasks_results:
-        name = scenario["key"]["name"]
+    for workload in tasks_results:
+        name = workload["key"]["name"]
         position[name] += 1
-        source_dict[name].append(scenario["key"]["kw"])
-        tasks.append(_process_scenario(scenario, position[name]))
+        source_dict[name].append(workload["key"]["kw"])
+        workloads.append((workload, position[name]))
 
     source = json.dumps(source_dict, indent=2, sort_keys=True)
-    return source, sorted(tasks, key=lambda r: (r["cls"], r["met"],
-                                                int(r["pos"])))
+    workloads.sort(key=lambda w: (w[0]["key"]["name"].split("."), w[1]))
+    return source, (_process_workload(workload, pos)
+                    for workload, pos in workloads)
 
 
 def _extend_results(results):
@@ -201,7 +282,8 @@ def _extend_results(results):
                             "hooks": result.get("hooks"),
                             "raw": result["result"],
                             "full_duration": result["full_duration"],
-                            "load_duration": result["load_duration"]},
+                            "load_duration": result["load_duration"],
+                            "statistics": result.get("statistics")},
                    "created_at": result.get("created_at"),
                    "updated_at": result.get("updated_at")}
         extended_results.extend(
@@ -209,14 +291,46 @@ def _extend_results(results):
     return extended_results
 
 
-def plot(tasks_results, include_libs=False):
-    extended_results = _extend_results(tasks_results)
+def generate_plot(tasks_results, include_libs=False):
+    """Generate HTML report piece by piece.
+
+    Workloads are processed one by one, in a single pass over iterations
+    of each one (so `result' of tasks results can be
+    processing.utils.ChunkedIterations), and report data of a workload is
+    encoded to JSON and yielded as soon as it is built, so neither all
+    iterations nor the whole report are ever kept in memory.
+
+    :param tasks_results: tasks results list in old format
+    :param include_libs: whether to embed JS and CSS libraries into report
+    :returns: iterator over str pieces of HTML report
+    """
     template = ui_utils.get_template("task/report.html")
-    source, data = _process_tasks(extended_results)
-    return template.render(version=version.version_string(),
-                           source=json.dumps(source),
-                           data=json.dumps(data),
-                           include_libs=include_libs)
+    source, workloads = _process_tasks(tasks_results)
+
+    # NOTE: the placeholder is replaced with data that is encoded by pieces
+    placeholder = "__rally_report_data_%s__" % id(workloads)
+    encoder = json.JSONEncoder()
+    for piece in template.generate(version=version.version_string(),
+                                   source=json.dumps(source),
+                                   data=placeholder,
+                                   include_libs=include_libs):
+        if placeholder not in piece:
+            yield piece
+            continue
+        head, tail = piece.split(placeholder, 1)
+        yield head
+        yield "["
+        for i, workload in enumerate(workloads):
+            if i:
+                yield ", "
+            for data_piece in encoder.iterencode(workload):
+                yield data_piece
+        yield "]"
+        yield tail
+
+
+def plot(tasks_results, include_libs=False):
+    return "".join(generate_plot(tasks_results, include_libs=include_libs))
 
 
 def trends(tasks_results):
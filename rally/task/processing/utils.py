@@ -13,7 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import array
 import collections
+import math
+
+from rally.common import streaming_algorithms as streaming
 
 
 class GraphZipper(object):
@@ -93,15 +97,376 @@ class AtomicMerger(object):
         return self._merge_name(name, self._atomic[name].get("count", 1))
 
     def merge_atomic_actions(self, atomic_actions):
+        durations = {}
+        counts = collections.Counter()
+        for action in atomic_actions:
+            name = action["name"]
+            duration = action["finished_at"] - action["started_at"]
+            durations[name] = durations.get(name, 0) + duration
+            counts[name] += 1
         new_atomic_actions = collections.OrderedDict()
         for name in self._atomic.keys():
-            count = 0
-            duration = 0
-            for action in atomic_actions:
-                if action["name"] == name:
-                    duration += action["finished_at"] - action["started_at"]
-                    count += 1
-            if count == self._atomic[name].get("count", 1):
+            count = counts[name]
+            if count and count == self._atomic[name].get("count", 1):
                 new_name = self._merge_name(name, count)
-                new_atomic_actions[new_name] = duration
+                new_atomic_actions[new_name] = durations[name]
         return new_atomic_actions
+
+
+def fix_output(iteration):
+    """Add `output' to the iteration if it is missed there.
+
+    :param iteration: dict, iteration of raw workload data
+    :returns: the same iteration
+    """
+    if "output" not in iteration:
+        iteration["output"] = {"additive": [], "complete": []}
+
+        # NOTE(amaretskiy): Deprecated "scenario_output"
+        #     is supported for backward compatibility
+        if ("scenario_output" in iteration
+                and iteration["scenario_output"]["data"]):
+            iteration["output"]["additive"].append(
+                {"items": iteration["scenario_output"]["data"].items(),
+                 "title": "Scenario output",
+                 "description": "",
+                 "chart": "OutputStackedAreaChart"})
+            del iteration["scenario_output"]
+    return iteration
+
+
+class ChunkedIterations(object):
+    """Iterations of a workload, which are loaded chunk by chunk.
+
+    It can be iterated several times, each time chunks are requested again,
+    so only a single chunk of iterations is kept in memory.
+    """
+
+    def __init__(self, get_page, process_iteration=None):
+        """Init iterations.
+
+        :param get_page: callable that accepts `chunk' keyword argument and
+                         returns page of iterations, in the format of
+                         db.workload_data_get_page()
+        :param process_iteration: optional callable that is applied to each
+                                  iteration and returns processed one
+        """
+        self.get_page = get_page
+        self._process_iteration = process_iteration
+        self._count = None
+        self._first_page = None
+
+    def __len__(self):
+        """Number of iterations.
+
+        It is known without loading of all chunks, when the first page is
+        loaded. The page is kept until the next iteration over chunks, so
+        `list(iterations)' does not request it twice.
+        """
+        if self._count is None:
+            self._first_page = self.get_page(chunk=0)
+            self._count = self._first_page["iterations_count"]
+        return self._count
+
+    def __iter__(self):
+        chunk = 0
+        while chunk is not None:
+            if chunk == 0 and self._first_page is not None:
+                page, self._first_page = self._first_page, None
+            else:
+                page = self.get_page(chunk=chunk)
+            self._count = page["iterations_count"]
+            for iteration in page["iterations"]:
+                if self._process_iteration:
+                    iteration = self._process_iteration(iteration)
+                yield iteration
+            chunk = page["next_chunk"]
+
+
+class IterationsStore(object):
+    """Columnar in-memory representation of workload iterations.
+
+    Instead of keeping a dict per iteration, each iteration value is kept
+    in its own flat array of numbers: `timestamp', `duration',
+    `idle_duration', `error' flags, and total durations and numbers of
+    calls of each atomic action. The store is built once per workload and
+    then charts consume whole columns at once (see
+    Chart.add_iterations_store()).
+
+    If info about atomic actions is not given, the store collects it (and
+    the rest of the workload info, see get_info()) while iterations are
+    added, so the workload can be processed in a single pass.
+
+    Merged durations of atomic actions that are missed in some iteration
+    (or have unexpected number of calls) are NaN.
+    """
+
+    def __init__(self, atomic=None):
+        """Setup empty columns.
+
+        :param atomic: dict, generalized info about atomic actions, the same
+                       as `atomic' in workload info. If None, it is
+                       collected from the added iterations
+        """
+        self._collect_atomic = atomic is None
+        self._atomic = collections.OrderedDict() if atomic is None else atomic
+        self.timestamp = array.array("d")
+        self.duration = array.array("d")
+        self.idle_duration = array.array("d")
+        self.error = array.array("B")
+        self._atomic_durations = collections.OrderedDict()
+        self._atomic_calls = collections.OrderedDict()
+        self._atomics = None
+        self.iterations_failed = 0
+        self.min_duration = 0
+        self.max_duration = 0
+        self.tstamp_start = 0
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def _collect_info(self, iteration, atomic_actions):
+        if self._collect_atomic:
+            for name, (duration, count) in atomic_actions.items():
+                value = self._atomic.get(name)
+                if value is None or count > value["count"]:
+                    self._atomic[name] = {"min_duration": duration,
+                                          "max_duration": duration,
+                                          "count": count}
+                elif count == value["count"]:
+                    value["min_duration"] = min(value["min_duration"],
+                                                duration)
+                    value["max_duration"] = max(value["max_duration"],
+                                                duration)
+
+        if not self.tstamp_start or iteration["timestamp"] < self.tstamp_start:
+            self.tstamp_start = iteration["timestamp"]
+
+        if iteration["error"]:
+            self.iterations_failed += 1
+        else:
+            duration = iteration["duration"] or 0
+            if not self.min_duration or duration < self.min_duration:
+                self.min_duration = duration
+            if not self.max_duration or duration > self.max_duration:
+                self.max_duration = duration
+
+    def add_iteration(self, iteration):
+        atomic_actions = collections.OrderedDict()
+        for action in iteration["atomic_actions"]:
+            duration, count = atomic_actions.get(action["name"], (0, 0))
+            atomic_actions[action["name"]] = (
+                duration + action["finished_at"] - action["started_at"],
+                count + 1)
+        self._collect_info(iteration, atomic_actions)
+
+        size = len(self)
+        self.timestamp.append(iteration["timestamp"])
+        self.duration.append(iteration["duration"] or 0)
+        self.idle_duration.append(iteration["idle_duration"] or 0)
+        self.error.append(1 if iteration["error"] else 0)
+        for name in atomic_actions:
+            if name not in self._atomic_durations:
+                self._atomic_durations[name] = array.array(
+                    "d", [float("nan")] * size)
+                self._atomic_calls[name] = array.array("I", [0] * size)
+        for name, durations in self._atomic_durations.items():
+            duration, count = atomic_actions.get(name, (float("nan"), 0))
+            durations.append(duration)
+            self._atomic_calls[name].append(count)
+        self._atomics = None
+
+    @property
+    def atomics(self):
+        """Merged durations of atomic actions, column by column.
+
+        An atomic action called N times per iteration is named as
+        AtomicMerger names it, i.e. "action (xN)".
+        """
+        if self._atomics is None:
+            nan = float("nan")
+            merger = AtomicMerger(self._atomic)
+            self._atomics = collections.OrderedDict()
+            for name, value in self._atomic.items():
+                count = value.get("count", 1)
+                durations = self._atomic_durations.get(name)
+                if durations is None:
+                    column = array.array("d", [nan] * len(self))
+                else:
+                    column = array.array("d", [
+                        d if c == count else nan
+                        for d, c in zip(durations, self._atomic_calls[name])])
+                self._atomics[merger.get_merged_name(name)] = column
+        return self._atomics
+
+    def get_info(self):
+        """Get generalized info about the added iterations.
+
+        :returns: dict with the same keys as `info' of extended workload
+                  results, except durations of the workload and `stat'
+        """
+        return {"atomic": self._atomic,
+                "iterations_count": len(self),
+                "iterations_failed": self.iterations_failed,
+                "min_duration": self.min_duration,
+                "max_duration": self.max_duration,
+                "tstamp_start": self.tstamp_start}
+
+    def atomic_columns(self, missed=None):
+        """Get atomic actions durations column by column.
+
+        :param missed: value to use for atomic actions missed in iteration
+        :returns: list of tuples (merged_name, list of durations)
+        """
+        return [(name, [missed if math.isnan(v) else v for v in column])
+                for name, column in self.atomics.items()]
+
+    def iterations(self):
+        """Restore iterations from the columns, one by one.
+
+        Only values kept in the store are restored: `error' of a failed
+        iteration is a list of empty strings, and an atomic action called
+        several times per iteration is split into calls of equal duration.
+        """
+        calls = [(name, value.get("count", 1))
+                 for name, value in self._atomic.items()]
+        columns = list(self.atomics.values())
+        for i in range(len(self)):
+            atomic_actions = []
+            started_at = self.timestamp[i]
+            for (name, count), column in zip(calls, columns):
+                if math.isnan(column[i]):
+                    continue
+                for _ in range(count):
+                    finished_at = started_at + column[i] / count
+                    atomic_actions.append({"name": name, "children": [],
+                                           "started_at": started_at,
+                                           "finished_at": finished_at})
+                    started_at = finished_at
+            yield {"timestamp": self.timestamp[i],
+                   "duration": self.duration[i],
+                   "idle_duration": self.idle_duration[i],
+                   "error": ["", "", ""] if self.error[i] else [],
+                   "atomic_actions": atomic_actions}
+
+
+class DurationStats(object):
+    """Mergeable statistics of a single action (or of whole iterations).
+
+    Min, max, percentiles, mean and standard deviation are calculated over
+    durations of successful iterations only, the same way MainStatsTable
+    does it, while success rate and count take all iterations into account.
+    """
+
+    def __init__(self):
+        self._min = streaming.MinComputation()
+        self._median = streaming.PercentileComputation(0.5)
+        self._90ile = streaming.PercentileComputation(0.9)
+        self._95ile = streaming.PercentileComputation(0.95)
+        self._max = streaming.MaxComputation()
+        self._avg = streaming.MeanComputation()
+        self._stddev = streaming.StdDevComputation()
+        self._success = streaming.MeanComputation()
+        self._count = streaming.IncrementComputation()
+
+    def _durations_algorithms(self):
+        return (self._min, self._median, self._90ile, self._95ile,
+                self._max, self._avg, self._stddev)
+
+    def add(self, duration, success=True):
+        self._count.add()
+        self._success.add(1 if success else 0)
+        if success:
+            for algorithm in self._durations_algorithms():
+                algorithm.add(duration)
+
+    def merge(self, other):
+        self._count.merge(other._count)
+        self._success.merge(other._success)
+        if other._min.result() is not None:
+            for algorithm, other_algorithm in zip(
+                    self._durations_algorithms(),
+                    other._durations_algorithms()):
+                algorithm.merge(other_algorithm)
+
+    def result(self):
+        return collections.OrderedDict([
+            ("min", self._min.result()),
+            ("median", self._median.result()),
+            ("90%ile", self._90ile.result()),
+            ("95%ile", self._95ile.result()),
+            ("max", self._max.result()),
+            ("avg", self._avg.result()),
+            ("stddev", self._stddev.result()),
+            ("success", self._success.result()),
+            ("count", self._count.result())])
+
+
+class WorkloadStats(object):
+    """Mergeable aggregate of workload iterations.
+
+    It is updated once per iteration result and allows to get the workload
+    summary without scanning raw iterations again. Several instances (for
+    example, built by each worker process) can be combined with merge().
+
+    Atomic actions are named workload-wide the way AtomicMerger names them,
+    i.e. "action (xN)" where N is the max number of calls of the action per
+    iteration; iterations which call it a different number of times are
+    not taken into account, like in MainStatsTable.
+    """
+
+    def __init__(self):
+        self.iterations_count = 0
+        self.iterations_failed = 0
+        self.total = DurationStats()
+        # NOTE: stats of atomic actions are kept per number of calls in
+        #     iteration, because the max one is known only at the end
+        self.atomics = collections.OrderedDict()
+
+    @staticmethod
+    def _merge_atomic_actions(atomic_actions):
+        merged = collections.OrderedDict()
+        for action in atomic_actions:
+            duration, count = merged.get(action["name"], (0, 0))
+            merged[action["name"]] = (
+                duration + action["finished_at"] - action["started_at"],
+                count + 1)
+        return merged
+
+    def _get_stats(self, name, count):
+        stats = self.atomics.setdefault(name, {})
+        if count not in stats:
+            stats[count] = DurationStats()
+        return stats[count]
+
+    def add_iteration(self, iteration):
+        success = not iteration.get("error")
+        self.iterations_count += 1
+        if not success:
+            self.iterations_failed += 1
+        self.total.add(iteration["duration"], success)
+
+        for name, (duration, count) in self._merge_atomic_actions(
+                iteration.get("atomic_actions", [])).items():
+            self._get_stats(name, count).add(duration, success)
+
+    def merge(self, other):
+        self.iterations_count += other.iterations_count
+        self.iterations_failed += other.iterations_failed
+        self.total.merge(other.total)
+        for name, stats in other.atomics.items():
+            for count, count_stats in stats.items():
+                self._get_stats(name, count).merge(count_stats)
+
+    def result(self):
+        atomic = collections.OrderedDict(
+            (name, {"count": max(stats)})
+            for name, stats in self.atomics.items())
+        merger = AtomicMerger(atomic)
+        return {"iterations_count": self.iterations_count,
+                "iterations_failed": self.iterations_failed,
+                "total": self.total.result(),
+                "atomics": collections.OrderedDict(
+                    (merger.get_merged_name(name),
+                     self.atomics[name][value["count"]].result())
+                    for name, value in atomic.items())}
@@ -17,6 +17,7 @@ import abc
 import collections
 import copy
 import multiprocessing
+import threading
 import time
 
 import six
@@ -26,6 +27,7 @@ from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.common import validation
 from rally.task.processing import charts
+from rally.task.processing import utils as putils
 from rally.task import scenario
 from rally.task import types
 from rally.task import utils
@@ -45,12 +47,49 @@ def format_result_on_timeout(exc, timeout):
     }
 
 
+# NOTE: parts of the context which iterations only read. They are locked
+#       for changes once per workload and shared by all iterations instead
+#       of being deep-copied for each of them.
+SHARED_CONTEXT_KEYS = ("admin", "config", "sorted_tenant_ids", "task",
+                       "tenants", "users")
+
+_IMMUTABLE_TYPES = (six.string_types, six.integer_types, float, bool,
+                    type(None))
+
+
+def _lock(value):
+    if isinstance(value, dict):
+        return rutils.LockedDict(value)
+    elif isinstance(value, list):
+        return tuple([_lock(v) for v in value])
+    return value
+
+
+def _share_context(context_obj):
+    """Returns a copy of the context with read-only shared parts."""
+    context_obj = dict(context_obj)
+    for key in SHARED_CONTEXT_KEYS:
+        if key in context_obj:
+            context_obj[key] = _lock(context_obj[key])
+    return context_obj
+
+
 def _get_scenario_context(iteration, context_obj):
-    context_obj = copy.deepcopy(context_obj)
+    context_obj = dict(
+        (key, value if key in SHARED_CONTEXT_KEYS else copy.deepcopy(value))
+        for key, value in context_obj.items())
     context_obj["iteration"] = iteration + 1  # Numeration starts from `1'
     return context_obj
 
 
+def _copy_scenario_kwargs(scenario_kwargs):
+    # NOTE: the scenario gets the arguments as **kwargs, so a new dict is
+    #       created for each call anyway, only mutable values are copied
+    return dict((key, value if isinstance(value, _IMMUTABLE_TYPES)
+                 else copy.deepcopy(value))
+                for key, value in scenario_kwargs.items())
+
+
 def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
                        event_queue):
     iteration = context_obj["iteration"]
@@ -60,7 +99,7 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
     })
 
     # provide arguments isolation between iterations
-    scenario_kwargs = copy.deepcopy(scenario_kwargs)
+    scenario_kwargs = _copy_scenario_kwargs(scenario_kwargs)
 
     LOG.info("Task %(task)s | ITER: %(iteration)s START" %
              {"task": context_obj["task"]["uuid"], "iteration": iteration})
@@ -94,6 +133,148 @@ def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs,
                                  scenario_kwargs, event_queue))
 
 
+_RESULT_SCHEMA = {
+    "fields": [("duration", float), ("timestamp", float),
+               ("idle_duration", float), ("output", dict),
+               ("atomic_actions", list), ("error", list)]
+}
+
+
+def _result_has_valid_schema(result, task):
+    """Check whatever result has valid schema or not."""
+    # NOTE(boris-42): We can't use here jsonschema, this method is called
+    #                 to check every iteration result schema. And this
+    #                 method works 200 times faster then jsonschema
+    #                 which totally makes sense.
+    for key, proper_type in _RESULT_SCHEMA["fields"]:
+        if key not in result:
+            LOG.warning("'%s' is not result" % key)
+            return False
+        if not isinstance(result[key], proper_type):
+            LOG.warning(
+                "Task %(uuid)s | result['%(key)s'] has wrong type "
+                "'%(actual_type)s', should be '%(proper_type)s'"
+                % {"uuid": task["uuid"],
+                   "key": key,
+                   "actual_type": type(result[key]),
+                   "proper_type": proper_type.__name__})
+            return False
+
+    # NOTE: actions are only read here, so a shallow copy of the list is
+    #       enough to walk through the nested ones
+    actions_list = list(result["atomic_actions"])
+    for action in actions_list:
+        for key in ("name", "started_at", "finished_at", "children"):
+            if key not in action:
+                LOG.warning(
+                    "Task %(uuid)s | Atomic action %(action)s "
+                    "missing key '%(key)s'"
+                    % {"uuid": task["uuid"],
+                       "action": action,
+                       "key": key})
+                return False
+        for key in ("started_at", "finished_at"):
+            if not isinstance(action[key], float):
+                LOG.warning(
+                    "Task %(uuid)s | Atomic action %(action)s has "
+                    "wrong type '%(type)s', should be 'float'"
+                    % {"uuid": task["uuid"],
+                       "action": action,
+                       "type": type(action[key])})
+                return False
+        if action["children"]:
+            actions_list.extend(action["children"])
+
+    for e in result["error"]:
+        if not isinstance(e, str):
+            LOG.warning("error value has wrong type '%s', should be 'str'"
+                        % type(e))
+            return False
+
+    for key in ("additive", "complete"):
+        if key not in result["output"]:
+            LOG.warning("Task %(uuid)s | Output missing key '%(key)s'"
+                        % {"uuid": task["uuid"], "key": key})
+            return False
+
+        type_ = type(result["output"][key])
+        if type_ != list:
+            LOG.warning(
+                "Task %(uuid)s | Value of result['output']['%(key)s'] "
+                "has wrong type '%(type)s', must be 'list'"
+                % {"uuid": task["uuid"],
+                   "key": key, "type": type_.__name__})
+            return False
+
+    for key in result["output"]:
+        for output_data in result["output"][key]:
+            message = charts.validate_output(key, output_data)
+            if message:
+                LOG.warning("Task %(uuid)s | %(message)s"
+                            % {"uuid": task["uuid"],
+                               "message": message})
+                return False
+
+    return True
+
+
+class ResultsBatch(object):
+    """Results of iterations with statistics aggregated over them."""
+
+    def __init__(self):
+        self.results = []
+        self.stats = putils.WorkloadStats()
+
+    def add(self, result):
+        self.results.append(result)
+        self.stats.add_iteration(result)
+
+    def __len__(self):
+        return len(self.results)
+
+
+# NOTE: interval (in seconds) at which worker processes send their results
+RESULTS_SEND_INTERVAL = 1.0
+
+
+class _BatchQueue(object):
+    """Queue of worker process results, which batches them on the way.
+
+    Results are checked against the result schema and aggregated in the
+    worker process, and they are put to the wrapped queue as ResultsBatch
+    at intervals and on flush(), which is called when the worker is done.
+    So the main process neither checks nor aggregates every iteration.
+    """
+
+    def __init__(self, queue, task, interval=RESULTS_SEND_INTERVAL):
+        self.queue = queue
+        self.task = task
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._batch = ResultsBatch()
+        self._sent_at = time.time()
+
+    def put(self, result):
+        if not _result_has_valid_schema(result, self.task):
+            LOG.warning("Task %s | Worker is trying to send results in "
+                        "wrong format" % self.task["uuid"])
+            return
+        with self._lock:
+            self._batch.add(result)
+            if time.time() - self._sent_at >= self.interval:
+                self._send()
+
+    def flush(self):
+        with self._lock:
+            self._send()
+
+    def _send(self):
+        if self._batch:
+            self.queue.put(self._batch)
+            self._batch = ResultsBatch()
+        self._sent_at = time.time()
+
+
 def _log_worker_info(**info):
     """Log worker parameters for debugging.
 
@@ -137,12 +318,15 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         """
         self.task = task
         self.config = config
-        self.result_queue = collections.deque()
-        self.event_queue = collections.deque()
+        self.result_queue = rutils.WaitableDeque()
+        self.event_queue = rutils.WaitableDeque()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0
+        # NOTE: workload statistics collected by the runner itself, they are
+        #     saved with statistics of the workload
+        self.statistics = {}
         self.batch_size = batch_size
-        self.result_batch = []
+        self.result_batch = ResultsBatch()
 
     @abc.abstractmethod
     def _run_scenario(self, cls, method_name, context, args):
@@ -163,6 +347,7 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
 
         # NOTE(boris-42): processing @types decorators
         args = types.preprocess(name, context, args)
+        context = _share_context(context)
 
         if scenario_plugin.is_classbased:
             cls, method_name = scenario_plugin, "run"
@@ -205,23 +390,39 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
     def _join_processes(self, process_pool, result_queue, event_queue):
         """Join the processes in the pool and send their results to the queue.
 
+        Results and events are read with blocking calls: the queues are
+        drained as soon as workers put something there and the pool is
+        considered finished when the ``None`` marker, which is put after all
+        processes exited, is received. Workers send results in batches which
+        are already checked and aggregated (see _BatchQueue), so they are
+        passed to the consumer as is.
+
         :param process_pool: pool of processes to join
         :param result_queue: multiprocessing.Queue that receives the results
         :param event_queue: multiprocessing.Queue that receives the events
         """
-        while process_pool:
-            while process_pool and not process_pool[0].is_alive():
+        def join_pool():
+            while process_pool:
                 process_pool.popleft().join()
+            # NOTE: processes flush their queues before exit, so the markers
+            #     are received after all results and events.
+            result_queue.put(None)
+            event_queue.put(None)
+
+        def consume_events():
+            for event in iter(event_queue.get, None):
+                self.send_event(**event)
 
-            if result_queue.empty() and event_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.01)
+        pool_joiner = threading.Thread(target=join_pool)
+        pool_joiner.start()
+        events_consumer = threading.Thread(target=consume_events)
+        events_consumer.start()
 
-            while not event_queue.empty():
-                self.send_event(**event_queue.get())
+        for batch in iter(result_queue.get, None):
+            self._send_results_batch(batch)
 
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+        pool_joiner.join()
+        events_consumer.join()
 
         self._flush_results()
         result_queue.close()
@@ -229,90 +430,12 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
 
     def _flush_results(self):
         if self.result_batch:
-            sorted_batch = sorted(self.result_batch)
-            self.result_queue.append(sorted_batch)
-            del self.result_batch[:]
-
-    _RESULT_SCHEMA = {
-        "fields": [("duration", float), ("timestamp", float),
-                   ("idle_duration", float), ("output", dict),
-                   ("atomic_actions", list), ("error", list)]
-    }
+            self.result_queue.append(self.result_batch)
+            self.result_batch = ResultsBatch()
 
     def _result_has_valid_schema(self, result):
         """Check whatever result has valid schema or not."""
-        # NOTE(boris-42): We can't use here jsonschema, this method is called
-        #                 to check every iteration result schema. And this
-        #                 method works 200 times faster then jsonschema
-        #                 which totally makes sense.
-        for key, proper_type in self._RESULT_SCHEMA["fields"]:
-            if key not in result:
-                LOG.warning("'%s' is not result" % key)
-                return False
-            if not isinstance(result[key], proper_type):
-                LOG.warning(
-                    "Task %(uuid)s | result['%(key)s'] has wrong type "
-                    "'%(actual_type)s', should be '%(proper_type)s'"
-                    % {"uuid": self.task["uuid"],
-                       "key": key,
-                       "actual_type": type(result[key]),
-                       "proper_type": proper_type.__name__})
-                return False
-
-        actions_list = copy.deepcopy(result["atomic_actions"])
-        for action in actions_list:
-            for key in ("name", "started_at", "finished_at", "children"):
-                if key not in action:
-                    LOG.warning(
-                        "Task %(uuid)s | Atomic action %(action)s "
-                        "missing key '%(key)s'"
-                        % {"uuid": self.task["uuid"],
-                           "action": action,
-                           "key": key})
-                    return False
-            for key in ("started_at", "finished_at"):
-                if not isinstance(action[key], float):
-                    LOG.warning(
-                        "Task %(uuid)s | Atomic action %(action)s has "
-                        "wrong type '%(type)s', should be 'float'"
-                        % {"uuid": self.task["uuid"],
-                           "action": action,
-                           "type": type(action[key])})
-                    return False
-            if action["children"]:
-                actions_list.extend(action["children"])
-
-        for e in result["error"]:
-            if not isinstance(e, str):
-                LOG.warning("error value has wrong type '%s', should be 'str'"
-                            % type(e))
-                return False
-
-        for key in ("additive", "complete"):
-            if key not in result["output"]:
-                LOG.warning("Task %(uuid)s | Output missing key '%(key)s'"
-                            % {"uuid": self.task["uuid"], "key": key})
-                return False
-
-            type_ = type(result["output"][key])
-            if type_ != list:
-                LOG.warning(
-                    "Task %(uuid)s | Value of result['output']['%(key)s'] "
-                    "has wrong type '%(type)s', must be 'list'"
-                    % {"uuid": self.task["uuid"],
-                       "key": key, "type": type_.__name__})
-                return False
-
-        for key in result["output"]:
-            for output_data in result["output"][key]:
-                message = charts.validate_output(key, output_data)
-                if message:
-                    LOG.warning("Task %(uuid)s | %(message)s"
-                                % {"uuid": self.task["uuid"],
-                                   "message": message})
-                    return False
-
-        return True
+        return _result_has_valid_schema(result, self.task)
 
     def _send_result(self, result):
         """Store partial result to send it to consumer later.
@@ -329,13 +452,17 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
                 % {"task": self.task["uuid"], "runner": self.get_name()})
             return
 
-        self.result_batch.append(result)
+        self.result_batch.add(result)
 
         if len(self.result_batch) >= self.batch_size:
-            sorted_batch = sorted(self.result_batch,
-                                  key=lambda r: result["timestamp"])
-            self.result_queue.append(sorted_batch)
-            del self.result_batch[:]
+            self._flush_results()
+
+    def _send_results_batch(self, batch):
+        """Send results which are already checked and aggregated.
+
+        :param batch: ResultsBatch received from a worker process
+        """
+        self.result_queue.append(batch)
 
     def send_event(self, type, value=None):
         """Store event to send it to consumer later.
@@ -15,6 +15,8 @@
 
 import collections
 import itertools
+import os
+import threading
 import time
 import traceback
 
@@ -173,10 +175,346 @@ def wait_is_ready(resource, is_ready, update_resource=None,
                 resource_status=get_status(resource))
 
 
+def _get_id(resource, id_attr="id"):
+    if isinstance(resource, dict):
+        return resource.get(id_attr)
+    return getattr(resource, id_attr, None)
+
+
+class StatusFuture(object):
+    """Result of waiting for the resource status with StatusWatcher."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def set_result(self, result):
+        self._result = result
+        self._done.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def result(self):
+        """Wait for the resource and return it or raise the error."""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class _WatchedResource(object):
+
+    def __init__(self, resource, ready_statuses, failure_statuses,
+                 status_attr, id_attr, check_deletion, timeout,
+                 check_interval):
+        self.resource = resource
+        self.resource_id = _get_id(resource, id_attr)
+        self.resource_repr = getattr(resource, "name", repr(resource))
+        self.ready_statuses = ready_statuses
+        self.failure_statuses = failure_statuses
+        self.status_attr = status_attr
+        self.id_attr = id_attr
+        self.check_deletion = check_deletion
+        self.check_interval = check_interval
+        self.status = get_status(resource, status_attr)
+        self.status_updated_at = time.time()
+        self.deadline = self.status_updated_at + timeout
+        self.future = StatusFuture()
+
+    def update(self, resources_by_id):
+        """Check the resource in the fresh list of resources.
+
+        :returns: True if the status of the resource is changed
+        """
+        resource = resources_by_id.get(self.resource_id)
+        status = ("DELETED" if resource is None
+                  else get_status(resource, self.status_attr))
+        changed = status != self.status
+        if changed:
+            current_time = time.time()
+            LOG.debug(
+                "Waiting for resource %(resource)s. Status changed: "
+                "%(latest)s => %(current)s in %(delta)s" %
+                {"resource": self.resource_repr, "latest": self.status,
+                 "current": status,
+                 "delta": current_time - self.status_updated_at})
+            self.status = status
+            self.status_updated_at = current_time
+        if resource is not None:
+            self.resource = resource
+
+        if resource is not None and status in self.ready_statuses:
+            self.future.set_result(resource)
+        elif status in ("DELETED", "DELETE_COMPLETE"):
+            if self.check_deletion:
+                self.future.set_result(None)
+            else:
+                self.future.set_error(
+                    exceptions.GetResourceNotFound(resource=self.resource))
+        elif status in self.failure_statuses:
+            self.future.set_error(exceptions.GetResourceErrorStatus(
+                resource=resource,
+                status=status,
+                fault="Status in failure list %s" % str(
+                    self.failure_statuses)))
+        return changed
+
+    def check_timeout(self, now):
+        if now > self.deadline:
+            self.future.set_error(exceptions.TimeoutException(
+                desired_status="('%s')" % "', '".join(self.ready_statuses),
+                resource_name=self.resource_repr,
+                resource_type=self.resource.__class__.__name__,
+                resource_id=_get_id(self.resource, self.id_attr) or "<no id>",
+                resource_status=self.status))
+
+
+class _WatchGroup(object):
+
+    def __init__(self, key, list_resources):
+        self.key = key
+        self.list_resources = list_resources
+        self.resources = []
+        self.interval = None
+        self.next_poll = time.time()
+        self.polling = False
+        self.list_thread = None
+
+
+class StatusWatcher(object):
+    """Waits for statuses of many resources in the background.
+
+    Resources are grouped by a key (by default, the function that lists
+    them), so statuses of all the awaited resources of the same group are
+    refreshed with a single list call instead of a get call per resource.
+    Groups are polled by at most `workers` threads, so a slow list call of
+    one group does not delay the others, and the watcher stops waiting for
+    a list call after `list_timeout` seconds.
+
+    If no status is changed in a group between two polls, the interval of
+    polling of the group grows up to `max_backoff` times of the minimal
+    check interval of its resources.
+    """
+
+    def __init__(self, backoff_factor=1.5, max_backoff=4, workers=4,
+                 list_timeout=60):
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.workers = workers
+        self.list_timeout = list_timeout
+        self.pid = os.getpid()
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def watch(self, resource, list_resources, ready_statuses,
+              failure_statuses=None, status_attr="status", id_attr="id",
+              check_deletion=False, timeout=60, check_interval=1,
+              group_key=None):
+        """Start watching the resource.
+
+        :param resource: The resource object or dict
+        :param list_resources: Function that returns a list of resources
+                               which includes the awaited one while it
+                               exists. Resources with the same function are
+                               refreshed together
+        :param ready_statuses: List of statuses which mean that the resource
+                               is ready
+        :param failure_statuses: List of statuses which mean that an error
+                                 has occurred while waiting for the resource
+        :param status_attr: The name of the status attribute of the resource
+        :param id_attr: The name of the id attribute of the resource
+        :param check_deletion: If True, the missing resource is considered
+                               ready, otherwise GetResourceNotFound is raised
+        :param timeout: Timeout in seconds after which a TimeoutException will
+                        be raised
+        :param check_interval: Minimal interval in seconds between the two
+                               consecutive checks
+        :param group_key: Hashable key of the group of resources which are
+                          refreshed together. Pass a key which does not
+                          depend on the caller object (e.g. the tenant id and
+                          the resource type) to share the list calls between
+                          iterations. Defaults to list_resources; the group
+                          is listed by list_resources of its first resource
+        :returns: StatusFuture
+        """
+        watched = _WatchedResource(
+            resource,
+            ready_statuses=set(s.upper() for s in ready_statuses),
+            failure_statuses=set(s.upper() for s in failure_statuses or []),
+            status_attr=status_attr, id_attr=id_attr,
+            check_deletion=check_deletion, timeout=timeout,
+            check_interval=check_interval)
+        if group_key is None:
+            group_key = list_resources
+        with self._lock:
+            group = self._groups.get(group_key)
+            if group is None:
+                group = self._groups[group_key] = _WatchGroup(
+                    group_key, list_resources)
+            group.resources.append(watched)
+            if group.interval is None or check_interval < group.interval:
+                group.interval = check_interval
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        self._wakeup.set()
+        return watched.future
+
+    def _run(self):
+        groups_queue = six.moves.queue.Queue()
+        pollers = []
+        try:
+            while True:
+                self._wakeup.clear()
+                with self._lock:
+                    if not self._groups:
+                        self._thread = None
+                        return
+                    now = time.time()
+                    groups = [g for g in self._groups.values()
+                              if not g.polling and g.next_poll <= now]
+                    for group in groups:
+                        group.polling = True
+                    next_polls = [g.next_poll for g in self._groups.values()
+                                  if not g.polling]
+                for group in groups:
+                    groups_queue.put(group)
+                    if len(pollers) < self.workers:
+                        poller = threading.Thread(target=self._poller,
+                                                  args=(groups_queue,))
+                        poller.daemon = True
+                        poller.start()
+                        pollers.append(poller)
+                # NOTE: pollers wake up the loop when a group is polled
+                self._wakeup.wait(
+                    min(next_polls) - now if next_polls else None)
+        finally:
+            for poller in pollers:
+                groups_queue.put(None)
+
+    def _poller(self, groups_queue):
+        while True:
+            group = groups_queue.get()
+            if group is None:
+                return
+            try:
+                self._poll(group)
+            finally:
+                group.polling = False
+                self._wakeup.set()
+
+    def _list(self, group):
+        """Call list_resources() of the group, waiting up to list_timeout.
+
+        A list call which is not finished in time is left running in its
+        thread and the group is not listed again until it finishes.
+        """
+        if group.list_thread is not None and group.list_thread.is_alive():
+            raise exceptions.RallyException(
+                _("the previous list call is not finished"))
+        result = {}
+
+        def list_resources():
+            try:
+                result["resources"] = group.list_resources()
+            except Exception as e:
+                result["error"] = e
+
+        group.list_thread = threading.Thread(target=list_resources)
+        group.list_thread.daemon = True
+        group.list_thread.start()
+        group.list_thread.join(self.list_timeout)
+        if group.list_thread.is_alive():
+            raise exceptions.RallyException(
+                _("the list call is not finished in %s seconds")
+                % self.list_timeout)
+        if "error" in result:
+            raise result["error"]
+        return result["resources"]
+
+    def _poll(self, group):
+        with self._lock:
+            watched = list(group.resources)
+
+        changed = False
+        try:
+            resources = self._list(group)
+        except Exception as e:
+            LOG.warning(_("Failed to list resources to check their "
+                          "statuses: %s") % e)
+        else:
+            indexes = {}
+            for w in watched:
+                if w.id_attr not in indexes:
+                    indexes[w.id_attr] = dict(
+                        (_get_id(r, w.id_attr), r) for r in resources)
+                try:
+                    changed = w.update(indexes[w.id_attr]) or changed
+                except Exception as e:
+                    w.future.set_error(e)
+        now = time.time()
+        for w in watched:
+            if not w.future.done():
+                w.check_timeout(now)
+
+        with self._lock:
+            group.resources = [w for w in group.resources
+                               if not w.future.done()]
+            if not group.resources:
+                del self._groups[group.key]
+                return
+            min_interval = min(w.check_interval for w in group.resources)
+            if changed:
+                group.interval = min_interval
+            else:
+                group.interval = min(group.interval * self.backoff_factor,
+                                     min_interval * self.max_backoff)
+            group.next_poll = now + group.interval
+
+
+_status_watcher = None
+_status_watcher_lock = threading.Lock()
+
+
+def get_status_watcher():
+    """Returns StatusWatcher shared by the current process."""
+    global _status_watcher
+    with _status_watcher_lock:
+        # NOTE: the thread of the watcher is not inherited by forked
+        #       processes, so each process has its own watcher
+        if _status_watcher is None or _status_watcher.pid != os.getpid():
+            _status_watcher = StatusWatcher()
+        return _status_watcher
+
+
+def wait_for_statuses(resources, ready_statuses, list_resources, **kwargs):
+    """Wait for statuses of many resources at once.
+
+    All the resources are refreshed together by the shared StatusWatcher,
+    see StatusWatcher.watch() for the arguments.
+
+    :returns: list of the refreshed resources in the same order
+    """
+    watcher = get_status_watcher()
+    futures = [watcher.watch(resource, list_resources, ready_statuses,
+                             **kwargs)
+               for resource in resources]
+    return [future.result() for future in futures]
+
+
 def wait_for_status(resource, ready_statuses, failure_statuses=None,
                     status_attr="status", update_resource=None,
                     timeout=60, check_interval=1, check_deletion=False,
-                    id_attr="id"):
+                    id_attr="id", list_resources=None, group_key=None):
 
     resource_repr = getattr(resource, "name", repr(resource))
     if not isinstance(ready_statuses, (set, list, tuple)):
@@ -199,11 +537,21 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
         raise ValueError(
             "Can't wait for resource's %s status. No ready "
             "statuses provided" % resource_repr)
-    if not update_resource:
+    if not (update_resource or list_resources):
         raise ValueError(
             "Can't wait for resource's %s status. No update method."
             % resource_repr)
 
+    if list_resources is not None:
+        # NOTE: the resource is refreshed by the shared watcher together
+        #       with other awaited resources returned by list_resources()
+        return wait_for_statuses(
+            [resource], ready_statuses, list_resources,
+            failure_statuses=failure_statuses, status_attr=status_attr,
+            id_attr=id_attr, check_deletion=check_deletion,
+            timeout=timeout, check_interval=check_interval,
+            group_key=group_key)[0]
+
     start = time.time()
 
     latest_status = get_status(resource, status_attr)
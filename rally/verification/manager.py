@@ -419,4 +419,10 @@ class VerifierManager(plugin.Plugin):
               ...
             }
 
+        If results of tests are saved while they are running (see
+        Verification.add_tests()), the object can also have
+        <object>.unreported_tests property with results of the tests that
+        are not saved yet or are changed since they were saved, in the same
+        format as <object>.tests. Only these tests are saved when the
+        verification is finished then.
         """
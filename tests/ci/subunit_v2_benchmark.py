@@ -0,0 +1,105 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the rate of parsing subunit v2 streams by Rally.
+
+A synthetic stream is generated like a Tempest run produces it: tests are
+grouped by classes, every tenth class is skipped as a whole by one
+setUpClass event and tracebacks of failed tests are split into chunks.
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime as dt
+import os
+import shutil
+import tempfile
+import time
+
+from subunit import iso8601
+from subunit import v2
+
+from rally.common.io import subunit_v2
+
+
+TRACEBACK_CHUNK = b"  File \"test.py\", line 42, in test\n"
+
+
+def generate_stream(stream, tests, tests_per_class):
+    output = v2.StreamResultToBytes(stream)
+    timestamp = dt.datetime(2017, 1, 1, tzinfo=iso8601.UTC)
+    step = dt.timedelta(milliseconds=10)
+    classes = (tests + tests_per_class - 1) // tests_per_class
+
+    for cls_num in range(classes):
+        cls_id = "tempest.api.module%d.test_module.TestClass%d" % (
+            cls_num % 100, cls_num)
+        test_ids = ["%s.test_%d[id-%d,smoke]" % (cls_id, i, i)
+                    for i in range(tests_per_class)]
+        for test_id in test_ids:
+            output.status(test_id=test_id, test_status="exists")
+
+        if cls_num % 10 == 9:
+            output.status(test_id="setUpClass (%s)" % cls_id,
+                          test_status="skip", timestamp=timestamp,
+                          file_name="reason", file_bytes=b"Skipped class",
+                          mime_type="text/plain; charset=utf8")
+            continue
+
+        for i, test_id in enumerate(test_ids):
+            output.status(test_id=test_id, test_status="inprogress",
+                          timestamp=timestamp)
+            timestamp += step
+            if i % 20 == 0:
+                for _ in range(50):
+                    output.status(test_id=test_id, file_name="traceback",
+                                  file_bytes=TRACEBACK_CHUNK,
+                                  mime_type="text/plain; charset=utf8")
+                status = "fail"
+            else:
+                status = "success"
+            output.status(test_id=test_id, test_status=status,
+                          timestamp=timestamp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--tests", type=int, default=50000,
+                        help="The number of tests in the stream.")
+    parser.add_argument("--tests-per-class", type=int, default=50,
+                        help="The number of tests in one test class.")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tmp_dir, "subunit_v2.stream")
+        with open(filename, "wb") as stream:
+            generate_stream(stream, args.tests, args.tests_per_class)
+
+        started_at = time.time()
+        results = subunit_v2.parse_file(filename)
+        totals = results.totals
+        duration = time.time() - started_at
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    print("Parsed %(tests_count)d tests (%(success)d success, "
+          "%(failures)d failures, %(skipped)d skipped)" % totals)
+    print("Parsing took %.3f seconds, %.0f tests per second" % (
+        duration, totals["tests_count"] / duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -636,28 +636,34 @@ class TaskCommandsTestCase(test.TestCase):
         task_id = "eb290c30-38d8-4c8f-bbcc-fc8f74b004ae"
         data = [
             {"key": {"name": "class.test", "pos": 0},
-             "data": {"raw": "foo_raw", "sla": "foo_sla",
+             "data": {"workload_uuid": "foo_uuid", "sla": "foo_sla",
                       "hooks": "foo_hooks",
                       "load_duration": 0.1,
                       "full_duration": 1.2},
              "created_at": "2017-06-02 07:33:04"},
             {"key": {"name": "class.test", "pos": 0},
-             "data": {"raw": "bar_raw", "sla": "bar_sla",
+             "data": {"workload_uuid": "bar_uuid", "sla": "bar_sla",
                       "hooks": "bar_hooks",
                       "load_duration": 2.1,
                       "full_duration": 2.2},
              "created_at": "2017-06-02 07:33:04"}]
 
         results = [{"key": x["key"],
-                    "result": x["data"]["raw"],
+                    "result": mock.ANY,
                     "sla": x["data"]["sla"],
                     "hooks": x["data"]["hooks"],
+                    "statistics": None,
                     "load_duration": x["data"]["load_duration"],
                     "full_duration": x["data"]["full_duration"],
                     "created_at": x["created_at"]}
                    for x in data]
         self.fake_api.task.get_detailed.return_value = {"results": data}
-        mock_plot.plot.return_value = "html_report"
+        self.fake_api.task.get_workload_data.side_effect = (
+            lambda workload_uuid, chunk: {
+                "iterations_count": 2,
+                "iterations": [workload_uuid + "_itr%d" % (chunk + 1)],
+                "next_chunk": None if chunk else 1})
+        mock_plot.generate_plot.return_value = ["html_", "report"]
 
         def reset_mocks():
             for m in (self.fake_api.task.get_detailed, mock_webbrowser,
@@ -666,18 +672,25 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.report(self.fake_api, tasks=task_id,
                          out="/tmp/%s.html" % task_id)
         mock_open.assert_called_once_with("/tmp/%s.html" % task_id, "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.generate_plot.assert_called_once_with(results,
+                                                        include_libs=False)
+        self.assertEqual(
+            [["foo_uuid_itr1", "foo_uuid_itr2"],
+             ["bar_uuid_itr1", "bar_uuid_itr2"]],
+            [list(r["result"])
+             for r in mock_plot.generate_plot.call_args[0][0]])
 
-        mock_open.side_effect().write.assert_called_once_with("html_report")
+        self.assertEqual([mock.call("html_"), mock.call("report")],
+                         mock_open.side_effect().write.mock_calls)
         self.fake_api.task.get_detailed.assert_called_once_with(
-            task_id=task_id)
+            task_id=task_id, load_raw=False)
 
         # JUnit
         reset_mocks()
         self.task.report(self.fake_api, tasks=task_id,
                          out="/tmp/%s.html" % task_id, out_format="junit")
         mock_open.assert_called_once_with("/tmp/%s.html" % task_id, "w+")
-        self.assertFalse(mock_plot.plot.called)
+        self.assertFalse(mock_plot.generate_plot.called)
 
         # HTML
         reset_mocks()
@@ -685,14 +698,16 @@ class TaskCommandsTestCase(test.TestCase):
                          open_it=True, out_format="html")
         mock_webbrowser.open_new_tab.assert_called_once_with(
             "file://realpath_output.html")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.generate_plot.assert_called_once_with(results,
+                                                        include_libs=False)
 
         # HTML with embedded JS/CSS
         reset_mocks()
         self.task.report(self.fake_api, task_id, open_it=False,
                          out="output.html", out_format="html_static")
         self.assertFalse(mock_webbrowser.open_new_tab.called)
-        mock_plot.plot.assert_called_once_with(results, include_libs=True)
+        mock_plot.generate_plot.assert_called_once_with(results,
+                                                        include_libs=True)
 
     @mock.patch("rally.cli.commands.task.os.path.realpath",
                 side_effect=lambda p: "realpath_%s" % p)
@@ -706,13 +721,13 @@ class TaskCommandsTestCase(test.TestCase):
                  "eb290c30-38d8-4c8f-bbcc-fc8f74b004af"]
         data = [
             {"key": {"name": "test", "pos": 0},
-             "data": {"raw": "foo_raw", "sla": "foo_sla",
+             "data": {"workload_uuid": "foo_uuid", "sla": "foo_sla",
                       "hooks": "foo_hooks",
                       "load_duration": 0.1,
                       "full_duration": 1.2},
              "created_at": "2017-06-02 07:33:04"},
             {"key": {"name": "test", "pos": 0},
-             "data": {"raw": "bar_raw", "sla": "bar_sla",
+             "data": {"workload_uuid": "bar_uuid", "sla": "bar_sla",
                       "hooks": "bar_hooks",
                       "load_duration": 2.1,
                       "full_duration": 2.2},
@@ -722,27 +737,26 @@ class TaskCommandsTestCase(test.TestCase):
         for task_uuid in tasks:
             results.extend(
                 map(lambda x: {"key": x["key"],
-                               "result": x["data"]["raw"],
+                               "result": mock.ANY,
                                "sla": x["data"]["sla"],
                                "hooks": x["data"]["hooks"],
+                               "statistics": None,
                                "load_duration": x["data"]["load_duration"],
                                "full_duration": x["data"]["full_duration"],
                                "created_at": x["created_at"]},
                     data))
 
         self.fake_api.task.get_detailed.return_value = {"results": data}
-        mock_plot.plot.return_value = "html_report"
+        mock_plot.generate_plot.return_value = ["html_report"]
 
-        def reset_mocks():
-            for m in (self.fake_api.task.get_detailed, mock_webbrowser,
-                      mock_plot, mock_open):
-                m.reset_mock()
         self.task.report(self.fake_api, tasks=tasks, out="/tmp/1_test.html")
         mock_open.assert_called_once_with("/tmp/1_test.html", "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.generate_plot.assert_called_once_with(results,
+                                                        include_libs=False)
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
-        expected_get_calls = [mock.call(task_id=task) for task in tasks]
+        expected_get_calls = [mock.call(task_id=task, load_raw=False)
+                              for task in tasks]
         self.fake_api.task.get_detailed.assert_has_calls(
             expected_get_calls, any_order=True)
 
@@ -777,7 +791,7 @@ class TaskCommandsTestCase(test.TestCase):
                     "created_at": x["created_at"]}
                    for x in data]
 
-        mock_plot.plot.return_value = "html_report"
+        mock_plot.generate_plot.return_value = ["html_report"]
         mock_open.side_effect = mock.mock_open()
         self.task._load_task_results_file = mock.MagicMock(
             return_value=results
@@ -790,7 +804,8 @@ class TaskCommandsTestCase(test.TestCase):
             self.real_api, task_file)
         expected_open_calls = [mock.call("/tmp/1_test.html", "w+")]
         mock_open.assert_has_calls(expected_open_calls, any_order=True)
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.generate_plot.assert_called_once_with(results,
+                                                        include_libs=False)
         mock_open.side_effect().write.assert_called_once_with("html_report")
 
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=False)
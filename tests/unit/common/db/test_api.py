@@ -19,6 +19,7 @@ import collections
 import copy
 import datetime as dt
 import json
+import zlib
 
 import ddt
 import mock
@@ -28,6 +29,7 @@ from rally.common import db
 from rally.common.db import api as db_api
 from rally import consts
 from rally import exceptions
+from rally.task.processing import utils as putils
 from tests.unit import test
 
 NOW = dt.datetime.now()
@@ -51,6 +53,7 @@ class SerializeTestCase(test.DBTestCase):
         {"data": 1, "serialized": 1},
         {"data": 1.1, "serialized": 1.1},
         {"data": "a string", "serialized": "a string"},
+        {"data": b"bytes", "serialized": b"bytes"},
         {"data": NOW, "serialized": NOW},
         {"data": {"k1": 1, "k2": 2}, "serialized": {"k1": 1, "k2": 2}},
         {"data": [1, "foo"], "serialized": [1, "foo"]},
@@ -300,6 +303,7 @@ class TasksTestCase(test.DBTestCase):
             key["kw"]["args"]["task_id"] = task_id
             data["sla"][0] = {"success": True}
             data["raw"] = []
+            data["statistics"] = {}
             self.assertEqual(len(res), 1)
             self.assertEqual(res[0]["key"], key)
             self.assertEqual(res[0]["data"], data)
@@ -368,6 +372,33 @@ class TasksTestCase(test.DBTestCase):
                "name": "zzz"}]],
             [w["atomic_actions"] for w in results[0]["data"]["raw"]])
 
+    def test_task_result_get_all_by_uuid__transform_compressed_atomics(self):
+        task = self._create_task()["uuid"]
+        key = {"name": "atata", "description": "tatata", "pos": 0,
+               "kw": {"args": {}, "context": {}, "sla": {},
+                      "runner": {"type": "T"}, "hooks": []}}
+        subtask = db.subtask_create(task, title="foo")
+        workload = db.workload_create(task, subtask["uuid"], key)
+        for i, name in enumerate(("foo", "bar")):
+            db.workload_data_create(
+                task, workload["uuid"], i,
+                {"raw": [{"duration": 1, "timestamp": 1, "idle_duration": 1,
+                          "error": None, "output": None,
+                          "atomic_actions": {name: 1}}]},
+                compress=True)
+        db.workload_set_results(workload["uuid"], {"sla": [{"success": True}],
+                                                   "load_duration": 13,
+                                                   "full_duration": 42,
+                                                   "hooks": []})
+
+        results = db.task_result_get_all_by_uuid(task)
+        self.assertEqual(
+            [[{"started_at": 1, "finished_at": 2, "children": [],
+               "name": "foo"}],
+             [{"started_at": 1, "finished_at": 2, "children": [],
+               "name": "bar"}]],
+            [w["atomic_actions"] for w in results[0]["data"]["raw"]])
+
     def test_task_get_detailed(self):
         validation_result = {
             "etype": "FooError",
@@ -422,8 +453,16 @@ class TasksTestCase(test.DBTestCase):
             "load_duration": 13,
             "full_duration": 42,
             "hooks": [],
+            "statistics": {},
         }, results[0]["data"])
 
+        task1_full = db.task_get_detailed(task1["uuid"], load_raw=False)
+        results = task1_full["results"]
+        self.assertEqual(1, len(results))
+        self.assertNotIn("raw", results[0]["data"])
+        self.assertEqual(workload["uuid"],
+                         results[0]["data"]["workload_uuid"])
+
     def test_task_get_detailed_last(self):
         task1 = self._create_task()
         key = {
@@ -469,6 +508,7 @@ class TasksTestCase(test.DBTestCase):
             "load_duration": 13,
             "full_duration": 42,
             "hooks": [],
+            "statistics": {},
         }, results[0]["data"])
 
     def test_task_result_create(self):
@@ -611,6 +651,7 @@ class TasksTestCase(test.DBTestCase):
             ],
             "sla": [{"success": True}],
             "hooks": [],
+            "statistics": {},
             "load_duration": 13,
             "full_duration": 42
         })
@@ -630,6 +671,12 @@ class SubtaskTestCase(test.DBTestCase):
         subtask = db.subtask_create(self.task["uuid"], title="foo")
         self.assertEqual("foo", subtask["title"])
         self.assertEqual(self.task["uuid"], subtask["task_uuid"])
+        self.assertFalse(subtask["run_in_parallel"])
+
+    def test_subtask_create_run_in_parallel(self):
+        subtask = db.subtask_create(self.task["uuid"], title="foo",
+                                    run_in_parallel=True)
+        self.assertTrue(subtask["run_in_parallel"])
 
     def test_subtask_update(self):
         subtask = db.subtask_create(self.task["uuid"], title="foo")
@@ -716,16 +763,124 @@ class WorkloadTestCase(test.DBTestCase):
         self.assertEqual("T", workload["runner_type"])
         self.assertEqual(13, workload["load_duration"])
         self.assertEqual(42, workload["full_duration"])
-        self.assertEqual(0, workload["min_duration"])
+        self.assertEqual(1, workload["min_duration"])
         self.assertEqual(2, workload["max_duration"])
         self.assertEqual(3, workload["total_iteration_count"])
         self.assertEqual(1, workload["failed_iteration_count"])
         self.assertTrue(workload["pass_sla"])
         self.assertEqual([], workload["hooks"])
+        self.assertEqual({}, workload["context_execution"])
         self.assertEqual(data["sla"], workload["sla_results"]["sla"])
         self.assertEqual(self.task_uuid, workload["task_uuid"])
         self.assertEqual(self.subtask_uuid, workload["subtask_uuid"])
 
+    @mock.patch("rally.common.db.sqlalchemy.api.Connection."
+                "_workload_data_summary")
+    def test_workload_set_results_with_statistics(
+            self, mock_connection__workload_data_summary):
+        key = {
+            "name": "atata",
+            "description": "tatata",
+            "pos": 0,
+            "kw": {
+                "args": {"a": "A"},
+                "context": {"c": "C"},
+                "sla": {"s": "S"},
+                "runner": {"r": "R", "type": "T"}
+            }
+        }
+        statistics = {"durations": {"iterations_count": 10,
+                                    "iterations_failed": 2,
+                                    "total": {"min": 0.5, "max": 3.5},
+                                    "atomics": {}}}
+        data = {
+            "sla": [{"s": "S", "success": True}],
+            "load_duration": 13,
+            "full_duration": 42,
+            "statistics": statistics,
+            "context_execution": {"users": {"setup": 1.5, "cleanup": 0.5}}
+        }
+
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid, key)
+        workload = db.workload_set_results(workload["uuid"], data)
+        self.assertFalse(mock_connection__workload_data_summary.called)
+        self.assertEqual(data["context_execution"],
+                         workload["context_execution"])
+        self.assertEqual(0.5, workload["min_duration"])
+        self.assertEqual(3.5, workload["max_duration"])
+        self.assertEqual(10, workload["total_iteration_count"])
+        self.assertEqual(2, workload["failed_iteration_count"])
+        self.assertEqual(statistics, workload["statistics"])
+        self.assertTrue(workload["pass_sla"])
+
+    def test_workload_set_results_with_chunks_statistics(self):
+        key = {
+            "name": "atata",
+            "description": "tatata",
+            "pos": 0,
+            "kw": {
+                "args": {"a": "A"},
+                "context": {"c": "C"},
+                "sla": {"s": "S"},
+                "runner": {"r": "R", "type": "T"}
+            }
+        }
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid, key)
+        # NOTE: raw data of the chunk with statistics should not be used
+        db.workload_data_create(
+            self.task_uuid, workload["uuid"], 0,
+            {"raw": [{"duration": 100, "timestamp": 1, "error": []},
+                     {"duration": 0.1, "timestamp": 1, "error": []}],
+             "statistics": {"durations": {"total": {"min": 2, "max": 3}}}})
+        db.workload_data_create(
+            self.task_uuid, workload["uuid"], 1,
+            {"raw": [{"duration": 5, "timestamp": 1, "error": []},
+                     {"duration": 7, "timestamp": 1, "error": ["e"]}]})
+
+        workload = db.workload_set_results(
+            workload["uuid"], {"sla": [], "load_duration": 13,
+                               "full_duration": 42})
+        self.assertEqual(2, workload["min_duration"])
+        self.assertEqual(5, workload["max_duration"])
+        self.assertEqual(4, workload["total_iteration_count"])
+        self.assertEqual(1, workload["failed_iteration_count"])
+        self.assertEqual({}, workload["statistics"])
+
+    @mock.patch("rally.common.db.sqlalchemy.api.Connection._get_raw_data")
+    def test_workload_set_results_with_workload_stats_of_chunks(
+            self, mock_connection__get_raw_data):
+        key = {
+            "name": "atata",
+            "description": "tatata",
+            "pos": 0,
+            "kw": {
+                "args": {"a": "A"},
+                "context": {"c": "C"},
+                "sla": {"s": "S"},
+                "runner": {"r": "R", "type": "T"}
+            }
+        }
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid, key)
+        chunks = [[{"duration": 4, "timestamp": 1, "error": []},
+                   {"duration": 1.5, "timestamp": 2, "error": []}],
+                  [{"duration": 9, "timestamp": 3, "error": ["e"]}]]
+        for i, chunk in enumerate(chunks):
+            stats = putils.WorkloadStats()
+            for r in chunk:
+                stats.add_iteration(r)
+            db.workload_data_create(
+                self.task_uuid, workload["uuid"], i,
+                {"raw": chunk, "statistics": {"durations": stats.result()}})
+
+        workload = db.workload_set_results(
+            workload["uuid"], {"sla": [], "load_duration": 13,
+                               "full_duration": 42})
+        self.assertFalse(mock_connection__get_raw_data.called)
+        self.assertEqual(1.5, workload["min_duration"])
+        self.assertEqual(4, workload["max_duration"])
+        self.assertEqual(3, workload["total_iteration_count"])
+        self.assertEqual(1, workload["failed_iteration_count"])
+
     def test_workload_set_results_empty_raw_data(self):
         key = {
             "name": "atata",
@@ -797,14 +952,94 @@ class WorkloadDataTestCase(test.DBTestCase):
                                                 self.workload_uuid, 0, data)
         self.assertEqual(3, workload_data["iteration_count"])
         self.assertEqual(1, workload_data["failed_iteration_count"])
+        chunk_size = len(json.dumps(data["raw"], separators=(",", ":")))
+        self.assertEqual(chunk_size, workload_data["chunk_size"])
+        self.assertEqual(chunk_size, workload_data["compressed_chunk_size"])
         self.assertEqual(dt.datetime.fromtimestamp(1),
                          workload_data["started_at"])
         self.assertEqual(dt.datetime.fromtimestamp(4),
                          workload_data["finished_at"])
         self.assertEqual(data, workload_data["chunk_data"])
+        self.assertIsNone(workload_data["compressed_chunk_data"])
+        self.assertEqual({}, workload_data["statistics"])
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
+    def test_workload_data_create_with_statistics(self):
+        statistics = {"durations": {"iterations_count": 1}}
+        data = {"raw": [{"duration": 1, "timestamp": 1}],
+                "statistics": statistics}
+        workload_data = db.workload_data_create(self.task_uuid,
+                                                self.workload_uuid, 0, data)
+        self.assertEqual({"raw": data["raw"]}, workload_data["chunk_data"])
+        self.assertEqual(statistics, workload_data["statistics"])
+
+    def test_workload_data_create_compressed(self):
+        data = {
+            "raw": [
+                {"error": ["anError"], "duration": 0, "timestamp": 1,
+                 "atomic_actions": []},
+                {"duration": 1, "timestamp": 1, "error": [],
+                 "atomic_actions": []},
+            ] * 50
+        }
+        workload_data = db.workload_data_create(
+            self.task_uuid, self.workload_uuid, 0, data, compress=True)
+        self.assertEqual(100, workload_data["iteration_count"])
+        self.assertEqual(50, workload_data["failed_iteration_count"])
+        self.assertEqual({"compression": "zlib"}, workload_data["chunk_data"])
+        self.assertEqual(
+            data["raw"],
+            json.loads(zlib.decompress(
+                workload_data["compressed_chunk_data"]).decode("utf-8")))
+        self.assertEqual(
+            len(json.dumps(data["raw"], separators=(",", ":"))),
+            workload_data["chunk_size"])
+        self.assertEqual(len(workload_data["compressed_chunk_data"]),
+                         workload_data["compressed_chunk_size"])
+        self.assertGreater(workload_data["chunk_size"],
+                           workload_data["compressed_chunk_size"] * 10)
+
+        db.workload_data_create(self.task_uuid, self.workload_uuid, 1,
+                                {"raw": data["raw"][:2]})
+        results = db.task_result_get_all_by_uuid(self.task_uuid)
+        self.assertEqual(data["raw"] + data["raw"][:2],
+                         results[0]["data"]["raw"])
+
+    def test_workload_data_get_page(self):
+        raw = [{"error": [], "duration": i, "timestamp": i,
+                "atomic_actions": []} for i in range(5)]
+        db.workload_data_create(self.task_uuid, self.workload_uuid, 1,
+                                {"raw": raw[3:]}, compress=True)
+        db.workload_data_create(self.task_uuid, self.workload_uuid, 0,
+                                {"raw": raw[:3]})
+
+        self.assertEqual(
+            {"chunk": 0, "offset": 0, "iterations_count": 5,
+             "iterations": raw[:3], "next_chunk": 1},
+            db.workload_data_get_page(self.workload_uuid))
+        self.assertEqual(
+            {"chunk": 1, "offset": 3, "iterations_count": 5,
+             "iterations": raw[3:], "next_chunk": None},
+            db.workload_data_get_page(self.workload_uuid, chunk=1))
+
+        self.assertEqual(
+            {"chunk": 0, "offset": 0, "iterations_count": 0,
+             "iterations": [], "next_chunk": None},
+            db.workload_data_get_page("foo"))
+
+    def test_workload_data_get_page_old_atomic_actions(self):
+        raw = [{"error": [], "duration": 3, "timestamp": 1,
+                "atomic_actions": {"foo": 2}}]
+        db.workload_data_create(self.task_uuid, self.workload_uuid, 0,
+                                {"raw": raw})
+
+        page = db.workload_data_get_page(self.workload_uuid)
+        self.assertEqual(1, len(page["iterations"]))
+        self.assertEqual([{"name": "foo", "children": [], "started_at": 1,
+                           "finished_at": 3}],
+                         page["iterations"][0]["atomic_actions"])
+
     @mock.patch("time.time")
     def test_workload_data_create_empty(self, mock_time):
         mock_time.return_value = 10
@@ -1140,6 +1375,68 @@ class VerificationTestCase(test.DBTestCase):
         self.assertEqual("foo", v["status"])
         self.assertEqual(10, v["tests_count"])
 
+    def test_verification_add_tests(self):
+        v = self._create_verification()
+        v = db.verification_add_tests(
+            v["uuid"],
+            {"t1": {"name": "t1", "status": "success", "duration": "1.500",
+                    "tags": ["gate"], "timestamp": "2017-01-01T00:00:00"},
+             "t2[smoke]": {"name": "t2", "status": "fail",
+                           "duration": "0.100", "traceback": "tb"}})
+        self.assertEqual(2, v["tests_count"])
+        self.assertEqual(1, v["success"])
+        self.assertEqual(1, v["failures"])
+        self.assertEqual(0, v["skipped"])
+
+        tests = db.verification_test_list(v["uuid"])
+        self.assertEqual(["t1", "t2[smoke]"], [t["test_id"] for t in tests])
+        self.assertEqual(1.5, tests[0]["duration"])
+        self.assertEqual(["gate"], tests[0]["tags"])
+        self.assertEqual("2017-01-01T00:00:00", tests[0]["timestamp"])
+        self.assertEqual({}, tests[0]["details"])
+        self.assertEqual({"traceback": "tb"}, tests[1]["details"])
+
+        # results of the same test are replaced
+        v = db.verification_add_tests(
+            v["uuid"], {"t2[smoke]": {"name": "t2", "status": "xfail"},
+                        "t3": {"name": "t3", "status": "skip"}})
+        self.assertEqual(3, v["tests_count"])
+        self.assertEqual(0, v["failures"])
+        self.assertEqual(1, v["expected_failures"])
+        self.assertEqual(1, v["skipped"])
+        self.assertEqual(
+            ["t1", "t2[smoke]", "t3"],
+            sorted(t["test_id"] for t in db.verification_test_list(v["uuid"])))
+
+    def test_verification_add_tests_raise_exc(self):
+        self.assertRaises(exceptions.ResourceNotFound,
+                          db.verification_add_tests, "1234",
+                          {"t1": {"status": "success"}})
+
+    def test_verification_test_list(self):
+        v1 = self._create_verification()
+        v2 = self._create_verification()
+        db.verification_add_tests(
+            v1["uuid"], {"t1": {"name": "t1", "status": "success"},
+                         "t2": {"name": "t2", "status": "fail"}})
+        db.verification_add_tests(
+            v2["uuid"], {"t1": {"name": "t1", "status": "fail"}})
+
+        self.assertEqual(3, len(db.verification_test_list()))
+        self.assertEqual(
+            [v1["uuid"], v2["uuid"]],
+            [t["verification_uuid"]
+             for t in db.verification_test_list(name="t1")])
+        tests = db.verification_test_list(v1["uuid"], status="fail")
+        self.assertEqual(["t2"], [t["test_id"] for t in tests])
+
+    def test_verification_delete_with_tests(self):
+        v = self._create_verification()
+        db.verification_add_tests(
+            v["uuid"], {"t1": {"name": "t1", "status": "success"}})
+        db.verification_delete(v["uuid"])
+        self.assertEqual([], db.verification_test_list(v["uuid"]))
+
 
 class WorkerTestCase(test.DBTestCase):
     def setUp(self):
@@ -1417,3 +1417,95 @@ class MigrationWalkTestCase(rtest.DBTestCase,
                 conn.execute(
                     deployment_table.delete().where(
                         deployment_table.c.uuid == deployment))
+
+    def _check_7287df262dbc(self, engine, data):
+        self.assertEqual(
+            "7287df262dbc", api.get_backend().schema_revision(engine=engine))
+        self.assertColumnExists(engine, "workloaddata", "statistics")
+        t = db_utils.get_table(engine, "workloaddata")
+        self.assertFalse(t.c.statistics.nullable)
+
+    def _pre_upgrade_b2a4e7f2c1d3(self, engine):
+        self._b2a4e7f2c1d3_verification_uuid = "b2a4e7f2c1d3-verification"
+        self._b2a4e7f2c1d3_tests = {
+            "t1[gate]": {"name": "t1", "status": "success",
+                         "duration": "1.500", "tags": ["gate"],
+                         "timestamp": "2017-03-20T12:42:17+0000"},
+            "t2": {"name": "t2", "status": "skip", "duration": "0.000",
+                   "tags": [], "reason": "bug"}}
+
+        deployment_table = db_utils.get_table(engine, "deployments")
+        verifiers_table = db_utils.get_table(engine, "verifiers")
+        verifications_table = db_utils.get_table(engine, "verifications")
+
+        with engine.connect() as conn:
+            conn.execute(
+                deployment_table.insert(),
+                [{"uuid": "b2a4e7f2c1d3-deployment",
+                  "name": "b2a4e7f2c1d3-deployment",
+                  "config": json.dumps({}),
+                  "enum_deployments_status":
+                      consts.DeployStatus.DEPLOY_FINISHED,
+                  "credentials": json.dumps({})}])
+            conn.execute(
+                verifiers_table.insert(),
+                [{"uuid": "b2a4e7f2c1d3-verifier",
+                  "name": "b2a4e7f2c1d3-verifier",
+                  "type": "tempest",
+                  "status": consts.VerifierStatus.INSTALLED}])
+            conn.execute(
+                verifications_table.insert(),
+                [{"uuid": self._b2a4e7f2c1d3_verification_uuid,
+                  "verifier_uuid": "b2a4e7f2c1d3-verifier",
+                  "deployment_uuid": "b2a4e7f2c1d3-deployment",
+                  "status": consts.VerificationStatus.FINISHED,
+                  "tests": json.dumps(self._b2a4e7f2c1d3_tests)}])
+
+    def _check_b2a4e7f2c1d3(self, engine, data):
+        self.assertEqual(
+            "b2a4e7f2c1d3", api.get_backend().schema_revision(engine=engine))
+
+        self.assertColumnNotExists(engine, "verifications", "tests")
+        self.assertColumnType(engine, "verification_tests", "name",
+                              sa.Text)
+
+        tests_table = db_utils.get_table(engine, "verification_tests")
+        verifications_table = db_utils.get_table(engine, "verifications")
+        verifiers_table = db_utils.get_table(engine, "verifiers")
+        deployment_table = db_utils.get_table(engine, "deployments")
+
+        with engine.connect() as conn:
+            tests = conn.execute(tests_table.select().where(
+                tests_table.c.verification_uuid ==
+                self._b2a4e7f2c1d3_verification_uuid)).fetchall()
+            tests = dict((t.test_id, t) for t in tests)
+            self.assertEqual(sorted(self._b2a4e7f2c1d3_tests), sorted(tests))
+
+            self.assertEqual("t1", tests["t1[gate]"].name)
+            self.assertEqual("success", tests["t1[gate]"].status)
+            self.assertEqual(1.5, tests["t1[gate]"].duration)
+            self.assertEqual(["gate"], json.loads(tests["t1[gate]"].tags))
+            self.assertEqual("2017-03-20T12:42:17+0000",
+                             tests["t1[gate]"].timestamp)
+            self.assertEqual({}, json.loads(tests["t1[gate]"].details))
+            self.assertEqual("skip", tests["t2"].status)
+            self.assertIsNone(tests["t2"].timestamp)
+            self.assertEqual({"reason": "bug"},
+                             json.loads(tests["t2"].details))
+
+            conn.execute(tests_table.delete())
+            conn.execute(verifications_table.delete().where(
+                verifications_table.c.uuid ==
+                self._b2a4e7f2c1d3_verification_uuid))
+            conn.execute(verifiers_table.delete().where(
+                verifiers_table.c.uuid == "b2a4e7f2c1d3-verifier"))
+            conn.execute(deployment_table.delete().where(
+                deployment_table.c.uuid == "b2a4e7f2c1d3-deployment"))
+
+    def _check_c5b1e62d4f7a(self, engine, data):
+        self.assertEqual(
+            "c5b1e62d4f7a", api.get_backend().schema_revision(engine=engine))
+        self.assertColumnExists(engine, "workloaddata",
+                                "compressed_chunk_data")
+        t = db_utils.get_table(engine, "workloaddata")
+        self.assertTrue(t.c.compressed_chunk_data.nullable)
@@ -11,9 +11,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime as dt
+import io
 import os
 
 import mock
+from subunit import iso8601
+from subunit import v2
 
 from rally.common.io import subunit_v2
 from tests.unit import test
@@ -25,6 +29,7 @@ class SubunitParserTestCase(test.TestCase):
 
     def test_parse_file(self):
         result = subunit_v2.parse_file(self.fake_stream, live=True)
+        self.assertEqual(result.tests, result.unreported_tests)
 
         self.assertEqual({"tests_count": 7,
                           "tests_duration": "5.007",
@@ -61,6 +66,54 @@ RuntimeError: broken setUp method
                           "timestamp": "2015-06-03T08:46:22+0000"},
                          failed_tests[failed_test])
 
+    def test_parse_with_class_skips_and_chunked_attachments(self):
+        stream = io.BytesIO()
+        output = v2.StreamResultToBytes(stream)
+        timestamp = dt.datetime(2017, 1, 1, tzinfo=iso8601.UTC)
+        for test_id in ("a.B.test_1[smoke]", "a.B.test_2", "a.BB.test_1",
+                        "a.C.test_1"):
+            output.status(test_id=test_id, test_status="exists")
+        for chunk in (b"no ", b"service"):
+            output.status(test_id="setUpClass (a.B)", file_name="reason",
+                          file_bytes=chunk,
+                          mime_type="text/plain; charset=utf8")
+        output.status(test_id="setUpClass (a.B)", test_status="skip",
+                      timestamp=timestamp)
+        for test_id, status in (("a.BB.test_1", "success"),
+                                ("a.C.test_1", "fail")):
+            output.status(test_id=test_id, test_status="inprogress",
+                          timestamp=timestamp)
+            for chunk in (b"Trace", b"back"):
+                output.status(test_id=test_id, file_name="traceback",
+                              file_bytes=chunk,
+                              mime_type="text/plain; charset=utf8")
+            output.status(test_id=test_id, test_status=status,
+                          timestamp=timestamp)
+        stream.seek(0)
+
+        finished = {}
+        result = subunit_v2.parse(stream,
+                                  on_test_finished=finished.__setitem__)
+
+        self.assertEqual(["a.BB.test_1", "a.C.test_1"], sorted(finished))
+        # NOTE: tests of the skipped class are changed on parsing
+        self.assertEqual(
+            {"a.B.test_1[smoke]": result.tests["a.B.test_1[smoke]"],
+             "a.B.test_2": result.tests["a.B.test_2"]},
+            result.unreported_tests)
+        self.assertEqual("skip", result.tests["a.B.test_1[smoke]"]["status"])
+        self.assertEqual("no service",
+                         result.tests["a.B.test_1[smoke]"]["reason"])
+        self.assertEqual("skip", result.tests["a.B.test_2"]["status"])
+        self.assertEqual("success", result.tests["a.BB.test_1"]["status"])
+        self.assertNotIn("reason", result.tests["a.BB.test_1"])
+        self.assertEqual("Traceback",
+                         result.tests["a.C.test_1"]["traceback"])
+        self.assertEqual({"tests_count": 4, "tests_duration": "0.000",
+                          "failures": 1, "skipped": 2, "success": 1,
+                          "unexpected_success": 0, "expected_failures": 0},
+                         result.totals)
+
     def test_filter_results(self):
         results = subunit_v2.SubunitV2StreamResult()
         results._tests = {
@@ -145,3 +198,21 @@ RuntimeError: broken setUp method
         self.assertEqual("skip", tests[test_id]["status"])
         self.assertEqual("Some details why this test skipped",
                          tests[test_id]["reason"])
+
+    def test_parse_file_with_on_test_finished(self):
+        finished = {}
+
+        def on_test_finished(test_id, test):
+            self.assertNotIn(test_id, finished)
+            finished[test_id] = test
+
+        test_id = "test_foo.SimpleTestCase.test_to_skip"
+        result = subunit_v2.parse_file(
+            self.fake_stream, skipped_tests={test_id: None},
+            on_test_finished=on_test_finished)
+
+        self.assertEqual("skip", finished[test_id]["status"])
+        self.assertEqual(sorted(result.tests), sorted(finished))
+        self.assertEqual({}, result.unreported_tests)
+        failed_test = "test_foo.SimpleTestCase.test_something_that_fails"
+        self.assertEqual(result.tests[failed_test], finished[failed_test])
@@ -24,6 +24,7 @@ import mock
 from rally.common import objects
 from rally import consts
 from rally import exceptions
+from rally.task.processing import utils as putils
 from tests.unit import test
 
 
@@ -232,6 +233,84 @@ class TaskTestCase(test.TestCase):
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
+    @mock.patch("rally.common.objects.task.charts")
+    def test_extend_results_with_statistics(self, mock_charts):
+        mock_stat = mock_charts.MainStatsTable.return_value
+        mock_stat.render_statistics.return_value = "durations_stat"
+        iterations = [
+            {"timestamp": 2, "duration": 5, "error": [], "idle_duration": 0,
+             "atomic_actions": [{"name": "foo", "started_at": 0,
+                                 "finished_at": 1}]}]
+        durations = {"total": {}, "atomics": {}}
+        obsolete = [
+            {"task_uuid": "foo_uuid", "created_at": None, "updated_at": None,
+             "id": 11, "key": {"kw": {"foo": 42},
+                               "name": "Foo.bar", "pos": 0},
+             "data": {"raw": iterations, "sla": [], "hooks": [],
+                      "statistics": {"durations": durations,
+                                     "rps": [[0, 1, 1]],
+                                     "corrected_latency": {"count": 1}},
+                      "full_duration": 40, "load_duration": 32}}]
+
+        results = objects.Task.extend_results(obsolete)
+
+        self.assertEqual("durations_stat", results[0]["info"]["stat"])
+        self.assertEqual([[0, 1, 1]], results[0]["info"]["rps"])
+        self.assertEqual({"count": 1},
+                         results[0]["info"]["corrected_latency"])
+        mock_charts.MainStatsTable.assert_called_once_with(
+            {"iterations_count": 1,
+             "atomic": {"foo": {"min_duration": 1, "max_duration": 1,
+                                "count": 1}}})
+        mock_stat.render_statistics.assert_called_once_with(durations)
+        self.assertFalse(mock_stat.add_iteration.called)
+
+    @mock.patch("rally.common.objects.task.Workload.get_data_page")
+    @mock.patch("rally.common.objects.task.charts")
+    def test_extend_results_with_chunked_iterations(
+            self, mock_charts, mock_workload_get_data_page):
+        mock_stat = mock_charts.MainStatsTable.return_value
+        mock_stat.render_statistics.return_value = "durations_stat"
+        chunks = [
+            [{"timestamp": 3, "duration": 5, "error": [], "idle_duration": 0,
+              "atomic_actions": []},
+             {"timestamp": 2, "duration": 7, "error": ["E"],
+              "idle_duration": 0, "atomic_actions": []}],
+            [{"timestamp": 4, "duration": 3, "error": [], "idle_duration": 0,
+              "atomic_actions": []}]]
+        mock_workload_get_data_page.side_effect = (
+            lambda workload_uuid, chunk: {
+                "iterations_count": 3, "iterations": chunks[chunk],
+                "next_chunk": chunk + 1 if chunk + 1 < len(chunks) else None})
+        durations = {"total": {}, "atomics": {}}
+        obsolete = [
+            {"task_uuid": "foo_uuid", "created_at": None, "updated_at": None,
+             "id": 11, "key": {"kw": {"foo": 42},
+                               "name": "Foo.bar", "pos": 0},
+             "data": {"workload_uuid": "wload_uuid", "sla": [], "hooks": [],
+                      "statistics": {"durations": durations},
+                      "full_duration": 40, "load_duration": 32}}]
+
+        results = objects.Task.extend_results(obsolete, serializable=True)
+
+        self.assertEqual(
+            {"stat": "durations_stat", "atomic": {},
+             "iterations_count": 3, "iterations_failed": 1,
+             "min_duration": 3, "max_duration": 5, "tstamp_start": 2,
+             "full_duration": 40, "load_duration": 32},
+            results[0]["info"])
+        self.assertIsInstance(results[0]["iterations"],
+                              putils.ChunkedIterations)
+        self.assertEqual([mock.call("wload_uuid", chunk=0),
+                          mock.call("wload_uuid", chunk=1)],
+                         mock_workload_get_data_page.call_args_list)
+
+        iterations = list(results[0]["iterations"])
+        self.assertEqual([3, 2, 4], [itr["timestamp"] for itr in iterations])
+        for itr in iterations:
+            self.assertEqual({"additive": [], "complete": []}, itr["output"])
+        self.assertEqual(4, mock_workload_get_data_page.call_count)
+
     @mock.patch("rally.common.objects.task.db.deployment_get")
     @mock.patch("rally.common.objects.task.Task.get_results")
     def test_to_dict(self, mock_get_results, mock_deployment_get):
@@ -262,7 +341,8 @@ class TaskTestCase(test.TestCase):
             "updated_at": dt.datetime.now()}]}
 
         task_detailed = task.get_detailed(task_id="task_id")
-        mock_task_get_detailed.assert_called_once_with("task_id")
+        mock_task_get_detailed.assert_called_once_with("task_id",
+                                                       load_raw=True)
         self.assertEqual(mock_task_get_detailed.return_value, task_detailed)
 
     @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid",
@@ -415,7 +495,14 @@ class WorkloadTestCase(test.TestCase):
         workload = workload.add_workload_data(0, {"data": "foo"})
         mock_workload_data_create.assert_called_once_with(
             self.workload["task_uuid"], self.workload["uuid"],
-            0, {"data": "foo"})
+            0, {"data": "foo"}, compress=False)
+
+        mock_workload_data_create.reset_mock()
+        workload = objects.Workload("uuid1", "uuid2", {"bar": "baz"})
+        workload.add_workload_data(1, {"data": "foo"}, compress=True)
+        mock_workload_data_create.assert_called_once_with(
+            self.workload["task_uuid"], self.workload["uuid"],
+            1, {"data": "foo"}, compress=True)
 
     @mock.patch("rally.common.objects.task.db.workload_set_results")
     @mock.patch("rally.common.objects.task.db.workload_create")
@@ -427,3 +514,11 @@ class WorkloadTestCase(test.TestCase):
         workload = workload.set_results({"data": "foo"})
         mock_workload_set_results.assert_called_once_with(
             self.workload["uuid"], {"data": "foo"})
+
+    @mock.patch("rally.common.objects.task.db.workload_data_get_page")
+    def test_get_data_page(self, mock_workload_data_get_page):
+        self.assertEqual(
+            mock_workload_data_get_page.return_value,
+            objects.Workload.get_data_page("wload_uuid", chunk=1))
+        mock_workload_data_get_page.assert_called_once_with(
+            "wload_uuid", chunk=1)
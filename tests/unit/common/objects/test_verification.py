@@ -36,7 +36,10 @@ class VerificationTestCase(test.TestCase):
         self.assertEqual(self.db_obj["uuid"], v.uuid)
         self.assertEqual(self.db_obj["uuid"], v["uuid"])
 
-    def test_to_dict(self):
+    @mock.patch("rally.common.objects.verification.Verification.get_tests")
+    def test_to_dict(self, mock_verification_get_tests):
+        mock_verification_get_tests.return_value = {"test1": "tdata1",
+                                                    "test2": "tdata2"}
         TIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
         data = {"created_at": dt.date(2017, 2, 3),
                 "updated_at": dt.date(2017, 3, 3),
@@ -46,8 +49,7 @@ class VerificationTestCase(test.TestCase):
                 "verifier_uuid": "v_uuid",
                 "unexpected_success": "2",
                 "status": "False",
-                "tests": {"test1": "tdata1",
-                          "test2": "tdata2"},
+                "tests": {},
                 "skipped": 2,
                 "tests_duration": "",
                 "tags": None,
@@ -59,9 +61,15 @@ class VerificationTestCase(test.TestCase):
         verification = objects.Verification("verification_id")
         verification._db_entry = data
         result = objects.Verification.to_dict(verification)
+        self.assertEqual(1, mock_verification_get_tests.call_count)
+        result_without_tests = verification.to_dict(include_tests=False)
+        self.assertEqual(1, mock_verification_get_tests.call_count)
         data["created_at"] = data["created_at"].strftime(TIME_FORMAT)
         data["updated_at"] = data["updated_at"].strftime(TIME_FORMAT)
+        data["tests"] = mock_verification_get_tests.return_value
         self.assertEqual(data, result)
+        data.pop("tests")
+        self.assertEqual(data, result_without_tests)
 
     @mock.patch("rally.common.objects.verification.db.verification_create")
     def test_create(self, mock_verification_create):
@@ -95,8 +103,45 @@ class VerificationTestCase(test.TestCase):
         mock_verification_update.assert_called_once_with(self.db_obj["uuid"],
                                                          status="some-status")
 
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_add_tests")
+    def test_add_tests(self, mock_verification_add_tests):
+        v = objects.Verification(self.db_obj)
+        tests = {"foo_test": {"name": "foo_test", "status": "success"}}
+        v.add_tests(tests)
+        mock_verification_add_tests.assert_called_once_with(
+            self.db_obj["uuid"], tests)
+        self.assertEqual(mock_verification_add_tests.return_value,
+                         v._db_entry)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_test_list")
+    def test_get_tests(self, mock_verification_test_list):
+        mock_verification_test_list.return_value = [
+            {"test_id": "foo_test[gate]", "name": "foo_test",
+             "status": "fail", "duration": 0.25, "tags": ["gate"],
+             "timestamp": "2017-01-01T00:00:00",
+             "details": {"traceback": "tb"}},
+            {"test_id": "bar_test", "name": "bar_test", "status": "skip",
+             "duration": None, "tags": [], "timestamp": None,
+             "details": {}}]
+        v = objects.Verification(self.db_obj)
+        self.assertEqual(
+            {"foo_test[gate]": {"name": "foo_test", "status": "fail",
+                                "duration": "0.250", "tags": ["gate"],
+                                "timestamp": "2017-01-01T00:00:00",
+                                "traceback": "tb"},
+             "bar_test": {"name": "bar_test", "status": "skip",
+                          "duration": "0.000", "tags": []}},
+            v.get_tests(status="foo"))
+        mock_verification_test_list.assert_called_once_with(
+            self.db_obj["uuid"], status="foo")
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_add_tests")
     @mock.patch("rally.common.objects.verification.db.verification_update")
-    def test_finish(self, mock_verification_update):
+    def test_finish(self, mock_verification_update,
+                    mock_verification_add_tests):
         v = objects.Verification(self.db_obj)
         totals = {
             "tests_count": 2,
@@ -124,7 +169,9 @@ class VerificationTestCase(test.TestCase):
         v.finish(totals, tests)
         mock_verification_update.assert_called_once_with(
             self.db_obj["uuid"], status=consts.VerificationStatus.FINISHED,
-            tests=tests, **totals)
+            **totals)
+        mock_verification_add_tests.assert_called_once_with(
+            self.db_obj["uuid"], tests)
 
         v = objects.Verification(self.db_obj)
         totals.update(failures=1)
@@ -132,7 +179,7 @@ class VerificationTestCase(test.TestCase):
         v.finish(totals, tests)
         mock_verification_update.assert_called_once_with(
             self.db_obj["uuid"], status=consts.VerificationStatus.FAILED,
-            tests=tests, **totals)
+            **totals)
 
         v = objects.Verification(self.db_obj)
         totals.update(failures=0, unexpected_success=1)
@@ -140,7 +187,12 @@ class VerificationTestCase(test.TestCase):
         v.finish(totals, tests)
         mock_verification_update.assert_called_once_with(
             self.db_obj["uuid"], status=consts.VerificationStatus.FAILED,
-            tests=tests, **totals)
+            **totals)
+
+        # all tests are already saved
+        mock_verification_add_tests.reset_mock()
+        v.finish(totals, {})
+        self.assertFalse(mock_verification_add_tests.called)
 
     @mock.patch("rally.common.objects.verification.db.verification_update")
     def test_set_error(self, mock_verification_update):
@@ -148,3 +200,21 @@ class VerificationTestCase(test.TestCase):
         v.set_error("Some error")
         mock_verification_update.assert_called_once_with(
             self.db_obj["uuid"], status=consts.VerificationStatus.CRASHED)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_test_list")
+    def test_tests(self, mock_verification_test_list):
+        mock_verification_test_list.return_value = [
+            {"test_id": "foo_test[gate]", "name": "foo_test",
+             "status": "fail", "duration": 1.5, "tags": ["gate"],
+             "timestamp": None, "details": {}}]
+        # NOTE: the JSON field of the verification is not read anymore
+        v = objects.Verification(dict(self.db_obj, tests={}))
+        expected = {"foo_test[gate]": {"name": "foo_test", "status": "fail",
+                                       "duration": "1.500",
+                                       "tags": ["gate"]}}
+
+        self.assertEqual(expected, v.tests)
+        self.assertEqual(expected, v["tests"])
+        mock_verification_test_list.assert_called_with(
+            self.db_obj["uuid"], status=None)
@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import threading
 
 import mock
 
@@ -58,6 +59,21 @@ class BrokerTestCase(test.TestCase):
         broker._consumer(mock_consume, queue)
         self.assertEqual(0, len(queue))
 
+    def test__consumer_waits_for_publisher(self):
+        queue = collections.deque()
+        is_published = mock.Mock()
+        is_published.is_set.side_effect = [False, False, True, True]
+
+        def wait(timeout):
+            queue.append(timeout)
+
+        is_published.wait.side_effect = wait
+        mock_consume = mock.MagicMock()
+        broker._consumer(mock_consume, queue, is_published)
+        is_published.wait.assert_called_once_with(0.1)
+        mock_consume.assert_called_once_with({}, 0.1)
+        self.assertEqual(0, len(queue))
+
     @mock.patch("rally.common.broker.LOG")
     def test__consumer_indexerror(self, mock_log):
         consume = mock.Mock()
@@ -84,3 +100,21 @@ class BrokerTestCase(test.TestCase):
         consumer_count = 2
         broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+
+    def test_run_pipeline(self):
+        consumed = []
+        is_consumed = threading.Event()
+
+        def publish(queue):
+            queue.append(1)
+            # NOTE: consumers are already running, so the first item is
+            #       consumed before the publisher is finished
+            self.assertTrue(is_consumed.wait(10))
+            queue.append(2)
+
+        def consume(cache, item):
+            consumed.append(item)
+            is_consumed.set()
+
+        broker.run(publish, consume, 2, pipeline=True)
+        self.assertEqual([1, 2], sorted(consumed))
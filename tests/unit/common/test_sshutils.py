@@ -112,6 +112,28 @@ class SSHTestCase(test.TestCase):
                               password=None, timeout=1),
         ]
         self.assertEqual(client_calls, client.mock_calls)
+        self.assertEqual(client, ssh._get_client())
+        mock_paramiko.SSHClient.assert_called_once_with()
+
+    @mock.patch("rally.common.sshutils.paramiko")
+    def test__get_client_error(self, mock_paramiko):
+        mock_paramiko.SSHClient.return_value.connect.side_effect = (
+            socket.error)
+        self.assertRaises(exceptions.SSHError, self.ssh._get_client)
+        self.assertFalse(self.ssh._client)
+
+    @mock.patch("rally.common.sshutils.SSH._get_pkey")
+    @mock.patch("rally.common.sshutils.SSH._connect")
+    def test__get_client_pooled(self, mock_ssh__connect, mock_ssh__get_pkey):
+        mock_ssh__get_pkey.return_value.get_base64.return_value = "key64"
+        pool = mock.Mock()
+        ssh = sshutils.SSH("admin", "example.net", pkey="key", pool=pool)
+
+        self.assertEqual(pool.get.return_value, ssh._get_client())
+        pool.get.assert_called_once_with(
+            ("admin", "example.net", 22, "key64", None, None),
+            ssh._connect)
+        self.assertFalse(mock_ssh__connect.called)
 
     def test_close(self):
         with mock.patch.object(self.ssh, "_client") as m_client:
@@ -119,6 +141,13 @@ class SSHTestCase(test.TestCase):
         m_client.close.assert_called_once_with()
         self.assertFalse(self.ssh._client)
 
+    def test_close_pooled(self):
+        self.ssh.pool = mock.Mock()
+        with mock.patch.object(self.ssh, "_client") as m_client:
+            self.ssh.close()
+        self.assertFalse(m_client.close.called)
+        self.assertFalse(self.ssh._client)
+
     @mock.patch("rally.common.sshutils.six.moves.StringIO")
     def test_execute(self, mock_string_io):
         mock_string_io.side_effect = stdio = [mock.Mock(), mock.Mock()]
@@ -154,6 +183,137 @@ class SSHTestCase(test.TestCase):
         self.assertEqual([mock.call("uname")] * 3, self.ssh.execute.mock_calls)
 
 
+class SSHPoolTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SSHPoolTestCase, self).setUp()
+        self.pool = sshutils.SSHPool()
+
+    def test_get(self):
+        client = mock.Mock()
+        connect = mock.Mock(return_value=client)
+
+        self.assertEqual(client, self.pool.get(("u", "h"), connect))
+        self.assertEqual(client, self.pool.get(("u", "h"), connect))
+        connect.assert_called_once_with()
+
+        self.assertEqual(client, self.pool.get(("u", "h2"), connect))
+        self.assertEqual(2, connect.call_count)
+
+    def test_get_inactive(self):
+        inactive_client = mock.Mock()
+        inactive_client.get_transport.return_value.is_active.return_value = (
+            False)
+        client = mock.Mock()
+        connect = mock.Mock(side_effect=[inactive_client, client])
+
+        self.pool.get(("u", "h"), connect)
+        self.assertEqual(client, self.pool.get(("u", "h"), connect))
+        inactive_client.close.assert_called_once_with()
+
+    def test_get_connect_error(self):
+        connect = mock.Mock(side_effect=exceptions.SSHError)
+        self.assertRaises(exceptions.SSHError, self.pool.get, ("u", "h"),
+                          connect)
+        connect.side_effect = None
+        self.assertEqual(connect.return_value,
+                         self.pool.get(("u", "h"), connect))
+
+    def test_close(self):
+        clients = {"h1": mock.Mock(), "h2": mock.Mock(), "h3": mock.Mock()}
+        for host, client in clients.items():
+            self.pool.get(("u", host), mock.Mock(return_value=client))
+
+        self.pool.close(host="h1")
+        clients["h1"].close.assert_called_once_with()
+        self.assertFalse(clients["h2"].close.called)
+
+        self.pool.close()
+        for client in clients.values():
+            client.close.assert_called_once_with()
+
+    @mock.patch("rally.common.sshutils._POOLS", new_callable=dict)
+    def test_get_pool(self, mock__pools):
+        pool = sshutils.get_pool("w1")
+        self.assertIsInstance(pool, sshutils.SSHPool)
+        self.assertIs(pool, sshutils.get_pool("w1"))
+        self.assertIsNot(pool, sshutils.get_pool("w2"))
+
+    @mock.patch("rally.common.sshutils._POOLS", new_callable=dict)
+    @mock.patch("rally.common.sshutils.SSHPool")
+    def test_close_pool(self, mock_ssh_pool, mock__pools):
+        pool1 = mock.Mock()
+        pool2 = mock.Mock()
+        mock_ssh_pool.side_effect = [pool1, pool2]
+        sshutils.get_pool("w1")
+        sshutils.get_pool("w2")
+
+        sshutils.close_pool("w1")
+        pool1.close.assert_called_once_with()
+        self.assertFalse(pool2.close.called)
+        self.assertEqual({"w2": pool2}, mock__pools)
+        # closing an unknown pool is a noop
+        sshutils.close_pool("w1")
+        pool1.close.assert_called_once_with()
+
+    @mock.patch("rally.common.sshutils.multiprocessing.util.Finalize")
+    @mock.patch("rally.common.sshutils.os.getpid", return_value=42)
+    @mock.patch("rally.common.sshutils._POOLS", new_callable=dict)
+    def test_get_pool_in_new_process(self, mock__pools, mock_os_getpid,
+                                     mock_finalize):
+        inherited = mock.Mock()
+        mock__pools["w1"] = inherited
+        # NOTE: pools were created by the parent process
+        pid_patcher = mock.patch.object(sshutils, "_POOLS_PID", 1)
+        pid_patcher.start()
+        self.addCleanup(pid_patcher.stop)
+
+        pool = sshutils.get_pool("w1")
+
+        self.assertIsNot(inherited, pool)
+        self.assertFalse(inherited.close.called)
+        self.assertEqual({"w1": pool}, mock__pools)
+        mock_finalize.assert_called_once_with(
+            None, sshutils._close_pools, exitpriority=0)
+
+        sshutils.get_pool("w2")
+        mock_finalize.assert_called_once_with(
+            None, sshutils._close_pools, exitpriority=0)
+
+    @mock.patch("rally.common.sshutils._POOLS", new_callable=dict)
+    def test__close_pools(self, mock__pools):
+        pools = {"w1": mock.Mock(), "w2": mock.Mock()}
+        mock__pools.update(pools)
+
+        sshutils._close_pools()
+
+        self.assertEqual({}, mock__pools)
+        for pool in pools.values():
+            pool.close.assert_called_once_with()
+
+
+class ExecuteManyTestCase(test.TestCase):
+
+    def test_execute_many(self):
+        clients = [mock.Mock(), mock.Mock(), mock.Mock()]
+        clients[0].execute.return_value = (0, "out", "")
+        clients[1].execute.side_effect = exceptions.SSHError
+        clients[2].execute.return_value = (1, "", "err")
+
+        results = sshutils.execute_many(clients, "cmd", stdin="in",
+                                        timeout=10, workers=2)
+
+        self.assertEqual((0, "out", ""), results[0])
+        self.assertIsInstance(results[1], exceptions.SSHError)
+        self.assertEqual((1, "", "err"), results[2])
+        for client in clients:
+            client.execute.assert_called_once_with("cmd", stdin="in",
+                                                   timeout=10)
+
+    def test_execute_many_empty(self):
+        self.assertEqual([], sshutils.execute_many([], "cmd"))
+
+
 @ddt.ddt
 class SSHRunTestCase(test.TestCase):
     """Test SSH.run method in different aspects.
@@ -219,6 +379,15 @@ class SSHRunTestCase(test.TestCase):
         self.assertRaises(exceptions.SSHError, self.ssh.run, "cmd")
         self.assertEqual(1, self.ssh.run("cmd", raise_on_error=False))
 
+    @mock.patch("rally.common.sshutils.select")
+    def test_run_read_buffer_size(self, mock_select):
+        mock_select.select.return_value = ([], [], [])
+        self.fake_session.recv_ready.side_effect = [True, False]
+        self.fake_session.recv.return_value = b"ok"
+        self.ssh.run("cmd")
+        self.fake_session.recv.assert_called_once_with(
+            sshutils.SSH.READ_BUFFER_SIZE)
+
     @mock.patch("rally.common.sshutils.select")
     def test_run_stdout(self, mock_select):
         mock_select.select.return_value = ([], [], [])
@@ -204,8 +204,9 @@ class PercentileComputationTestCase(test.TestCase):
                26.27, 97.3, 56.6, 19.75, 69, 25.03, 10.76, 17.71, 29.4, 15.75,
                19.88, 90.16, 82.0, 63.4, 14.84, 49.07, 72.06, 41, 1.48, 82.19,
                48.45, 53, 88.33, 52.31, 62, 15.96, 21.17, 25.33, 53.27]
-    mixed5000 = mixed50 * 1000
+    mixed50000 = mixed50 * 1000
     range5000 = range(5000)
+    range50000 = [i - 25000 for i in range(50000)]
 
     @ddt.data(
         {"stream": "mixed1", "percent": 0.95, "expected": 0},
@@ -221,28 +222,93 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
             82.81300000000002},
-        {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
-        {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
         {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
         {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
         {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
     @ddt.unpack
     def test_add_and_result(self, percent, stream, expected):
-        comp = algo.PercentileComputation(percent=percent, length=len(
-            getattr(self, stream)))
+        comp = algo.PercentileComputation(percent=percent)
         [comp.add(i) for i in getattr(self, stream)]
         self.assertEqual(expected, comp.result())
 
+    def _get_exact(self, stream, percent):
+        comp = algo.PercentileComputation(percent, exact_size=len(stream))
+        [comp.add(i) for i in stream]
+        return comp.result()
+
+    @ddt.data(
+        {"stream": "mixed50000", "percent": 0.25},
+        {"stream": "mixed50000", "percent": 0.50},
+        {"stream": "mixed50000", "percent": 0.90},
+        {"stream": "range50000", "percent": 0.10},
+        {"stream": "range50000", "percent": 0.50},
+        {"stream": "range50000", "percent": 0.95})
+    @ddt.unpack
+    def test_add_and_result_approximate(self, stream, percent):
+        stream = getattr(self, stream)
+        comp = algo.PercentileComputation(percent, relative_error=0.01)
+        [comp.add(i) for i in stream]
+        self.assertIsNone(comp._values)
+
+        expected = self._get_exact(stream, percent)
+        self.assertAlmostEqual(expected, comp.result(),
+                               delta=abs(expected) * 0.01)
+
+    def test_max_buckets(self):
+        comp = algo.PercentileComputation(0.5, exact_size=10, max_buckets=5)
+        [comp.add(10 ** i) for i in range(20)]
+        self.assertEqual(5, len(comp._positive))
+        self.assertEqual(20, sum(comp._positive.values()))
+        self.assertEqual(1, comp._min)
+        self.assertEqual(10 ** 19, comp._max)
+
+    @ddt.data(
+        {"first": 10, "second": 20, "exact_size": 100},
+        {"first": 1000, "second": 20, "exact_size": 100},
+        {"first": 20, "second": 1000, "exact_size": 100},
+        {"first": 1000, "second": 2000, "exact_size": 100},
+        {"first": 0, "second": 2000, "exact_size": 100},
+        {"first": 2000, "second": 0, "exact_size": 100})
+    @ddt.unpack
+    def test_merge(self, first, second, exact_size):
+        stream = self.range50000[::17]
+        single = algo.PercentileComputation(0.9, exact_size=exact_size)
+        comp1 = algo.PercentileComputation(0.9, exact_size=exact_size)
+        comp2 = algo.PercentileComputation(0.9, exact_size=exact_size)
+        for value in stream[:first]:
+            single.add(value)
+            comp1.add(value)
+        for value in stream[first:first + second]:
+            single.add(value)
+            comp2.add(value)
+
+        comp1.merge(comp2)
+
+        self.assertEqual(single._count, comp1._count)
+        self.assertEqual(single._min, comp1._min)
+        self.assertEqual(single._max, comp1._max)
+        if first + second <= exact_size:
+            self.assertEqual(single._values, comp1._values)
+        self.assertEqual(single.result(), comp1.result())
+
+    def test_merge_raises(self):
+        comp1 = algo.PercentileComputation(0.5, relative_error=0.01)
+        comp2 = algo.PercentileComputation(0.5, relative_error=0.02)
+        self.assertRaises(ValueError, comp1.merge, comp2)
+
     def test_add_raises(self):
-        comp = algo.PercentileComputation(0.50, 100)
+        comp = algo.PercentileComputation(0.50)
         self.assertRaises(TypeError, comp.add)
+        self.assertRaises(TypeError, comp.add, None)
+
+    @ddt.data(0, 1, -0.5)
+    def test_init_raises(self, relative_error):
+        self.assertRaises(ValueError, algo.PercentileComputation, 0.5,
+                          relative_error=relative_error)
 
     def test_result_empty(self):
         self.assertRaises(TypeError, algo.PercentileComputation)
-        comp = algo.PercentileComputation(0.50, 100)
+        comp = algo.PercentileComputation(0.50)
         self.assertIsNone(comp.result())
 
 
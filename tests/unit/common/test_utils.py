@@ -14,6 +14,7 @@
 
 from __future__ import print_function
 import collections
+import pickle
 import string
 import sys
 import threading
@@ -494,6 +495,53 @@ class TimeoutThreadTestCase(test.TestCase):
         self.assertLess(time_elapsed, 11,
                         "Thread killed too late (%s seconds)" % time_elapsed)
 
+    @mock.patch("rally.common.utils.terminate_thread")
+    def test_timeout_thread_terminate_method(self, mock_terminate_thread):
+        queue = Queue.Queue()
+        handle = mock.Mock()
+        queue.put((handle, time.time() - 1))
+        queue.put((None, None))
+
+        utils.timeout_thread(queue)
+
+        handle.terminate.assert_called_once_with()
+        self.assertFalse(mock_terminate_thread.called)
+
+
+class CallCacheTestCase(test.TestCase):
+
+    def test_get(self):
+        cache = utils.CallCache()
+        func = mock.Mock(side_effect=lambda x: x * 2)
+
+        self.assertEqual(2, cache.get("a", func, 1))
+        self.assertEqual(2, cache.get("a", func, 5))
+        self.assertEqual(10, cache.get("b", func, x=5))
+        self.assertEqual([mock.call(1), mock.call(x=5)], func.call_args_list)
+        self.assertEqual({}, cache._key_locks)
+
+    def test_get_fails(self):
+        cache = utils.CallCache()
+        func = mock.Mock(side_effect=[ValueError("foo"), "bar"])
+
+        self.assertRaises(ValueError, cache.get, "a", func)
+        self.assertEqual({}, cache._key_locks)
+        self.assertEqual("bar", cache.get("a", func))
+        self.assertEqual({}, cache._key_locks)
+
+    def test_get_hooks(self):
+        class Cache(utils.CallCache):
+            def _get_cached(self, key):
+                return super(Cache, self)._get_cached(key) + 1
+
+            def _set_cached(self, key, value):
+                super(Cache, self)._set_cached(key, value * 10)
+
+        cache = Cache()
+
+        self.assertEqual(1, cache.get("a", lambda: 1))
+        self.assertEqual(11, cache.get("a", lambda: 2))
+
 
 class LockedDictTestCase(test.TestCase):
 
@@ -558,6 +606,15 @@ class LockedDictTestCase(test.TestCase):
                          args)
         self.assertEqual({"memo": "foo_memo"}, kw)
 
+    def test_pickle(self):
+        d = utils.LockedDict(foo="bar", spam={"a": ["b", {"c": "d"}]})
+        loaded = pickle.loads(pickle.dumps(d))
+
+        self.assertEqual(d, loaded)
+        self.assertIsInstance(loaded, utils.LockedDict)
+        self.assertIsInstance(loaded["spam"], utils.LockedDict)
+        self.assertRaises(RuntimeError, loaded.__setitem__, "foo", "baz")
+
 
 @ddt.ddt
 class FloatFormatterTestCase(test.TestCase):
@@ -598,6 +655,52 @@ class FloatFormatterTestCase(test.TestCase):
         self.assertEqual(num_str, utils.format_float_to_str(num_float))
 
 
+class WaitableDequeTestCase(test.TestCase):
+
+    def test_append_and_extend(self):
+        deque = utils.WaitableDeque([1])
+        deque.append(2)
+        deque.extend([3, 4])
+        self.assertEqual(collections.deque([1, 2, 3, 4]), deque)
+        self.assertEqual(1, deque.popleft())
+
+    def test_wait_not_empty(self):
+        self.assertTrue(utils.WaitableDeque([1]).wait())
+
+    def test_wait_stop_event_is_set(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertFalse(utils.WaitableDeque().wait(stop_event))
+
+    def test_wait_timeout(self):
+        self.assertFalse(utils.WaitableDeque().wait(timeout=0.01))
+
+    def test_wait_for_append(self):
+        deque = utils.WaitableDeque()
+        waiter = threading.Thread(target=deque.append, args=(42,))
+        with deque._cond:
+            waiter.start()
+            # NOTE: the condition lock is held, so the item can be appended
+            #     only after wait() starts waiting
+            self.assertTrue(deque.wait(timeout=10))
+        waiter.join()
+        self.assertEqual([42], list(deque))
+
+    def test_interrupt(self):
+        deque = utils.WaitableDeque()
+        stop_event = threading.Event()
+
+        def stop():
+            stop_event.set()
+            deque.interrupt()
+
+        stopper = threading.Thread(target=stop)
+        with deque._cond:
+            stopper.start()
+            self.assertFalse(deque.wait(stop_event, timeout=10))
+        stopper.join()
+
+
 class DequeAsQueueTestCase(test.TestCase):
 
     def setUp(self):
@@ -13,7 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import ddt
+import mock
 
 from rally.common.plugin import plugin
 from rally.common import validation
@@ -95,6 +98,48 @@ class ValidatorTestCase(test.TestCase):
 
         DummyPlugin.unregister()
 
+    def test_validate_with_session(self):
+        @plugin.base()
+        class DummyPluginBase(plugin.Plugin,
+                              validation.ValidatablePluginMixin):
+            pass
+
+        sessions = []
+
+        @plugin.configure(name="session_validator")
+        class SessionValidator(validation.Validator):
+            def validate(self, credentials, config, plugin_cls, plugin_cfg):
+                sessions.append(self.session)
+
+        @validation.add(name="session_validator")
+        @plugin.configure(name="dummy_plugin")
+        class DummyPlugin(DummyPluginBase):
+            pass
+
+        self.addCleanup(SessionValidator.unregister)
+        self.addCleanup(DummyPlugin.unregister)
+        session = validation.ValidationSession()
+        DummyPluginBase.validate(name="dummy_plugin", credentials={},
+                                 config={}, plugin_cfg={}, session=session)
+        DummyPluginBase.validate(name="dummy_plugin", credentials={},
+                                 config={}, plugin_cfg={})
+
+        self.assertEqual([session, None], sessions)
+
+    def test__cached(self):
+        validator = DummyValidator("foo")
+        func = mock.Mock(return_value="result")
+
+        self.assertEqual("result", validator._cached("key", func, 1, a=2))
+        self.assertEqual("result", validator._cached("key", func, 1, a=2))
+        self.assertEqual(2, func.call_count)
+
+        validator.session = validation.ValidationSession()
+        func.reset_mock()
+        self.assertEqual("result", validator._cached("key", func, 1, a=2))
+        self.assertEqual("result", validator._cached("key", func, 1, a=2))
+        func.assert_called_once_with(1, a=2)
+
     def test_failures(self):
         @plugin.base()
         class DummyPluginBase(plugin.Plugin,
@@ -140,3 +185,51 @@ class RequiredPlatformValidatorTestCase(test.TestCase):
             self.assertEqual(error_msg, result.msg)
         else:
             self.assertIsNone(result)
+
+
+class ValidationSessionTestCase(test.TestCase):
+
+    def test_get(self):
+        session = validation.ValidationSession()
+        func = mock.Mock(side_effect=lambda x: x * 2)
+
+        self.assertEqual(2, session.get("a", func, 1))
+        self.assertEqual(2, session.get("a", func, 5))
+        self.assertEqual(10, session.get("b", func, 5))
+        self.assertEqual([mock.call(1), mock.call(5)], func.call_args_list)
+
+    def test_get_fails(self):
+        session = validation.ValidationSession()
+        func = mock.Mock(side_effect=[ValueError("foo"), "bar"])
+
+        self.assertRaises(ValueError, session.get, "a", func)
+        self.assertEqual({}, session._key_locks)
+        self.assertEqual("bar", session.get("a", func))
+        self.assertEqual("bar", session.get("a", func))
+        self.assertEqual(2, func.call_count)
+
+    def test_get_concurrently(self):
+        session = validation.ValidationSession()
+        started = threading.Event()
+        release = threading.Event()
+
+        def func():
+            started.set()
+            release.wait()
+            return "value"
+
+        func = mock.Mock(side_effect=func)
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(session.get("key", func)))
+            for i in range(5)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(["value"] * 5, results)
+        func.assert_called_once_with()
+        self.assertEqual({}, session._key_locks)
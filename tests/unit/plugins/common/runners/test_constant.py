@@ -16,6 +16,7 @@
 import ddt
 import mock
 
+from rally import exceptions
 from rally.plugins.common.runners import constant
 from rally.task import runner
 from tests.unit import fakes
@@ -63,15 +64,11 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         mock_runner._run_scenario_once.assert_called_once_with(
             "FOO", ("BAR", "QUUZ"))
 
-    @mock.patch(RUNNERS + "constant.time")
     @mock.patch(RUNNERS + "constant.threading.Thread")
     @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time):
-
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
+    def test__worker_process(self, mock_runner, mock_queue, mock_thread):
+        mock_thread_instance = mock.MagicMock()
         mock_thread.return_value = mock_thread_instance
 
         mock_event = mock.MagicMock(
@@ -80,33 +77,119 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         mock_event_queue = mock.MagicMock()
 
         times = 4
+        concurrency = 2
 
         fake_ram_int = iter(range(10))
 
-        context = {"users": [{"tenant_id": "t1", "credential": "c1",
+        context = {"task": {"uuid": "task_uuid"},
+                   "users": [{"tenant_id": "t1", "credential": "c1",
                               "id": "uuid1"}]}
         info = {"processes_to_start": 1, "processes_counter": 1}
 
-        constant._worker_process(mock_queue, fake_ram_int, 1, 2, times,
-                                 context, "Dummy", "dummy", (),
+        constant._worker_process(mock_queue, fake_ram_int, 1, concurrency,
+                                 times, context, "Dummy", "dummy", (),
                                  mock_event_queue, mock_event, info)
 
-        self.assertEqual(times + 1, mock_thread.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.start.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.join.call_count)
-        # NOTE(rvasilets): `times` + 1 here because `times` the number of
-        # scenario repetition and one more need on "initialization" stage
-        # of the thread stuff.
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+        # NOTE(rvasilets): `concurrency` + 1 here because one more thread is
+        # needed for timeouts handling.
+        self.assertEqual(concurrency + 1, mock_thread.call_count)
+        self.assertEqual(concurrency + 1,
+                         mock_thread_instance.start.call_count)
+        self.assertEqual(concurrency + 1,
+                         mock_thread_instance.join.call_count)
+        mock_runner._BatchQueue.assert_called_once_with(mock_queue,
+                                                        context["task"])
+        batch_queue = mock_runner._BatchQueue.return_value
+        self.assertEqual(
+            [mock.call(target=constant._pooled_worker_thread,
+                       args=(batch_queue, fake_ram_int, times, 1, mock.ANY,
+                             context, "Dummy", "dummy", (),
+                             mock_event_queue, mock_event))] * concurrency,
+            mock_thread.call_args_list[1:])
+        batch_queue.flush.assert_called_once_with()
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__pooled_worker_thread(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event_queue = mock.MagicMock()
+        mock_timeout_queue = mock.MagicMock()
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False))
+        times = 4
+        context = {"users": []}
+
+        constant._pooled_worker_thread(
+            mock_queue, iter(range(10)), times, 1, mock_timeout_queue,
+            context, "Dummy", "dummy", (), mock_event_queue, aborted)
+
+        self.assertEqual(
+            [mock.call(i, context) for i in range(times)],
+            mock_runner._get_scenario_context.call_args_list)
+        scenario_context = mock_runner._get_scenario_context.return_value
+        self.assertEqual(
+            [mock.call(mock_queue, "Dummy", "dummy", scenario_context, (),
+                       mock_event_queue)] * times,
+            mock_runner._worker_thread.call_args_list)
+        self.assertEqual(times, mock_timeout_queue.put.call_count)
+        for call in mock_timeout_queue.put.call_args_list:
+            handle, deadline = call[0][0]
+            self.assertFalse(handle.isAlive())
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__pooled_worker_thread_aborted(self, mock_runner):
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=True))
+
+        constant._pooled_worker_thread(
+            mock.Mock(), iter(range(10)), 4, 0, None, {}, "Dummy", "dummy",
+            (), mock.Mock(), aborted)
+
+        self.assertFalse(mock_runner._worker_thread.called)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__pooled_worker_thread_interrupted_between_iterations(
+            self, mock_runner):
+        mock_runner._worker_thread.side_effect = [
+            exceptions.ThreadTimeoutException(), None]
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False))
+
+        constant._pooled_worker_thread(
+            mock.Mock(), iter(range(10)), 2, 0, None, {}, "Dummy", "dummy",
+            (), mock.Mock(), aborted)
+
+        self.assertEqual(2, mock_runner._worker_thread.call_count)
+
+    def test__iteration_handle(self):
+        handle = constant._IterationHandle(42)
+        self.assertEqual(42, handle.ident)
+        self.assertTrue(handle.isAlive())
+        handle.finish()
+        self.assertFalse(handle.isAlive())
+
+    @mock.patch(RUNNERS + "constant.ctypes")
+    @mock.patch(RUNNERS + "constant.utils.terminate_thread")
+    def test__iteration_handle_terminate(self, mock_terminate_thread,
+                                         mock_ctypes):
+        handle = constant._IterationHandle(42)
+        handle.terminate()
+        handle.terminate()
+        mock_terminate_thread.assert_called_once_with(42)
+
+        handle.finish()
+        # the pending exception must not hit the next iteration
+        set_async_exc = mock_ctypes.pythonapi.PyThreadState_SetAsyncExc
+        set_async_exc.assert_called_once_with(
+            mock_ctypes.c_long.return_value, None)
+        mock_ctypes.c_long.assert_called_once_with(42)
+
+    @mock.patch(RUNNERS + "constant.ctypes")
+    @mock.patch(RUNNERS + "constant.utils.terminate_thread")
+    def test__iteration_handle_terminate_finished(self, mock_terminate_thread,
+                                                  mock_ctypes):
+        handle = constant._IterationHandle(42)
+        handle.finish()
+        handle.terminate()
+        self.assertFalse(mock_terminate_thread.called)
+        self.assertFalse(
+            mock_ctypes.pythonapi.PyThreadState_SetAsyncExc.called)
 
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -129,9 +212,10 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
 
         runner_obj._run_scenario(
             fakes.FakeScenario, "do_it", self.context, self.args)
-        self.assertEqual(len(runner_obj.result_queue), self.config["times"])
+        self.assertEqual(self.config["times"],
+                         sum(len(b) for b in runner_obj.result_queue))
         for result_batch in runner_obj.result_queue:
-            for result in result_batch:
+            for result in result_batch.results:
                 self.assertIsNotNone(result)
 
     def test__run_scenario_exception(self):
@@ -139,11 +223,12 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
 
         runner_obj._run_scenario(fakes.FakeScenario, "something_went_wrong",
                                  self.context, self.args)
-        self.assertEqual(len(runner_obj.result_queue), self.config["times"])
+        self.assertEqual(self.config["times"],
+                         sum(len(b) for b in runner_obj.result_queue))
         for result_batch in runner_obj.result_queue:
-            for result in result_batch:
+            for result in result_batch.results:
                 self.assertIsNotNone(result)
-        self.assertIn("error", runner_obj.result_queue[0][0])
+        self.assertIn("error", runner_obj.result_queue[0].results[0])
 
     def test__run_scenario_aborted(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
@@ -289,7 +374,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
         expected_times = 1
         self.assertEqual(len(runner_obj.result_queue), expected_times)
         for result_batch in runner_obj.result_queue:
-            for result in result_batch:
+            for result in result_batch.results:
                 self.assertIsNotNone(result)
 
     def test_run_scenario_constantly_for_duration_exception(self):
@@ -302,9 +387,9 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
         expected_times = 1
         self.assertEqual(len(runner_obj.result_queue), expected_times)
         for result_batch in runner_obj.result_queue:
-            for result in result_batch:
+            for result in result_batch.results:
                 self.assertIsNotNone(result)
-        self.assertIn("error", runner_obj.result_queue[0][0])
+        self.assertIn("error", runner_obj.result_queue[0].results[0])
 
     def test_run_scenario_constantly_for_duration_timeout(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
@@ -316,9 +401,9 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
         expected_times = 1
         self.assertEqual(len(runner_obj.result_queue), expected_times)
         for result_batch in runner_obj.result_queue:
-            for result in result_batch:
+            for result in result_batch.results:
                 self.assertIsNotNone(result)
-        self.assertIn("error", runner_obj.result_queue[0][0])
+        self.assertIn("error", runner_obj.result_queue[0].results[0])
 
     def test__run_scenario_constantly_aborted(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(None,
@@ -0,0 +1,155 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import ddt
+import mock
+
+from rally.plugins.common.runners import process_pool
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+@ddt.ddt
+class ProcessPoolScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProcessPoolScenarioRunnerTestCase, self).setUp()
+        self.config = {"times": 4, "processes": 2, "type": "process_pool"}
+        self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+        self.task = mock.MagicMock()
+
+    @ddt.data(({"times": 4, "processes": 2, "type": "process_pool"}, True),
+              ({"type": "process_pool"}, True),
+              ({"times": 4, "processes": 0, "type": "process_pool"}, False),
+              ({"times": 4, "concurrency": 2, "type": "process_pool"}, False))
+    @ddt.unpack
+    def test_validate(self, config, valid):
+        results = runner.ScenarioRunner.validate(
+            "process_pool", None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    @mock.patch(RUNNERS + "process_pool.runner")
+    def test__worker_process(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event_queue = mock.MagicMock()
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False))
+        info = {"processes_to_start": 2, "processes_counter": 1}
+
+        process_pool._worker_process(mock_queue, iter(range(10)), 3,
+                                     self.context, "Dummy", "dummy", (),
+                                     mock_event_queue, aborted, info)
+
+        self.assertEqual(
+            [mock.call(i, self.context) for i in range(3)],
+            mock_runner._get_scenario_context.call_args_list)
+        scenario_context = mock_runner._get_scenario_context.return_value
+        self.assertEqual(
+            [mock.call("Dummy", "dummy", scenario_context, (),
+                       mock_event_queue)] * 3,
+            mock_runner._run_scenario_once.call_args_list)
+        mock_runner._BatchQueue.assert_called_once_with(
+            mock_queue, self.context["task"])
+        batch_queue = mock_runner._BatchQueue.return_value
+        self.assertEqual(
+            [mock.call(mock_runner._run_scenario_once.return_value)] * 3,
+            batch_queue.put.call_args_list)
+        batch_queue.flush.assert_called_once_with()
+        mock_runner._log_worker_info.assert_called_once_with(
+            times=3, cls="Dummy", method_name="dummy", args=(), **info)
+
+    @mock.patch(RUNNERS + "process_pool.runner")
+    def test__worker_process_aborted(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=True))
+
+        process_pool._worker_process(mock_queue, iter(range(10)), 3,
+                                     self.context, "Dummy", "dummy", (),
+                                     mock.MagicMock(), aborted, {})
+
+        self.assertFalse(mock_runner._run_scenario_once.called)
+        self.assertFalse(mock_runner._BatchQueue.return_value.put.called)
+
+    def test__run_scenario(self):
+        runner_obj = process_pool.ProcessPoolScenarioRunner(self.task,
+                                                            self.config)
+
+        runner_obj._run_scenario(
+            fakes.FakeScenario, "do_it", self.context, self.args)
+
+        results = [result for batch in runner_obj.result_queue
+                   for result in batch.results]
+        self.assertEqual(self.config["times"], len(results))
+        for result in results:
+            self.assertEqual([], result["error"])
+        self.assertEqual(
+            list(range(1, self.config["times"] + 1)),
+            sorted(event["value"] for event in runner_obj.event_queue))
+
+    def test__run_scenario_exception(self):
+        runner_obj = process_pool.ProcessPoolScenarioRunner(self.task,
+                                                            self.config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "something_went_wrong",
+                                 self.context, self.args)
+
+        results = [result for batch in runner_obj.result_queue
+                   for result in batch.results]
+        self.assertEqual(self.config["times"], len(results))
+        self.assertTrue(results[0]["error"])
+
+    def test__run_scenario_aborted(self):
+        runner_obj = process_pool.ProcessPoolScenarioRunner(self.task,
+                                                            self.config)
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                                 self.args)
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    @mock.patch(RUNNERS + "process_pool.multiprocessing.Queue")
+    @mock.patch(RUNNERS + "process_pool.multiprocessing.cpu_count",
+                return_value=8)
+    @mock.patch(RUNNERS + "process_pool.ProcessPoolScenarioRunner"
+                "._create_process_pool")
+    @mock.patch(RUNNERS + "process_pool.ProcessPoolScenarioRunner"
+                "._join_processes")
+    @ddt.data(({"times": 20}, 8),
+              ({"times": 3}, 3),
+              ({"times": 20, "processes": 2}, 2))
+    @ddt.unpack
+    def test__run_scenario_processes_count(
+            self, config, expected_processes, mock__join_processes,
+            mock__create_process_pool, mock_cpu_count,
+            mock_multiprocessing_queue):
+        runner_obj = process_pool.ProcessPoolScenarioRunner(self.task,
+                                                            config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                                 self.args)
+
+        mock__create_process_pool.assert_called_once_with(
+            expected_processes, process_pool._worker_process, mock.ANY)
+        mock__join_processes.assert_called_once_with(
+            mock__create_process_pool.return_value,
+            mock_multiprocessing_queue.return_value,
+            mock_multiprocessing_queue.return_value)
@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 import ddt
 import mock
 
 from rally.plugins.common.runners import rps
+from rally.task.processing import utils as putils
 from rally.task import runner
 from tests.unit import fakes
 from tests.unit import test
@@ -127,6 +130,23 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             },
             "valid": False
         },
+        {
+            "config": {
+                "type": "rps",
+                "rps": 2,
+                "times": 55,
+                "arrival": "poisson"
+            }
+        },
+        {
+            "config": {
+                "type": "rps",
+                "rps": 2,
+                "times": 55,
+                "arrival": "bursty"
+            },
+            "valid": False
+        },
         {
             "config": {
                 "type": "rps",
@@ -178,7 +198,8 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         fake_ram_int = iter(range(10))
 
         context = {"users": [{"tenant_id": "t1", "credential": "c1",
-                              "id": "uuid1"}]}
+                              "id": "uuid1"}],
+                   "task": {"uuid": "task_uuid"}}
         info = {"processes_to_start": 1, "processes_counter": 1}
         mock_runs_per_second = mock.MagicMock(return_value=10)
 
@@ -202,10 +223,14 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
         self.assertEqual(times, mock_runner._get_scenario_context.call_count)
 
+        mock_runner._BatchQueue.assert_called_once_with(
+            mock_queue, context["task"])
+        batch_queue = mock_runner._BatchQueue.return_value
+        batch_queue.flush.assert_called_once_with()
         for i in range(times):
             scenario_context = mock_runner._get_scenario_context(i, context)
             call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
+                args=(batch_queue, "Dummy", "dummy", scenario_context, (),
                       mock_event_queue),
                 target=mock_runner._worker_thread,
             )
@@ -276,10 +301,11 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         runner_obj._run_scenario(fakes.FakeScenario, "do_it",
                                  fakes.FakeContext({}).context, {})
 
-        self.assertEqual(config["times"], len(runner_obj.result_queue))
+        self.assertEqual(config["times"],
+                         sum(len(b) for b in runner_obj.result_queue))
 
         for result_batch in runner_obj.result_queue:
-            for result in result_batch:
+            for result in result_batch.results:
                 self.assertIsNotNone(result)
 
     @mock.patch(RUNNERS + "rps.time.sleep")
@@ -289,9 +315,10 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
         runner_obj._run_scenario(fakes.FakeScenario, "something_went_wrong",
                                  fakes.FakeContext({}).context, {})
-        self.assertEqual(len(runner_obj.result_queue), config["times"])
+        self.assertEqual(config["times"],
+                         sum(len(b) for b in runner_obj.result_queue))
         for result_batch in runner_obj.result_queue:
-            for result in result_batch:
+            for result in result_batch.results:
                 self.assertIsNotNone(result)
 
     @mock.patch(RUNNERS + "rps.time.sleep")
@@ -308,6 +335,151 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         for result in runner_obj.result_queue:
             self.assertIsNotNone(result)
 
+    def test__get_arrival_schedule_constant(self):
+        self.assertEqual([0.0, 0.5, 1.0, 1.5],
+                         rps._get_arrival_schedule(2, 4, "constant"))
+
+    def test__get_arrival_schedule_ramp(self):
+        rps_cfg = {"start": 1, "end": 3, "step": 1}
+        self.assertEqual([0.0, 1.0, 1.5, 2.0, 2.0 + 1.0 / 3],
+                         rps._get_arrival_schedule(rps_cfg, 5, "constant"))
+
+    @mock.patch(RUNNERS + "rps.random.expovariate")
+    def test__get_arrival_schedule_poisson(self, mock_expovariate):
+        mock_expovariate.side_effect = [0.25, 0.5, 0.125, 1]
+        rps_cfg = {"start": 2, "end": 4, "step": 2, "duration": 0.5}
+
+        self.assertEqual([0.0, 0.25, 0.75, 0.875],
+                         rps._get_arrival_schedule(rps_cfg, 4, "poisson"))
+        self.assertEqual([mock.call(2.0), mock.call(2.0), mock.call(4.0),
+                          mock.call(4.0)],
+                         mock_expovariate.call_args_list)
+
+    @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
+    def test__open_loop_worker_thread(self, mock__run_scenario_once):
+        mock__run_scenario_once.return_value = {
+            "timestamp": 10.5, "duration": 2.0,
+            "output": {"additive": [], "complete": []}}
+        queue = mock.Mock()
+        slots = mock.Mock()
+
+        rps._open_loop_worker_thread(queue, slots, 10.0, "cls", "method",
+                                     "ctx", {}, "event_queue")
+
+        slots.release.assert_called_once_with()
+        mock__run_scenario_once.assert_called_once_with(
+            "cls", "method", "ctx", {}, "event_queue")
+        result = queue.put.call_args[0][0]
+        self.assertEqual(10.0, result["scheduled_timestamp"])
+        self.assertEqual({"additive": [], "complete": []}, result["output"])
+
+    @mock.patch(RUNNERS + "rps.time")
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__open_loop_worker_process(self, mock_runner, mock_thread,
+                                       mock_time):
+        mock_time.time.return_value = 100.0
+        mock_thread_instance = mock.MagicMock(
+            isAlive=mock.MagicMock(return_value=False))
+        mock_thread.return_value = mock_thread_instance
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False),
+                                 wait=mock.MagicMock(return_value=False))
+        queue = mock.Mock()
+        event_queue = mock.Mock()
+        started = mock.Mock()
+        context = {"users": [], "task": {"uuid": "task_uuid"}}
+        schedule = [0.0, 0.5, 1.0]
+
+        rps._open_loop_worker_process(
+            queue, iter(range(10)), 0, schedule, 3, context, "Dummy",
+            "dummy", (), event_queue, aborted, mock.Mock(value=100.0),
+            started, info={"processes_to_start": 1, "processes_counter": 0})
+
+        started.wait.assert_called_once_with()
+
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         aborted.wait.call_args_list)
+        self.assertEqual(len(schedule), mock_thread.call_count)
+        self.assertEqual(len(schedule),
+                         mock_thread_instance.join.call_count)
+        mock_runner._BatchQueue.assert_called_once_with(
+            queue, context["task"])
+        batch_queue = mock_runner._BatchQueue.return_value
+        batch_queue.flush.assert_called_once_with()
+        scenario_context = mock_runner._get_scenario_context.return_value
+        for offset, call in zip(schedule, mock_thread.call_args_list):
+            self.assertEqual(
+                mock.call(target=rps._open_loop_worker_thread,
+                          args=(batch_queue, mock.ANY, 100.0 + offset, "Dummy",
+                                "dummy", scenario_context, (), event_queue)),
+                call)
+
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__open_loop_worker_process_aborted(self, mock_runner,
+                                               mock_thread):
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False),
+                                 wait=mock.MagicMock(return_value=True))
+
+        rps._open_loop_worker_process(
+            mock.Mock(), iter(range(10)), 0, [10.0, 20.0], 2,
+            {"task": {"uuid": "task_uuid"}}, "Dummy",
+            "dummy", (), mock.Mock(), aborted,
+            mock.Mock(value=rps.time.time()), mock.Mock(),
+            info={"processes_to_start": 1, "processes_counter": 0})
+
+        self.assertFalse(mock_thread.called)
+
+    @ddt.data("constant", "poisson")
+    @mock.patch(RUNNERS + "rps.LOG")
+    def test__run_scenario_open_loop(self, arrival, mock_log):
+        config = {"times": 10, "rps": 100, "max_concurrency": 4,
+                  "arrival": arrival}
+        runner_obj = rps.RPSScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 fakes.FakeContext({}).context, {})
+
+        results = [result for batch in runner_obj.result_queue
+                   for result in batch.results]
+        self.assertEqual(config["times"], len(results))
+        for result in results:
+            self.assertIn("scheduled_timestamp", result)
+        self.assertEqual(config["times"],
+                         sum(runner_obj._open_loop_starts.values()))
+        self.assertEqual(config["times"],
+                         sum(achieved for second, requested, achieved
+                             in runner_obj.statistics["rps"]))
+        latency = runner_obj.statistics["corrected_latency"]
+        self.assertEqual(config["times"], latency["count"])
+        self.assertIsNotNone(latency["min"])
+        self.assertEqual(2, mock_log.info.call_count)
+
+    def test__send_results_batch_open_loop(self):
+        runner_obj = rps.RPSScenarioRunner(self.task, {"times": 3, "rps": 1})
+        runner_obj._open_loop_start = 100.0
+        runner_obj._open_loop_starts = collections.Counter()
+        runner_obj._open_loop_latency = putils.DurationStats()
+        batch = runner.ResultsBatch()
+        for scheduled_at, timestamp, error in ((100.0, 100.5, []),
+                                               (101.0, 103.0, []),
+                                               (102.0, 103.0, ["err"])):
+            batch.add({"scheduled_timestamp": scheduled_at,
+                       "timestamp": timestamp, "duration": 1.0,
+                       "error": error, "atomic_actions": []})
+
+        runner_obj._send_results_batch(batch)
+
+        self.assertEqual({0: 1, 3: 2}, runner_obj._open_loop_starts)
+        runner_obj._save_open_loop_statistics([0.0, 1.0, 2.0])
+        self.assertEqual([[0, 1, 1], [1, 1, 0], [2, 1, 0], [3, 0, 2]],
+                         runner_obj.statistics["rps"])
+        latency = runner_obj.statistics["corrected_latency"]
+        self.assertEqual(1.5, latency["min"])
+        self.assertEqual(3.0, latency["max"])
+        self.assertEqual(3, latency["count"])
+        self.assertEqual([batch], list(runner_obj.result_queue))
+
     @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "rps.multiprocessing.cpu_count")
     @mock.patch(RUNNERS + "rps.RPSScenarioRunner._log_debug_info")
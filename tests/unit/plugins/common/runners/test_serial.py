@@ -40,7 +40,7 @@ class SerialScenarioRunnerTestCase(test.TestCase):
                              fakes.FakeContext().context, {})
 
         self.assertEqual(len(runner.result_queue), times)
-        results = list(runner.result_queue)
+        results = [batch.results for batch in runner.result_queue]
         self.assertEqual(results, expected_results)
         expected_calls = []
         for i in range(times):
@@ -39,3 +39,20 @@ class RequestScenarioTestCase(test.TestCase):
         mock_choice.assert_called_once_with([{"url": "sample_url"}])
         mock__check_request.assert_called_once_with(
             status_code=200, url="sample_url")
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
+    def test_check_request_pooled(self, mock__check_request):
+        Requests = http_requests.HttpRequestsCheckRequest(
+            test.get_test_context())
+        Requests.run("sample_url", "GET", 200, pool={"size": 2})
+        mock__check_request.assert_called_once_with(
+            "sample_url", "GET", 200, pool={"size": 2})
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
+    def test_check_random_request_pooled(self, mock__check_request):
+        Requests = http_requests.HttpRequestsCheckRandomRequest(
+            test.get_test_context())
+        Requests.run(status_code=200, requests=[{"url": "sample_url"}],
+                     pool={"keep_alive": True})
+        mock__check_request.assert_called_once_with(
+            status_code=200, url="sample_url", pool={"keep_alive": True})
@@ -10,13 +10,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 
+import ddt
 import mock
 
 from rally.plugins.common.scenarios.requests import utils
 from tests.unit import test
 
+UTILS = "rally.plugins.common.scenarios.requests.utils"
 
+
+@ddt.ddt
 class RequestsTestCase(test.TestCase):
 
     @mock.patch("requests.request")
@@ -36,3 +41,123 @@ class RequestsTestCase(test.TestCase):
 
         self.assertRaises(ValueError, scenario._check_request,
                           status_code=201, url="sample", method="GET")
+
+    @mock.patch("%s.get_session" % UTILS)
+    def test__check_request_pooled(self, mock_get_session):
+        session = mock_get_session.return_value
+        senders = []
+
+        def request(*args, **kwargs):
+            senders.append(utils._local.scenario)
+            return mock.MagicMock(status_code=200)
+
+        session.request.side_effect = request
+        scenario = utils.RequestScenario(test.get_test_context())
+        scenario._check_request(status_code=200, url="sample", method="GET",
+                                pool={"size": 5}, timeout=10)
+
+        mock_get_session.assert_called_once_with(size=5)
+        session.request.assert_called_once_with("GET", "sample", stream=True,
+                                                timeout=10)
+        actions = scenario.atomic_actions()
+        self.assertEqual(["requests.check_request"],
+                         [a["name"] for a in actions])
+        self.assertEqual(["requests.send_request", "requests.read_response"],
+                         [a["name"] for a in actions[0]["children"]])
+        self.assertEqual([scenario], senders)
+        self.assertIsNone(utils._local.scenario)
+
+    def test_timed_http_adapter(self):
+        adapter = utils.TimedHTTPAdapter()
+        for url in ("http://example.com", "https://example.com"):
+            conn_pool = adapter.get_connection(url)
+            self.assertTrue(conn_pool.ConnectionCls._rally_timed)
+            self.assertIs(conn_pool,
+                          adapter.get_connection(url + "/path"))
+            self.assertIs(conn_pool.ConnectionCls,
+                          adapter.get_connection(url).ConnectionCls)
+
+    def test__get_timed_connection_cls(self):
+        connected = []
+
+        class Connection(object):
+            def connect(self):
+                connected.append(self)
+
+        timed_cls = utils._get_timed_connection_cls(Connection)
+        self.assertIs(timed_cls, utils._get_timed_connection_cls(Connection))
+
+        conn = timed_cls()
+        conn.connect()
+        self.assertEqual([conn], connected)
+
+        scenario = utils.RequestScenario(test.get_test_context())
+        utils._local.scenario = scenario
+        self.addCleanup(setattr, utils._local, "scenario", None)
+        conn.connect()
+        self.assertEqual([conn, conn], connected)
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "requests.connect")
+
+    @mock.patch("%s.get_session" % UTILS)
+    def test__check_request_pooled_stream(self, mock_get_session):
+        session = mock_get_session.return_value
+        session.request.return_value = mock.MagicMock(status_code=200)
+        scenario = utils.RequestScenario(test.get_test_context())
+        scenario._check_request(status_code=200, url="sample", method="GET",
+                                pool={}, stream=True)
+
+        session.request.assert_called_once_with("GET", "sample", stream=True)
+        self.assertEqual(
+            ["requests.send_request"],
+            [a["name"] for a in scenario.atomic_actions()[0]["children"]])
+
+    @mock.patch("%s._sessions" % UTILS, new_callable=dict)
+    def test_get_session(self, mock__sessions):
+        session = utils.get_session(size=3)
+        self.assertIs(session, utils.get_session(size=3))
+        self.assertIsNot(session, utils.get_session(size=4))
+        self.assertNotEqual("close", session.headers.get("Connection"))
+        adapter = session.get_adapter("https://example.com")
+        self.assertIs(adapter, session.get_adapter("http://example.com"))
+        self.assertEqual(3, adapter._pool_maxsize)
+
+        self.assertEqual(
+            "close",
+            utils.get_session(keep_alive=False).headers["Connection"])
+
+        sessions = []
+        threads = [threading.Thread(
+            target=lambda: sessions.append(utils.get_session(size=3)))
+            for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([session] * 3, sessions)
+
+    @mock.patch("%s._sessions" % UTILS, new_callable=dict)
+    @mock.patch("%s.os.getpid" % UTILS, return_value=1)
+    def test_get_session_forked(self, mock_getpid, mock__sessions):
+        session = utils.get_session(size=3)
+        mock_getpid.return_value = 2
+        self.assertIsNot(session, utils.get_session(size=3))
+
+    @ddt.data(
+        ({}, None),
+        ({"pool": {"size": 3, "keep_alive": False}}, None),
+        ({"requests": [{"url": "u"}, {"url": "u", "pool": {}}]}, None),
+        ({"pool": {"maxsize": 5}}, "Additional properties are not allowed"),
+        ({"pool": {"size": 0}}, "0 is less than the minimum of 1"),
+        ({"pool": {"keep_alive": "yes"}}, "'yes' is not of type 'boolean'"),
+        ({"requests": [{"url": "u", "pool": {"size": "5"}}]},
+         "'5' is not of type 'integer'"))
+    @ddt.unpack
+    def test_check_request_pool_validator(self, args, error):
+        validator = utils.CheckRequestPoolValidator()
+        result = validator.validate(None, {"args": args}, None, None)
+        if error is None:
+            self.assertIsNone(result)
+        else:
+            self.assertFalse(result.is_valid)
+            self.assertIn(error, result.msg)
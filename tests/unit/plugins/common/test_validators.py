@@ -47,6 +47,29 @@ class JsonSchemaValidatorTestCase(test.TestCase):
 
         DummyPlugin.unregister()
 
+    @mock.patch("rally.plugins.common.validators.jsonschema.validators"
+                ".validator_for")
+    def test_validate_caches_schema_validator(self, mock_validator_for):
+        class DummyPlugin(object):
+            CONFIG_SCHEMA = {"type": "string"}
+
+        validator_cls = mock_validator_for.return_value
+        validator = validators.JsonSchemaValidator()
+        for i in range(3):
+            validator.validate(None, None, DummyPlugin, "foo")
+
+        mock_validator_for.assert_called_once_with(DummyPlugin.CONFIG_SCHEMA)
+        validator_cls.check_schema.assert_called_once_with(
+            DummyPlugin.CONFIG_SCHEMA)
+        validator_cls.assert_called_once_with(DummyPlugin.CONFIG_SCHEMA)
+        self.assertEqual([mock.call("foo")] * 3,
+                         validator_cls.return_value.validate.call_args_list)
+
+        DummyPlugin.CONFIG_SCHEMA = {"type": "integer"}
+        validator.validate(None, None, DummyPlugin, 10)
+        validator_cls.assert_called_with({"type": "integer"})
+        self.assertEqual(2, validator_cls.call_count)
+
 
 @ddt.ddt
 class ArgsValidatorTestCase(test.TestCase):
@@ -12,8 +12,11 @@
 #    under the License.
 
 import os
+import shutil
 import subprocess
+import tempfile
 
+import ddt
 import mock
 
 from rally import exceptions
@@ -24,13 +27,16 @@ from tests.unit import test
 PATH = "rally.plugins.common.verification.testr"
 
 
+@ddt.ddt
 class TestrContextTestCase(test.TestCase):
 
     def setUp(self):
         super(TestrContextTestCase, self).setUp()
-        self.verifier = mock.Mock()
+        self.verifier = mock.Mock(deployment={"uuid": "deployment_uuid"})
         self.prepare_run_args = self.verifier.manager.prepare_run_args
         self.prepare_run_args.side_effect = lambda x: x
+        self.mock_verification_list = mock.patch(
+            "%s.objects.Verification.list" % PATH, return_value=[]).start()
 
     def assertEqualCmd(self, expected, actual, msg=""):
         cmd = ["testr", "run", "--subunit"]
@@ -132,6 +138,77 @@ class TestrContextTestCase(test.TestCase):
         ctx.setup()
         self.assertEqualCmd(["--parallel", "foo"], cfg["testr_cmd"])
 
+    def test_setup_with_tests_durations(self):
+        self.mock_verification_list.return_value = [
+            mock.Mock(tests={"t1": {"status": "success", "duration": "3.0"},
+                             "t2": {"status": "fail", "duration": "2.000"},
+                             "t3": {"status": "skip", "duration": "0.000"}}),
+            mock.Mock(tests={"t1": {"status": "success", "duration": "4.0"},
+                             "t4": {"status": "success", "duration": "1.0"}}),
+            mock.Mock(tests=None)]
+        cfg = {"verifier": self.verifier, "run_args": {"concurrency": 2}}
+        ctx = testr.TestrContext(cfg)
+        ctx.setup()
+
+        self.mock_verification_list.assert_called_once_with(
+            verifier_id=self.verifier.uuid,
+            deployment_id="deployment_uuid")
+        self.verifier.manager.seed_tests_durations.assert_called_once_with(
+            {"t1": 4.0, "t2": 2.0, "t4": 1.0})
+        # NOTE: tests of the run are unknown without a load list
+        self.assertNotIn("predicted_tests_duration", cfg)
+
+    @mock.patch("%s.common_utils.generate_random_path" % PATH)
+    def test_setup_with_tests_durations_and_load_list(
+            self, mock_generate_random_path):
+        self.mock_verification_list.return_value = [
+            mock.Mock(tests={"t1": {"status": "success", "duration": "3.0"},
+                             "t2": {"status": "success", "duration": "2.0"},
+                             "t3": {"status": "success", "duration": "2.0"}})]
+        cfg = {"verifier": self.verifier,
+               "run_args": {"concurrency": 2, "load_list": ["t2", "t3"]}}
+        ctx = testr.TestrContext(cfg)
+        with mock.patch("%s.open" % PATH, mock.mock_open()):
+            ctx.setup()
+
+        self.assertEqual(2.0, cfg["predicted_tests_duration"])
+
+        # NOTE: the run can not be shorter than the longest test
+        cfg = {"verifier": self.verifier,
+               "run_args": {"concurrency": 2, "load_list": ["t1", "t2"]}}
+        ctx = testr.TestrContext(cfg)
+        with mock.patch("%s.open" % PATH, mock.mock_open()):
+            ctx.setup()
+
+        self.assertEqual(3.0, cfg["predicted_tests_duration"])
+
+    @ddt.data({"failed": True}, {"pattern": "foo"})
+    @mock.patch("%s.common_utils.generate_random_path" % PATH)
+    def test_setup_with_tests_durations_and_filtered_load_list(
+            self, run_args, mock_generate_random_path):
+        self.mock_verification_list.return_value = [
+            mock.Mock(tests={"t1": {"status": "success", "duration": "3.0"},
+                             "t2": {"status": "success", "duration": "2.0"}})]
+        run_args.update(concurrency=2, load_list=["t1", "t2"])
+        cfg = {"verifier": self.verifier, "run_args": run_args}
+        ctx = testr.TestrContext(cfg)
+        with mock.patch("%s.open" % PATH, mock.mock_open()):
+            ctx.setup()
+
+        self.assertTrue(self.verifier.manager.seed_tests_durations.called)
+        self.assertNotIn("predicted_tests_duration", cfg)
+
+    def test_setup_serial_mode_with_tests_durations(self):
+        self.mock_verification_list.return_value = [
+            mock.Mock(tests={"t1": {"status": "success", "duration": "3.0"}})]
+        cfg = {"verifier": self.verifier, "run_args": {"concurrency": 1}}
+        ctx = testr.TestrContext(cfg)
+        ctx.setup()
+
+        self.assertFalse(self.mock_verification_list.called)
+        self.assertFalse(self.verifier.manager.seed_tests_durations.called)
+        self.assertNotIn("predicted_tests_duration", cfg)
+
     @mock.patch("%s.os.remove" % PATH)
     @mock.patch("%s.os.path.exists" % PATH)
     def test_cleanup(self, mock_exists, mock_remove):
@@ -250,7 +327,79 @@ class TestrLauncherTestCase(test.TestCase):
             mock_popen.return_value.stdout, live=True,
             expected_failures=ctx["run_args"]["xfail_list"],
             skipped_tests=ctx["run_args"]["skip_list"],
-            logger_name=launcher.verifier.name)
+            logger_name=launcher.verifier.name, on_test_finished=None)
+
+    @mock.patch("%s.subunit_v2.parse" % PATH)
+    @mock.patch("%s.subprocess.Popen" % PATH)
+    def test_run_with_verification(self, mock_popen, mock_parse):
+        saved = []
+        verification = mock.Mock()
+        verification.add_tests.side_effect = lambda t: saved.append(dict(t))
+
+        def parse(stream, **kwargs):
+            for i in range(5):
+                kwargs["on_test_finished"]("t%s" % i, {"status": "success"})
+            return mock.DEFAULT
+
+        mock_parse.side_effect = parse
+        launcher = testr.TestrLauncher(mock.Mock())
+        with mock.patch("%s.TESTS_BATCH_SIZE" % PATH, 2):
+            launcher.run({"testr_cmd": ["ls"], "verification": verification})
+
+        self.assertEqual([{"t0": {"status": "success"},
+                           "t1": {"status": "success"}},
+                          {"t2": {"status": "success"},
+                           "t3": {"status": "success"}},
+                          {"t4": {"status": "success"}}], saved)
+
+    @mock.patch("%s.LOG" % PATH)
+    @mock.patch("%s.common_utils.Timer" % PATH)
+    @mock.patch("%s.subunit_v2.parse" % PATH)
+    @mock.patch("%s.subprocess.Popen" % PATH)
+    def test_run_with_predicted_duration(self, mock_popen, mock_parse,
+                                         mock_timer, mock_log):
+        timer = mock_timer.return_value.__enter__.return_value
+        timer.duration.return_value = 5.0
+        launcher = testr.TestrLauncher(mock.Mock())
+        ctx = {"testr_cmd": ["ls"], "predicted_tests_duration": 4.0}
+
+        self.assertEqual(mock_parse.return_value, launcher.run(ctx))
+        # NOTE: the prediction is compared with the wall-clock time of the
+        #       run, not with the sum of durations of tests
+        mock_log.info.assert_called_once_with(mock.ANY, 5.0, 4.0)
+
+    def test_seed_tests_durations(self):
+        try:
+            import anydbm as dbm
+        except ImportError:
+            import dbm
+
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        os.mkdir(os.path.join(tmp_dir, ".testrepository"))
+        times_db = os.path.join(tmp_dir, ".testrepository", "times.dbm")
+        db = dbm.open(times_db, "c")
+        db["t1"] = "1.0"
+        db.close()
+
+        launcher = testr.TestrLauncher(mock.Mock())
+        with mock.patch.object(testr.TestrLauncher, "repo_dir", tmp_dir):
+            launcher.seed_tests_durations({"t1": 5.0, "t2": 2.5})
+
+        db = dbm.open(times_db, "r")
+        try:
+            self.assertEqual(b"1.0", db["t1"])
+            self.assertEqual(b"2.5", db["t2"])
+        finally:
+            db.close()
+
+    @mock.patch("%s.LOG" % PATH)
+    def test_seed_tests_durations_failed(self, mock_log):
+        launcher = testr.TestrLauncher(mock.Mock())
+        with mock.patch.object(testr.TestrLauncher, "repo_dir",
+                               "/non/existing/path"):
+            launcher.seed_tests_durations({"t1": 5.0})
+        self.assertTrue(mock_log.debug.called)
 
     @mock.patch("%s.manager.VerifierManager.install" % PATH)
     def test_install(self, mock_verifier_manager_install):
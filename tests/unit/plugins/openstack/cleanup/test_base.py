@@ -32,6 +32,14 @@ class ResourceDecoratorTestCase(test.TestCase):
 
         self.assertEqual(Fake._service, "service")
         self.assertEqual(Fake._resource, "res")
+        self.assertFalse(Fake._independent)
+        self.assertFalse(Fake._batch_deletion_check)
+
+        @base.resource("service", "res", independent=True)
+        class FakeIndependent(object):
+            pass
+
+        self.assertTrue(FakeIndependent._independent)
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -13,11 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
 import mock
 
 from rally.common import utils
+from rally import exceptions
 from rally.plugins.openstack.cleanup import base
 from rally.plugins.openstack.cleanup import manager
+from rally.plugins.openstack.cleanup import resources  # noqa
 from tests.unit import test
 
 
@@ -48,7 +53,8 @@ class SeekAndDestroyTestCase(test.TestCase):
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource(self, mock_log):
         mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
-                                       _interval=0.01)
+                                       _interval=0.01,
+                                       _batch_deletion_check=False)
         mock_resource.delete.side_effect = [Exception, Exception, True]
         mock_resource.is_deleted.side_effect = [False, False, True]
 
@@ -67,7 +73,8 @@ class SeekAndDestroyTestCase(test.TestCase):
     def test__delete_single_resource_timeout(self, mock_log):
 
         mock_resource = mock.MagicMock(_max_attempts=1, _timeout=0.02,
-                                       _interval=0.025)
+                                       _interval=0.025,
+                                       _batch_deletion_check=False)
 
         mock_resource.delete.return_value = True
         mock_resource.is_deleted.side_effect = [False, False, True]
@@ -83,7 +90,8 @@ class SeekAndDestroyTestCase(test.TestCase):
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource_excpetion_in_is_deleted(self, mock_log):
         mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
-                                       _interval=0)
+                                       _interval=0,
+                                       _batch_deletion_check=False)
         mock_resource.delete.return_value = True
         mock_resource.is_deleted.side_effect = [Exception] * 4
         manager.SeekAndDestroy(None, None, None)._delete_single_resource(
@@ -95,6 +103,62 @@ class SeekAndDestroyTestCase(test.TestCase):
         self.assertEqual(5, mock_log.warning.call_count)
         self.assertEqual(4, mock_log.exception.call_count)
 
+    @mock.patch("%s.task_utils.get_status_watcher" % BASE)
+    def test__delete_single_resource_batch_deletion_check(
+            self, mock_get_status_watcher):
+        mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
+                                       _interval=2,
+                                       _batch_deletion_check=True)
+        manager_cls = mock.MagicMock()
+        destroyer = manager.SeekAndDestroy(manager_cls, None, None)
+        destroyer._delete_single_resource(mock_resource)
+
+        mock_resource.delete.assert_called_once_with()
+        self.assertFalse(mock_resource.is_deleted.called)
+        mock_watch = mock_get_status_watcher.return_value.watch
+        mock_watch.assert_called_once_with(
+            mock_resource.raw_resource, destroyer._get_lister(mock_resource),
+            ready_statuses=["DELETED", "DELETE_COMPLETE"],
+            check_deletion=True, timeout=10, check_interval=2)
+        mock_watch.return_value.result.assert_called_once_with()
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.task_utils.get_status_watcher" % BASE)
+    def test__delete_single_resource_batch_deletion_check_timeout(
+            self, mock_get_status_watcher, mock_log):
+        mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
+                                       _interval=2,
+                                       _batch_deletion_check=True)
+        mock_watch = mock_get_status_watcher.return_value.watch
+        mock_watch.return_value.result.side_effect = (
+            exceptions.TimeoutException(
+                desired_status="DELETED", resource_name="foo",
+                resource_type="Fake", resource_id="id",
+                resource_status="ACTIVE"))
+        destroyer = manager.SeekAndDestroy(mock.MagicMock(), None, None)
+        destroyer._delete_single_resource(mock_resource)
+
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    def test__get_lister(self):
+        manager_cls = mock.MagicMock()
+        destroyer = manager.SeekAndDestroy(manager_cls, None, None)
+        resource1 = mock.Mock(tenant_uuid="t1")
+        resource2 = mock.Mock(tenant_uuid="t1")
+        resource3 = mock.Mock(tenant_uuid="t2")
+
+        lister = destroyer._get_lister(resource1)
+        self.assertIs(lister, destroyer._get_lister(resource2))
+        self.assertIsNot(lister, destroyer._get_lister(resource3))
+        manager_cls.assert_has_calls([
+            mock.call(admin=resource1.admin, user=resource1.user,
+                      tenant_uuid="t1"),
+            mock.call(admin=resource3.admin, user=resource3.user,
+                      tenant_uuid="t2")])
+
+        self.assertEqual(manager_cls.return_value.list.return_value,
+                         lister())
+
     def _manager(self, list_side_effect, **kw):
         mock_mgr = mock.MagicMock()
         mock_mgr().list.side_effect = list_side_effect
@@ -293,7 +357,22 @@ class SeekAndDestroyTestCase(test.TestCase):
 
         mock_broker_run.assert_called_once_with(cleaner._publisher,
                                                 cleaner._consumer,
-                                                consumers_count=5)
+                                                consumers_count=5,
+                                                pipeline=True)
+
+    def test__call_api(self):
+        func = mock.Mock()
+        cleaner = manager.SeekAndDestroy(None, None, None)
+        self.assertEqual(func.return_value, cleaner._call_api(func, 1, 2))
+        func.assert_called_once_with(1, 2)
+
+        semaphore = mock.MagicMock()
+        cleaner = manager.SeekAndDestroy(None, None, None,
+                                         api_semaphore=semaphore)
+        self.assertEqual(func.return_value, cleaner._call_api(func, 3))
+        func.assert_called_with(3)
+        semaphore.__enter__.assert_called_once_with()
+        semaphore.__exit__.assert_called_once_with(None, None, None)
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -364,7 +443,11 @@ class ResourceManagerTestCase(test.TestCase):
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[
+                    mock.MagicMock(_service="a", _resource="x", _order=1,
+                                   _independent=False),
+                    mock.MagicMock(_service="b", _resource="y", _order=2,
+                                   _independent=False)])
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy,
                      mock_itersubclasses):
         class A(utils.RandomNameGeneratorMixin):
@@ -375,28 +458,35 @@ class ResourceManagerTestCase(test.TestCase):
 
         mock_itersubclasses.return_value = [A, B]
 
-        manager.cleanup(names=["a", "b"], admin_required=True,
-                        admin="admin", users=["user"],
-                        superclass=A,
-                        task_id="task_id")
+        durations = manager.cleanup(names=["a", "b"], admin_required=True,
+                                    admin="admin", users=["user"],
+                                    superclass=A,
+                                    task_id="task_id")
+        self.assertEqual(["a.x", "b.y"], list(durations))
 
         mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
 
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=None,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      api_semaphore=None),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=None,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      api_semaphore=None),
             mock.call().exterminate()
         ])
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[
+                    mock.MagicMock(_service="a", _resource="x", _order=1,
+                                   _independent=False),
+                    mock.MagicMock(_service="b", _resource="y", _order=2,
+                                   _independent=False)])
     def test_cleanup_with_api_versions(self,
                                        mock_find_resource_managers,
                                        mock_seek_and_destroy,
@@ -421,10 +511,143 @@ class ResourceManagerTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=api_versions,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      api_semaphore=None),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=api_versions,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      api_semaphore=None),
             mock.call().exterminate()
         ])
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses",
+                return_value=[])
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_concurrently(self, mock_find_resource_managers,
+                                  mock_seek_and_destroy,
+                                  mock_itersubclasses):
+        manager.CONF.set_override("max_api_calls_per_service", 2, "cleanup")
+        self.addCleanup(manager.CONF.clear_override,
+                        "max_api_calls_per_service", "cleanup")
+        managers = [
+            mock.MagicMock(_service="a", _resource="x", _order=100,
+                           _independent=True),
+            mock.MagicMock(_service="a", _resource="y", _order=200,
+                           _independent=False),
+            mock.MagicMock(_service="b", _resource="z", _order=250,
+                           _independent=False),
+            mock.MagicMock(_service="c", _resource="w", _order=300,
+                           _independent=False)]
+        mock_find_resource_managers.return_value = managers
+
+        durations = manager.cleanup(names=["a", "b", "c"])
+
+        self.assertEqual(["a.x", "a.y", "b.z", "c.w"], list(durations))
+        self.assertEqual(4, mock_seek_and_destroy.call_count)
+        semaphores = {}
+        for call in mock_seek_and_destroy.call_args_list:
+            semaphore = call[1]["api_semaphore"]
+            self.assertIsNotNone(semaphore)
+            semaphores.setdefault(call[0][0]._service, set()).add(semaphore)
+        self.assertEqual({"a", "b", "c"}, set(semaphores))
+        self.assertEqual(1, len(semaphores["a"]))
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses",
+                return_value=[])
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_same_order_concurrently(self,
+                                             mock_find_resource_managers,
+                                             mock_seek_and_destroy,
+                                             mock_itersubclasses):
+        managers = [
+            mock.MagicMock(_service="a", _resource="x", _order=100,
+                           _independent=False),
+            mock.MagicMock(_service="b", _resource="y", _order=100,
+                           _independent=False),
+            mock.MagicMock(_service="c", _resource="z", _order=101,
+                           _independent=False)]
+        mock_find_resource_managers.return_value = managers
+        b_started = threading.Event()
+        calls = []
+
+        def seek_and_destroy(mgr, *args, **kwargs):
+            calls.append(mgr._service)
+            if mgr._service == "b":
+                b_started.set()
+            elif mgr._service == "a":
+                # NOTE: managers with the same order are cleaned up at once
+                self.assertTrue(b_started.wait(10))
+            return mock.Mock()
+
+        mock_seek_and_destroy.side_effect = seek_and_destroy
+
+        manager.cleanup(names=["a", "b", "c"])
+
+        self.assertEqual("c", calls[-1])
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    def test_cleanup_dependent_services_in_order(self,
+                                                 mock_seek_and_destroy):
+        # NOTE: heat stacks can own senlin clusters and ec2 instances are
+        #       nova servers, so they must not be cleaned up concurrently
+        events = []
+        lock = threading.Lock()
+
+        def seek_and_destroy(mgr, *args, **kwargs):
+            service = mgr._service
+
+            def exterminate():
+                with lock:
+                    events.append(("start", service))
+                # NOTE: give a concurrently started cleanup time to run
+                time.sleep(0.01)
+                with lock:
+                    events.append(("finish", service))
+
+            return mock.Mock(exterminate=exterminate)
+
+        mock_seek_and_destroy.side_effect = seek_and_destroy
+
+        manager.cleanup(names=["heat", "senlin", "nova", "ec2"])
+
+        for first, second in (("heat", "senlin"), ("nova", "ec2")):
+            last_finish = max(i for i, e in enumerate(events)
+                              if e == ("finish", first))
+            first_start = min(i for i, e in enumerate(events)
+                              if e == ("start", second))
+            self.assertLess(last_finish, first_start)
+
+    def test__cleanup_threads(self):
+        managers = [mock.Mock(name="a"), mock.Mock(name="b")]
+        cleanup_func = mock.Mock(side_effect=lambda m: m())
+        managers[0].side_effect = ValueError
+        threads = manager._CleanupThreads(managers, cleanup_func)
+
+        threads.start()
+        self.assertRaises(ValueError, threads.join)
+
+        managers[1].assert_called_once_with()
+        threads.join(reraise=False)
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses",
+                return_value=[])
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_fails(self, mock_find_resource_managers,
+                           mock_seek_and_destroy, mock_itersubclasses):
+        mock_find_resource_managers.return_value = [
+            mock.MagicMock(_service="a", _resource="x", _order=100,
+                           _independent=False),
+            mock.MagicMock(_service="b", _resource="y", _order=100,
+                           _independent=False),
+            mock.MagicMock(_service="c", _resource="z", _order=200,
+                           _independent=False)]
+        mock_seek_and_destroy.return_value.exterminate.side_effect = (
+            ValueError)
+
+        self.assertRaises(ValueError, manager.cleanup,
+                          names=["a", "b", "c"])
+        self.assertEqual(2, mock_seek_and_destroy.call_count)
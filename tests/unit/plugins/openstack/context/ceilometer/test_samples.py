@@ -127,7 +127,8 @@ class CeilometerSampleGeneratorTestCase(test.TestCase):
         tenants, real_context = self._gen_context(
             tenants_count, users_per_tenant,
             resources_per_tenant, samples_per_resource)
-        scenario = ceilo_utils.CeilometerScenario(real_context)
+        scenario = ceilo_utils.CeilometerScenario(
+            copy.deepcopy(real_context))
         sample = {
             "counter_name": "fake-counter-name",
             "counter_type": "fake-counter-type",
@@ -46,7 +46,11 @@ class AdminCleanupTestCase(test.TestCase):
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[
+                    mock.MagicMock(_service="a", _resource="x", _order=1,
+                                   _independent=False),
+                    mock.MagicMock(_service="b", _resource="y", _order=2,
+                                   _independent=False)])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers,
                      mock_itersubclasses):
@@ -66,6 +70,7 @@ class AdminCleanupTestCase(test.TestCase):
         admin_cleanup.setup()
         admin_cleanup.cleanup()
 
+        self.assertEqual(["a.x", "b.y"], sorted(ctx["cleanup_durations"]))
         mock_itersubclasses.assert_called_once_with(scenario.OpenStackScenario)
         mock_find_resource_managers.assert_called_once_with(("a", "b"), True)
         mock_seek_and_destroy.assert_has_calls([
@@ -74,20 +79,26 @@ class AdminCleanupTestCase(test.TestCase):
                       ctx["users"],
                       api_versions=None,
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
+                      task_id="task_id",
+                      api_semaphore=None),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       ctx["admin"],
                       ctx["users"],
                       api_versions=None,
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
+                      task_id="task_id",
+                      api_semaphore=None),
             mock.call().exterminate()
         ])
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[
+                    mock.MagicMock(_service="a", _resource="x", _order=1,
+                                   _independent=False),
+                    mock.MagicMock(_service="b", _resource="y", _order=2,
+                                   _independent=False)])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup_admin_with_api_versions(self,
                                              mock_seek_and_destroy,
@@ -125,13 +136,15 @@ class AdminCleanupTestCase(test.TestCase):
                       ctx["users"],
                       api_versions=ctx["config"]["api_versions"],
                       resource_classes=[ResourceClass],
-                      task_id=ctx["task"]["uuid"]),
+                      task_id=ctx["task"]["uuid"],
+                      api_semaphore=None),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       ctx["admin"],
                       ctx["users"],
                       api_versions=ctx["config"]["api_versions"],
                       resource_classes=[ResourceClass],
-                      task_id=ctx["task"]["uuid"]),
+                      task_id=ctx["task"]["uuid"],
+                      api_semaphore=None),
             mock.call().exterminate()
         ])
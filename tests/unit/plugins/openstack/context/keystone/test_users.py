@@ -204,6 +204,8 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
             self.assertEqual(len(ctx.context["tenants"]),
                              self.tenants_num)
             self.assertEqual("random", ctx.context["user_choice_method"])
+            self.assertEqual(tuple(sorted(ctx.context["tenants"])),
+                             ctx.context["sorted_tenant_ids"])
 
         # Cleanup (called by content manager)
         self.assertEqual(len(ctx.context["users"]), 0)
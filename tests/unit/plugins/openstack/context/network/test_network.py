@@ -18,6 +18,7 @@ import mock
 import netaddr
 
 from rally.plugins.openstack.context.network import networks as network_context
+from rally.plugins.openstack.wrappers import network as network_wrapper
 from tests.unit import test
 
 NET = "rally.plugins.openstack.wrappers.network."
@@ -65,14 +66,9 @@ class NetworkTestCase(test.TestCase):
               {"dns_nameservers": ["1.2.3.4", "5.6.7.8"]})
     @ddt.unpack
     @mock.patch(NET + "wrap")
-    @mock.patch("rally.plugins.openstack.context.network.networks.utils")
     @mock.patch("rally.osclients.Clients")
-    def test_setup(self, mock_clients, mock_utils, mock_wrap, **dns_kwargs):
-        mock_utils.iterate_per_tenants.return_value = [
-            ("foo_user", "foo_tenant"),
-            ("bar_user", "bar_tenant")]
+    def test_setup(self, mock_clients, mock_wrap, **dns_kwargs):
         mock_create = mock.Mock(side_effect=lambda t, **kw: t + "-net")
-        mock_utils.generate_random_name = mock.Mock()
         mock_wrap.return_value = mock.Mock(create_network=mock_create)
         nets_per_tenant = 2
         net_context = network_context.Network(
@@ -89,11 +85,8 @@ class NetworkTestCase(test.TestCase):
             mock.call(tenant, add_router=True,
                       subnets_num=1, network_create_args={"fakearg": "fake"},
                       **dns_kwargs)
-            for user, tenant in mock_utils.iterate_per_tenants.return_value]
-        mock_create.assert_has_calls(create_calls)
-
-        mock_utils.iterate_per_tenants.assert_called_once_with(
-            net_context.context["users"])
+            for tenant in ("foo_tenant", "bar_tenant")] * nets_per_tenant
+        mock_create.assert_has_calls(create_calls, any_order=True)
         expected_networks = ["bar_tenant-net",
                              "foo_tenant-net"] * nets_per_tenant
         actual_networks = []
@@ -102,6 +95,22 @@ class NetworkTestCase(test.TestCase):
         self.assertSequenceEqual(sorted(expected_networks),
                                  sorted(actual_networks))
 
+    @mock.patch("rally.osclients.Clients")
+    @mock.patch(NET + "wrap")
+    def test_setup_fails(self, mock_wrap, mock_clients):
+        mock_wrap.return_value.create_network.side_effect = [
+            "foo_tenant-net", network_wrapper.NetworkWrapperException()]
+        net_context = network_context.Network(self.get_context())
+        with mock.patch.object(network_context.context, "CONF") as mock_conf:
+            mock_conf.context_setup_workers = 1
+            self.assertRaises(network_wrapper.NetworkWrapperException,
+                              net_context.setup)
+
+        mock_wrap.return_value.delete_network.assert_called_once_with(
+            "foo_tenant-net")
+        self.assertNotIn("networks", net_context.context["tenants"][
+            "foo_tenant"])
+
     @mock.patch("rally.osclients.Clients")
     @mock.patch(NET + "wrap")
     def test_cleanup(self, mock_wrap, mock_clients):
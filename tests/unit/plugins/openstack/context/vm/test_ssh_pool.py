@@ -0,0 +1,35 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.plugins.openstack.context.vm import ssh_pool
+from tests.unit import test
+
+BASE = "rally.plugins.openstack.context.vm.ssh_pool"
+
+
+class SSHPoolTestCase(test.TestCase):
+
+    @mock.patch("%s.sshutils.close_pool" % BASE)
+    def test_cleanup(self, mock_close_pool):
+        ctx = ssh_pool.SSHPool({"task": mock.MagicMock(),
+                                "owner_id": "foo_workload",
+                                "config": {"ssh_pool": None}})
+        ctx.setup()
+        self.assertFalse(mock_close_pool.called)
+
+        ctx.cleanup()
+        mock_close_pool.assert_called_once_with("foo_workload")
@@ -22,8 +22,14 @@ import mock
 class AuthenticateTestCase(test.ScenarioTestCase):
 
     def test_keystone(self):
-        scenario_inst = authenticate.Keystone()
+        clients = mock.MagicMock()
+        sess = mock.Mock()
+        plugin = mock.Mock()
+        clients.keystone.get_session.return_value = (sess, plugin)
+        scenario_inst = authenticate.Keystone(clients=clients)
         scenario_inst.run()
+        clients.keystone.get_session.assert_called_once_with(shared=False)
+        plugin.get_access.assert_called_once_with(sess)
         self.assertTrue(self.client_created("keystone"))
         self._test_atomic_action_timer(scenario_inst.atomic_actions(),
                                        "authenticate.keystone")
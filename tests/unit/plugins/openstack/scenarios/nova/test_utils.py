@@ -111,10 +111,11 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         self.mock_wait_for_status.mock.assert_called_once_with(
             self.server,
             ready_statuses=["ACTIVE"],
-            update_resource=self.mock_get_from_manager.mock.return_value,
+            failure_statuses=["ERROR"],
+            list_resources=nova_scenario._list_servers_for_status,
+            group_key=nova_scenario._servers_status_group(),
             check_interval=CONF.benchmark.nova_server_boot_poll_interval,
             timeout=CONF.benchmark.nova_server_boot_timeout)
-        self.mock_get_from_manager.mock.assert_called_once_with()
         self.assertEqual(self.mock_wait_for_status.mock.return_value,
                          return_server)
 
@@ -256,11 +257,12 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         self.mock_wait_for_status.mock.assert_called_once_with(
             self.server,
             ready_statuses=["deleted"],
+            failure_statuses=["ERROR"],
             check_deletion=True,
-            update_resource=self.mock_get_from_manager.mock.return_value,
+            list_resources=nova_scenario._list_servers_for_status,
+            group_key=nova_scenario._servers_status_group(),
             check_interval=CONF.benchmark.nova_server_delete_poll_interval,
             timeout=CONF.benchmark.nova_server_delete_timeout)
-        self.mock_get_from_manager.mock.assert_called_once_with()
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        "nova.delete_server")
 
@@ -271,11 +273,12 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         self.mock_wait_for_status.mock.assert_called_once_with(
             self.server,
             ready_statuses=["deleted"],
+            failure_statuses=["ERROR"],
             check_deletion=True,
-            update_resource=self.mock_get_from_manager.mock.return_value,
+            list_resources=nova_scenario._list_servers_for_status,
+            group_key=nova_scenario._servers_status_group(),
             check_interval=CONF.benchmark.nova_server_delete_poll_interval,
             timeout=CONF.benchmark.nova_server_delete_timeout)
-        self.mock_get_from_manager.mock.assert_called_once_with()
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        "nova.force_delete_server")
 
@@ -381,16 +384,7 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         servers = [self.server, self.server1]
         nova_scenario = utils.NovaScenario(context=self.context)
         nova_scenario._delete_servers(servers, force=force)
-        check_interval = CONF.benchmark.nova_server_delete_poll_interval
-        expected = []
         for server in servers:
-            expected.append(mock.call(
-                server,
-                ready_statuses=["deleted"],
-                check_deletion=True,
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                check_interval=check_interval,
-                timeout=CONF.benchmark.nova_server_delete_timeout))
             if force:
                 server.force_delete.assert_called_once_with()
                 self.assertFalse(server.delete.called)
@@ -398,11 +392,37 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
                 server.delete.assert_called_once_with()
                 self.assertFalse(server.force_delete.called)
 
-        self.mock_wait_for_status.mock.assert_has_calls(expected)
+        self.mock_wait_for_statuses.mock.assert_called_once_with(
+            servers,
+            ready_statuses=["deleted"],
+            list_resources=nova_scenario._list_servers_for_status,
+            group_key=nova_scenario._servers_status_group(),
+            check_deletion=True,
+            check_interval=CONF.benchmark.nova_server_delete_poll_interval,
+            timeout=CONF.benchmark.nova_server_delete_timeout)
         timer_name = "nova.%sdelete_servers" % ("force_" if force else "")
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        timer_name)
 
+    def test__list_servers_for_status(self):
+        nova_scenario = utils.NovaScenario(context=self.context)
+        self.assertEqual(self.clients("nova").servers.list.return_value,
+                         nova_scenario._list_servers_for_status())
+        self.clients("nova").servers.list.assert_called_once_with()
+
+    @ddt.data(
+        {"context": {"tenant": {"id": "t1"}, "user": {"tenant_id": "t2"}},
+         "expected": ("t1", "nova.servers")},
+        {"context": {"user": {"tenant_id": "t2"}},
+         "expected": ("t2", "nova.servers")},
+        {"context": {}, "expected": None})
+    @ddt.unpack
+    def test__servers_status_group(self, context, expected):
+        context["user"] = dict(context.get("user", {}),
+                               credential=mock.MagicMock())
+        scenario = utils.NovaScenario(context=context)
+        self.assertEqual(expected, scenario._servers_status_group())
+
     def test__default_delete_servers(self):
         self._test_delete_servers()
 
@@ -444,10 +464,10 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         scenario.generate_random_name = mock.Mock()
         scenario._pick_random_nic = mock.Mock()
 
-        scenario._boot_servers(image_id, flavor_id, requests,
-                               instances_amount=instances_amount,
-                               auto_assign_nic=auto_assign_nic,
-                               **kwargs)
+        result = scenario._boot_servers(image_id, flavor_id, requests,
+                                        instances_amount=instances_amount,
+                                        auto_assign_nic=auto_assign_nic,
+                                        **kwargs)
 
         expected_kwargs = dict(kwargs)
         if auto_assign_nic and "nics" not in kwargs:
@@ -462,18 +482,16 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
             for i in range(requests)]
         self.clients("nova").servers.create.assert_has_calls(create_calls)
 
-        wait_for_status_calls = [
-            mock.call(
-                servers[i],
-                ready_statuses=["ACTIVE"],
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                check_interval=CONF.benchmark.nova_server_boot_poll_interval,
-                timeout=CONF.benchmark.nova_server_boot_timeout)
-            for i in range(instances_amount)]
-        self.mock_wait_for_status.mock.assert_has_calls(wait_for_status_calls)
-
-        self.mock_get_from_manager.mock.assert_has_calls(
-            [mock.call() for i in range(instances_amount)])
+        self.assertEqual(self.mock_wait_for_statuses.mock.return_value,
+                         result)
+        self.mock_wait_for_statuses.mock.assert_called_once_with(
+            servers,
+            ready_statuses=["ACTIVE"],
+            list_resources=scenario._list_servers_for_status,
+            group_key=scenario._servers_status_group(),
+            failure_statuses=["ERROR"],
+            check_interval=CONF.benchmark.nova_server_boot_poll_interval,
+            timeout=CONF.benchmark.nova_server_boot_timeout)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "nova.boot_servers")
 
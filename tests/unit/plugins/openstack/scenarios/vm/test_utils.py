@@ -114,18 +114,22 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             check_interval=CONF.benchmark.vm_ping_poll_interval)
 
     @mock.patch(VMTASKS_UTILS + ".VMScenario._run_command_over_ssh")
+    @mock.patch("rally.common.sshutils.get_pool")
     @mock.patch("rally.common.sshutils.SSH")
-    def test__run_command(self, mock_sshutils_ssh,
+    def test__run_command(self, mock_sshutils_ssh, mock_get_pool,
                           mock_vm_scenario__run_command_over_ssh):
         vm_scenario = utils.VMScenario(self.context)
-        vm_scenario.context = {"user": {"keypair": {"private": "ssh"}}}
+        vm_scenario.context = {"user": {"keypair": {"private": "ssh"}},
+                               "owner_id": "foo_workload"}
         vm_scenario._run_command("1.2.3.4", 22, "username", "password",
                                  command={"script_file": "foo",
                                           "interpreter": "bar"})
 
         mock_sshutils_ssh.assert_called_once_with(
             "username", "1.2.3.4",
-            port=22, pkey="ssh", password="password")
+            port=22, pkey="ssh", password="password",
+            pool=mock_get_pool.return_value)
+        mock_get_pool.assert_called_once_with("foo_workload")
         mock_sshutils_ssh.return_value.wait.assert_called_once_with(120, 1)
         mock_vm_scenario__run_command_over_ssh.assert_called_once_with(
             mock_sshutils_ssh.return_value,
@@ -186,7 +190,8 @@ class VMScenarioTestCase(test.ScenarioTestCase):
         scenario._attach_floating_ip.assert_called_once_with(
             server, "ext_network")
 
-    def test__delete_server_with_fixed_ip(self):
+    @mock.patch("rally.common.sshutils.get_pool")
+    def test__delete_server_with_fixed_ip(self, mock_get_pool):
         ip = {"ip": "foo_ip", "id": None, "is_floating": False}
         scenario, server = self.get_scenario()
         scenario._delete_floating_ip = mock.Mock()
@@ -194,8 +199,11 @@ class VMScenarioTestCase(test.ScenarioTestCase):
 
         self.assertEqual(scenario._delete_floating_ip.mock_calls, [])
         scenario._delete_server.assert_called_once_with(server, force=True)
+        mock_get_pool.return_value.close.assert_called_once_with(
+            host="foo_ip")
 
-    def test__delete_server_with_fip(self):
+    @mock.patch("rally.common.sshutils.get_pool")
+    def test__delete_server_with_fip(self, mock_get_pool):
         fip = {"ip": "foo_ip", "id": "foo_id", "is_floating": True}
         scenario, server = self.get_scenario()
         scenario._delete_floating_ip = mock.Mock()
@@ -203,6 +211,8 @@ class VMScenarioTestCase(test.ScenarioTestCase):
 
         scenario._delete_floating_ip.assert_called_once_with(server, fip)
         scenario._delete_server.assert_called_once_with(server, force=True)
+        mock_get_pool.return_value.close.assert_called_once_with(
+            host="foo_ip")
 
     @mock.patch(VMTASKS_UTILS + ".network_wrapper.wrap")
     def test__attach_floating_ip(self, mock_wrap):
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
 import ddt
 import mock
 
@@ -255,32 +257,80 @@ class VMTasksTestCase(test.ScenarioTestCase):
                           "StdOut:", "{\"foo\": 42}"],
                       "title": "Script Output"})
 
+    @mock.patch("rally.common.sshutils.get_pool")
     @mock.patch("%s.heat" % BASE)
     @mock.patch("%s.sshutils" % BASE)
-    def test_runcommand_heat(self, mock_sshutils, mock_heat):
-        fake_ssh = mock.Mock()
-        fake_ssh.execute.return_value = [0, "key:val", ""]
-        mock_sshutils.SSH.return_value = fake_ssh
+    def _run_runcommand_heat(self, gate_node, results, mock_sshutils,
+                             mock_heat, mock_get_pool):
+        mock_sshutils.execute_many.side_effect = [
+            [(0, "", "")] * len(results), [(0, "", "")] * len(results),
+            results]
         fake_stack = mock.Mock()
         fake_stack.stack.outputs = [{"output_key": "gate_node",
-                                     "output_value": "ok"}]
+                                     "output_value": gate_node}]
         mock_heat.main.Stack.return_value = fake_stack
         context = {
             "user": {"keypair": {"name": "name", "private": "pk"},
                      "credential": mock.MagicMock()},
-            "tenant": {"networks": [{"router_id": "1"}]}
+            "tenant": {"networks": [{"router_id": "1"}]},
+            "owner_id": "foo_workload"
         }
         scenario = vmtasks.RuncommandHeat(context)
         scenario.generate_random_name = mock.Mock(return_value="name")
         scenario.add_output = mock.Mock()
         workload = {"username": "admin",
                     "resource": ["foo", "bar"]}
-        scenario.run(workload, "template",
-                     {"file_key": "file_value"},
-                     {"param_key": "param_value"})
+        try:
+            scenario.run(workload, "template",
+                         {"file_key": "file_value"},
+                         {"param_key": "param_value"})
+        finally:
+            mock_get_pool.assert_called_with("foo_workload")
+        ips = [gate_node] if isinstance(gate_node, str) else gate_node
+        self.assertEqual(
+            [mock.call("admin", ip, pkey="pk",
+                       pool=mock_get_pool.return_value) for ip in ips],
+            mock_sshutils.SSH.call_args_list)
+        clients = [mock_sshutils.SSH.return_value] * len(ips)
+        self.assertEqual(
+            [mock.call(clients, "cat > /tmp/.rally-workload",
+                       stdin=vmtasks.pkgutil.get_data.return_value),
+             mock.call(clients, "chmod +x /tmp/.rally-workload",
+                       stdin=None),
+             mock.call(clients, "/tmp/.rally-workload",
+                       stdin=json.dumps(fake_stack.stack.outputs))],
+            mock_sshutils.execute_many.call_args_list)
+        return scenario
+
+    @mock.patch("%s.pkgutil" % BASE)
+    def test_runcommand_heat(self, mock_pkgutil):
+        scenario = self._run_runcommand_heat("ok", [(0, "key:val", "")])
         expected = {"chart_plugin": "Table",
                     "data": {"rows": [["key", "val"]],
                              "cols": ["key", "value"]},
                     "description": "Data generated by workload",
                     "title": "Workload summary"}
         scenario.add_output.assert_called_once_with(complete=expected)
+
+    @mock.patch("%s.pkgutil" % BASE)
+    def test_runcommand_heat_many_nodes(self, mock_pkgutil):
+        scenario = self._run_runcommand_heat(
+            ["ip1", "ip2"], [(0, "key:val1", ""), (0, "key:val2", "")])
+        expected = {"chart_plugin": "Table",
+                    "data": {"rows": [["key (ip1)", "val1"],
+                                      ["key (ip2)", "val2"]],
+                             "cols": ["key", "value"]},
+                    "description": "Data generated by workload",
+                    "title": "Workload summary"}
+        scenario.add_output.assert_called_once_with(complete=expected)
+
+    @mock.patch("%s.pkgutil" % BASE)
+    def test_runcommand_heat_no_data(self, mock_pkgutil):
+        self.assertRaises(exceptions.ScriptError, self._run_runcommand_heat,
+                          ["ip1", "ip2"], [(0, "", "err1"), (1, "", "err2")])
+
+    @mock.patch("%s.pkgutil" % BASE)
+    def test_runcommand_heat_failed_node(self, mock_pkgutil):
+        error = exceptions.SSHError("foo")
+        self.assertRaises(exceptions.SSHError, self._run_runcommand_heat,
+                          ["ip1", "ip2"], [(0, "key:val", ""), error])
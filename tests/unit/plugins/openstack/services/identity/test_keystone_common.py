@@ -14,6 +14,7 @@
 
 import mock
 
+from rally.plugins.openstack import credential as oscredential
 from rally.plugins.openstack import service
 from rally.plugins.openstack.services.identity import identity
 from rally.plugins.openstack.services.identity import keystone_common
@@ -267,11 +268,33 @@ class KeystoneMixinTestCase(test.TestCase):
 
     @mock.patch("rally.osclients.Clients")
     def test_fetch_token(self, mock_clients):
-        expected_token = mock_clients.return_value.keystone.auth_ref.auth_token
+        keystone = mock_clients.return_value.keystone
+        sess = mock.Mock()
+        plugin = mock.Mock()
+        keystone.get_session.return_value = (sess, plugin)
+        expected_token = plugin.get_access.return_value.auth_token
         self.assertEqual(expected_token, self.service.fetch_token())
         mock_clients.assert_called_once_with(
             credential=self.clients.credential,
             api_info=self.clients.api_info)
+        keystone.get_session.assert_called_once_with(shared=False)
+        plugin.get_access.assert_called_once_with(sess)
+
+    @mock.patch("rally.osclients.Keystone._create_session")
+    def test_fetch_token_authenticates_every_time(
+            self, mock_keystone__create_session):
+        self.clients.credential = oscredential.OpenStackCredential(
+            "http://auth_url/v3", "user", "pass", "tenant")
+        self.clients.api_info = {}
+        sessions = [(mock.Mock(), mock.Mock()), (mock.Mock(), mock.Mock())]
+        mock_keystone__create_session.side_effect = sessions
+
+        self.service.fetch_token()
+        self.service.fetch_token()
+
+        self.assertEqual(2, mock_keystone__create_session.call_count)
+        for sess, plugin in sessions:
+            plugin.get_access.assert_called_once_with(sess)
 
     def test_validate_token(self):
         token = "some_token"
@@ -18,6 +18,7 @@ import mock
 
 from rally.plugins.openstack.credential import OpenStackCredential
 from rally.plugins.openstack import scenario as base_scenario
+from rally.task import runner
 from tests.unit import test
 
 
@@ -71,7 +72,7 @@ class OpenStackScenarioTestCase(test.TestCase):
 
         scenario = base_scenario.OpenStackScenario(self.context)
 
-        self.assertEqual(user, scenario.context["user"])
+        self.assertIs(user, scenario.context["user"])
         self.assertEqual(self.context["tenants"]["foo"],
                          scenario.context["tenant"])
 
@@ -117,8 +118,8 @@ class OpenStackScenarioTestCase(test.TestCase):
                          mock_profiler_init.call_count)
 
     def test__choose_user_random(self):
-        users = [{"credential": mock.Mock(), "tenant_id": "foo"}
-                 for _ in range(5)]
+        users = [{"credential": "credential%d" % i, "tenant_id": "foo"}
+                 for i in range(5)]
         self.context["users"] = users
         self.context["tenants"] = {"foo": {"name": "bar"},
                                    "baz": {"name": "spam"}}
@@ -133,17 +134,20 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
 
-    @ddt.data((1, "0", "bar"),
-              (2, "0", "foo"),
-              (3, "1", "bar"),
-              (4, "1", "foo"),
-              (5, "0", "bar"),
-              (6, "0", "foo"),
-              (7, "1", "bar"),
-              (8, "1", "foo"))
+    @ddt.data((1, "0", "bar", False),
+              (2, "0", "foo", False),
+              (3, "1", "bar", False),
+              (4, "1", "foo", False),
+              (5, "0", "bar", False),
+              (6, "0", "foo", False),
+              (7, "1", "bar", False),
+              (8, "1", "foo", False),
+              (1, "0", "foo", True),
+              (4, "1", "bar", True),
+              (7, "1", "foo", True))
     @ddt.unpack
-    def test__choose_user_round_robin(self, iteration,
-                                      expected_user_id, expected_tenant_id):
+    def test__choose_user_round_robin(self, iteration, expected_user_id,
+                                      expected_tenant_id, sorted_tenant_ids):
         self.context["iteration"] = iteration
         self.context["user_choice_method"] = "round_robin"
         self.context["users"] = []
@@ -152,6 +156,9 @@ class OpenStackScenarioTestCase(test.TestCase):
             users = [{"id": str(i), "tenant_id": tid} for i in range(2)]
             self.context["users"] += users
             self.context["tenants"][tid] = {"name": tid, "users": users}
+        if sorted_tenant_ids:
+            # the precomputed order is used instead of sorting tenants
+            self.context["sorted_tenant_ids"] = ("foo", "bar")
 
         scenario = base_scenario.OpenStackScenario()
         scenario._choose_user(self.context)
@@ -163,3 +170,28 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
         self.assertEqual(expected_tenant_id, tenant_id)
+
+    @ddt.data("random", "round_robin")
+    def test__choose_user_does_not_copy_tenant(self, user_choice_method):
+        users = [{"id": str(i), "tenant_id": tid,
+                  "credential": mock.Mock()}
+                 for tid in ("foo", "bar") for i in range(2)]
+        tenants = dict((tid, {"name": tid, "networks": [{"id": "net"}],
+                              "users": [u for u in users
+                                        if u["tenant_id"] == tid]})
+                       for tid in ("foo", "bar"))
+        shared = runner._share_context(
+            {"users": users, "tenants": tenants,
+             "sorted_tenant_ids": ("bar", "foo"),
+             "user_choice_method": user_choice_method})
+
+        for iteration in range(4):
+            context = runner._get_scenario_context(iteration, shared)
+            scenario = base_scenario.OpenStackScenario()
+            scenario._choose_user(context)
+
+            tenant_id = context["user"]["tenant_id"]
+            self.assertIs(shared["tenants"][tenant_id], context["tenant"])
+            self.assertIn(context["user"], context["tenant"]["users"])
+            self.assertRaises(RuntimeError, context["tenant"].__setitem__,
+                              "name", "spam")
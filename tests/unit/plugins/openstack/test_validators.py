@@ -20,6 +20,7 @@ import mock
 from glanceclient import exc as glance_exc
 from novaclient import exceptions as nova_exc
 
+from rally.common import validation
 from rally import consts
 from rally import exceptions
 from rally.plugins.openstack import validators
@@ -331,6 +332,31 @@ class ImageValidOnFlavorValidatorTestCase(test.TestCase):
             clients=clients, resource_config=self.config["args"]["flavor"])
         clients.nova().flavors.get.assert_called_with(flavor="flavor_id")
 
+    @mock.patch("rally.plugins.openstack.validators"
+                ".openstack_types.Flavor.transform",
+                return_value="flavor_id")
+    def test__get_validated_flavor_with_session(self, mock_flavor_transform):
+        self.validator.session = validation.ValidationSession()
+        clients = mock.Mock()
+        clients.nova().flavors.get.return_value = "flavor"
+
+        for i in range(3):
+            result = self.validator._get_validated_flavor(self.config,
+                                                          clients,
+                                                          "flavor")
+            self.assertTrue(result[0].is_valid, result[0].msg)
+            self.assertEqual("flavor", result[1])
+
+        mock_flavor_transform.assert_called_once_with(
+            clients=clients, resource_config=self.config["args"]["flavor"])
+        clients.nova().flavors.get.assert_called_once_with(flavor="flavor_id")
+
+        other_clients = mock.Mock()
+        self.validator._get_validated_flavor(self.config, other_clients,
+                                             "flavor")
+        other_clients.nova().flavors.get.assert_called_once_with(
+            flavor="flavor_id")
+
     @mock.patch("rally.plugins.openstack.validators"
                 ".openstack_types.Flavor.transform")
     def test__get_validated_flavor_not_found(self, mock_flavor_transform):
@@ -566,6 +592,19 @@ class RequiredServicesValidatorTestCase(test.TestCase):
             consts.Service.NOVA)
         self.assertEqual(expected_msg, result.msg)
 
+    def test_validator_with_session(self):
+        self.validator.session = validation.ValidationSession()
+        admin = mock.MagicMock()
+        services = admin.clients.return_value.services
+        services.return_value.values.return_value = [
+            consts.Service.KEYSTONE, consts.Service.NOVA,
+            consts.Service.NOVA_NET]
+        creds = {"openstack": {"admin": admin, "users": []}}
+
+        for i in range(3):
+            self.assertIsNone(self.validator.validate({}, creds, None, None))
+        services.assert_called_once_with()
+
     def test_validator_wrong_service(self):
 
         self.config["context"]["api_versions"].get = mock.Mock(
@@ -20,11 +20,22 @@ import mock
 
 from rally.common.plugin import plugin
 from rally.task.processing import charts
+from rally.task.processing import utils
 from tests.unit import test
 
 CHARTS = "rally.task.processing.charts."
 
 
+def make_store(atomic, iterations):
+    store = utils.IterationsStore(atomic)
+    for iteration in iterations:
+        itr = {"timestamp": 0, "duration": 0, "idle_duration": 0,
+               "error": None, "atomic_actions": []}
+        itr.update(iteration)
+        store.add_iteration(itr)
+    return store
+
+
 class ChartTestCase(test.TestCase):
 
     class Chart(charts.Chart):
@@ -70,6 +81,44 @@ class ChartTestCase(test.TestCase):
         self.assertEqual([("foo_a", "a_points"), ("foo_b", "b_points")],
                          chart.render())
 
+    @mock.patch(CHARTS + "utils.GraphZipper")
+    def test_add_iterations_store_and_render(self, mock_graph_zipper):
+        gzipper_a = mock.Mock(get_zipped_graph=lambda: "a_points")
+        mock_graph_zipper.return_value = gzipper_a
+        chart = self.Chart(self.wload_info, 24)
+        store = make_store(self.wload_info["atomic"], [])
+
+        chart._map_store_columns = mock.Mock(
+            return_value=[("foo_a", [1, 3])])
+        chart.add_iterations_store(store)
+        chart._map_store_columns.assert_called_once_with(store)
+        mock_graph_zipper.assert_called_once_with(42, 24)
+        self.assertEqual([mock.call(1), mock.call(3)],
+                         gzipper_a.add_point.mock_calls)
+        self.assertEqual([("foo_a", "a_points")], chart.render())
+
+    def test__map_store_columns_default(self):
+        info = {"iterations_count": 3, "iterations_failed": 1,
+                "atomic": collections.OrderedDict(
+                    [("foo", {"count": 1}), ("bar", {"count": 2})])}
+        store = make_store(info["atomic"], [
+            {"duration": 4, "idle_duration": 1, "atomic_actions": [
+                {"name": "foo", "started_at": 0, "finished_at": 1},
+                {"name": "bar", "started_at": 1, "finished_at": 2},
+                {"name": "bar", "started_at": 2, "finished_at": 4}]},
+            {"duration": 5, "idle_duration": 2, "error": ["E", "m", "t"],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 0, "finished_at": 2}]},
+            {"duration": 1, "idle_duration": 0}])
+
+        for chart_cls in (charts.MainStackedAreaChart,
+                          charts.AtomicStackedAreaChart):
+            chart = chart_cls(info)
+            self.assertEqual(
+                [(name, list(values))
+                 for name, values in chart._map_store_columns(store)],
+                charts.Chart._map_store_columns(chart, store))
+
     def test__fix_atomic_actions(self):
         chart = self.Chart(self.wload_info)
         self.assertEqual(
@@ -99,27 +148,39 @@ class MainStackedAreaChartTestCase(test.TestCase):
         chart = charts.MainStackedAreaChart({"iterations_count": 3,
                                              "iterations_failed": 0}, 10)
         self.assertIsInstance(chart, charts.Chart)
-        [chart.add_iteration(itr) for itr in (
+        iterations = (
             {"duration": 1.1, "idle_duration": 2.2, "error": []},
             {"error": [], "duration": 1.1, "idle_duration": 0.5},
-            {"duration": 1.3, "idle_duration": 3.4, "error": []})]
+            {"duration": 1.3, "idle_duration": 3.4, "error": []})
+        [chart.add_iteration(itr) for itr in iterations]
         expected = [("duration", [[1, 1.1], [2, 1.1], [3, 1.3]]),
                     ("idle_duration", [[1, 2.2], [2, 0.5], [3, 3.4]])]
         self.assertEqual(expected, chart.render())
 
+        chart = charts.MainStackedAreaChart({"iterations_count": 3,
+                                             "iterations_failed": 0}, 10)
+        chart.add_iterations_store(make_store({}, iterations))
+        self.assertEqual(expected, chart.render())
+
     def test_add_iteration_and_render_with_failed_iterations(self):
         chart = charts.MainStackedAreaChart({"iterations_count": 3,
                                              "iterations_failed": 2}, 10)
         self.assertIsInstance(chart, charts.Chart)
-        [chart.add_iteration(itr) for itr in (
+        iterations = (
             {"duration": 1.1, "idle_duration": 2.2, "error": []},
             {"error": ["foo_err"], "duration": 1.1, "idle_duration": 0.5},
-            {"duration": 1.3, "idle_duration": 3.4, "error": ["foo_err"]})]
+            {"duration": 1.3, "idle_duration": 3.4, "error": ["foo_err"]})
+        [chart.add_iteration(itr) for itr in iterations]
         expected = [("duration", [[1, 1.1], [2, 0], [3, 0]]),
                     ("idle_duration", [[1, 2.2], [2, 0], [3, 0]]),
                     ("failed_duration", [[1, 0], [2, 1.6], [3, 4.7]])]
         self.assertEqual(expected, chart.render())
 
+        chart = charts.MainStackedAreaChart({"iterations_count": 3,
+                                             "iterations_failed": 2}, 10)
+        chart.add_iterations_store(make_store({}, iterations))
+        self.assertEqual(expected, chart.render())
+
 
 class AtomicStackedAreaChartTestCase(test.TestCase):
 
@@ -139,13 +200,17 @@ class AtomicStackedAreaChartTestCase(test.TestCase):
              "error": [], "duration": 5.5, "idle_duration": 2.5})
         expected = [("bar", [[1, 0], [2, 1.2], [3, 1.2]]),
                     ("foo", [[1, 1.1], [2, 1.1], [3, 0]])]
-        chart = charts.AtomicStackedAreaChart(
-            {"iterations_count": 3, "iterations_failed": 0,
-             "atomic": {"foo": {}, "bar": {}}}, 10)
+        info = {"iterations_count": 3, "iterations_failed": 0,
+                "atomic": {"foo": {}, "bar": {}}}
+        chart = charts.AtomicStackedAreaChart(info, 10)
         self.assertIsInstance(chart, charts.Chart)
         [chart.add_iteration(iteration) for iteration in iterations]
         self.assertEqual(expected, sorted(chart.render()))
 
+        chart = charts.AtomicStackedAreaChart(info, 10)
+        chart.add_iterations_store(make_store(info["atomic"], iterations))
+        self.assertEqual(expected, sorted(chart.render()))
+
     def test_add_iteration_and_render_with_failed_iterations(self):
         iterations = (
             {"atomic_actions": [{"name": "foo", "started_at": 0,
@@ -162,13 +227,17 @@ class AtomicStackedAreaChartTestCase(test.TestCase):
         expected = [("bar", [[1, 0], [2, 1.2], [3, 1.2]]),
                     ("failed_duration", [[1, 0], [2, 39.7], [3, 6.8]]),
                     ("foo", [[1, 1.1], [2, 1.1], [3, 0]])]
-        chart = charts.AtomicStackedAreaChart(
-            {"iterations_count": 3, "iterations_failed": 2,
-             "atomic": {"foo": {}, "bar": {}}}, 10)
+        info = {"iterations_count": 3, "iterations_failed": 2,
+                "atomic": {"foo": {}, "bar": {}}}
+        chart = charts.AtomicStackedAreaChart(info, 10)
         self.assertIsInstance(chart, charts.Chart)
         [chart.add_iteration(iteration) for iteration in iterations]
         self.assertEqual(expected, sorted(chart.render()))
 
+        chart = charts.AtomicStackedAreaChart(info, 10)
+        chart.add_iterations_store(make_store(info["atomic"], iterations))
+        self.assertEqual(expected, sorted(chart.render()))
+
 
 class AvgChartTestCase(test.TestCase):
 
@@ -189,15 +258,20 @@ class AvgChartTestCase(test.TestCase):
 class AtomicAvgChartTestCase(test.TestCase):
 
     def test_add_iteration_and_render(self):
-        chart = charts.AtomicAvgChart({"iterations_count": 3,
-                                       "atomic": {"foo": {},
-                                                  "bar": {}}})
+        info = {"iterations_count": 3, "atomic": {"foo": {}, "bar": {}}}
+        chart = charts.AtomicAvgChart(info)
         self.assertIsInstance(chart, charts.AvgChart)
-        [chart.add_iteration({"atomic_actions": a})
-         for a in ([{"name": "foo", "started_at": 0, "finished_at": 2},
-                    {"name": "bar", "started_at": 0, "finished_at": 5}],
-                   [{"name": "foo", "started_at": 0, "finished_at": 4}],
-                   [{"name": "bar", "started_at": 0, "finished_at": 7}])]
+        iterations = [
+            {"atomic_actions": a}
+            for a in ([{"name": "foo", "started_at": 0, "finished_at": 2},
+                       {"name": "bar", "started_at": 0, "finished_at": 5}],
+                      [{"name": "foo", "started_at": 0, "finished_at": 4}],
+                      [{"name": "bar", "started_at": 0, "finished_at": 7}])]
+        [chart.add_iteration(itr) for itr in iterations]
+        self.assertEqual([("bar", 4.0), ("foo", 2.0)], sorted(chart.render()))
+
+        chart = charts.AtomicAvgChart(info)
+        chart.add_iterations_store(make_store(info["atomic"], iterations))
         self.assertEqual([("bar", 4.0), ("foo", 2.0)], sorted(chart.render()))
 
 
@@ -245,6 +319,12 @@ class LoadProfileChartTestCase(test.TestCase):
             chart.add_iteration({"timestamp": ts, "duration": duration})
         self.assertEqual(expected, chart.render())
 
+        chart = charts.LoadProfileChart(info, **kwargs)
+        chart.add_iterations_store(make_store(
+            {}, [{"timestamp": itr_ts, "duration": itr_duration}
+                 for itr_ts, itr_duration in iterations]))
+        self.assertEqual(expected, chart.render())
+
 
 @ddt.ddt
 class HistogramChartTestCase(test.TestCase):
@@ -315,10 +395,11 @@ class MainHistogramChartTestCase(test.TestCase):
         chart = charts.MainHistogramChart(
             {"iterations_count": 3, "min_duration": 2, "max_duration": 7})
         self.assertIsInstance(chart, charts.HistogramChart)
-        [chart.add_iteration(itr) for itr in (
+        iterations = (
             {"duration": 1.1, "idle_duration": 2.2, "error": None},
             {"error": True},
-            {"duration": 1.3, "idle_duration": 3.4, "error": None})]
+            {"duration": 1.3, "idle_duration": 3.4, "error": None})
+        [chart.add_iteration(itr) for itr in iterations]
         expected = {
             "data": [
                 [{"disabled": None, "key": "task",
@@ -337,21 +418,28 @@ class MainHistogramChartTestCase(test.TestCase):
                       {"id": 2, "name": "Rice Rule"}]}
         self.assertEqual(expected, chart.render())
 
+        chart = charts.MainHistogramChart(
+            {"iterations_count": 3, "min_duration": 2, "max_duration": 7})
+        chart.add_iterations_store(make_store({}, iterations))
+        self.assertEqual(expected, chart.render())
+
 
 class AtomicHistogramChartTestCase(test.TestCase):
 
     def test_add_iteration_and_render(self):
-        chart = charts.AtomicHistogramChart(
-            {"iterations_count": 3,
-             "atomic": collections.OrderedDict(
-                 [("foo", {"min_duration": 1.6, "max_duration": 2.8}),
-                  ("bar", {"min_duration": 3.1, "max_duration": 5.5})])})
+        info = {"iterations_count": 3,
+                "atomic": collections.OrderedDict(
+                    [("foo", {"min_duration": 1.6, "max_duration": 2.8}),
+                     ("bar", {"min_duration": 3.1, "max_duration": 5.5})])}
+        chart = charts.AtomicHistogramChart(info)
         self.assertIsInstance(chart, charts.HistogramChart)
-        [chart.add_iteration({"atomic_actions": a})
-         for a in ([{"name": "foo", "started_at": 0, "finished_at": 1.6},
-                    {"name": "bar", "started_at": 0, "finished_at": 3.1}],
-                   [{"name": "foo", "started_at": 0, "finished_at": 2.8}],
-                   [{"name": "bar", "started_at": 0, "finished_at": 5.5}])]
+        iterations = [
+            {"atomic_actions": a}
+            for a in ([{"name": "foo", "started_at": 0, "finished_at": 1.6},
+                       {"name": "bar", "started_at": 0, "finished_at": 3.1}],
+                      [{"name": "foo", "started_at": 0, "finished_at": 2.8}],
+                      [{"name": "bar", "started_at": 0, "finished_at": 5.5}])]
+        [chart.add_iteration(itr) for itr in iterations]
         expected = {
             "data": [
                 [{"disabled": 0, "key": "foo", "view": "Square Root Choice",
@@ -375,6 +463,10 @@ class AtomicHistogramChartTestCase(test.TestCase):
                       {"id": 2, "name": "Rice Rule"}]}
         self.assertEqual(expected, chart.render())
 
+        chart = charts.AtomicHistogramChart(info)
+        chart.add_iterations_store(make_store(info["atomic"], iterations))
+        self.assertEqual(expected, chart.render())
+
 
 class TableTestCase(test.TestCase):
 
@@ -547,6 +639,16 @@ class MainStatsTableTestCase(test.TestCase):
                     "rows": expected_rows}
         self.assertEqual(expected, table.render())
 
+        stats = utils.WorkloadStats()
+        for el in data:
+            stats.add_iteration(el)
+        table = charts.MainStatsTable(info)
+        self.assertEqual(expected, table.render_statistics(stats.result()))
+
+        table = charts.MainStatsTable(info)
+        table.add_iterations_store(make_store(info["atomic"], data))
+        self.assertEqual(expected, table.render())
+
 
 class OutputChartTestCase(test.TestCase):
 
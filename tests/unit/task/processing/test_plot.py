@@ -13,12 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime as dt
 import json
 
 import ddt
 import mock
 
+from rally.task.processing import charts
 from rally.task.processing import plot
+from rally.task.processing import utils
 from tests.unit import test
 
 PLOT = "rally.task.processing.plot."
@@ -28,13 +31,11 @@ PLOT = "rally.task.processing.plot."
 class PlotTestCase(test.TestCase):
 
     @mock.patch(PLOT + "charts")
-    def test__process_scenario(self, mock_charts):
+    def test__process_workload(self, mock_charts):
         for mock_ins, ret in [
                 (mock_charts.MainStatsTable, "main_stats"),
                 (mock_charts.MainStackedAreaChart, "main_stacked"),
                 (mock_charts.AtomicStackedAreaChart, "atomic_stacked"),
-                (mock_charts.OutputStackedAreaDeprecatedChart,
-                 "output_stacked"),
                 (mock_charts.LoadProfileChart, "load_profile"),
                 (mock_charts.MainHistogramChart, "main_histogram"),
                 (mock_charts.AtomicHistogramChart, "atomic_histogram"),
@@ -44,21 +45,18 @@ class PlotTestCase(test.TestCase):
             {"timestamp": i + 2, "error": [],
              "duration": i + 5, "idle_duration": i,
              "output": {"additive": [], "complete": []},
-             "atomic_actions": {"foo_action": i + 10}} for i in range(10)]
-        data = {"iterations": iterations, "sla": [],
-                "key": {"kw": {"runner": {"type": "constant"}}, "pos": 0,
-                        "name": "Foo.bar", "description": "Description!!"},
-                "info": {"atomic": {"foo_action": {"max_duration": 19,
-                                                   "min_duration": 10}},
-                         "full_duration": 40, "load_duration": 32,
-                         "iterations_count": 10, "iterations_passed": 10,
-                         "max_duration": 14, "min_duration": 5,
-                         "output_names": [],
-                         "tstamp_end": 25, "tstamp_start": 2},
-                "created_at": "xxx_time",
-                "hooks": []}
-
-        result = plot._process_scenario(data, 1)
+             "atomic_actions": [{"name": "foo_action", "started_at": 0,
+                                 "finished_at": i + 10}]}
+            for i in range(10)]
+        workload = {"result": iterations[::-1], "sla": [],
+                    "key": {"kw": {"runner": {"type": "constant"}},
+                            "pos": 0, "name": "Foo.bar",
+                            "description": "Description!!"},
+                    "full_duration": 40, "load_duration": 32,
+                    "created_at": "xxx_time",
+                    "hooks": []}
+
+        result = plot._process_workload(workload, 1)
         self.assertEqual(
             {"cls": "Foo", "met": "bar", "pos": "1",
              "name": "bar [2]", "description": "Description!!",
@@ -80,6 +78,73 @@ class PlotTestCase(test.TestCase):
              "output_errors": [],
              "sla": [], "sla_success": True, "table": "main_stats"},
             result)
+        info = {"atomic": {"foo_action": {"min_duration": 10,
+                                          "max_duration": 19,
+                                          "count": 1}},
+                "iterations_count": 10, "iterations_failed": 0,
+                "min_duration": 5, "max_duration": 14,
+                "tstamp_start": 2, "full_duration": 40,
+                "load_duration": 32}
+        for mock_ins in (mock_charts.MainStatsTable,
+                         mock_charts.MainStackedAreaChart,
+                         mock_charts.AtomicStackedAreaChart,
+                         mock_charts.LoadProfileChart,
+                         mock_charts.MainHistogramChart,
+                         mock_charts.AtomicHistogramChart,
+                         mock_charts.AtomicAvgChart):
+            mock_ins.assert_called_once_with(info)
+            store = mock_ins.return_value.add_iterations_store.call_args[0][0]
+            self.assertEqual(10, len(store))
+            self.assertEqual(list(range(5, 15)), list(store.duration))
+            self.assertEqual(list(range(10, 20)),
+                             list(store.atomics["foo_action"]))
+
+    def test__process_workload_chunked_iterations(self):
+        chunks = [
+            [{"timestamp": 1, "error": [], "duration": 2,
+              "idle_duration": 0, "atomic_actions": [],
+              "output": {"additive": [{"chart_plugin": "StackedArea",
+                                       "title": "foo", "data": [["a", 1]]}],
+                         "complete": []}}],
+            [{"timestamp": 3, "error": ["KeyError", "msg", "trace"],
+              "duration": 1, "idle_duration": 0, "atomic_actions": [],
+              "output": {"additive": [{"chart_plugin": "StackedArea",
+                                       "title": "foo", "data": [["a", 2]]}],
+                         "complete": []}}]]
+        get_page = mock.Mock(side_effect=lambda chunk: {
+            "iterations_count": 2, "iterations": chunks[chunk],
+            "next_chunk": None if chunk else 1})
+        workload = {"result": utils.ChunkedIterations(get_page),
+                    "sla": [{"success": False}],
+                    "key": {"kw": {"runner": {"type": "constant"}},
+                            "pos": 0, "name": "Foo.bar"},
+                    "full_duration": 4, "load_duration": 3,
+                    "created_at": dt.datetime(2017, 6, 2, 7, 33, 4),
+                    "statistics": {
+                        "rps": [[0, 2, 1]],
+                        "corrected_latency": {
+                            "min": 1.0, "median": 1.5, "90%ile": 2.0,
+                            "95%ile": 2.0, "max": 2.0, "avg": 1.5,
+                            "stddev": 0.5, "success": 1.0, "count": 2}}}
+
+        result = plot._process_workload(workload, 0)
+
+        self.assertEqual([mock.call(chunk=0), mock.call(chunk=1)],
+                         get_page.call_args_list)
+        self.assertEqual(2, result["iterations_count"])
+        self.assertEqual([("success", 1), ("errors", 1)],
+                         result["iterations"]["pie"])
+        self.assertEqual([{"iteration": 2, "type": "KeyError",
+                           "message": "msg", "traceback": "trace"}],
+                         result["errors"])
+        self.assertEqual(
+            [("a", [[1, 1], [2, 2]])], result["additive_output"][0]["data"])
+        self.assertEqual("Requested and achieved rps",
+                         result["additive_output"][1]["title"])
+        self.assertEqual("Latency corrected for coordinated omission",
+                         result["additive_output"][2]["title"])
+        self.assertEqual("2017-02-06 07:33:04", result["created_at"])
+        self.assertFalse(result["sla_success"])
 
     @ddt.data(
         {"hooks": [], "expected": []},
@@ -158,55 +223,105 @@ class PlotTestCase(test.TestCase):
     def test__process_hooks(self, hooks, expected):
         self.assertEqual(expected, plot._process_hooks(hooks))
 
-    @mock.patch(PLOT + "_process_scenario")
+    def test__process_rps(self):
+        chart = plot._process_rps([[0, 10, 9], [1, 10, 11]])
+
+        self.assertEqual("Requested and achieved rps", chart["title"])
+        self.assertEqual("Lines", chart["widget"])
+        self.assertEqual([("requested", [[1, 10], [2, 10]]),
+                          ("achieved", [[1, 9], [2, 11]])], chart["data"])
+
+    @ddt.data(
+        {"latency": {"min": 1.0, "median": 1.5, "90%ile": 1.9,
+                     "95%ile": 1.95, "max": 2.0, "avg": 1.5, "stddev": 0.5,
+                     "success": 0.5, "count": 4},
+         "expected": ["corrected latency", 1.0, 1.5, 1.9, 1.95, 2.0, 1.5,
+                      "50.0%", 4]},
+        {"latency": {"min": None, "median": None, "90%ile": None,
+                     "95%ile": None, "max": None, "avg": None,
+                     "stddev": None, "success": 0.0, "count": 2},
+         "expected": ["corrected latency", "n/a", "n/a", "n/a", "n/a",
+                      "n/a", "n/a", "n/a", 2]})
+    @ddt.unpack
+    def test__process_corrected_latency(self, latency, expected):
+        table = plot._process_corrected_latency(latency)
+
+        self.assertEqual("Latency corrected for coordinated omission",
+                         table["title"])
+        self.assertEqual("Table", table["widget"])
+        self.assertEqual(charts.MainStatsTable.columns,
+                         table["data"]["cols"])
+        self.assertEqual([expected], table["data"]["rows"])
+
+    @mock.patch(PLOT + "_process_workload")
     @mock.patch(PLOT + "json.dumps", return_value="json_data")
-    def test__process_tasks(self, mock_json_dumps, mock__process_scenario):
-        tasks_results = [{"key": {"name": i, "kw": "kw_" + i}}
+    def test__process_tasks(self, mock_json_dumps, mock__process_workload):
+        tasks_results = [{"key": {"name": "%s.%s" % (i, i), "kw": "kw_" + i}}
                          for i in ("a", "b", "c", "b")]
-        mock__process_scenario.side_effect = lambda a, b: (
-            {"cls": "%s_cls" % a["key"]["name"],
-             "name": str(b),
-             "met": "dummy",
-             "pos": str(b)})
-        source, tasks = plot._process_tasks(tasks_results)
+        mock__process_workload.side_effect = lambda a, b: (
+            {"name": a["key"]["name"], "pos": str(b)})
+        source, workloads = plot._process_tasks(tasks_results)
         self.assertEqual(source, "json_data")
         mock_json_dumps.assert_called_once_with(
-            {"a": ["kw_a"], "b": ["kw_b", "kw_b"], "c": ["kw_c"]},
+            {"a.a": ["kw_a"], "b.b": ["kw_b", "kw_b"], "c.c": ["kw_c"]},
             sort_keys=True, indent=2)
+        self.assertFalse(mock__process_workload.called)
         self.assertEqual(
-            tasks,
-            [{"cls": "a_cls", "met": "dummy", "name": "0", "pos": "0"},
-             {"cls": "b_cls", "met": "dummy", "name": "0", "pos": "0"},
-             {"cls": "b_cls", "met": "dummy", "name": "1", "pos": "1"},
-             {"cls": "c_cls", "met": "dummy", "name": "0", "pos": "0"}])
+            [{"name": "a.a", "pos": "0"}, {"name": "b.b", "pos": "0"},
+             {"name": "b.b", "pos": "1"}, {"name": "c.c", "pos": "0"}],
+            list(workloads))
 
     @ddt.data({},
               {"include_libs": True},
               {"include_libs": False})
     @ddt.unpack
     @mock.patch(PLOT + "_process_tasks")
-    @mock.patch(PLOT + "_extend_results")
     @mock.patch(PLOT + "ui_utils.get_template")
     @mock.patch(PLOT + "json.dumps", side_effect=lambda s: "json_" + s)
     @mock.patch("rally.common.version.version_string", return_value="42.0")
     def test_plot(self, mock_version_string, mock_dumps, mock_get_template,
-                  mock__extend_results, mock__process_tasks, **ddt_kwargs):
-        mock__process_tasks.return_value = "source", "scenarios"
-        mock_get_template.return_value.render.return_value = "tasks_html"
-        mock__extend_results.return_value = ["extended_result"]
+                  mock__process_tasks, **ddt_kwargs):
+        mock__process_tasks.return_value = "source", iter([{"foo": 42}])
+        mock_get_template.return_value.generate.side_effect = (
+            lambda **kw: ["<html>", "data = %s;" % kw["data"], "</html>"])
         html = plot.plot("tasks_results", **ddt_kwargs)
-        self.assertEqual(html, "tasks_html")
-        mock__extend_results.assert_called_once_with("tasks_results")
+        self.assertEqual("<html>data = [{\"foo\": 42}];</html>", html)
         mock_get_template.assert_called_once_with("task/report.html")
-        mock__process_tasks.assert_called_once_with(["extended_result"])
-        if "include_libs" in ddt_kwargs:
-            mock_get_template.return_value.render.assert_called_once_with(
-                version="42.0", data="json_scenarios", source="json_source",
-                include_libs=ddt_kwargs["include_libs"])
-        else:
-            mock_get_template.return_value.render.assert_called_once_with(
-                version="42.0", data="json_scenarios", source="json_source",
-                include_libs=False)
+        mock__process_tasks.assert_called_once_with("tasks_results")
+        mock_get_template.return_value.generate.assert_called_once_with(
+            version="42.0", data=mock.ANY, source="json_source",
+            include_libs=ddt_kwargs.get("include_libs", False))
+
+    @mock.patch(PLOT + "_process_workload")
+    @mock.patch(PLOT + "ui_utils.get_template")
+    @mock.patch("rally.common.version.version_string", return_value="42.0")
+    def test_generate_plot(self, mock_version_string, mock_get_template,
+                           mock__process_workload):
+        processed = []
+
+        def process_workload(workload, pos):
+            processed.append(workload["key"]["name"])
+            return {"foo": workload["key"]["kw"]}
+
+        mock__process_workload.side_effect = process_workload
+        mock_get_template.return_value.generate.side_effect = (
+            lambda **kw: ["<html>", "data = %s;" % kw["data"], "</html>"])
+        tasks_results = [{"key": {"name": "A.b", "kw": 42}},
+                         {"key": {"name": "A.a", "kw": 24}}]
+        pieces = plot.generate_plot(tasks_results)
+        self.assertFalse(mock__process_workload.called)
+
+        self.assertEqual("<html>", next(pieces))
+        self.assertEqual("data = ", next(pieces))
+        self.assertEqual("[", next(pieces))
+        self.assertEqual([], processed)
+        self.assertEqual("{", next(pieces))
+        self.assertEqual(["A.a"], processed)
+
+        pieces = list(pieces)
+        self.assertEqual(["A.a", "A.b"], processed)
+        self.assertEqual("\"foo\": 24}, {\"foo\": 42}];</html>",
+                         "".join(pieces))
 
     @mock.patch(PLOT + "objects.Task.extend_results")
     def test__extend_results(self, mock_task_extend_results):
@@ -226,6 +341,7 @@ class PlotTestCase(test.TestCase):
                       "full_duration": "%s_full_duration" % k,
                       "load_duration": "%s_load_duration" % k,
                       "hooks": "%s_hooks" % k,
+                      "statistics": None,
                       "sla": "%s_sla" % k},
              "created_at": "%s_time" % k} for k in ("foo", "bar", "spam")]
         results = plot._extend_results(tasks_results)
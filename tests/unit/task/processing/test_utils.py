@@ -14,8 +14,12 @@
 #    under the License.
 
 import collections
+import pickle
+
 import ddt
+import mock
 
+from rally.task.processing import charts
 from rally.task.processing import utils
 from tests.unit import test
 
@@ -95,3 +99,241 @@ class AtomicMergerTestCase(test.TestCase):
         self.assertEqual(collections.OrderedDict([("foo", 1.1),
                                                   ("bar (x2)", 2.4)]),
                          atomic_merger.merge_atomic_actions(atomic_actions))
+
+
+class ChunkedIterationsTestCase(test.TestCase):
+
+    @staticmethod
+    def _get_page(chunk=0):
+        chunks = [[1, 2], [], [3]]
+        return {"chunk": chunk, "iterations_count": 3,
+                "iterations": chunks[chunk],
+                "next_chunk": chunk + 1 if chunk + 1 < len(chunks) else None}
+
+    def test___iter__(self):
+        get_page = mock.Mock(side_effect=self._get_page)
+        iterations = utils.ChunkedIterations(get_page)
+        self.assertFalse(get_page.called)
+        self.assertEqual([1, 2, 3], list(iterations))
+        self.assertEqual([1, 2, 3], list(iterations))
+        self.assertEqual([mock.call(chunk=0), mock.call(chunk=1),
+                          mock.call(chunk=2)] * 2, get_page.call_args_list)
+
+        iterations = utils.ChunkedIterations(get_page, lambda x: x * 10)
+        self.assertEqual([10, 20, 30], list(iterations))
+
+    def test___len__(self):
+        get_page = mock.Mock(side_effect=self._get_page)
+        iterations = utils.ChunkedIterations(get_page)
+        self.assertEqual(3, len(iterations))
+        get_page.assert_called_once_with(chunk=0)
+        self.assertEqual([1, 2, 3], list(iterations))
+        self.assertEqual([mock.call(chunk=0), mock.call(chunk=1),
+                          mock.call(chunk=2)], get_page.call_args_list)
+
+        get_page.reset_mock()
+        iterations = utils.ChunkedIterations(get_page)
+        for i, iteration in enumerate(iterations):
+            self.assertEqual(3, len(iterations))
+        self.assertEqual(3, get_page.call_count)
+
+
+class IterationsStoreTestCase(test.TestCase):
+
+    def test_add_iteration(self):
+        store = utils.IterationsStore(collections.OrderedDict(
+            [("foo", {"count": 1}), ("bar", {"count": 2})]))
+        self.assertEqual(0, len(store))
+        store.add_iteration(
+            {"timestamp": 1.5, "duration": 4.2, "idle_duration": 0.5,
+             "error": [],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 0, "finished_at": 1.5},
+                 {"name": "bar", "started_at": 1.5, "finished_at": 2},
+                 {"name": "bar", "started_at": 2, "finished_at": 3}]})
+        store.add_iteration(
+            {"timestamp": 2.5, "duration": None, "idle_duration": None,
+             "error": ["KeyError", "foo", "trace"],
+             "atomic_actions": [
+                 {"name": "bar", "started_at": 2.5, "finished_at": 3}]})
+
+        self.assertEqual(2, len(store))
+        self.assertEqual([1.5, 2.5], list(store.timestamp))
+        self.assertEqual([4.2, 0], list(store.duration))
+        self.assertEqual([0.5, 0], list(store.idle_duration))
+        self.assertEqual([0, 1], list(store.error))
+        self.assertEqual(["foo", "bar (x2)"], list(store.atomics))
+        self.assertEqual([("foo", [1.5, None]), ("bar (x2)", [1.5, None])],
+                         store.atomic_columns())
+        self.assertEqual([("foo", [1.5, 0]), ("bar (x2)", [1.5, 0])],
+                         store.atomic_columns(missed=0))
+
+    def test_iterations(self):
+        store = utils.IterationsStore(collections.OrderedDict(
+            [("foo", {"count": 1}), ("bar", {"count": 2})]))
+        store.add_iteration(
+            {"timestamp": 1, "duration": 4, "idle_duration": 0.5,
+             "error": [],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 1, "finished_at": 2},
+                 {"name": "bar", "started_at": 2, "finished_at": 2.5},
+                 {"name": "bar", "started_at": 2.5, "finished_at": 4}]})
+        store.add_iteration(
+            {"timestamp": 5, "duration": 1, "idle_duration": 0,
+             "error": ["KeyError", "foo", "trace"],
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 5, "finished_at": 6}]})
+
+        self.assertEqual(
+            [{"timestamp": 1, "duration": 4, "idle_duration": 0.5,
+              "error": [],
+              "atomic_actions": [
+                  {"name": "foo", "children": [], "started_at": 1,
+                   "finished_at": 2},
+                  {"name": "bar", "children": [], "started_at": 2,
+                   "finished_at": 3},
+                  {"name": "bar", "children": [], "started_at": 3,
+                   "finished_at": 4}]},
+             {"timestamp": 5, "duration": 1, "idle_duration": 0,
+              "error": ["", "", ""],
+              "atomic_actions": [
+                  {"name": "foo", "children": [], "started_at": 5,
+                   "finished_at": 6}]}],
+            list(store.iterations()))
+
+
+def _pop_stddev(result):
+    """Pop values of stddev, which may differ in the last digits."""
+    stats = [result] if "stddev" in result else (
+        [result["total"]] + list(result["atomics"].values()))
+    return [st.pop("stddev") for st in stats]
+
+
+class DurationStatsTestCase(test.TestCase):
+
+    def test_add_and_result(self):
+        stats = utils.DurationStats()
+        for duration in (4, 1, 3, 2):
+            stats.add(duration)
+        stats.add(100, success=False)
+
+        result = stats.result()
+        self.assertEqual(["min", "median", "90%ile", "95%ile", "max", "avg",
+                          "stddev", "success", "count"], list(result))
+        self.assertEqual(1, result["min"])
+        self.assertEqual(2.5, result["median"])
+        self.assertEqual(4, result["max"])
+        self.assertEqual(2.5, result["avg"])
+        self.assertEqual(0.8, result["success"])
+        self.assertEqual(5, result["count"])
+
+    def test_result_empty(self):
+        result = utils.DurationStats().result()
+        self.assertIsNone(result["min"])
+        self.assertIsNone(result["median"])
+        self.assertIsNone(result["stddev"])
+        self.assertEqual(0, result["count"])
+
+    def test_merge(self):
+        single = utils.DurationStats()
+        stats = [utils.DurationStats() for i in range(3)]
+        for i in range(30):
+            single.add(i, success=bool(i % 4))
+            stats[i % 2].add(i, success=bool(i % 4))
+        stats[2].add(42, success=False)
+        single.add(42, success=False)
+
+        stats[0].merge(stats[1])
+        stats[0].merge(stats[2])
+
+        expected = single.result()
+        actual = stats[0].result()
+        self.assertAlmostEqual(_pop_stddev(expected)[0],
+                               _pop_stddev(actual)[0])
+        self.assertEqual(expected, actual)
+
+
+class WorkloadStatsTestCase(test.TestCase):
+
+    def _get_iteration(self, duration, error=None, atomics=()):
+        atomic_actions = []
+        started_at = 0
+        for name, action_duration in atomics:
+            atomic_actions.append({"name": name, "started_at": started_at,
+                                   "finished_at": started_at + action_duration,
+                                   "children": []})
+            started_at += action_duration
+        return {"duration": duration, "error": error or [],
+                "atomic_actions": atomic_actions}
+
+    def test_add_iteration(self):
+        stats = utils.WorkloadStats()
+        stats.add_iteration(self._get_iteration(
+            3, atomics=[("foo", 1), ("bar", 1), ("bar", 1)]))
+        stats.add_iteration(self._get_iteration(
+            5, error=["Error", "msg", "tb"], atomics=[("foo", 2)]))
+        stats.add_iteration(self._get_iteration(1, atomics=[("bar", 1)]))
+
+        result = stats.result()
+        self.assertEqual(3, result["iterations_count"])
+        self.assertEqual(1, result["iterations_failed"])
+        self.assertEqual(1, result["total"]["min"])
+        self.assertEqual(3, result["total"]["max"])
+        # NOTE: "bar" is called once in the last iteration, so it is not
+        #     counted, like AtomicMerger does it
+        self.assertEqual(["foo", "bar (x2)"], list(result["atomics"]))
+        self.assertEqual(2, result["atomics"]["foo"]["count"])
+        self.assertEqual(0.5, result["atomics"]["foo"]["success"])
+        self.assertEqual(1, result["atomics"]["foo"]["max"])
+        self.assertEqual(2, result["atomics"]["bar (x2)"]["avg"])
+        self.assertEqual(1, result["atomics"]["bar (x2)"]["count"])
+
+    def test_result_matches_main_stats_table(self):
+        iterations = [
+            self._get_iteration(3, atomics=[("foo", 1), ("bar", 1)]),
+            self._get_iteration(4, atomics=[("bar", 1), ("bar", 2)]),
+            self._get_iteration(5, error=["Error", "msg", "tb"],
+                                atomics=[("foo", 2), ("bar", 1),
+                                         ("bar", 1)])]
+        stats = utils.WorkloadStats()
+        store = utils.IterationsStore()
+        for iteration in iterations:
+            stats.add_iteration(iteration)
+            store.add_iteration(dict(iteration, timestamp=0,
+                                     idle_duration=0))
+        table = charts.MainStatsTable(store.get_info())
+        table.add_iterations_store(store)
+
+        self.assertEqual(table.render(),
+                         table.render_statistics(stats.result()))
+
+    def test_pickle(self):
+        stats = utils.WorkloadStats()
+        stats.add_iteration(self._get_iteration(3, atomics=[("foo", 1)]))
+        self.assertEqual(stats.result(),
+                         pickle.loads(pickle.dumps(stats)).result())
+
+    def test_merge(self):
+        iterations = [
+            self._get_iteration(3, atomics=[("foo", 1), ("bar", 2)]),
+            self._get_iteration(4, error=["Error", "msg", "tb"]),
+            self._get_iteration(2, atomics=[("bar", 2)]),
+            self._get_iteration(6, atomics=[("foo", 1), ("foo", 2)])]
+        single = utils.WorkloadStats()
+        first = utils.WorkloadStats()
+        second = utils.WorkloadStats()
+        for i, iteration in enumerate(iterations):
+            single.add_iteration(iteration)
+            (first if i < 2 else second).add_iteration(iteration)
+
+        first.merge(second)
+
+        expected = single.result()
+        actual = first.result()
+        for expected_stddev, actual_stddev in zip(_pop_stddev(expected),
+                                                  _pop_stddev(actual)):
+            if expected_stddev is None:
+                self.assertIsNone(actual_stddev)
+            else:
+                self.assertAlmostEqual(expected_stddev, actual_stddev)
+        self.assertEqual(expected, actual)
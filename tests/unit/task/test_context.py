@@ -14,6 +14,8 @@
 #    under the License.
 
 import collections
+import threading
+
 import ddt
 import mock
 
@@ -137,6 +139,16 @@ class BaseContextTestCase(test.TestCase):
         self.assertFalse(FakeOtherContext(ctx) == fakes.FakeContext(ctx))
         self.assertTrue(FakeOtherContext(ctx) == FakeOtherContext(ctx))
 
+    def test_is_per_workload(self):
+        @context.configure(name="per_workload_ctx", order=1,
+                           per_workload=True)
+        class PerWorkloadContext(fakes.FakeContext):
+            pass
+
+        self.addCleanup(PerWorkloadContext.unregister)
+        self.assertTrue(PerWorkloadContext.is_per_workload())
+        self.assertFalse(fakes.FakeContext.is_per_workload())
+
     def test_get_owner_id_from_task(self):
         ctx = {"config": {"fake": {"test": 10}}, "task": {"uuid": "task_uuid"}}
         ins = fakes.FakeContext(ctx)
@@ -148,6 +160,54 @@ class BaseContextTestCase(test.TestCase):
         ins = fakes.FakeContext(ctx)
         self.assertEqual("foo_uuid", ins.get_owner_id())
 
+    def _get_tenants_context(self, tenants_count):
+        users = [{"id": "u%d" % i, "tenant_id": "t%d" % (i // 2)}
+                 for i in range(tenants_count * 2)]
+        ctx = {"config": {"fake": {}}, "task": {"uuid": "task_uuid"},
+               "users": users}
+        return fakes.FakeContext(ctx), users
+
+    @mock.patch("rally.task.context.LOG")
+    def test__setup_per_tenant(self, mock_log):
+        ins, users = self._get_tenants_context(20)
+        setup_tenant = mock.Mock(side_effect=lambda c, u, t: t)
+        rollback_tenant = mock.Mock()
+
+        ins._setup_per_tenant(setup_tenant, rollback_tenant, workers=4)
+
+        setup_tenant.assert_has_calls(
+            [mock.call(mock.ANY, users[i], "t%d" % (i // 2))
+             for i in range(0, 40, 2)], any_order=True)
+        self.assertEqual(20, setup_tenant.call_count)
+        self.assertFalse(rollback_tenant.called)
+        self.assertEqual(10, mock_log.info.call_count)
+
+    def test__setup_per_tenant_fails(self):
+        ins, users = self._get_tenants_context(3)
+        created = []
+
+        def setup_tenant(cache, user, tenant_id):
+            if tenant_id == "t1":
+                raise ValueError()
+            created.append(tenant_id)
+            return tenant_id
+
+        rollback_tenant = mock.Mock()
+
+        self.assertRaises(ValueError, ins._setup_per_tenant,
+                          setup_tenant, rollback_tenant, workers=1)
+        self.assertEqual(["t0"], created)
+        rollback_tenant.assert_called_once_with(users[0], "t0", "t0")
+
+    def test__setup_per_tenant_rollback_fails(self):
+        ins, users = self._get_tenants_context(2)
+        setup_tenant = mock.Mock(side_effect=[None, KeyError()])
+        rollback_tenant = mock.Mock(side_effect=ValueError())
+
+        self.assertRaises(KeyError, ins._setup_per_tenant,
+                          setup_tenant, rollback_tenant, workers=1)
+        rollback_tenant.assert_called_once_with(users[0], "t0", None)
+
 
 class ContextManagerTestCase(test.TestCase):
     @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
@@ -165,6 +225,83 @@ class ContextManagerTestCase(test.TestCase):
         self.assertEqual(result, ctx_object)
         foo_context.setup.assert_called_once_with()
         bar_context.setup.assert_called_once_with()
+        self.assertEqual(
+            {foo_context.get_name.return_value: {"setup": mock.ANY},
+             bar_context.get_name.return_value: {"setup": mock.ANY}},
+            ctx_object["context_execution"])
+
+    def _make_contexts(self, *orders):
+        contexts = []
+        for i, order in enumerate(orders):
+            ctx = mock.MagicMock()
+            ctx.get_order.return_value = order
+            ctx.get_name.return_value = "ctx%d" % i
+            contexts.append(ctx)
+        return contexts
+
+    @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
+    def test_setup_same_order_concurrently(self,
+                                           mock__get_sorted_context_lst):
+        contexts = self._make_contexts(1, 2, 2, 3)
+        mock__get_sorted_context_lst.return_value = contexts
+        ready = threading.Event()
+        started = []
+
+        def setup_first():
+            started.append("ctx1")
+            # NOTE: ctx2 is set up while ctx1 is still running
+            self.assertTrue(ready.wait(10))
+
+        def setup_second():
+            started.append("ctx2")
+            ready.set()
+
+        contexts[1].setup.side_effect = setup_first
+        contexts[2].setup.side_effect = setup_second
+        contexts[3].setup.side_effect = lambda: started.append("ctx3")
+
+        ctx_object = {"config": {}}
+        manager = context.ContextManager(ctx_object)
+        manager.setup()
+
+        self.assertEqual(["ctx1", "ctx2", "ctx3"], sorted(started[:2]) +
+                         started[2:])
+        self.assertEqual(contexts, manager._visited)
+        self.assertEqual(["ctx0", "ctx1", "ctx2", "ctx3"],
+                         sorted(ctx_object["context_execution"]))
+        for execution in ctx_object["context_execution"].values():
+            self.assertEqual(["setup"], list(execution))
+
+    @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
+    def test_setup_fails(self, mock__get_sorted_context_lst):
+        contexts = self._make_contexts(1, 2, 2, 3)
+        contexts[1].setup.side_effect = ValueError()
+        mock__get_sorted_context_lst.return_value = contexts
+
+        manager = context.ContextManager({"config": {}})
+        self.assertRaises(ValueError, manager.setup)
+
+        contexts[2].setup.assert_called_once_with()
+        self.assertFalse(contexts[3].setup.called)
+        self.assertEqual(contexts[:3], manager._visited)
+
+    @mock.patch("rally.task.context.LOG")
+    def test_cleanup_same_order_concurrently(self, mock_log):
+        contexts = self._make_contexts(1, 2, 2)
+        contexts[2].cleanup.side_effect = ValueError()
+        ctx_object = {"config": {}}
+        manager = context.ContextManager(ctx_object)
+        manager._visited = contexts
+
+        manager.cleanup()
+
+        for ctx in contexts:
+            ctx.cleanup.assert_called_once_with()
+        self.assertEqual(1, mock_log.error.call_count)
+        self.assertEqual({"ctx0": {"cleanup": mock.ANY},
+                          "ctx1": {"cleanup": mock.ANY},
+                          "ctx2": {"cleanup": mock.ANY}},
+                         ctx_object["context_execution"])
 
     @mock.patch("rally.task.context.Context.get_all")
     @mock.patch("rally.task.context.Context.get")
@@ -225,6 +362,28 @@ class ContextManagerTestCase(test.TestCase):
                           for name in ("b", "c", "d")],
                          mock_context_get_all.call_args_list)
 
+    @mock.patch("rally.task.context.Context.get_all")
+    def test_get_config(self, mock_context_get_all):
+        ctx_object = {"config": {"shared": {"foo": "bar"},
+                                 "own": ["baz"]},
+                      "scenario_namespace": "foo"}
+        plugins = {
+            "shared": mock.Mock(is_per_workload=lambda: False),
+            "own": mock.Mock(is_per_workload=lambda: True)}
+        mock_context_get_all.side_effect = (
+            lambda name, allow_hidden: [plugins[name]])
+
+        self.assertEqual(ctx_object["config"],
+                         context.ContextManager(ctx_object).get_config())
+        shared_config = context.ContextManager(
+            ctx_object, per_workload=False).get_config()
+        self.assertEqual({"shared": {"foo": "bar"}}, shared_config)
+        self.assertIsNot(ctx_object["config"]["shared"],
+                         shared_config["shared"])
+        self.assertEqual(
+            {"own": ["baz"]},
+            context.ContextManager(ctx_object, per_workload=True).get_config())
+
     @mock.patch("rally.task.context.Context.get_all")
     def test_get_sorted_context_lst_fails(self, mock_context_get_all):
         ctx_object = {"config": {"foo": "bar"},
@@ -15,17 +15,20 @@
 
 """Tests for the Test engine."""
 
-import collections
 import json
 import threading
 
 import mock
 
 from rally.common import objects
+from rally.common import utils
 from rally.common import validation
 from rally import consts
 from rally import exceptions
+from rally.task import context
 from rally.task import engine
+from rally.task.processing import utils as putils
+from rally.task import runner as scenario_runner
 from tests.unit import fakes
 from tests.unit import test
 
@@ -69,9 +72,14 @@ class TaskEngineTestCase(test.TestCase):
 
         eng.validate()
 
-        mock_validate.syntax.assert_called_once_with(config)
-        mock_validate.platforms.assert_called_once_with(config)
-        mock_validate.semantic.assert_called_once_with(config)
+        mock_validate.syntax.assert_called_once_with(
+            config, session=mock.ANY)
+        session = mock_validate.syntax.call_args[1]["session"]
+        self.assertIsInstance(session, validation.ValidationSession)
+        mock_validate.platforms.assert_called_once_with(
+            config, session=session)
+        mock_validate.semantic.assert_called_once_with(
+            config, session=session)
 
     def test_validate__wrong_schema(self):
         config = {
@@ -152,34 +160,38 @@ class TaskEngineTestCase(test.TestCase):
         eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
                                 mock.Mock())
 
-        eng._validate_workload(workload)
+        eng._validate_workload(workload, session="session")
 
         mock_scenario_runner_validate.assert_called_once_with(
             name=runner_type, credentials=None, config=None,
-            plugin_cfg={"type": runner_type}, namespace="default", vtype=None)
+            plugin_cfg={"type": runner_type}, namespace="default", vtype=None,
+            session="session")
         self.assertEqual([mock.call(name="a",
                                     credentials=None,
                                     config=None,
                                     plugin_cfg="a_conf",
                                     namespace="default",
-                                    vtype=None),
+                                    vtype=None,
+                                    session="session"),
                           mock.call(name="foo",
                                     credentials=None,
                                     config=None,
                                     plugin_cfg="foo_conf",
                                     namespace="default",
                                     allow_hidden=True,
-                                    vtype=None)],
+                                    vtype=None,
+                                    session="session")],
                          mock_context_validate.call_args_list)
         mock_sla_validate.assert_called_once_with(
             config=None, credentials=None,
-            name="foo_sla", plugin_cfg="sla_conf", vtype=None)
+            name="foo_sla", plugin_cfg="sla_conf", vtype=None,
+            session="session")
         mock_hook_validate.assert_called_once_with(
             config=None, credentials=None, name="c", plugin_cfg="c_args",
-            vtype=None)
+            vtype=None, session="session")
         mock_trigger_validate.assert_called_once_with(
             config=None, credentials=None, name="d", plugin_cfg="d_args",
-            vtype=None)
+            vtype=None, session="session")
 
     @mock.patch("rally.task.engine.json.dumps")
     @mock.patch("rally.task.engine.scenario.Scenario.get")
@@ -342,12 +354,36 @@ class TaskEngineTestCase(test.TestCase):
         user_context.__enter__.return_value.context = {"users": users}
 
         eng._validate_config_semantic_helper(
-            "admin", user_context, workloads, "foo")
+            "admin", user_context, workloads, "foo", session="session")
 
         eng._validate_workload.assert_called_once_with(
             workloads[0], credentials={"foo": {"admin": "admin",
                                                "users": users}},
-            vtype="semantic")
+            vtype="semantic", session="session")
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__validate_workloads(self, mock_task_config):
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+        workloads = ["w%d" % i for i in range(20)]
+        validated = []
+
+        def validate_workload(workload, **kwargs):
+            validated.append(workload)
+            if workload in ("w5", "w3", "w12"):
+                raise exceptions.InvalidTaskConfig(
+                    name=workload, pos=0, config="", reason="")
+
+        eng._validate_workload = mock.Mock(side_effect=validate_workload)
+
+        e = self.assertRaises(exceptions.InvalidTaskConfig,
+                              eng._validate_workloads, workloads,
+                              vtype="syntax")
+        self.assertIn("w3", str(e))
+        self.assertEqual(sorted(workloads), sorted(validated))
+        eng._validate_workload.assert_has_calls(
+            [mock.call(w, vtype="syntax") for w in workloads],
+            any_order=True)
 
     @mock.patch("rally.task.engine.scenario.Scenario.get")
     @mock.patch("rally.task.engine.context.Context")
@@ -400,8 +436,10 @@ class TaskEngineTestCase(test.TestCase):
         user_context = mock_context.get.return_value.return_value
 
         mock__validate_config_semantic_helper.assert_has_calls([
-            mock.call(admin, user_context, [wconf1], "openstack"),
-            mock.call(admin, user_context, [wconf2, wconf3], "openstack"),
+            mock.call(admin, user_context, [wconf1], "openstack",
+                      session=None),
+            mock.call(admin, user_context, [wconf2, wconf3], "openstack",
+                      session=None),
         ], any_order=True)
 
     @mock.patch("rally.task.engine.TaskConfig")
@@ -428,10 +466,11 @@ class TaskEngineTestCase(test.TestCase):
 
         eng._validate_config_platforms(config)
 
-        self.assertEqual(
-            [mock.call(w, vtype="platform", credentials={"foo": foo_cred1})
-             for w in (workload1, workload2)],
-            mock__validate_workload.call_args_list)
+        mock__validate_workload.assert_has_calls(
+            [mock.call(w, vtype="platform", credentials={"foo": foo_cred1},
+                       session=None)
+             for w in (workload1, workload2)], any_order=True)
+        self.assertEqual(2, mock__validate_workload.call_count)
         deployment.get_all_credentials.assert_called_once_with()
 
     @mock.patch("rally.common.objects.Task.get_status")
@@ -599,6 +638,225 @@ class TaskEngineTestCase(test.TestCase):
         subtask_obj.update_status.assert_called_once_with(
             consts.SubtaskStatus.CRASHED)
 
+    @mock.patch("rally.task.engine.SharedContexts")
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    def test__run_subtask_reuse_context(
+            self, mock_task_engine__run_workload, mock_shared_contexts):
+        task = mock.MagicMock(spec=objects.Task)
+        eng = engine.TaskEngine({"a.task": [{}]}, task, mock.Mock())
+        subtask = mock.Mock(reuse_context=True, workloads=["w1", "w2"],
+                            to_dict=lambda: {})
+        subtask_obj = task.add_subtask.return_value
+        shared_contexts = mock_shared_contexts.return_value
+
+        eng._run_subtask(subtask)
+
+        mock_shared_contexts.assert_called_once_with(subtask_obj["uuid"])
+        self.assertEqual(
+            [mock.call(subtask_obj, "w1", shared_contexts=shared_contexts,
+                       next_workload="w2", parallel_runners=None),
+             mock.call(subtask_obj, "w2", shared_contexts=shared_contexts,
+                       next_workload=None, parallel_runners=None)],
+            mock_task_engine__run_workload.call_args_list)
+        shared_contexts.cleanup.assert_called_once_with()
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.FINISHED)
+
+        shared_contexts.cleanup.reset_mock()
+        mock_task_engine__run_workload.side_effect = engine.TaskAborted()
+        self.assertRaises(engine.TaskAborted, eng._run_subtask, subtask)
+        shared_contexts.cleanup.assert_called_once_with()
+
+    @mock.patch("rally.task.engine.SharedContexts")
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    def test__run_subtask_without_reuse_context(
+            self, mock_task_engine__run_workload, mock_shared_contexts):
+        task = mock.MagicMock(spec=objects.Task)
+        eng = engine.TaskEngine({"a.task": [{}]}, task, mock.Mock())
+        subtask = mock.Mock(reuse_context=False, workloads=["w1"],
+                            to_dict=lambda: {})
+
+        eng._run_subtask(subtask)
+
+        mock_task_engine__run_workload.assert_called_once_with(
+            task.add_subtask.return_value, "w1", shared_contexts=None,
+            next_workload=None, parallel_runners=None)
+        self.assertFalse(mock_shared_contexts.called)
+
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager")
+    @mock.patch("rally.task.engine.TaskEngine._prepare_context")
+    @mock.patch("rally.task.engine.TaskEngine._get_runner")
+    def test__run_workload_with_shared_contexts(
+            self, mock_task_engine__get_runner,
+            mock_task_engine__prepare_context, mock_context_manager,
+            mock_result_consumer):
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        eng = engine.TaskEngine({"a.task": [{}]}, mock.MagicMock(),
+                                mock.Mock())
+        subtask_obj = mock.MagicMock()
+        workload = mock.Mock()
+        workload.make_key.return_value = {"name": "Foo.bar"}
+        next_workload = mock.Mock()
+        shared_contexts = mock.Mock()
+        context_obj = mock_task_engine__prepare_context.return_value
+
+        shared_contexts.is_reused_by.return_value = True
+        eng._run_workload(subtask_obj, workload,
+                          shared_contexts=shared_contexts,
+                          next_workload=next_workload)
+        shared_contexts.setup.assert_called_once_with(context_obj)
+        mock_context_manager.assert_called_once_with(context_obj,
+                                                     per_workload=True)
+        mock_task_engine__prepare_context.assert_called_with(
+            next_workload.context, next_workload.name, None)
+        shared_contexts.is_reused_by.assert_called_once_with(context_obj)
+        self.assertFalse(shared_contexts.cleanup.called)
+
+        shared_contexts.is_reused_by.return_value = False
+        eng._run_workload(subtask_obj, workload,
+                          shared_contexts=shared_contexts,
+                          next_workload=next_workload)
+        shared_contexts.cleanup.assert_called_once_with(context_obj)
+
+        shared_contexts.reset_mock()
+        eng._run_workload(subtask_obj, workload,
+                          shared_contexts=shared_contexts)
+        self.assertFalse(shared_contexts.is_reused_by.called)
+        shared_contexts.cleanup.assert_called_once_with(context_obj)
+
+    def test__group_subtasks(self):
+        subtasks = [mock.Mock(run_in_parallel=flag)
+                    for flag in (False, True, True, False, True, False,
+                                 True, True, True)]
+        groups = engine.TaskEngine._group_subtasks(subtasks)
+        self.assertEqual(
+            [[subtasks[0]], subtasks[1:3], [subtasks[3]], [subtasks[4]],
+             [subtasks[5]], subtasks[6:]],
+            groups)
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.TaskEngine._run_subtask")
+    def test_run__subtasks_in_parallel(self, mock_task_engine__run_subtask,
+                                       mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        task = mock.MagicMock(spec=objects.Task)
+        config = {
+            "version": 2,
+            "title": "foo",
+            "subtasks": [
+                {"title": "a", "run_in_parallel": True,
+                 "workloads": [{"name": "a.task", "runner": {"type": "a"}}]},
+                {"title": "b", "run_in_parallel": True,
+                 "workloads": [{"name": "b.task", "runner": {"type": "a"}}]},
+                {"title": "c",
+                 "workloads": [{"name": "c.task", "runner": {"type": "a"}}]}
+            ]
+        }
+        eng = engine.TaskEngine(config, task, mock.Mock())
+        started = {"a": threading.Event(), "b": threading.Event()}
+
+        def run_subtask(subtask, parallel_runners=None):
+            if subtask.run_in_parallel:
+                self.assertIsInstance(parallel_runners,
+                                      engine.ParallelRunners)
+                # both parallel subtasks should be in progress at once
+                started[subtask.title].set()
+                for event in started.values():
+                    self.assertTrue(event.wait(10))
+
+        mock_task_engine__run_subtask.side_effect = run_subtask
+
+        eng.run()
+
+        titles = [c[0][0].title
+                  for c in mock_task_engine__run_subtask.call_args_list]
+        self.assertEqual(["a", "b"], sorted(titles[:2]))
+        self.assertEqual("c", titles[-1])
+        self.assertEqual(mock.call(consts.TaskStatus.FINISHED),
+                         task.update_status.mock_calls[-1])
+
+    @mock.patch("rally.task.engine.TaskEngine._run_subtask")
+    def test__run_subtasks_in_parallel_aborted(
+            self, mock_task_engine__run_subtask):
+        mock_task_engine__run_subtask.side_effect = [
+            None, engine.TaskAborted(), None]
+        eng = engine.TaskEngine({"a.task": [{}]}, mock.MagicMock(),
+                                mock.Mock())
+
+        self.assertRaises(engine.TaskAborted, eng._run_subtasks_in_parallel,
+                          [mock.Mock(), mock.Mock(), mock.Mock()])
+        self.assertEqual(3, mock_task_engine__run_subtask.call_count)
+
+    @mock.patch("rally.task.engine.TaskEngine._run_subtask")
+    def test__run_subtasks_in_parallel_crashed(
+            self, mock_task_engine__run_subtask):
+        mock_task_engine__run_subtask.side_effect = [
+            engine.TaskAborted(), MyException()]
+        eng = engine.TaskEngine({"a.task": [{}]}, mock.MagicMock(),
+                                mock.Mock())
+
+        self.assertRaises(MyException, eng._run_subtasks_in_parallel,
+                          [mock.Mock(), mock.Mock()])
+
+    @mock.patch("rally.task.engine.TaskEngine._run_subtask")
+    def test__run_subtasks_in_parallel_aborts_siblings(
+            self, mock_task_engine__run_subtask):
+        eng = engine.TaskEngine({"a.task": [{}]}, mock.MagicMock(),
+                                mock.Mock())
+        sibling_runner = mock.Mock()
+        sibling_started = threading.Event()
+        sibling_results = []
+
+        def run_subtask(subtask, parallel_runners):
+            if subtask == "failed":
+                self.assertTrue(sibling_started.wait(10))
+                raise MyException()
+            parallel_runners.add(sibling_runner)
+            sibling_started.set()
+            # NOTE: the runner is aborted while the workload is running
+            sibling_results.append(parallel_runners.aborted.wait(10))
+            parallel_runners.remove(sibling_runner)
+            self.assertRaises(engine.TaskAborted, parallel_runners.add,
+                              mock.Mock())
+
+        mock_task_engine__run_subtask.side_effect = run_subtask
+
+        self.assertRaises(MyException, eng._run_subtasks_in_parallel,
+                          ["failed", "sibling"])
+        self.assertEqual([True], sibling_results)
+        sibling_runner.abort.assert_called_once_with()
+
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager")
+    @mock.patch("rally.task.engine.TaskEngine._prepare_context")
+    @mock.patch("rally.task.engine.TaskEngine._get_runner")
+    def test__run_workload_with_parallel_runners(
+            self, mock_task_engine__get_runner,
+            mock_task_engine__prepare_context, mock_context_manager,
+            mock_result_consumer):
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        eng = engine.TaskEngine({"a.task": [{}]}, mock.MagicMock(),
+                                mock.Mock())
+        subtask_obj = mock.MagicMock()
+        workload = mock.Mock()
+        workload.make_key.return_value = {"name": "Foo.bar"}
+        runner_obj = mock_task_engine__get_runner.return_value
+        parallel_runners = engine.ParallelRunners()
+
+        def run(*args):
+            parallel_runners.abort()
+
+        runner_obj.run.side_effect = run
+        eng._run_workload(subtask_obj, workload,
+                          parallel_runners=parallel_runners)
+        runner_obj.abort.assert_called_once_with()
+
+        self.assertRaises(engine.TaskAborted, eng._run_workload,
+                          subtask_obj, workload,
+                          parallel_runners=parallel_runners)
+        self.assertEqual(1, runner_obj.run.call_count)
+
     @mock.patch("rally.task.engine.TaskConfig")
     @mock.patch("rally.task.engine.scenario.Scenario.get")
     def test__prepare_context(self, mock_scenario_get, mock_task_config):
@@ -661,6 +919,13 @@ class TaskEngineTestCase(test.TestCase):
 
 class ResultConsumerTestCase(test.TestCase):
 
+    @staticmethod
+    def _make_batch(*results):
+        batch = scenario_runner.ResultsBatch()
+        for r in results:
+            batch.add(r)
+        return batch
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
@@ -674,26 +939,37 @@ class ResultConsumerTestCase(test.TestCase):
         task = mock.MagicMock()
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
-        runner = mock.MagicMock()
+        runner = mock.MagicMock(statistics={"rps": [[0, 10, 9]]})
 
         results = [
-            [{"duration": 1, "timestamp": 3}],
-            [{"duration": 2, "timestamp": 2}]
+            self._make_batch({"duration": 1, "timestamp": 3}),
+            self._make_batch({"duration": 2, "timestamp": 2})
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         with engine.ResultConsumer(
                 key, task, subtask, workload, runner, False) as consumer_obj:
             pass
 
+        statistics = workload.set_results.call_args[0][0]["statistics"]
+        self.assertEqual([[0, 10, 9]], statistics["rps"])
+        self.assertIn("durations", statistics)
+
         mock_sla_instance.add_iteration.assert_has_calls([
             mock.call({"duration": 1, "timestamp": 3}),
             mock.call({"duration": 2, "timestamp": 2})])
 
-        self.assertEqual([{"duration": 2, "timestamp": 2},
-                          {"duration": 1, "timestamp": 3}],
-                         consumer_obj.results)
+        workload.add_workload_data.assert_called_once_with(
+            0, {"raw": [{"duration": 2, "timestamp": 2},
+                        {"duration": 1, "timestamp": 3}],
+                "statistics": {"durations": mock.ANY}},
+            compress=mock.ANY)
+        self.assertEqual([], consumer_obj.batches)
+        self.assertEqual(2, consumer_obj.stats.iterations_count)
+        self.assertEqual(0, consumer_obj.stats.iterations_failed)
+        self.assertEqual(1, consumer_obj.stats.total.result()["min"])
+        self.assertEqual(2, consumer_obj.stats.total.result()["max"])
 
     @mock.patch("rally.task.hook.HookExecutor")
     @mock.patch("rally.task.engine.LOG")
@@ -717,8 +993,8 @@ class ResultConsumerTestCase(test.TestCase):
         runner = mock.MagicMock()
 
         results = []
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         with engine.ResultConsumer(
                 key, task, subtask, workload, runner, False):
             pass
@@ -727,6 +1003,42 @@ class ResultConsumerTestCase(test.TestCase):
         workload.set_results.assert_called_once_with({
             "full_duration": 1,
             "sla": mock_sla_results,
+            "statistics": {"durations": putils.WorkloadStats().result()},
+            "load_duration": 0
+        })
+
+    @mock.patch("rally.task.hook.HookExecutor")
+    @mock.patch("rally.task.engine.LOG")
+    @mock.patch("rally.task.engine.time.time")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_context_durations(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_time, mock_log, mock_hook_executor):
+        mock_time.side_effect = [0, 1]
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        runner.result_queue = utils.WaitableDeque()
+        runner.event_queue = utils.WaitableDeque()
+        context_obj = {}
+
+        with engine.ResultConsumer(key, task, subtask, workload, runner,
+                                   False, context_obj=context_obj):
+            context_obj["cleanup_durations"] = {"nova.servers": 2.5}
+            context_obj["context_execution"] = {
+                "users": {"setup": 1, "cleanup": 2}}
+
+        workload.set_results.assert_called_once_with({
+            "full_duration": 1,
+            "sla": mock_sla_checker.return_value.results.return_value,
+            "statistics": {"durations": putils.WorkloadStats().result(),
+                           "cleanup": {"nova.servers": 2.5}},
+            "context_execution": {"users": {"setup": 1, "cleanup": 2}},
             "load_duration": 0
         })
 
@@ -746,9 +1058,9 @@ class ResultConsumerTestCase(test.TestCase):
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
 
-        runner.result_queue = collections.deque(
-            [[{"duration": 1, "timestamp": 1},
-              {"duration": 2, "timestamp": 2}]] * 4)
+        runner.result_queue = utils.WaitableDeque(
+            [self._make_batch({"duration": 1, "timestamp": 1},
+                              {"duration": 2, "timestamp": 2})] * 4)
 
         with engine.ResultConsumer(key, task, subtask, workload, runner, True):
             pass
@@ -766,7 +1078,7 @@ class ResultConsumerTestCase(test.TestCase):
                                             mock_event, mock_thread,
                                             mock_task_get_status,
                                             mock_hook_executor):
-        runner = mock.MagicMock(result_queue=False)
+        runner = mock.MagicMock(result_queue=utils.WaitableDeque())
 
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = (False, True)
@@ -803,9 +1115,9 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque(
-            [[{"duration": 1, "timestamp": 4}]] * 4)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(
+            [self._make_batch({"duration": 1, "timestamp": 4})] * 4)
+        runner.event_queue = utils.WaitableDeque()
 
         with engine.ResultConsumer(key, task, subtask, workload,
                                    runner, False):
@@ -827,8 +1139,9 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1])
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(
+            [self._make_batch({"duration": 1, "timestamp": 1})])
+        runner.event_queue = utils.WaitableDeque()
         exc = MyException()
         try:
             with engine.ResultConsumer(key, task, subtask, workload,
@@ -848,6 +1161,7 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
             mock_task_get_status, mock_conf):
         mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_chunk_compression = True
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
@@ -858,17 +1172,17 @@ class ResultConsumerTestCase(test.TestCase):
         runner = mock.MagicMock()
 
         results = [
-            [{"duration": 1, "timestamp": 3},
-             {"duration": 2, "timestamp": 2},
-             {"duration": 3, "timestamp": 3}],
-            [{"duration": 4, "timestamp": 2},
-             {"duration": 5, "timestamp": 3}],
-            [{"duration": 6, "timestamp": 2}],
-            [{"duration": 7, "timestamp": 1}],
+            self._make_batch({"duration": 1, "timestamp": 3},
+                             {"duration": 2, "timestamp": 2},
+                             {"duration": 3, "timestamp": 3}),
+            self._make_batch({"duration": 4, "timestamp": 2},
+                             {"duration": 5, "timestamp": 3}),
+            self._make_batch({"duration": 6, "timestamp": 2}),
+            self._make_batch({"duration": 7, "timestamp": 1}),
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         with engine.ResultConsumer(
                 key, task, subtask, workload, runner, False) as consumer_obj:
             pass
@@ -882,17 +1196,31 @@ class ResultConsumerTestCase(test.TestCase):
             mock.call({"duration": 6, "timestamp": 2}),
             mock.call({"duration": 7, "timestamp": 1})])
 
-        self.assertEqual([{"duration": 7, "timestamp": 1}],
-                         consumer_obj.results)
-
-        workload.add_workload_data.assert_has_calls([
-            mock.call(0, {"raw": [{"duration": 2, "timestamp": 2},
-                                  {"duration": 1, "timestamp": 3}]}),
-            mock.call(1, {"raw": [{"duration": 4, "timestamp": 2},
-                                  {"duration": 3, "timestamp": 3}]}),
-            mock.call(2, {"raw": [{"duration": 6, "timestamp": 2},
-                                  {"duration": 5, "timestamp": 3}]}),
-            mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]})])
+        self.assertEqual([], consumer_obj.batches)
+
+        # NOTE: chunks are made of whole batches, so the first one is
+        #     bigger than raw_result_chunk_size
+        def chunk(*results):
+            stats = putils.WorkloadStats()
+            for r in results:
+                stats.add_iteration(r)
+            return {"raw": list(results),
+                    "statistics": {"durations": stats.result()}}
+
+        self.assertEqual([
+            mock.call(0, chunk({"duration": 2, "timestamp": 2},
+                               {"duration": 1, "timestamp": 3},
+                               {"duration": 3, "timestamp": 3}),
+                      compress=True),
+            mock.call(1, chunk({"duration": 4, "timestamp": 2},
+                               {"duration": 5, "timestamp": 3}),
+                      compress=True),
+            mock.call(2, chunk({"duration": 7, "timestamp": 1},
+                               {"duration": 6, "timestamp": 2}),
+                      compress=True)],
+            workload.add_workload_data.call_args_list)
+        self.assertEqual(7, consumer_obj.stats.iterations_count)
+        self.assertEqual(7, consumer_obj.stats.total.result()["max"])
 
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.hook.HookExecutor")
@@ -920,8 +1248,8 @@ class ResultConsumerTestCase(test.TestCase):
             {"type": "iteration", "value": 2},
             {"type": "iteration", "value": 3}
         ]
-        runner.result_queue = collections.deque()
-        runner.event_queue = collections.deque(events)
+        runner.result_queue = utils.WaitableDeque()
+        runner.event_queue = utils.WaitableDeque(events)
 
         consumer_obj = engine.ResultConsumer(key, task, subtask,
                                              workload, runner, False)
@@ -946,6 +1274,7 @@ class ResultConsumerTestCase(test.TestCase):
         workload.set_results.assert_called_once_with({
             "full_duration": 1,
             "sla": mock_sla_results,
+            "statistics": {"durations": putils.WorkloadStats().result()},
             "hooks": mock_hook_results,
             "load_duration": 0
         })
@@ -1086,6 +1415,198 @@ class TaskTestCase(test.TestCase):
             mock.call(subtask_conf2)])
 
 
+class SharedContextsTestCase(test.TestCase):
+
+    def _make_context_obj(self, owner_id, namespace="foo"):
+        return {"task": "task", "owner_id": owner_id,
+                "scenario_name": "Foo.bar", "scenario_namespace": namespace,
+                "config": {"users": {}, "cleanup": ["nova"]}}
+
+    def _setup_manager(self, ctx_obj):
+        ctx_obj["users"] = ["user"]
+        ctx_obj["context_execution"] = {"users": {"setup": 1}}
+        ctx_obj["owner_id"] = "changed"
+
+    @mock.patch("rally.task.engine.context.ContextManager")
+    def test_setup_reuses_contexts(self, mock_context_manager):
+        managers = []
+
+        def create_manager(ctx_obj, per_workload=None):
+            manager = mock.Mock(context_obj=ctx_obj)
+            manager.get_config.return_value = {"users": {}}
+            manager.setup.side_effect = lambda: self._setup_manager(ctx_obj)
+            managers.append(manager)
+            return manager
+
+        mock_context_manager.side_effect = create_manager
+        shared_contexts = engine.SharedContexts("s1")
+
+        first = self._make_context_obj("w1")
+        shared_contexts.setup(first)
+        second = self._make_context_obj("w2")
+        shared_contexts.setup(second)
+
+        self.assertEqual(
+            [mock.call(mock.ANY, per_workload=False)] * 2,
+            mock_context_manager.call_args_list)
+        managers[0].setup.assert_called_once_with()
+        self.assertFalse(managers[1].setup.called)
+        self.assertFalse(managers[0].cleanup.called)
+        self.assertEqual(["user"], first["users"])
+        self.assertEqual("w1", first["owner_id"])
+        self.assertEqual({"users": {"setup": 1}}, first["context_execution"])
+        self.assertEqual(["user"], second["users"])
+        self.assertEqual("w2", second["owner_id"])
+        self.assertNotIn("context_execution", second)
+
+        shared_contexts.cleanup()
+        managers[0].cleanup.assert_called_once_with()
+        shared_contexts.cleanup()
+        managers[0].cleanup.assert_called_once_with()
+
+    def test_workload_cleanup_keeps_shared_resources(self):
+        resources = []
+
+        @context.configure(name="shared_resources", order=1)
+        class SharedResources(context.Context):
+            def setup(self):
+                resources.append(self.get_owner_id())
+                self.context["resources"] = list(resources)
+
+            def cleanup(self):
+                resources.remove(self.get_owner_id())
+
+        @context.configure(name="workload_cleanup", order=2,
+                           per_workload=True)
+        class WorkloadCleanup(context.Context):
+            def setup(self):
+                pass
+
+            def cleanup(self):
+                # NOTE: like the cleanup context, delete everything which
+                #       matches the owner id of the workload
+                resources[:] = [r for r in resources
+                                if r != self.get_owner_id()]
+
+        self.addCleanup(SharedResources.unregister)
+        self.addCleanup(WorkloadCleanup.unregister)
+
+        def make_context_obj(owner_id):
+            return {"task": {"uuid": "task"}, "owner_id": owner_id,
+                    "scenario_name": "Foo.bar",
+                    "scenario_namespace": "default",
+                    "config": {"shared_resources": {},
+                               "workload_cleanup": {}}}
+
+        shared_contexts = engine.SharedContexts("s1")
+        for owner_id in ("w1", "w2"):
+            ctx_obj = make_context_obj(owner_id)
+            shared_contexts.setup(ctx_obj)
+            self.assertEqual(["s1"], ctx_obj["resources"])
+            self.assertEqual(owner_id, ctx_obj["owner_id"])
+            with context.ContextManager(ctx_obj, per_workload=True):
+                pass
+            # NOTE: resources of shared contexts survive cleanup of the
+            #       workload and are still there for the next one
+            self.assertEqual(["s1"], resources)
+
+        shared_contexts.cleanup(ctx_obj)
+        self.assertEqual([], resources)
+
+    @mock.patch("rally.task.engine.context.ContextManager")
+    def test_setup_other_contexts(self, mock_context_manager):
+        first_manager = mock.Mock(context_obj={})
+        first_manager.get_config.return_value = {"users": {}}
+        second_manager = mock.Mock(context_obj={})
+        second_manager.get_config.return_value = {"users": {"tenants": 2}}
+        third_manager = mock.Mock(context_obj={})
+        third_manager.get_config.return_value = {"users": {"tenants": 2}}
+        mock_context_manager.side_effect = [first_manager, second_manager,
+                                            third_manager]
+        shared_contexts = engine.SharedContexts("s1")
+
+        shared_contexts.setup(self._make_context_obj("w1"))
+        shared_contexts.setup(self._make_context_obj("w2"))
+        first_manager.cleanup.assert_called_once_with()
+        second_manager.setup.assert_called_once_with()
+
+        shared_contexts.setup(self._make_context_obj("w3", namespace="bar"))
+        second_manager.cleanup.assert_called_once_with()
+        third_manager.setup.assert_called_once_with()
+
+    @mock.patch("rally.task.engine.context.ContextManager")
+    def test_is_reused_by(self, mock_context_manager):
+        mock_context_manager.return_value.get_config.return_value = {}
+        shared_contexts = engine.SharedContexts("s1")
+        self.assertFalse(shared_contexts.is_reused_by(
+            self._make_context_obj("w1")))
+
+        shared_contexts.setup(self._make_context_obj("w1"))
+        self.assertTrue(shared_contexts.is_reused_by(
+            self._make_context_obj("w2")))
+        self.assertFalse(shared_contexts.is_reused_by(
+            self._make_context_obj("w2", namespace="bar")))
+        self.assertFalse(mock_context_manager.return_value.cleanup.called)
+
+    @mock.patch("rally.task.engine.context.ContextManager")
+    def test_cleanup_saves_durations(self, mock_context_manager):
+        manager = mock_context_manager.return_value
+        manager.get_config.return_value = {}
+        manager.context_obj = {
+            "context_execution": {"users": {"setup": 1, "cleanup": 2},
+                                  "roles": {"setup": 3}},
+            "cleanup_durations": {"nova.servers": 4}}
+        shared_contexts = engine.SharedContexts("s1")
+        shared_contexts.setup(self._make_context_obj("w1"))
+
+        ctx_obj = self._make_context_obj("w2")
+        ctx_obj["context_execution"] = {"cleanup": {"setup": 5,
+                                                    "cleanup": 6}}
+        shared_contexts.cleanup(ctx_obj)
+
+        manager.cleanup.assert_called_once_with()
+        self.assertEqual({"cleanup": {"setup": 5, "cleanup": 6},
+                          "users": {"cleanup": 2}},
+                         ctx_obj["context_execution"])
+        self.assertEqual({"nova.servers": 4}, ctx_obj["cleanup_durations"])
+
+    @mock.patch("rally.task.engine.context.ContextManager")
+    def test_setup_fails(self, mock_context_manager):
+        manager = mock_context_manager.return_value
+        manager.get_config.return_value = {}
+        manager.setup.side_effect = MyException()
+        shared_contexts = engine.SharedContexts("s1")
+
+        self.assertRaises(MyException, shared_contexts.setup,
+                          self._make_context_obj("w1"))
+        manager.cleanup.assert_called_once_with()
+
+        manager.cleanup.reset_mock()
+        shared_contexts.cleanup()
+        self.assertFalse(manager.cleanup.called)
+
+
+class SubTaskTestCase(test.TestCase):
+
+    def test_to_dict(self):
+        subtask = engine.SubTask({"title": "foo", "run_in_parallel": True,
+                                  "workloads": []})
+        self.assertEqual({"title": "foo", "description": None,
+                          "context": {}, "run_in_parallel": True},
+                         subtask.to_dict())
+
+    def test_to_dict_defaults(self):
+        subtask = engine.SubTask({"title": "foo", "workloads": []})
+        self.assertFalse(subtask.to_dict()["run_in_parallel"])
+        self.assertFalse(subtask.reuse_context)
+
+    def test_reuse_context(self):
+        subtask = engine.SubTask({"title": "foo", "reuse_context": True,
+                                  "workloads": []})
+        self.assertTrue(subtask.reuse_context)
+        self.assertNotIn("reuse_context", subtask.to_dict())
+
+
 class WorkloadTestCase(test.TestCase):
 
     def setUp(self):
@@ -19,6 +19,7 @@ import multiprocessing
 import ddt
 import mock
 
+from rally.common import utils
 from rally.plugins.common.runners import serial
 from rally.task import runner
 from rally.task import scenario
@@ -52,6 +53,51 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         result = runner._get_scenario_context(13, context_obj)
         self.assertEqual(result, {"foo": "bar", "iteration": 14})
 
+    def test_get_scenario_context_shares_read_only_parts(self):
+        context_obj = runner._share_context(
+            {"tenants": {"t1": {"users": [{"id": "u1"}]}},
+             "users": [{"id": "u1", "tenant_id": "t1"}],
+             "sorted_tenant_ids": ("t1",),
+             "admin": {"credential": "admin"},
+             "config": {"users": {"tenants": 1}},
+             "task": {"uuid": "task"},
+             "foo": {"bar": []}})
+
+        result = runner._get_scenario_context(0, context_obj)
+
+        for key in runner.SHARED_CONTEXT_KEYS:
+            self.assertIs(context_obj[key], result[key])
+        self.assertEqual({"bar": []}, result["foo"])
+        self.assertIsNot(context_obj["foo"], result["foo"])
+        self.assertEqual(1, result["iteration"])
+        self.assertRaises(RuntimeError, result["tenants"].__setitem__,
+                          "t2", {})
+        self.assertRaises(RuntimeError, result["users"][0].__setitem__,
+                          "id", "u2")
+
+    def test_share_context(self):
+        context_obj = {"tenants": {"t1": {"users": [{"id": "u1"}]}},
+                       "users": [{"id": "u1"}],
+                       "foo": {"bar": []}}
+
+        result = runner._share_context(context_obj)
+
+        self.assertIsInstance(result["tenants"], utils.LockedDict)
+        self.assertEqual(({"id": "u1"},), result["tenants"]["t1"]["users"])
+        self.assertEqual(({"id": "u1"},), result["users"])
+        self.assertIs(context_obj["foo"], result["foo"])
+        self.assertEqual([{"id": "u1"}], context_obj["users"])
+
+    def test__copy_scenario_kwargs(self):
+        kwargs = {"a": 1, "b": "foo", "c": None, "d": {"e": [1]}}
+
+        result = runner._copy_scenario_kwargs(kwargs)
+
+        self.assertEqual(kwargs, result)
+        self.assertIsNot(kwargs, result)
+        self.assertIsNot(kwargs["d"], result["d"])
+        self.assertIsNot(kwargs["d"]["e"], result["d"]["e"])
+
     def test_run_scenario_once_internal_logic(self):
         context = runner._get_scenario_context(
             12, fakes.FakeContext({}).context)
@@ -130,6 +176,56 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
                          ["Exception", "Something went wrong"])
 
 
+class BatchQueueTestCase(test.TestCase):
+
+    def setUp(self):
+        super(BatchQueueTestCase, self).setUp()
+        self.queue = mock.Mock()
+        self.task = {"uuid": "foo_uuid"}
+        self.result = {"duration": 1.0, "timestamp": 1.0,
+                       "idle_duration": 0.0, "error": [],
+                       "output": {"additive": [], "complete": []},
+                       "atomic_actions": []}
+
+    @mock.patch(BASE + "time.time", return_value=0)
+    def test_put(self, mock_time):
+        batch_queue = runner._BatchQueue(self.queue, self.task, interval=10)
+
+        batch_queue.put(self.result)
+        batch_queue.put(self.result)
+        self.assertFalse(self.queue.put.called)
+
+        mock_time.return_value = 10
+        batch_queue.put(self.result)
+
+        self.queue.put.assert_called_once_with(mock.ANY)
+        batch = self.queue.put.call_args[0][0]
+        self.assertIsInstance(batch, runner.ResultsBatch)
+        self.assertEqual([self.result] * 3, batch.results)
+        self.assertEqual(3, batch.stats.iterations_count)
+
+    @mock.patch(BASE + "LOG")
+    def test_put_invalid_result(self, mock_log):
+        batch_queue = runner._BatchQueue(self.queue, self.task, interval=0)
+
+        batch_queue.put({"duration": 1.0})
+        batch_queue.flush()
+
+        self.assertTrue(mock_log.warning.called)
+        self.assertFalse(self.queue.put.called)
+
+    def test_flush(self):
+        batch_queue = runner._BatchQueue(self.queue, self.task)
+
+        batch_queue.put(self.result)
+        batch_queue.flush()
+        batch_queue.flush()
+
+        self.queue.put.assert_called_once_with(mock.ANY)
+        self.assertEqual([self.result],
+                         self.queue.put.call_args[0][0].results)
+
+
 @ddt.ddt
 class ScenarioRunnerTestCase(test.TestCase):
 
@@ -166,7 +262,13 @@ class ScenarioRunnerTestCase(test.TestCase):
 
         expected_config_kwargs = {"image": 1, "flavor": 1}
         runner_obj._run_scenario.assert_called_once_with(
-            plugin_cls, method_name, context_obj, expected_config_kwargs)
+            plugin_cls, method_name, mock.ANY, expected_config_kwargs)
+        shared_context = runner_obj._run_scenario.call_args[0][2]
+        self.assertEqual(("nova", "cinder"),
+                         shared_context["config"]["cleanup"])
+        self.assertIsInstance(shared_context["config"], utils.LockedDict)
+        self.assertIsInstance(shared_context["admin"], utils.LockedDict)
+        self.assertEqual(["nova", "cinder"], context_obj["config"]["cleanup"])
 
     @mock.patch(BASE + "rutils.Timer.duration", return_value=10)
     def test_run_classbased(self, mock_timer_duration):
@@ -217,15 +319,19 @@ class ScenarioRunnerTestCase(test.TestCase):
         for process in process_pool:
             self.assertIsInstance(process, multiprocessing.Process)
 
-    @mock.patch(BASE + "ScenarioRunner._send_result")
-    def test__join_processes(self, mock_scenario_runner__send_result):
-        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
+    @mock.patch(BASE + "ScenarioRunner.send_event")
+    @mock.patch(BASE + "ScenarioRunner._send_results_batch")
+    def test__join_processes(self, mock_scenario_runner__send_results_batch,
+                             mock_scenario_runner_send_event):
+        process = mock.MagicMock()
         processes = 10
         process_pool = collections.deque([process] * processes)
+        batches = [runner.ResultsBatch(), runner.ResultsBatch()]
         mock_result_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+            get=mock.MagicMock(side_effect=batches + [None]))
         mock_event_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+            get=mock.MagicMock(side_effect=[{"type": "iteration",
+                                             "value": 1}, None]))
 
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -235,7 +341,15 @@ class ScenarioRunnerTestCase(test.TestCase):
             process_pool, mock_result_queue, mock_event_queue)
 
         self.assertEqual(processes, process.join.call_count)
+        self.assertEqual(
+            [mock.call(batch) for batch in batches],
+            mock_scenario_runner__send_results_batch.call_args_list)
+        mock_scenario_runner_send_event.assert_called_once_with(
+            type="iteration", value=1)
+        mock_result_queue.put.assert_called_once_with(None)
+        mock_event_queue.put.assert_called_once_with(None)
         mock_result_queue.close.assert_called_once_with()
+        mock_event_queue.close.assert_called_once_with()
 
     def _get_runner(self, task="mock_me", config="mock_me", batch_size=0):
         class ScenarioRunner(runner.ScenarioRunner):
@@ -368,11 +482,15 @@ class ScenarioRunnerTestCase(test.TestCase):
 
     def test__send_result(self):
         runner_ = self._get_runner(task={"uuid": "foo_uuid"})
-        result = {"timestamp": 42}
+        result = {"timestamp": 42.0, "duration": 1.0, "error": [],
+                  "atomic_actions": []}
         runner_._result_has_valid_schema = mock.Mock(return_value=True)
         self.assertIsNone(runner_._send_result(result))
-        self.assertEqual([], runner_.result_batch)
-        self.assertEqual(collections.deque([[result]]), runner_.result_queue)
+        self.assertEqual(0, len(runner_.result_batch))
+        self.assertEqual(1, len(runner_.result_queue))
+        batch = runner_.result_queue[0]
+        self.assertEqual([result], batch.results)
+        self.assertEqual(1, batch.stats.iterations_count)
 
     @mock.patch("rally.task.runner.LOG")
     def test__send_result_with_invalid_schema(self, mock_log):
@@ -382,5 +500,11 @@ class ScenarioRunnerTestCase(test.TestCase):
         self.assertIsNone(runner_._send_result(result))
         runner_._result_has_valid_schema.assert_called_once_with(result)
         self.assertTrue(mock_log.warning.called)
-        self.assertEqual([], runner_.result_batch)
+        self.assertEqual(0, len(runner_.result_batch))
         self.assertEqual(collections.deque([]), runner_.result_queue)
+
+    def test__send_results_batch(self):
+        runner_ = self._get_runner(task={"uuid": "foo_uuid"})
+        batch = runner.ResultsBatch()
+        runner_._send_results_batch(batch)
+        self.assertEqual(collections.deque([batch]), runner_.result_queue)
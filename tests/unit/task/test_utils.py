@@ -15,6 +15,7 @@
 
 import collections
 import datetime as dt
+import threading
 
 import ddt
 from jsonschema import exceptions as schema_exceptions
@@ -528,6 +529,219 @@ class WaitForStatusTestCase(test.TestCase):
                           resource=res, ready_statuses=["ready"],
                           update_resource=upd, timeout=2, id_attr="uuid")
 
+    @mock.patch("rally.task.utils.get_status_watcher")
+    def test_wait_for_statuses(self, mock_get_status_watcher):
+        resources = [{"id": 1}, {"id": 2}]
+        list_resources = mock.Mock()
+        mock_watch = mock_get_status_watcher.return_value.watch
+        futures = [mock.Mock(), mock.Mock()]
+        mock_watch.side_effect = futures
+        ret = utils.wait_for_statuses(resources, ["ready"], list_resources,
+                                      timeout=2)
+        self.assertEqual([f.result.return_value for f in futures], ret)
+        self.assertEqual(
+            [mock.call(r, list_resources, ["ready"], timeout=2)
+             for r in resources],
+            mock_watch.call_args_list)
+
+    @mock.patch("rally.task.utils.get_status_watcher")
+    def test_wait_with_list_resources(self, mock_get_status_watcher):
+        res = {"status": "not_ready"}
+        list_resources = mock.Mock()
+        mock_watch = mock_get_status_watcher.return_value.watch
+        ret = utils.wait_for_status(resource=res, ready_statuses=["ready"],
+                                    list_resources=list_resources,
+                                    timeout=2, check_interval=3)
+        self.assertEqual(mock_watch.return_value.result.return_value, ret)
+        mock_watch.assert_called_once_with(
+            res, list_resources, {"READY"}, failure_statuses=set(),
+            status_attr="status", id_attr="id", check_deletion=False,
+            timeout=2, check_interval=3, group_key=None)
+
+
+class StatusWatcherTestCase(test.TestCase):
+
+    def _watch(self, watcher, list_resources, resource_id, **kwargs):
+        kwargs.setdefault("timeout", 5)
+        kwargs.setdefault("check_interval", 0.001)
+        return watcher.watch({"id": resource_id, "status": "building"},
+                             list_resources, **kwargs)
+
+    def test_watch(self):
+        resources = [{"id": 1, "status": "active"},
+                     {"id": 2, "status": "error"},
+                     {"id": 3, "status": "deleted"}]
+        list_resources = mock.Mock(return_value=resources)
+        watcher = utils.StatusWatcher()
+
+        ready = self._watch(watcher, list_resources, 1,
+                            ready_statuses=["ACTIVE"])
+        failed = self._watch(watcher, list_resources, 2,
+                             ready_statuses=["ACTIVE"],
+                             failure_statuses=["error"])
+        deleted = self._watch(watcher, list_resources, 3,
+                              ready_statuses=["ACTIVE"])
+        missing = self._watch(watcher, list_resources, 4,
+                              ready_statuses=["ACTIVE"],
+                              check_deletion=True)
+
+        self.assertEqual(resources[0], ready.result())
+        self.assertRaises(exceptions.GetResourceErrorStatus, failed.result)
+        self.assertRaises(exceptions.GetResourceNotFound, deleted.result)
+        self.assertIsNone(missing.result())
+        self.assertTrue(ready.done())
+        self.assertLessEqual(list_resources.call_count, 4)
+
+    def test_watch_batches_resources(self):
+        resources = [{"id": i, "status": "building"} for i in range(10)]
+        list_called = mock.Mock()
+
+        def list_resources():
+            list_called()
+            for resource in resources:
+                resource["status"] = "active"
+            return resources
+
+        watcher = utils.StatusWatcher()
+        # NOTE: pretend the thread is started to poll in the current thread
+        watcher._thread = mock.Mock()
+        futures = [self._watch(watcher, list_resources, i,
+                               ready_statuses=["active"])
+                   for i in range(10)]
+        watcher._run()
+
+        self.assertIsNone(watcher._thread)
+        self.assertEqual(resources, [f.result() for f in futures])
+        list_called.assert_called_once_with()
+        self.assertEqual({}, watcher._groups)
+
+    def test_watch_group_key(self):
+        resources = [{"id": i, "status": "active"} for i in range(4)]
+        list_first = mock.Mock(return_value=resources)
+        list_second = mock.Mock(return_value=resources)
+
+        watcher = utils.StatusWatcher()
+        watcher._thread = mock.Mock()
+        futures = [self._watch(watcher, list_resources, i,
+                               ready_statuses=["active"],
+                               group_key=("tenant", "servers"))
+                   for i, list_resources in enumerate(
+                       [list_first, list_second] * 2)]
+        self.assertEqual([("tenant", "servers")], list(watcher._groups))
+        watcher._run()
+
+        self.assertEqual(resources, [f.result() for f in futures])
+        list_first.assert_called_once_with()
+        self.assertFalse(list_second.called)
+        self.assertEqual({}, watcher._groups)
+
+    def test_watch_timeout(self):
+        list_resources = mock.Mock(return_value=[{"id": 1,
+                                                  "status": "building"}])
+        watcher = utils.StatusWatcher()
+        future = self._watch(watcher, list_resources, 1,
+                             ready_statuses=["active"], timeout=0.01)
+        self.assertRaises(exceptions.TimeoutException, future.result)
+
+    @mock.patch("rally.task.utils.LOG")
+    def test_watch_list_fails(self, mock_log):
+        list_resources = mock.Mock(side_effect=[Exception, []])
+        watcher = utils.StatusWatcher()
+        future = self._watch(watcher, list_resources, 1,
+                             ready_statuses=["active"], check_deletion=True)
+        self.assertIsNone(future.result())
+        self.assertEqual(2, list_resources.call_count)
+        self.assertTrue(mock_log.warning.called)
+
+    def test_watch_slow_group(self):
+        release = threading.Event()
+
+        def list_slow():
+            release.wait(5)
+            return [{"id": 1, "status": "active"}]
+
+        list_fast = mock.Mock(return_value=[{"id": 2, "status": "active"}])
+        watcher = utils.StatusWatcher(workers=2)
+        slow = self._watch(watcher, list_slow, 1, ready_statuses=["active"])
+        fast = self._watch(watcher, list_fast, 2, ready_statuses=["active"])
+        self.assertEqual({"id": 2, "status": "active"}, fast.result())
+        self.assertFalse(slow.done())
+        release.set()
+        self.assertEqual({"id": 1, "status": "active"}, slow.result())
+
+    def test__run_bounds_pollers(self):
+        watcher = utils.StatusWatcher(workers=2)
+        watcher._thread = mock.Mock()
+        futures = [self._watch(watcher,
+                               mock.Mock(return_value=[{"id": i,
+                                                        "status": "active"}]),
+                               i, ready_statuses=["active"])
+                   for i in range(5)]
+        with mock.patch("rally.task.utils.threading.Thread",
+                        side_effect=threading.Thread) as mock_thread:
+            watcher._run()
+        pollers = [c for c in mock_thread.call_args_list
+                   if c[1].get("target") == watcher._poller]
+        self.assertEqual(2, len(pollers))
+        self.assertEqual([{"id": i, "status": "active"} for i in range(5)],
+                         [f.result() for f in futures])
+
+    @mock.patch("rally.task.utils.LOG")
+    def test__poll_list_timeout(self, mock_log):
+        release = threading.Event()
+        list_resources = mock.Mock(side_effect=lambda: release.wait(5))
+        watcher = utils.StatusWatcher(list_timeout=0.01)
+        group = utils._WatchGroup(list_resources, list_resources)
+        watched = utils._WatchedResource(
+            {"id": 1, "status": "building"}, ready_statuses={"ACTIVE"},
+            failure_statuses=set(), status_attr="status", id_attr="id",
+            check_deletion=False, timeout=0, check_interval=1)
+        group.resources.append(watched)
+        group.interval = 1
+        watcher._groups[list_resources] = group
+
+        watcher._poll(group)
+        self.assertTrue(mock_log.warning.called)
+        self.assertRaises(exceptions.TimeoutException, watched.future.result)
+        self.assertEqual({}, watcher._groups)
+
+        # the hanging call is not repeated
+        group.resources.append(watched)
+        watcher._groups[list_resources] = group
+        watcher._poll(group)
+        list_resources.assert_called_once_with()
+        release.set()
+
+    def test__poll_backoff(self):
+        list_resources = mock.Mock(return_value=[{"id": 1,
+                                                  "status": "building"}])
+        watcher = utils.StatusWatcher(backoff_factor=2, max_backoff=3)
+        group = utils._WatchGroup(list_resources, list_resources)
+        watched = utils._WatchedResource(
+            {"id": 1, "status": "building"}, ready_statuses={"ACTIVE"},
+            failure_statuses=set(), status_attr="status", id_attr="id",
+            check_deletion=False, timeout=60, check_interval=1)
+        group.resources.append(watched)
+        group.interval = 1
+        watcher._groups[list_resources] = group
+
+        intervals = []
+        for i in range(3):
+            watcher._poll(group)
+            intervals.append(group.interval)
+        self.assertEqual([2, 3, 3], intervals)
+
+        list_resources.return_value = [{"id": 1, "status": "rebuilding"}]
+        watcher._poll(group)
+        self.assertEqual(1, group.interval)
+
+    @mock.patch("rally.task.utils.os.getpid", return_value=1)
+    def test_get_status_watcher(self, mock_getpid):
+        watcher = utils.get_status_watcher()
+        self.assertIs(watcher, utils.get_status_watcher())
+        mock_getpid.return_value = 2
+        self.assertIsNot(watcher, utils.get_status_watcher())
+
 
 @ddt.ddt
 class WrapperForAtomicActionsTestCase(test.TestCase):
@@ -22,6 +22,7 @@ from oslo_config import fixture
 from oslotest import base
 
 from rally.common import db
+from rally import osclients
 from rally import plugins
 from rally.task import utils as tutils
 from tests.unit import fakes
@@ -44,6 +45,7 @@ class TestCase(base.BaseTestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        self.addCleanup(osclients.SESSION_CACHE.clear)
         plugins.load()
 
     def _test_atomic_action_timer(self, atomic_actions, name):
@@ -129,11 +131,14 @@ class ScenarioTestCase(TestCase):
                 self.benchmark_utils + ".wait_for_delete")
             self.mock_wait_for_status = fixtures.MockPatch(
                 self.benchmark_utils + ".wait_for_status")
+            self.mock_wait_for_statuses = fixtures.MockPatch(
+                self.benchmark_utils + ".wait_for_statuses")
             self.useFixture(self.mock_resource_is)
             self.useFixture(self.mock_get_from_manager)
             self.useFixture(self.mock_wait_for)
             self.useFixture(self.mock_wait_for_delete)
             self.useFixture(self.mock_wait_for_status)
+            self.useFixture(self.mock_wait_for_statuses)
 
         self.mock_sleep = fixtures.MockPatch("time.sleep")
         self.useFixture(self.mock_sleep)
@@ -16,6 +16,7 @@
 """Test for api."""
 
 import copy
+import datetime as dt
 import os
 
 import ddt
@@ -424,7 +425,15 @@ class TaskAPITestCase(test.TestCase):
         mock_task.get_detailed.return_value = "detailed_task_data"
         self.assertEqual("detailed_task_data",
                          self.task_inst.get_detailed(task_id="task_uuid"))
-        mock_task.get_detailed.assert_called_once_with("task_uuid")
+        mock_task.get_detailed.assert_called_once_with("task_uuid",
+                                                       load_raw=True)
+
+    @mock.patch("rally.api.objects.Workload")
+    def test_get_workload_data(self, mock_workload):
+        self.assertEqual(
+            mock_workload.get_data_page.return_value,
+            self.task_inst.get_workload_data(workload_uuid="uuid", chunk=2))
+        mock_workload.get_data_page.assert_called_once_with("uuid", chunk=2)
 
     @mock.patch("rally.api.objects.Task")
     def test_list(self, mock_task):
@@ -443,7 +452,8 @@ class TaskAPITestCase(test.TestCase):
         self.assertEqual({"uuid": "foo_uuid", "results": "extended_results"},
                          self.task_inst.get_detailed(task_id="foo_uuid",
                                                      extended_results=True))
-        mock_task.get_detailed.assert_called_once_with("foo_uuid")
+        mock_task.get_detailed.assert_called_once_with("foo_uuid",
+                                                       load_raw=True)
         mock_task.extend_results.assert_called_once_with("raw_results")
 
     @mock.patch("rally.api.objects.Task")
@@ -481,7 +491,8 @@ class TaskAPITestCase(test.TestCase):
         )
         work_load = sub_task.add_workload.return_value
         work_load.add_workload_data.assert_has_calls(
-            [mock.call(0, {"raw": task_results[0]["result"]})]
+            [mock.call(0, {"raw": task_results[0]["result"]},
+                       compress=False)]
         )
         work_load.set_results.assert_has_calls(
             [mock.call(task_results[0])]
@@ -502,6 +513,7 @@ class TaskAPITestCase(test.TestCase):
                                     {"timestamp": 2},
                                     {"timestamp": 3}]}]
         mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_chunk_compression = False
 
         self.assertEqual(
             mock_task.return_value.to_dict(),
@@ -529,8 +541,8 @@ class TaskAPITestCase(test.TestCase):
         work_load = sub_task.add_workload.return_value
         work_load.add_workload_data.assert_has_calls(
             [mock.call(0, {"raw": [{"timestamp": 1},
-                                   {"timestamp": 2}]}),
-             mock.call(1, {"raw": [{"timestamp": 3}]})
+                                   {"timestamp": 2}]}, compress=False),
+             mock.call(1, {"raw": [{"timestamp": 3}]}, compress=False)
              ]
         )
         work_load.set_results.assert_has_calls(
@@ -1636,6 +1648,28 @@ class VerificationAPITestCase(test.TestCase):
         mock_verification_list.assert_called_once_with(
             verifier_id, deployment_id=deployment_id, tags=tags,
             status=status)
+        mock_verification_list.return_value[0].to_dict.assert_called_with(
+            include_tests=False)
+
+    @mock.patch("rally.common.objects.verification.db."
+                "verification_test_list")
+    @mock.patch("rally.common.objects.verification.db.verification_list")
+    def test_list_does_not_load_tests(self, mock_verification_list,
+                                      mock_verification_test_list):
+        now = dt.datetime.now()
+        mock_verification_list.return_value = [
+            {"uuid": "uuid-1", "tests_count": 2, "created_at": now,
+             "updated_at": now},
+            {"uuid": "uuid-2", "tests_count": 0, "created_at": now,
+             "updated_at": now}]
+
+        verifications = self.verification_inst.list()
+
+        self.assertEqual(["uuid-1", "uuid-2"],
+                         [v["uuid"] for v in verifications])
+        self.assertEqual([2, 0], [v["tests_count"] for v in verifications])
+        self.assertNotIn("tests", verifications[0])
+        self.assertFalse(mock_verification_test_list.called)
 
     @mock.patch("rally.api.vreporter.VerificationReporter")
     @mock.patch("rally.api.objects.Verification.get")
@@ -1800,8 +1834,8 @@ class VerificationAPITestCase(test.TestCase):
         verifier_obj.manager.run.assert_called_once_with(context)
 
         results = verifier_obj.manager.run.return_value
-        verification_obj.finish.assert_called_once_with(results.totals,
-                                                        results.tests)
+        verification_obj.finish.assert_called_once_with(
+            results.totals, results.unreported_tests)
 
         self.assertFalse(mock_configure.called)
 
@@ -1892,7 +1926,7 @@ class VerificationAPITestCase(test.TestCase):
                                      concurrency=1)
         mock_start.assert_called_once_with(
             verifier_id="v_uuid", deployment_id="d_uuid",
-            load_list=tests.keys(), tags=None, concurrency=1)
+            load_list=list(tests), tags=None, concurrency=1)
 
     @mock.patch("rally.api._Verification.start")
     @mock.patch("rally.api.objects.Verification.create")
@@ -1901,32 +1935,29 @@ class VerificationAPITestCase(test.TestCase):
                                 mock_verification_get,
                                 mock_verification_create,
                                 mock_start):
-        tests = {"test_1": {"status": "success"},
-                 "test_2": {"status": "fail"},
+        tests = {"test_2": {"status": "fail"},
                  "test_3": {"status": "fail"}}
         mock_verification_get.return_value = mock.Mock(
-            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid",
-            tests=tests)
+            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid")
+        mock_verification_get.return_value.get_tests.return_value = tests
         self.verification_inst.return_value = mock.Mock()
         self.verification_inst.api.deployment.get.return_value = {
             "name": "deployment_name",
             "uuid": "deployment_uuid",
         }
-        expected_tests = [t for t, r in tests.items() if r["status"] == "fail"]
         self.verification_inst.rerun(verification_uuid="uuid", failed=True)
+        mock_verification_get.return_value.get_tests.assert_called_once_with(
+            status="fail")
         mock_start.assert_called_once_with(
             verifier_id="v_uuid", deployment_id="deployment_uuid",
-            load_list=expected_tests, tags=None)
+            load_list=list(tests), tags=None)
 
     @mock.patch("rally.api._Verification._get")
     def test_rerun_failed_tests_raise_exc(
             self, mock___verification__get):
-        tests = {"test_1": {"status": "success"},
-                 "test_2": {"status": "success"},
-                 "test_3": {"status": "skip"}}
         mock___verification__get.return_value = mock.Mock(
-            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid",
-            tests=tests)
+            uuid="uuid", verifier_uuid="v_uuid", deployment_uuid="d_uuid")
+        mock___verification__get.return_value.get_tests.return_value = {}
 
         e = self.assertRaises(exceptions.RallyException,
                               self.verification_inst.rerun,
@@ -274,9 +274,92 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
         self.assertEqual(auth_plugin.get_access.return_value,
                          cache["keystone_auth_ref"])
 
-        # check that auth_ref was cached.
+        # check that the token is taken from the plugin, which refreshes
+        # it if it is about to expire
         keystone.auth_ref
-        mock_keystone_get_session.assert_called_once_with()
+        self.assertEqual([mock.call()] * 2,
+                         mock_keystone_get_session.call_args_list)
+        self.assertEqual([mock.call(session)] * 2,
+                         auth_plugin.get_access.call_args_list)
+
+    @mock.patch("rally.osclients.Keystone._create_session")
+    def test_get_session_shared(self, mock_keystone__create_session):
+        credential = oscredential.OpenStackCredential(
+            "http://auth_url/v3", "user", "pass", "tenant")
+        other_credential = oscredential.OpenStackCredential(
+            "http://auth_url/v3", "user2", "pass", "tenant")
+
+        session = osclients.Keystone(credential, {}, {}).get_session()
+        self.assertEqual(mock_keystone__create_session.return_value, session)
+        self.assertEqual(
+            session, osclients.Keystone(credential, {}, {}).get_session())
+        mock_keystone__create_session.assert_called_once_with(None)
+
+        osclients.Keystone(credential, {}, {}).get_session(version="3")
+        osclients.Keystone(other_credential, {}, {}).get_session()
+        self.assertEqual(3, mock_keystone__create_session.call_count)
+        self.assertEqual(3, len(osclients.SESSION_CACHE._cache))
+
+    @mock.patch("rally.osclients.Keystone._create_session")
+    def test_get_session_not_shared(self, mock_keystone__create_session):
+        credential = oscredential.OpenStackCredential(
+            "http://auth_url/v3", "user", "pass", "tenant")
+        keystone = osclients.Keystone(credential, {}, {})
+
+        keystone.get_session()
+        keystone.get_session(shared=False)
+        keystone.get_session(shared=False)
+
+        self.assertEqual(3, mock_keystone__create_session.call_count)
+        self.assertEqual(1, len(osclients.SESSION_CACHE._cache))
+
+
+class SessionCacheTestCase(test.TestCase):
+
+    def test_get(self):
+        cache = osclients.SessionCache()
+        func = mock.Mock()
+
+        self.assertEqual(func.return_value, cache.get("key", func))
+        self.assertEqual(func.return_value, cache.get("key", func))
+        func.assert_called_once_with()
+        self.assertEqual({"key": func.return_value}, cache._cache)
+
+        cache.clear()
+        self.assertEqual({}, cache._cache)
+
+    def test_get_error(self):
+        cache = osclients.SessionCache()
+        func = mock.Mock(side_effect=[ValueError, "session"])
+
+        self.assertRaises(ValueError, cache.get, "key", func)
+        self.assertEqual("session", cache.get("key", func))
+        self.assertEqual({"key": "session"}, cache._cache)
+
+    def test_get_bounded(self):
+        cache = osclients.SessionCache(max_size=2)
+
+        cache.get("a", lambda: "session_a")
+        cache.get("b", lambda: "session_b")
+        # NOTE: "a" becomes the most recently used one, so "b" is dropped
+        self.assertEqual("session_a", cache.get("a", mock.Mock()))
+        cache.get("c", lambda: "session_c")
+
+        self.assertEqual(["a", "c"], list(cache._cache))
+        self.assertEqual("session_a", cache.get("a", mock.Mock()))
+        self.assertEqual("new_b", cache.get("b", lambda: "new_b"))
+        self.assertEqual({}, cache._key_locks)
+
+    @mock.patch("rally.osclients.os.getpid")
+    def test_get_forked(self, mock_getpid):
+        mock_getpid.return_value = 1
+        cache = osclients.SessionCache()
+        func = mock.Mock(side_effect=["parent", "child"])
+        self.assertEqual("parent", cache.get("key", func))
+
+        mock_getpid.return_value = 2
+        self.assertEqual("child", cache.get("key", func))
+        self.assertEqual({"key": "child"}, cache._cache)
 
 
 @ddt.ddt